@@ -29,13 +29,22 @@
 """
 
 import pandas as pd
+import numpy as np
 import re
 import os
 import shutil
 import argparse
 import sys
-from typing import Dict, List, Optional, Tuple, Any
-from openpyxl import load_workbook
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.log_tokenizer import build_marker_spec, tokenize_log_parallel, columns_to_dataframe
+from common.nano_time import LOG_NANO_DTYPES, NANO_DTYPE, cast_nano_columns, nano_columns_as_text
+from common.excel_report import TEXT_FORMAT, write_excel_with_side_table
+from common.event_pivot import ATTEMPT_COLUMN, ATTEMPT_KEYS, as_record_frame, assign_attempt_ids, pivot_events_by_tag
+from common.binning import BIN_MODE_EQUAL, BinningEngine, add_binning_arguments, binning_engine_from_args, summarize_bins_by_room
+from common.room_partition import RoomPartition, sort_subset_within_rooms
+from common.table_io import TABLE_FORMAT_EXTENSIONS, get_table_format, with_table_extension, write_table
 
 # ===== 상수 정의 =====
 # 파일 경로 상수
@@ -58,6 +67,35 @@ RESULT_UNKNOWN = 'UNKNOWN'
 # 분석 구간 수
 BINS_COUNT = 10
 
+# 기본 bin 할당 방식 (방별 BINS_COUNT 개 구간 균등 분할, --bin_mode 등으로 변경)
+DEFAULT_BINNING = BinningEngine(BIN_MODE_EQUAL, bin_count=BINS_COUNT)
+
+# 이벤트 태그 → 프로필 컬럼 접두사
+EVENT_PREFIXES = {
+    EVENT_WAITING_START: 'waiting_start',
+    EVENT_CRITICAL_ENTER: 'critical_enter',
+    EVENT_CRITICAL_LEAVE: 'critical_leave',
+    EVENT_INCREMENT_BEFORE: 'increment_before',
+    EVENT_INCREMENT_AFTER: 'increment_after'
+}
+
+# 이벤트 필드 → 프로필 컬럼 접미사
+EVENT_FIELDS = {'timestamp': 'time', 'nanoTime': 'nanoTime', 'epochNano': 'epochNano', 'event_type': 'event_type'}
+
+# 프로필 컬럼 접미사 → dtype
+EVENT_FIELD_DTYPES = {'time': 'datetime64[ns, UTC]', 'nanoTime': NANO_DTYPE, 'epochNano': NANO_DTYPE, 'event_type': 'string'}
+
+# 중간 산출물 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환)
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'float64',
+    'user_id': 'string',
+    ATTEMPT_COLUMN: 'int64',
+    'room_entry_sequence': 'float64',
+    'join_result': 'string',
+    **{f'{prefix}_{suffix}': dtype for prefix in EVENT_PREFIXES.values() for suffix, dtype in EVENT_FIELD_DTYPES.items()}
+}
+
 # 정규 표현식 패턴
 CRITICAL_PATTERN = re.compile(
     r'CRITICAL_SECTION_MARK tag=(?P<tag>WAITING_START|CRITICAL_ENTER|CRITICAL_LEAVE)'
@@ -78,6 +116,17 @@ INCREMENT_PATTERN = re.compile(
     r'.* nanoTime=(?P<nanoTime>\d+)'
 )
 
+# 로그 토크나이저 규칙 (마커 부분 문자열로 사전 필터링 후 마커별 정규식 1회 적용, 앞쪽 규칙 우선)
+CRITICAL_SPEC = build_marker_spec(
+    'CRITICAL_SECTION_MARK', ['CRITICAL_SECTION_MARK tag='], CRITICAL_PATTERN,
+    int_fields=['roomNumber', 'nanoTime', 'epochNano'], copy_fields={'event_type': 'event'}
+)
+INCREMENT_SPEC = build_marker_spec(
+    'INCREMENT', ['event=INCREMENT_'], INCREMENT_PATTERN,
+    int_fields=['roomNumber', 'nanoTime', 'epochNano'], constant_fields={'event_type': None}
+)
+LOG_SPECS = [CRITICAL_SPEC, INCREMENT_SPEC]
+
 
 def test_critical_pattern():
     """CRITICAL_PATTERN 정규식 테스트 함수"""
@@ -110,55 +159,14 @@ def replace_log_file() -> None:
     print(f"로그 파일 교체 완료: {NEW_LOG_PATH} → {LOG_FILE}")
 
 
-def parse_log_line(line: str) -> Optional[Dict[str, Any]]:
-    """
-    로그 라인을 파싱하여 이벤트 정보 추출
-    """
-    # CRITICAL_SECTION_MARK 패턴 매칭
-    match = CRITICAL_PATTERN.search(line)
-    if match:
-        data = match.groupdict()
-        data['event_type'] = data['event']
-        return data
-    
-    # INCREMENT 이벤트 패턴 매칭
-    match = INCREMENT_PATTERN.search(line)
-    if match:
-        data = match.groupdict()
-        data['event_type'] = None
-        return data
-    
-    return None
-
-
-def parse_five_events_clean(filepath: str, room_number: Optional[int] = None) -> pd.DataFrame:
+def parse_five_events_clean(filepath: str, room_number: Optional[int] = None, workers: int = 1) -> pd.DataFrame:
     """
     로그 파일에서 5가지 이벤트 + PRE_CHECK_FAIL 이벤트를 파싱하여 DataFrame으로 변환
     """
-    records = []
-    pre_check_fail_count = 0
-    
     try:
-        with open(filepath, encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                data = parse_log_line(line)
-                
-                if data:
-                    # PRE_CHECK_FAIL_OVER_CAPACITY 이벤트 발견 시 로깅
-                    if data.get('event_type') == 'PRE_CHECK_FAIL_OVER_CAPACITY':
-                        pre_check_fail_count += 1
-                        print(f"🔍 PRE_CHECK_FAIL 이벤트 발견 (라인 {line_num}): roomNumber={data.get('roomNumber')}, userId={data.get('userId')}")
-                    
-                    # 방 번호를 정수로 변환
-                    data['roomNumber'] = int(data['roomNumber'])
-                    
-                    # 나노초 값들을 문자열로 유지
-                    data['nanoTime'] = data['nanoTime']
-                    data['epochNano'] = data['epochNano']
-                    
-                    # 방 번호 필터링
-                    if room_number is None or data['roomNumber'] == room_number:
-                        records.append(data)
+        # 마커 사전 필터링 + 컬럼별 누적 (방 번호/나노초 값들은 정수)
+        # workers > 1 이면 개행 경계 구간별 병렬 파싱 후 순서대로 병합
+        columns = tokenize_log_parallel(filepath, LOG_SPECS, room_number=room_number, workers=workers)
     
     except FileNotFoundError:
         print(f"오류: 로그 파일을 찾을 수 없습니다 - {filepath}")
@@ -167,139 +175,84 @@ def parse_five_events_clean(filepath: str, room_number: Optional[int] = None) ->
         print(f"오류: 로그 파일 파싱 실패 - {e}")
         return pd.DataFrame()
     
+    # PRE_CHECK_FAIL_OVER_CAPACITY 이벤트 집계 (라인별 출력 대신 건수만)
+    pre_check_fail_count = sum(1 for event_type in columns['event_type'] if event_type == 'PRE_CHECK_FAIL_OVER_CAPACITY')
     print(f"📊 전체 PRE_CHECK_FAIL_OVER_CAPACITY 이벤트 발견: {pre_check_fail_count}건")
-    return pd.DataFrame(records)
+    return columns_to_dataframe(columns, dtypes=LOG_NANO_DTYPES)
 
 
-def create_pre_check_fail_record(event_data: pd.Series) -> Dict[str, Any]:
+def build_pre_check_fail_records(events: pd.DataFrame) -> pd.DataFrame:
     """
-    PRE_CHECK_FAIL_OVER_CAPACITY 이벤트로부터 독립 레코드 생성 (room_entry_sequence 제거)
+    PRE_CHECK_FAIL_OVER_CAPACITY 이벤트들로부터 독립 레코드 일괄 생성 (room_entry_sequence 제거)
+    - 대기 시작 정보만 이벤트 값으로 채우고 나머지 이벤트 컬럼은 빈 값('') / 0
     """
-    record = {
+    records = pd.DataFrame({
         # 기본 정보
-        'user_id': event_data['userId'],
-        'roomNumber': event_data['roomNumber'],
+        'user_id': events['userId'].to_numpy(dtype=object),
+        ATTEMPT_COLUMN: events[ATTEMPT_COLUMN].to_numpy(dtype=object),
+        'roomNumber': events['roomNumber'].to_numpy(dtype=object),
         'join_result': RESULT_PRE_CHECK_FAIL,
         
         # 정렬용 시간 정보
-        'waiting_start_time': event_data['timestamp'],
-        'waiting_start_nanoTime': str(int(float(event_data['nanoTime']))),
-        'waiting_start_epochNano': str(int(float(event_data['epochNano']))),
-        
-        # 나머지 모든 이벤트 컬럼들 - 빈 값 처리
-        'waiting_start_event_type': '',
-        'critical_enter_time': '',
-        'critical_enter_nanoTime': '0',
-        'critical_enter_epochNano': '0',
-        'critical_enter_event_type': '',
-        'critical_leave_time': '',
-        'critical_leave_nanoTime': '0',
-        'critical_leave_epochNano': '0',
-        'critical_leave_event_type': '',
-        'increment_before_time': '',
-        'increment_before_nanoTime': '0',
-        'increment_before_epochNano': '0',
-        'increment_before_event_type': '',
-        'increment_after_time': '',
-        'increment_after_nanoTime': '0',
-        'increment_after_epochNano': '0',
-        'increment_after_event_type': ''
-    }
-    
-    return record
-
-
-def process_user_events(user_id: str, user_data: pd.DataFrame) -> Dict[str, Any]:
+        'waiting_start_time': events['timestamp'].to_numpy(dtype=object),
+        'waiting_start_nanoTime': events['nanoTime'].to_numpy(dtype=object),
+        'waiting_start_epochNano': events['epochNano'].to_numpy(dtype=object),
+        'waiting_start_event_type': ''
+    }, dtype=object)
+    
+    # 나머지 모든 이벤트 컬럼들 - 빈 값 처리
+    for prefix in ['critical_enter', 'critical_leave', 'increment_before', 'increment_after']:
+        records[f'{prefix}_time'] = ''
+        records[f'{prefix}_nanoTime'] = 0
+        records[f'{prefix}_epochNano'] = 0
+        records[f'{prefix}_event_type'] = ''
+    
+    return records.astype(object)
+
+
+def build_user_event_profiles(events: pd.DataFrame) -> pd.DataFrame:
     """
-    단일 사용자의 이벤트들을 처리하여 성능 프로필 생성
+    (방, 사용자, 시도)별 이벤트를 피벗하여 성능 프로필 생성 (정렬 1회 + 피벗 1회)
+    - events 에는 assign_attempt_ids 로 부여한 attempt_id 컬럼 필요 (재시도는 별도 프로필)
+    - 이벤트별 *_time / *_nanoTime / *_epochNano / *_event_type 컬럼
+    - 같은 시도 안에서 같은 이벤트가 여러 번 있으면 nanoTime 기준 마지막 이벤트 사용
+    - join_result: CRITICAL_LEAVE 의 event_type 기반 (CRITICAL_LEAVE 가 없으면 결측값)
     """
-    # nanoTime 기준으로 정렬
-    user_data = user_data.sort_values(['nanoTime_num']).reset_index(drop=True)
-    
-    # 이벤트별로 그룹화
-    events = {}
-    for _, row in user_data.iterrows():
-        event_name = row['tag']
-        events[event_name] = {
-            'timestamp': row['timestamp'],
-            'nanoTime': str(int(float(row['nanoTime']))),
-            'epochNano': str(int(float(row['epochNano']))),
-            'event_type': row.get('event_type')
-        }
-    
-    # 기본 프로필 정보
-    profile = {
-        'user_id': user_id,
-        'roomNumber': user_data.iloc[0]['roomNumber']
-    }
-    
-    # 각 이벤트별 정보 추가
-    event_mappings = {
-        EVENT_WAITING_START: 'waiting_start',
-        EVENT_CRITICAL_ENTER: 'critical_enter',
-        EVENT_CRITICAL_LEAVE: 'critical_leave',
-        EVENT_INCREMENT_BEFORE: 'increment_before',
-        EVENT_INCREMENT_AFTER: 'increment_after'
-    }
-    
-    for event_tag, prefix in event_mappings.items():
-        if event_tag in events:
-            event_data = events[event_tag]
-            profile.update({
-                f'{prefix}_time': event_data['timestamp'],
-                f'{prefix}_nanoTime': event_data['nanoTime'],
-                f'{prefix}_epochNano': event_data['epochNano']
-            })
-            
-            # event_type이 있는 경우 추가
-            if event_data['event_type'] is not None:
-                profile[f'{prefix}_event_type'] = event_data['event_type']
+    profiles = pivot_events_by_tag(events, EVENT_PREFIXES, EVENT_FIELDS, keys=ATTEMPT_KEYS)
+    profiles = profiles.rename(columns={'userId': 'user_id'})
     
     # join_result 설정 (CRITICAL_LEAVE의 event_type 기반)
-    if EVENT_CRITICAL_LEAVE in events:
-        leave_type = events[EVENT_CRITICAL_LEAVE]['event_type']
-        if leave_type == RESULT_SUCCESS:
-            profile['join_result'] = RESULT_SUCCESS
-        elif leave_type == RESULT_FAIL_CAPACITY:
-            profile['join_result'] = RESULT_FAIL_CAPACITY
-        else:
-            profile['join_result'] = RESULT_UNKNOWN
+    if 'critical_leave_nanoTime' in profiles.columns:
+        leave_type = profiles['critical_leave_event_type']
+        join_result = pd.Series(
+            np.select([leave_type == RESULT_SUCCESS, leave_type == RESULT_FAIL_CAPACITY],
+                      [RESULT_SUCCESS, RESULT_FAIL_CAPACITY], default=RESULT_UNKNOWN),
+            index=profiles.index, dtype=object
+        )
+        profiles['join_result'] = join_result.where(profiles['critical_leave_nanoTime'].notna())
     
-    return profile
+    return profiles
 
 
-def assign_bins(df: pd.DataFrame) -> pd.DataFrame:
+def assign_bins(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
-    각 방의 요청을 10개 구간으로 균등 분할
+    각 방의 요청에 bin 할당 (기본값: 10개 구간으로 균등 분할)
     """
     df = df.copy()
     
-    for room_num in df['roomNumber'].unique():
-        room_mask = df['roomNumber'] == room_num
-        room_data = df[room_mask]
-        
-        total_requests = len(room_data)
-        
-        # 요청이 10개 이하면 각각을 하나의 bin으로
-        if total_requests <= BINS_COUNT:
-            bins = range(1, total_requests + 1)
-        else:
-            # 10개 구간으로 균등 분할
-            bins = pd.cut(range(total_requests), bins=BINS_COUNT, labels=range(1, BINS_COUNT + 1)).astype(int)
-        
-        df.loc[room_mask, 'bin'] = bins
+    df['bin'] = binning.assign(df, time_column='waiting_start_nanoTime')
     
     return df
 
 
-def build_clean_performance_data(df: pd.DataFrame) -> pd.DataFrame:
+def build_clean_performance_data(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
     파싱된 로그 데이터를 성능 분석용 데이터로 변환 (단순화된 정렬)
     
     처리 과정:
         1. 타임스탬프 변환 및 nanoTime 기준 정렬
         2. PRE_CHECK_FAIL_OVER_CAPACITY 독립 이벤트와 나머지 이벤트 분리
-        3. 사용자별 이벤트 페어링 처리
+        3. (방, 사용자)별 이벤트를 WAITING_START 기준 시도 단위로 분할 후 피벗
         4. waiting_start_nanoTime 기준 1차 정렬
         5. 1차 정렬 직후 bin과 room_entry_sequence 부여
         6. critical_enter_nanoTime 기준 2차 정렬 (페어링된 스레드만)
@@ -310,57 +263,49 @@ def build_clean_performance_data(df: pd.DataFrame) -> pd.DataFrame:
     # 타임스탬프를 datetime 객체로 변환
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     
-    # 나노초 값들을 숫자로 변환 (정렬용)
-    df['nanoTime_num'] = df['nanoTime'].astype(float)
-    df['epochNano_num'] = df['epochNano'].astype(float)
-    
     # 방별 + nanoTime 기준 정렬 (기본 정렬은 유지)
-    df = df.sort_values(['roomNumber', 'nanoTime_num']).reset_index(drop=True)
+    df = df.sort_values(['roomNumber', 'nanoTime']).reset_index(drop=True)
+    
+    # (방, 사용자)별 이벤트 흐름을 WAITING_START 기준 시도 단위로 분할 (재시도 보존)
+    df[ATTEMPT_COLUMN] = assign_attempt_ids(df, EVENT_WAITING_START)
     
-    # PRE_CHECK_FAIL_OVER_CAPACITY 독립 이벤트와 나머지 이벤트 분리
+    # PRE_CHECK_FAIL_OVER_CAPACITY 독립 이벤트와 나머지 이벤트 분리 (시도 번호는 분리 전 전체 이벤트 기준)
     pre_check_fail_events = df[df['event_type'] == 'PRE_CHECK_FAIL_OVER_CAPACITY'].copy()
     other_events = df[df['event_type'] != 'PRE_CHECK_FAIL_OVER_CAPACITY'].copy()
     
     print(f"🔍 분리된 PRE_CHECK_FAIL 이벤트: {len(pre_check_fail_events)}건")
     print(f"🔍 분리된 기타 이벤트: {len(other_events)}건")
     
-    performance_results = []
+    # 1. PRE_CHECK_FAIL 이벤트들 처리 (이벤트당 독립 레코드)
+    pre_check_records = build_pre_check_fail_records(pre_check_fail_events)
     
-    # 각 방별로 처리
+    # 2. 기존 5개 이벤트를 (방, 사용자, 시도)별로 한 번에 피벗
+    profiles = build_user_event_profiles(other_events)
+    print_attempt_summary(profiles)
+    
+    pre_check_counts = pre_check_records['roomNumber'].value_counts()
+    profile_counts = profiles['roomNumber'].value_counts()
     for room_num in df['roomNumber'].unique():
-        print(f"🏠 방 {room_num} 처리 중...")
-        
-        # 1. PRE_CHECK_FAIL 이벤트들 처리 (room_entry_sequence 제거)
-        room_pre_check_fail = pre_check_fail_events[pre_check_fail_events['roomNumber'] == room_num].copy()
-        for _, pre_check_event in room_pre_check_fail.iterrows():
-            pre_check_record = create_pre_check_fail_record(pre_check_event)
-            performance_results.append(pre_check_record)
-            print(f"   ✅ PRE_CHECK_FAIL 레코드 생성: user_id={pre_check_record['user_id']}")
-        
-        # 2. 기존 5개 이벤트 그룹들을 사용자별로 그룹화하여 처리 (room_entry_sequence 제거)
-        room_other_events = other_events[other_events['roomNumber'] == room_num].copy()
-        if not room_other_events.empty:
-            for user_id, user_data in room_other_events.groupby('userId'):
-                profile = process_user_events(user_id, user_data)
-                performance_results.append(profile)
-    
-    if not performance_results:
+        print(f"🏠 방 {room_num}: PRE_CHECK_FAIL {pre_check_counts.get(room_num, 0)}건, "
+              f"사용자 프로필 {profile_counts.get(room_num, 0)}건")
+    
+    if pre_check_records.empty and profiles.empty:
         return pd.DataFrame()
     
-    # DataFrame 생성 및 정리
-    result_df = pd.DataFrame(performance_results)
+    # 방 순서대로 결합 (방 안에서는 PRE_CHECK_FAIL 레코드 → 사용자 프로필 순서)
+    result_df = pd.concat([frame for frame in (pre_check_records, profiles) if not frame.empty],
+                          ignore_index=True, sort=False)
+    result_df = result_df.sort_values('roomNumber', kind='stable').reset_index(drop=True)
     
-    # 나노초 컬럼들을 문자열로 확실히 변환
-    nano_columns = [col for col in result_df.columns if 'nanoTime' in col or 'epochNano' in col]
-    for col in nano_columns:
-        if col in result_df.columns:
-            result_df[col] = result_df[col].astype(str)
+    # DataFrame 정리 (레코드 생성과 같은 object 형태에서 나노초 컬럼은 Int64 로, 나머지는 dtype 추론)
+    result_df = as_record_frame(result_df)
+    result_df = cast_nano_columns(result_df).infer_objects()
     
     # 최종 정렬: 1차 정렬 → bin/sequence 부여 → 2차 정렬
-    result_df = sort_final_dataframe_simplified(result_df)
+    result_df = sort_final_dataframe_simplified(result_df, binning)
     
     # 컬럼 순서 정리
-    base_columns = ['roomNumber', 'bin', 'user_id', 'room_entry_sequence', 'join_result']
+    base_columns = ['roomNumber', 'bin', 'user_id', ATTEMPT_COLUMN, 'room_entry_sequence', 'join_result']
     event_columns = []
     
     # 이벤트별 컬럼들을 순서대로 추가
@@ -377,10 +322,16 @@ def build_clean_performance_data(df: pd.DataFrame) -> pd.DataFrame:
     
     return result_df
 
+def print_attempt_summary(profiles: pd.DataFrame) -> None:
+    """같은 사용자의 재시도(2번째 이후 시도) 세션 수 출력"""
+    retry_count = int((profiles[ATTEMPT_COLUMN] > 1).sum()) if not profiles.empty else 0
+    print(f"🔁 재시도 세션: {retry_count}건 (같은 방에서 같은 사용자의 2번째 이후 시도)")
+
 
-def assign_bins_and_sequence_after_first_sort(df: pd.DataFrame) -> pd.DataFrame:
+def assign_bins_and_sequence_after_first_sort(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
     1차 정렬 직후에 정렬된 순서를 기준으로 bin과 room_entry_sequence 부여
+    (bin 할당 방식은 binning 설정, time 모드는 waiting_start_nanoTime 기준 시간 창)
     """
     if df.empty:
         return df
@@ -389,27 +340,17 @@ def assign_bins_and_sequence_after_first_sort(df: pd.DataFrame) -> pd.DataFrame:
     
     df = df.copy()
     
-    # 방별로 처리
-    for room_num in df['roomNumber'].unique():
-        room_mask = df['roomNumber'] == room_num
-        room_data = df[room_mask]
-        room_indices = room_data.index
-        total_requests = len(room_data)
-        
-        # room_entry_sequence 할당 (1부터 시작)
-        df.loc[room_indices, 'room_entry_sequence'] = range(1, total_requests + 1)
-        
-        # bin 할당 (10개 구간으로 균등 분할)
-        if total_requests <= BINS_COUNT:
-            # 요청이 10개 이하면 각각을 하나의 bin으로
-            bins = range(1, total_requests + 1)
-        else:
-            # 10개 구간으로 균등 분할
-            bins = pd.cut(range(total_requests), bins=BINS_COUNT, labels=range(1, BINS_COUNT + 1)).astype(int)
-        
-        df.loc[room_indices, 'bin'] = bins
-        
-        print(f"  방 {room_num}: {total_requests}개 레코드에 room_entry_sequence(1~{total_requests})와 bin({len(set(bins))}개 구간) 할당")
+    # 방 파티션 인덱스로 전체 방의 순번과 bin 을 한 번에 계산 (방별 pd.cut 반복 없음)
+    partition = RoomPartition(df)
+    rank = partition.within_room_rank()
+    bin_values = binning.assign(df, time_column='waiting_start_nanoTime', partition=partition)
+    
+    for room_num, total_requests, bin_count in summarize_bins_by_room(df, bin_values).itertuples():
+        print(f"  방 {room_num}: {total_requests}개 레코드에 room_entry_sequence(1~{total_requests})와 bin({bin_count}개 구간) 할당")
+    
+    # room_entry_sequence 는 1부터 시작
+    df['room_entry_sequence'] = np.where(rank >= 0, rank + 1, np.nan)
+    df['bin'] = bin_values
     
     print("✅ bin과 room_entry_sequence 부여 완료")
     return df
@@ -427,21 +368,23 @@ def add_room_entry_sequence_after_sort(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     
     # 방별로 최종 정렬된 순서대로 room_entry_sequence 할당
-    for room_num in df['roomNumber'].unique():
-        room_mask = df['roomNumber'] == room_num
-        room_indices = df[room_mask].index
-        room_count = len(room_indices)
+    sequence_values = np.full(len(df), np.nan)
+    
+    for room_num, positions in RoomPartition(df).iter_positions():
+        room_count = len(positions)
         
         # 1부터 시작하는 순서 번호 할당
-        df.loc[room_indices, 'room_entry_sequence'] = range(1, room_count + 1)
+        sequence_values[positions] = np.arange(1, room_count + 1)
         
         print(f"  방 {room_num}: {room_count}개 레코드에 순서 번호 할당 (1~{room_count})")
     
+    df['room_entry_sequence'] = sequence_values
+    
     print("✅ room_entry_sequence 생성 완료")
     return df
 
 
-def sort_final_dataframe_simplified(df: pd.DataFrame) -> pd.DataFrame:
+def sort_final_dataframe_simplified(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
     올바른 정렬 로직
     1차: 모든 이벤트를 waiting_start_nanoTime 기준으로 정렬 (전체 경쟁 시작 시점)
@@ -455,12 +398,8 @@ def sort_final_dataframe_simplified(df: pd.DataFrame) -> pd.DataFrame:
     
     # 1차 정렬: 모든 이벤트를 waiting_start_nanoTime 기준으로 정렬
     if 'waiting_start_nanoTime' in df.columns:
-        # 나노초 값을 숫자로 변환
-        df['waiting_start_nanoTime_num'] = pd.to_numeric(df['waiting_start_nanoTime'], errors='coerce')
-        df['waiting_start_nanoTime_num'] = df['waiting_start_nanoTime_num'].fillna(float('inf'))
-        
-        # 방 번호 → waiting_start_nanoTime 순으로 1차 정렬 (모든 스레드의 경쟁 시작 시점)
-        df = df.sort_values(['roomNumber', 'waiting_start_nanoTime_num']).reset_index(drop=True)
+        # 방 번호 → waiting_start_nanoTime 순으로 1차 정렬 (모든 스레드의 경쟁 시작 시점) - Int64 정수 정렬, 값이 없으면 마지막
+        df = df.sort_values(['roomNumber', 'waiting_start_nanoTime'], na_position='last').reset_index(drop=True)
         
         print(f"✅ 1차 정렬 완료: 모든 이벤트를 waiting_start_nanoTime 기준으로 정렬 (경쟁 시작 시점)")
     else:
@@ -468,93 +407,38 @@ def sort_final_dataframe_simplified(df: pd.DataFrame) -> pd.DataFrame:
         df = df.sort_values(['roomNumber']).reset_index(drop=True)
     
     # 1차 정렬 직후: bin과 room_entry_sequence 부여
-    df = assign_bins_and_sequence_after_first_sort(df)
+    df = assign_bins_and_sequence_after_first_sort(df, binning)
     
     # 2차 정렬: 페어링된 스레드들(SUCCESS/FAIL_OVER_CAPACITY)만 critical_enter_nanoTime 기준으로 재정렬
     if 'critical_enter_nanoTime' in df.columns and 'join_result' in df.columns:
         
-        # 방별로 처리
-        final_df_list = []
+        # 방별로 SUCCESS/FAIL_OVER_CAPACITY 행이 있던 자리(waiting_start_nanoTime 순서)에 critical_enter_nanoTime 순으로 재배치,
+        # PRE_CHECK_FAIL 등 기타 행은 원래 자리 유지 (전체 방의 대상 위치를 배열로 계산 후 한 번에 재배치)
+        paired_mask = df['join_result'].isin([RESULT_SUCCESS, RESULT_FAIL_CAPACITY])
         
-        for room_num in df['roomNumber'].unique():
-            room_df = df[df['roomNumber'] == room_num].copy()
-            
-            print(f"  방 {room_num}: 페어링된 스레드들만 critical_enter_nanoTime으로 재정렬 중...")
-            
-            # 페어링된 스레드들(SUCCESS/FAIL_OVER_CAPACITY)과 PRE_CHECK_FAIL 분리
-            paired_mask = (room_df['join_result'] == RESULT_SUCCESS) | (room_df['join_result'] == RESULT_FAIL_CAPACITY)
-            room_paired = room_df[paired_mask].copy()
-            room_pre_check_fail = room_df[~paired_mask].copy()  # PRE_CHECK_FAIL 등
-            
-            if not room_paired.empty:
-                # critical_enter_nanoTime을 숫자로 변환
-                room_paired['critical_enter_nanoTime_num'] = pd.to_numeric(room_paired['critical_enter_nanoTime'], errors='coerce')
-                room_paired['critical_enter_nanoTime_num'] = room_paired['critical_enter_nanoTime_num'].fillna(float('inf'))
-                
-                # 페어링된 스레드들만 critical_enter_nanoTime으로 재정렬
-                room_paired = room_paired.sort_values(['critical_enter_nanoTime_num']).reset_index(drop=True)
-                room_paired = room_paired.drop(columns=['critical_enter_nanoTime_num'])
-                
-                print(f"    SUCCESS/FAIL_OVER_CAPACITY {len(room_paired)}개 스레드를 critical_enter_nanoTime으로 재정렬")
-            
-            # PRE_CHECK_FAIL은 원래 waiting_start_nanoTime 순서 유지
-            if not room_pre_check_fail.empty:
-                print(f"    PRE_CHECK_FAIL {len(room_pre_check_fail)}개는 waiting_start_nanoTime 순서 유지")
-            
-            # 전체 방 데이터를 waiting_start_nanoTime 순서로 순회하면서 
-            # 페어링된 스레드는 critical_enter_nanoTime 정렬된 순서로, PRE_CHECK_FAIL은 원래 순서로 재배치
-            room_result_list = []
-            paired_idx = 0
-            pre_check_fail_idx = 0
-            
-            for _, original_row in room_df.iterrows():
-                if original_row['join_result'] == RESULT_SUCCESS or original_row['join_result'] == RESULT_FAIL_CAPACITY:
-                    # 페어링된 스레드는 critical_enter_nanoTime 정렬된 순서대로
-                    if paired_idx < len(room_paired):
-                        room_result_list.append(room_paired.iloc[paired_idx])
-                        paired_idx += 1
-                else:
-                    # PRE_CHECK_FAIL은 원래 waiting_start_nanoTime 순서 유지
-                    if pre_check_fail_idx < len(room_pre_check_fail):
-                        room_result_list.append(room_pre_check_fail.iloc[pre_check_fail_idx])
-                        pre_check_fail_idx += 1
-            
-            # 혹시 남은 데이터들 추가
-            while paired_idx < len(room_paired):
-                room_result_list.append(room_paired.iloc[paired_idx])
-                paired_idx += 1
-            while pre_check_fail_idx < len(room_pre_check_fail):
-                room_result_list.append(room_pre_check_fail.iloc[pre_check_fail_idx])
-                pre_check_fail_idx += 1
-            
-            if room_result_list:
-                room_final = pd.DataFrame(room_result_list).reset_index(drop=True)
-                final_df_list.append(room_final)
+        room_counts = paired_mask.groupby(df['roomNumber'], sort=False).agg(['sum', 'size'])
+        for room_num, paired_count, room_count in zip(room_counts.index, room_counts['sum'], room_counts['size']):
+            print(f"  방 {room_num}: SUCCESS/FAIL_OVER_CAPACITY {paired_count}개 critical_enter_nanoTime 재정렬, "
+                  f"PRE_CHECK_FAIL 등 기타 {room_count - paired_count}개 waiting_start_nanoTime 순서 유지")
         
-        if final_df_list:
-            df = pd.concat(final_df_list, ignore_index=True)
-            print(f"✅ 2차 정렬 완료: 페어링된 스레드들만 critical_enter_nanoTime 기준으로 재정렬")
-        else:
-            print("⚠️ 처리할 데이터가 없어서 2차 정렬을 건너뜁니다.")
+        df = sort_subset_within_rooms(df, paired_mask, 'critical_enter_nanoTime')
+        print(f"✅ 2차 정렬 완료: 페어링된 스레드들(SUCCESS/FAIL_OVER_CAPACITY)만 critical_enter_nanoTime 기준으로 재정렬")
     else:
         print("⚠️ critical_enter_nanoTime 또는 join_result 컬럼이 없어서 2차 정렬을 건너뜁니다.")
     
-    # 정렬용 임시 컬럼 제거
-    if 'waiting_start_nanoTime_num' in df.columns:
-        df = df.drop(columns=['waiting_start_nanoTime_num'])
-    
     return df.reset_index(drop=True)
 
 
-def get_clean_event_desc_table() -> List[List[str]]:
+def get_clean_event_desc_table(binning: BinningEngine = DEFAULT_BINNING) -> List[List[str]]:
     """
     Excel 파일에 추가할 컬럼 설명 테이블 생성
     """
     return [
         ["속성명", "측정 목적", "도출 방법"],
         ["roomNumber", "방 번호 식별", "로그 필드: roomNumber"],
-        ["bin", "방별 분석 구간", "각 방의 요청을 10개 구간으로 균등 분할"],
+        ["bin", "방별 분석 구간", binning.describe()],
         ["user_id", "사용자 식별", "로그 필드: userId"],
+        ["attempt_id", "사용자별 시도 구분", "방-사용자별 WAITING_START 누적 순번 (재시도마다 증가)"],
         ["room_entry_sequence", "방별 처리 순번", "단순 순차 할당"],
         ["join_result", "입장 결과 구분", "SUCCESS/FAIL_OVER_CAPACITY/PRE_CHECK_FAIL/UNKNOWN"],
         ["waiting_start_*", "대기 시작 시점", "WAITING_START 이벤트 속성들"],
@@ -570,81 +454,32 @@ def get_clean_event_desc_table() -> List[List[str]]:
     ]
 
 
-def convert_nano_value(x: Any) -> str:
-    """
-    나노초 값을 문자열로 안전하게 변환
-    """
-    if pd.isna(x) or x == '' or str(x).lower() == 'nan':
-        return ''
-    try:
-        return str(int(float(x)))
-    except (ValueError, TypeError):
-        return str(x)
-
-
 def save_to_csv(df: pd.DataFrame, filepath: str) -> None:
     """
     DataFrame을 CSV 파일로 저장 (나노초 정밀도 유지)
+    - 확장자가 .parquet/.feather 이면 컬럼형 중간 산출물로 저장 (pyarrow 필요)
     """
-    # 나노초 컬럼들을 문자열로 변환하여 지수 표기법 방지
-    df_copy = df.copy()
-    nano_columns = [col for col in df.columns if 'nanoTime' in col or 'epochNano' in col]
-    
-    for col in nano_columns:
-        if col in df_copy.columns:
-            df_copy[col] = df_copy[col].apply(convert_nano_value)
-    
-    # 출력 디렉토리 생성
-    output_dir = os.path.dirname(filepath)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # 나노초 컬럼들을 Int64 로 유지하여 지수 표기 없이 정수 그대로 기록 (값이 없으면 빈 칸)
+    df_copy = cast_nano_columns(df.copy())
     
-    # UTF-8 with BOM으로 저장 (Excel에서 한글 깨짐 방지)
-    df_copy.to_csv(filepath, index=False, encoding='utf-8-sig')
-    print(f"CSV 파일 저장 완료: {filepath}")
+    # 출력 디렉토리 생성 후 저장 (CSV 는 UTF-8 with BOM - Excel에서 한글 깨짐 방지)
+    write_table(df_copy, filepath, schema=OUTPUT_TABLE_SCHEMA)
+    print(f"{get_table_format(filepath).upper()} 파일 저장 완료: {filepath}")
 
 
 def save_with_side_table(df: pd.DataFrame, filepath: str, desc_table: List[List[str]]) -> str:
     """
-    DataFrame을 Excel로 저장하고 설명 테이블 추가
+    DataFrame을 Excel로 저장하고 설명 테이블 추가 (스트리밍 기록 - 데이터/서식/설명 테이블을 한 번에 저장)
     """
-    # 출력 디렉토리 생성
-    output_dir = os.path.dirname(filepath)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    # timezone 제거한 복사본 생성
-    df_excel = df.copy()
-    for col in df_excel.columns:
-        if pd.api.types.is_datetime64_tz_dtype(df_excel[col]):
-            df_excel[col] = df_excel[col].dt.tz_localize(None)
-    
-    # Excel 파일 생성
-    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-        df_excel.to_excel(writer, index=False)
-        
-        # 나노초 컬럼들을 텍스트 형식으로 설정
-        workbook = writer.book
-        worksheet = writer.sheets['Sheet1']
-        
-        nano_columns = [col for col in df.columns if 'nanoTime' in col or 'epochNano' in col]
-        for col_name in nano_columns:
-            col_idx = df.columns.get_loc(col_name) + 1
-            for row in range(2, len(df) + 2):
-                cell = worksheet.cell(row=row, column=col_idx)
-                cell.number_format = '@'  # 텍스트 형식
-    
-    # 설명 테이블 추가
-    wb = load_workbook(filepath)
-    ws = wb.active
-    
-    start_col = len(df.columns) + 2
+    # 나노초 정수 문자열 변환한 복사본 생성 (timezone 은 기록 시 제거)
+    df_excel = nano_columns_as_text(df)
     
-    for i, row in enumerate(desc_table):
-        for j, val in enumerate(row):
-            ws.cell(row=i + 1, column=start_col + j, value=val)
-    
-    wb.save(filepath)
+    # 나노초 컬럼은 텍스트 형식, 설명 테이블은 마지막 컬럼 + 2열부터 기록
+    nano_columns = [col for col in df.columns if 'nanoTime' in col or 'epochNano' in col]
+    write_excel_with_side_table(
+        df_excel, filepath, side_table=desc_table,
+        column_formats={col: TEXT_FORMAT for col in nano_columns}
+    )
     print(f"Excel 파일 저장 완료: {filepath}")
     
     return filepath
@@ -779,8 +614,14 @@ def main():
     parser.add_argument('--csv', type=str, help='추가 CSV 파일명 (옵션)')
     parser.add_argument('--xlsx', type=str, help='Excel 파일명 (옵션)')
     parser.add_argument('--test', action='store_true', help='정규식 패턴 테스트 실행')
+    parser.add_argument('--table_format', choices=list(TABLE_FORMAT_EXTENSIONS.keys()), default='csv',
+                        help='기본 결과 파일 형식 (기본값: csv, parquet/feather 는 pyarrow 필요)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='로그 파싱 프로세스 수 (기본값: 1, 직렬 파싱)')
+    add_binning_arguments(parser, DEFAULT_BINNING)
     
     args = parser.parse_args()
+    binning = binning_engine_from_args(parser, args)
     
     # 정규식 테스트 옵션
     if args.test:
@@ -798,12 +639,12 @@ def main():
         
         # 2. 로그 파싱
         print(f"\n로그 파일 파싱 중...")
-        df = parse_five_events_clean(LOG_FILE, room_number=args.room)
+        df = parse_five_events_clean(LOG_FILE, room_number=args.room, workers=args.workers)
         print(f"파싱 완료: {len(df)}개 이벤트")
         
         # 3. 성능 데이터 구축 (단순화된 정렬)
         print(f"\n단순화된 정렬 데이터 구축 중...")
-        result = build_clean_performance_data(df)
+        result = build_clean_performance_data(df, binning)
         print(f"구축 완료: {len(result)}개 세션")
         
         # 4. 출력 디렉토리 설정 및 생성
@@ -818,7 +659,7 @@ def main():
         else:
             base_filename = 'all_rooms_simplified.csv'
         
-        csv_path = os.path.join(output_dir, base_filename)
+        csv_path = with_table_extension(os.path.join(output_dir, base_filename), args.table_format)
         save_to_csv(result, csv_path)
         
         # 6. 추가 CSV 파일 저장 (옵션)
@@ -829,7 +670,7 @@ def main():
         # 7. Excel 파일 저장 (옵션)
         if args.xlsx:
             xlsx_path = os.path.join(output_dir, args.xlsx)
-            desc_table = get_clean_event_desc_table()
+            desc_table = get_clean_event_desc_table(binning)
             save_with_side_table(result, xlsx_path, desc_table)
         
         # 8. 결과 분석 출력
@@ -32,13 +32,22 @@
 """
 
 import pandas as pd
+import numpy as np
 import re
 import os
 import shutil
 import argparse
 import sys
-from typing import Dict, List, Optional, Tuple, Any
-from openpyxl import load_workbook
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.log_tokenizer import build_marker_spec, tokenize_log_parallel, columns_to_dataframe
+from common.nano_time import LOG_NANO_DTYPES, NANO_DTYPE, cast_nano_columns, nano_columns_as_text
+from common.excel_report import TEXT_FORMAT, write_excel_with_side_table
+from common.event_pivot import ATTEMPT_COLUMN, ATTEMPT_KEYS, as_record_frame, assign_attempt_ids, pivot_events_by_tag
+from common.binning import BIN_MODE_EQUAL, BinningEngine, add_binning_arguments, binning_engine_from_args, summarize_bins_by_room
+from common.room_partition import RoomPartition
+from common.table_io import TABLE_FORMAT_EXTENSIONS, get_table_format, with_table_extension, write_table
 
 # ===== 상수 정의 =====
 # 파일 경로 상수
@@ -58,6 +67,28 @@ RESULT_UNKNOWN = 'UNKNOWN'
 # 분석 구간 수
 BINS_COUNT = 10
 
+# 기본 bin 할당 방식 (방별 BINS_COUNT 개 구간 균등 분할, --bin_mode 등으로 변경)
+DEFAULT_BINNING = BinningEngine(BIN_MODE_EQUAL, bin_count=BINS_COUNT)
+
+# 세마포어 이벤트 태그 → 피벗 컬럼 접두사
+SEMAPHORE_EVENT_PREFIXES = {
+    EVENT_SEMAPHORE_ATTEMPT: 'attempt',
+    EVENT_SEMAPHORE_SUCCESS: 'success',
+    EVENT_SEMAPHORE_FAIL: 'fail'
+}
+
+# 중간 산출물 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환)
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'float64',
+    'room_entry_sequence': 'float64',
+    'user_id': 'string',
+    ATTEMPT_COLUMN: 'int64',
+    'join_result': 'string',
+    'true_critical_section_nanoTime_start': NANO_DTYPE,
+    'true_critical_section_nanoTime_end': NANO_DTYPE
+}
+
 # 세마포어 성능 로그 정규식 패턴
 SEMAPHORE_PERFORMANCE_PATTERN = re.compile(
     r'SEMAPHORE_PERFORMANCE_MARK tag=(?P<tag>SEMAPHORE_EXISTING_ATTEMPT|SEMAPHORE_EXISTING_SUCCESS|SEMAPHORE_EXISTING_FAIL)'
@@ -72,6 +103,12 @@ SEMAPHORE_PERFORMANCE_PATTERN = re.compile(
     r' threadId=(?P<threadId>\d+)'
 )
 
+# 로그 토크나이저 규칙 (마커 부분 문자열로 사전 필터링 후 정규식 1회 적용)
+SEMAPHORE_PERFORMANCE_SPEC = build_marker_spec(
+    'SEMAPHORE_PERFORMANCE_MARK', ['SEMAPHORE_PERFORMANCE_MARK tag='], SEMAPHORE_PERFORMANCE_PATTERN,
+    int_fields=['roomNumber', 'currentPeople', 'maxPeople', 'threadId', 'nanoTime', 'epochNano']  # nanoTime/epochNano는 nullable Int64 로 파싱 (나노초 정밀도 그대로 보존)
+)
+
 
 def test_semaphore_pattern():
     """SEMAPHORE_PERFORMANCE_PATTERN 정규식 테스트 함수"""
@@ -104,44 +141,13 @@ def replace_log_file() -> None:
     print(f"로그 파일 교체 완료: {NEW_LOG_PATH} → {LOG_FILE}")
 
 
-def parse_log_line(line: str) -> Optional[Dict[str, Any]]:
-    """
-    로그 라인을 파싱하여 세마포어 성능 이벤트 정보 추출
-    """
-    # SEMAPHORE_PERFORMANCE_MARK 패턴 매칭
-    match = SEMAPHORE_PERFORMANCE_PATTERN.search(line)
-    if match:
-        data = match.groupdict()
-        return data
-    
-    return None
-
-
-def parse_semaphore_events(filepath: str, room_number: Optional[int] = None) -> pd.DataFrame:
+def parse_semaphore_events(filepath: str, room_number: Optional[int] = None, workers: int = 1) -> pd.DataFrame:
     """
     로그 파일에서 세마포어 성능 이벤트를 파싱하여 DataFrame으로 변환
     """
-    records = []
-    
     try:
-        with open(filepath, encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                data = parse_log_line(line)
-                
-                if data:
-                    # 방 번호를 정수로 변환
-                    data['roomNumber'] = int(data['roomNumber'])
-                    
-                    # 나노초 및 기타 수치 값들을 적절한 타입으로 변환
-                    data['currentPeople'] = int(data['currentPeople'])
-                    data['maxPeople'] = int(data['maxPeople'])
-                    data['nanoTime'] = data['nanoTime']  # 문자열로 유지 (정밀도 보존)
-                    data['epochNano'] = data['epochNano']  # 문자열로 유지
-                    data['threadId'] = int(data['threadId'])
-                    
-                    # 방 번호 필터링
-                    if room_number is None or data['roomNumber'] == room_number:
-                        records.append(data)
+        # 마커 사전 필터링 + 컬럼별 누적 (workers > 1 이면 개행 경계 구간별 병렬 파싱)
+        columns = tokenize_log_parallel(filepath, [SEMAPHORE_PERFORMANCE_SPEC], room_number=room_number, workers=workers)
     
     except FileNotFoundError:
         print(f"오류: 로그 파일을 찾을 수 없습니다 - {filepath}")
@@ -150,7 +156,7 @@ def parse_semaphore_events(filepath: str, room_number: Optional[int] = None) ->
         print(f"오류: 로그 파일 파싱 실패 - {e}")
         return pd.DataFrame()
     
-    df = pd.DataFrame(records)
+    df = columns_to_dataframe(columns, dtypes=LOG_NANO_DTYPES)
     print(f"📊 세마포어 성능 이벤트 파싱 완료: {len(df)}개 이벤트")
     
     if not df.empty:
@@ -162,72 +168,43 @@ def parse_semaphore_events(filepath: str, room_number: Optional[int] = None) ->
     return df
 
 
-def process_semaphore_user_events(user_id: str, user_data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+def build_semaphore_user_profiles(events: pd.DataFrame) -> pd.DataFrame:
     """
-    단일 사용자의 세마포어 이벤트들을 처리하여 성능 프로필 생성
+    (방, 사용자, 시도)별 세마포어 이벤트를 피벗하여 성능 프로필 생성 (정렬 1회 + 피벗 1회)
+    - events 에는 assign_attempt_ids 로 부여한 attempt_id 컬럼 필요 (재시도는 별도 프로필)
+    - ATTEMPT 이벤트가 없는 세션은 유효하지 않은 세션으로 제외
+    - 종료 시점: SUCCESS → FAIL 순으로 선택, 결과가 없으면 ATTEMPT 시점 (불완전한 세션)
     """
-    # nanoTime 기준으로 정렬
-    user_data = user_data.sort_values(['nanoTime_num']).reset_index(drop=True)
-    
-    # 이벤트별로 그룹화
-    events = {}
-    for _, row in user_data.iterrows():
-        event_name = row['tag']
-        events[event_name] = {
-            'timestamp': row['timestamp'],
-            'nanoTime': str(int(float(row['nanoTime']))),
-            'epochNano': str(int(float(row['epochNano']))),
-            'currentPeople': row['currentPeople'],
-            'maxPeople': row['maxPeople'],
-            'threadId': row['threadId']
-        }
-    
-    # ATTEMPT 이벤트가 없으면 유효하지 않은 세션으로 간주
-    if EVENT_SEMAPHORE_ATTEMPT not in events:
-        return None
-    
-    # 기본 프로필 정보
-    profile = {
-        'user_id': user_id,
-        'roomNumber': user_data.iloc[0]['roomNumber']
-    }
-    
-    # ATTEMPT 시점 정보 (시작점)
-    attempt_event = events[EVENT_SEMAPHORE_ATTEMPT]
-    profile.update({
-        'true_critical_section_nanoTime_start': attempt_event['nanoTime']
-    })
-    
-    # SUCCESS 또는 FAIL 결과 확인
-    if EVENT_SEMAPHORE_SUCCESS in events:
-        success_event = events[EVENT_SEMAPHORE_SUCCESS]
-        profile.update({
-            'join_result': RESULT_SUCCESS,
-            'true_critical_section_nanoTime_end': success_event['nanoTime']
-        })
-    elif EVENT_SEMAPHORE_FAIL in events:
-        fail_event = events[EVENT_SEMAPHORE_FAIL]
-        profile.update({
-            'join_result': RESULT_FAIL_CAPACITY,
-            'true_critical_section_nanoTime_end': fail_event['nanoTime']
-        })
-    else:
-        # ATTEMPT만 있고 결과가 없는 경우 (불완전한 세션)
-        profile.update({
-            'join_result': RESULT_UNKNOWN,
-            'true_critical_section_nanoTime_end': attempt_event['nanoTime']  # 같은 시점으로 설정
-        })
+    wide = pivot_events_by_tag(events, SEMAPHORE_EVENT_PREFIXES, {'nanoTime': 'nanoTime'}, keys=ATTEMPT_KEYS)
+    if 'attempt_nanoTime' not in wide.columns:
+        return pd.DataFrame()
     
-    return profile
+    wide = wide[wide['attempt_nanoTime'].notna()].reset_index(drop=True)
+    for prefix in ['success', 'fail']:
+        if f'{prefix}_nanoTime' not in wide.columns:
+            wide[f'{prefix}_nanoTime'] = pd.Series(pd.NA, index=wide.index, dtype=wide['attempt_nanoTime'].dtype)
+    
+    has_success = wide['success_nanoTime'].notna()
+    has_fail = wide['fail_nanoTime'].notna()
+    end_nano = wide['success_nanoTime'].where(has_success, wide['fail_nanoTime'].where(has_fail, wide['attempt_nanoTime']))
+    
+    return pd.DataFrame({
+        'user_id': wide['userId'],
+        ATTEMPT_COLUMN: wide[ATTEMPT_COLUMN],
+        'roomNumber': wide['roomNumber'],
+        'true_critical_section_nanoTime_start': wide['attempt_nanoTime'],
+        'join_result': np.select([has_success, has_fail], [RESULT_SUCCESS, RESULT_FAIL_CAPACITY], default=RESULT_UNKNOWN),
+        'true_critical_section_nanoTime_end': end_nano
+    })
 
 
-def build_semaphore_performance_data(df: pd.DataFrame) -> pd.DataFrame:
+def build_semaphore_performance_data(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
     파싱된 세마포어 로그 데이터를 성능 분석용 데이터로 변환
     
     처리 과정:
         1. 타임스탬프 변환 및 nanoTime 기준 정렬
-        2. 사용자별 이벤트 페어링 (ATTEMPT + SUCCESS/FAIL)
+        2. (방, 사용자)별 이벤트를 ATTEMPT 기준 시도 단위로 분할 후 피벗 (ATTEMPT + SUCCESS/FAIL)
         3. 세마포어 특화 컬럼 생성 (prev_people, curr_people 등)
         4. 방별 나노초 시간 기준 정렬
         5. bin 구간 및 room_entry_sequence 부여
@@ -240,43 +217,30 @@ def build_semaphore_performance_data(df: pd.DataFrame) -> pd.DataFrame:
     # 타임스탬프를 datetime 객체로 변환
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     
-    # 나노초 값들을 숫자로 변환 (정렬용)
-    df['nanoTime_num'] = df['nanoTime'].astype(float)
-    df['epochNano_num'] = df['epochNano'].astype(float)
-    
     # 방별 + nanoTime 기준 정렬 (기본 정렬)
-    df = df.sort_values(['roomNumber', 'nanoTime_num']).reset_index(drop=True)
+    df = df.sort_values(['roomNumber', 'nanoTime']).reset_index(drop=True)
     
-    performance_results = []
+    # (방, 사용자)별 이벤트 흐름을 ATTEMPT 기준 시도 단위로 분할 (재시도 보존)
+    df[ATTEMPT_COLUMN] = assign_attempt_ids(df, EVENT_SEMAPHORE_ATTEMPT)
     
-    # 각 방별로 처리
-    for room_num in df['roomNumber'].unique():
-        print(f"🏠 방 {room_num} 처리 중...")
-        
-        room_events = df[df['roomNumber'] == room_num].copy()
-        
-        # 사용자별로 그룹화하여 세마포어 이벤트 페어링
-        for user_id, user_data in room_events.groupby('userId'):
-            profile = process_semaphore_user_events(user_id, user_data)
-            if profile:  # 유효한 프로필만 추가
-                performance_results.append(profile)
-                print(f"   ✅ 세마포어 프로필 생성: user_id={profile['user_id']}, result={profile['join_result']}")
-    
-    if not performance_results:
+    # (방, 사용자, 시도)별 세마포어 이벤트를 한 번에 피벗 (유효한 프로필만)
+    profiles = build_semaphore_user_profiles(df)
+    
+    if profiles.empty:
         print("⚠️ 유효한 세마포어 세션이 없습니다.")
         return pd.DataFrame()
     
-    # DataFrame 생성 및 정리
-    result_df = pd.DataFrame(performance_results)
+    for (room_num, join_result), count in profiles.groupby(['roomNumber', 'join_result']).size().items():
+        print(f"🏠 방 {room_num}: {join_result} 세마포어 프로필 {count}건 생성")
+    retry_count = int((profiles[ATTEMPT_COLUMN] > 1).sum())
+    print(f"🔁 재시도 세션: {retry_count}건 (같은 방에서 같은 사용자의 2번째 이후 시도)")
     
-    # 나노초 컬럼들을 문자열로 확실히 변환
-    nano_columns = [col for col in result_df.columns if 'nanoTime' in col]
-    for col in nano_columns:
-        if col in result_df.columns:
-            result_df[col] = result_df[col].astype(str)
+    # DataFrame 정리 (레코드 생성과 같은 object 형태에서 나노초 컬럼은 Int64 로, 나머지는 dtype 추론)
+    result_df = as_record_frame(profiles)
+    result_df = cast_nano_columns(result_df).infer_objects()
     
     # 세마포어 특화 정렬 및 구간 할당
-    result_df = sort_and_assign_semaphore_bins(result_df)
+    result_df = sort_and_assign_semaphore_bins(result_df, binning)
     
     # 컬럼 순서 조정
     result_df = reorder_columns(result_df)
@@ -294,6 +258,7 @@ def reorder_columns(df: pd.DataFrame) -> pd.DataFrame:
         'bin', 
         'room_entry_sequence',
         'user_id',
+        ATTEMPT_COLUMN,
         'join_result',
         'true_critical_section_nanoTime_start',
         'true_critical_section_nanoTime_end'
@@ -304,9 +269,10 @@ def reorder_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df[existing_columns]
 
 
-def sort_and_assign_semaphore_bins(df: pd.DataFrame) -> pd.DataFrame:
+def sort_and_assign_semaphore_bins(df: pd.DataFrame, binning: BinningEngine = DEFAULT_BINNING) -> pd.DataFrame:
     """
     세마포어 데이터를 나노초 시간 기준으로 정렬하고 bin 구간 할당
+    (bin 할당 방식은 binning 설정, time 모드는 true_critical_section_nanoTime_start 기준 시간 창)
     """
     if df.empty:
         return df
@@ -315,15 +281,8 @@ def sort_and_assign_semaphore_bins(df: pd.DataFrame) -> pd.DataFrame:
     
     # ATTEMPT 시점 나노초 기준으로 정렬 (전체 경쟁 시작 순서)
     if 'true_critical_section_nanoTime_start' in df.columns:
-        # 나노초 값을 숫자로 변환하여 정렬
-        df['start_nanoTime_num'] = pd.to_numeric(df['true_critical_section_nanoTime_start'], errors='coerce')
-        df['start_nanoTime_num'] = df['start_nanoTime_num'].fillna(float('inf'))
-        
-        # 방 번호 → 시작 나노초 순으로 정렬
-        df = df.sort_values(['roomNumber', 'start_nanoTime_num']).reset_index(drop=True)
-        
-        # 정렬용 임시 컬럼 제거
-        df = df.drop(columns=['start_nanoTime_num'])
+        # 방 번호 → 시작 나노초 순으로 정렬 (Int64 정수 정렬, 값이 없으면 마지막)
+        df = df.sort_values(['roomNumber', 'true_critical_section_nanoTime_start'], na_position='last').reset_index(drop=True)
         
         print("✅ ATTEMPT 시점 나노초 기준 정렬 완료")
     else:
@@ -331,42 +290,33 @@ def sort_and_assign_semaphore_bins(df: pd.DataFrame) -> pd.DataFrame:
         df = df.sort_values(['roomNumber']).reset_index(drop=True)
         print("⚠️ 나노초 컬럼이 없어서 방 번호만으로 정렬")
     
-    # 방별로 bin과 room_entry_sequence 할당
-    for room_num in df['roomNumber'].unique():
-        room_mask = df['roomNumber'] == room_num
-        room_data = df[room_mask]
-        room_indices = room_data.index
-        total_requests = len(room_data)
-        
-        # room_entry_sequence 할당 (1부터 시작)
-        df.loc[room_indices, 'room_entry_sequence'] = range(1, total_requests + 1)
-        
-        # bin 할당 (10개 구간으로 균등 분할)
-        if total_requests <= BINS_COUNT:
-            # 요청이 10개 이하면 각각을 하나의 bin으로
-            bins = range(1, total_requests + 1)
-        else:
-            # 10개 구간으로 균등 분할
-            bins = pd.cut(range(total_requests), bins=BINS_COUNT, labels=range(1, BINS_COUNT + 1)).astype(int)
-        
-        df.loc[room_indices, 'bin'] = bins
-        
-        print(f"  방 {room_num}: {total_requests}개 세션에 순서 번호와 {len(set(bins))}개 bin 할당")
+    # 방 파티션 인덱스로 전체 방의 순번과 bin 을 한 번에 계산 (방별 pd.cut 반복 없음)
+    partition = RoomPartition(df)
+    rank = partition.within_room_rank()
+    bin_values = binning.assign(df, time_column='true_critical_section_nanoTime_start', partition=partition)
+    
+    for room_num, total_requests, bin_count in summarize_bins_by_room(df, bin_values).itertuples():
+        print(f"  방 {room_num}: {total_requests}개 세션에 순서 번호와 {bin_count}개 bin 할당")
+    
+    # room_entry_sequence 는 1부터 시작
+    df['room_entry_sequence'] = np.where(rank >= 0, rank + 1, np.nan)
+    df['bin'] = bin_values
     
     print("✅ bin과 room_entry_sequence 할당 완료")
     return df
 
 
-def get_semaphore_desc_table() -> List[List[str]]:
+def get_semaphore_desc_table(binning: BinningEngine = DEFAULT_BINNING) -> List[List[str]]:
     """
     Excel 파일에 추가할 세마포어 컬럼 설명 테이블 생성
     """
     return [
         ["속성명", "측정 목적", "도출 방법"],
         ["roomNumber", "방 번호 식별", "로그 필드: roomNumber"],
-        ["bin", "방별 분석 구간", "각 방의 요청을 10개 구간으로 균등 분할"],
+        ["bin", "방별 분석 구간", binning.describe()],
         ["room_entry_sequence", "방별 처리 순번", "ATTEMPT 나노초 시간 순서"],
         ["user_id", "사용자 식별", "로그 필드: userId"],
+        ["attempt_id", "사용자별 시도 구분", "방-사용자별 ATTEMPT 누적 순번 (재시도마다 증가)"],
         ["join_result", "입장 결과 구분", "SUCCESS/FAIL_OVER_CAPACITY/UNKNOWN"],
         ["true_critical_section_nanoTime_start", "permit 획득 시도 시점", "ATTEMPT 이벤트의 nanoTime"],
         ["true_critical_section_nanoTime_end", "permit 획득 결과 시점", "SUCCESS/FAIL 이벤트의 nanoTime"],
@@ -374,82 +324,32 @@ def get_semaphore_desc_table() -> List[List[str]]:
     ]
 
 
-def convert_nano_value(x: Any) -> str:
-    """
-    나노초 값을 문자열로 안전하게 변환
-    """
-    if pd.isna(x) or x == '' or str(x).lower() == 'nan':
-        return ''
-    try:
-        return str(int(float(x)))
-    except (ValueError, TypeError):
-        return str(x)
-
-
 def save_to_csv(df: pd.DataFrame, filepath: str) -> None:
     """
     DataFrame을 CSV 파일로 저장 (나노초 정밀도 유지)
+    - 확장자가 .parquet/.feather 이면 컬럼형 중간 산출물로 저장 (pyarrow 필요)
     """
-    # 나노초 컬럼들을 문자열로 변환하여 지수 표기법 방지
-    df_copy = df.copy()
-    nano_columns = [col for col in df.columns if 'nanoTime' in col]
-    
-    for col in nano_columns:
-        if col in df_copy.columns:
-            df_copy[col] = df_copy[col].apply(convert_nano_value)
-    
-    # 출력 디렉토리 생성
-    output_dir = os.path.dirname(filepath)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # 나노초 컬럼들을 Int64 로 유지하여 지수 표기 없이 정수 그대로 기록 (값이 없으면 빈 칸)
+    df_copy = cast_nano_columns(df.copy())
     
-    # UTF-8 with BOM으로 저장 (Excel에서 한글 깨짐 방지)
-    df_copy.to_csv(filepath, index=False, encoding='utf-8-sig')
-    print(f"CSV 파일 저장 완료: {filepath}")
+    # 출력 디렉토리 생성 후 저장 (CSV 는 UTF-8 with BOM - Excel에서 한글 깨짐 방지)
+    write_table(df_copy, filepath, schema=OUTPUT_TABLE_SCHEMA)
+    print(f"{get_table_format(filepath).upper()} 파일 저장 완료: {filepath}")
 
 
 def save_with_side_table(df: pd.DataFrame, filepath: str, desc_table: List[List[str]]) -> str:
     """
-    DataFrame을 Excel로 저장하고 설명 테이블 추가
+    DataFrame을 Excel로 저장하고 설명 테이블 추가 (스트리밍 기록 - 데이터/서식/설명 테이블을 한 번에 저장)
     """
-    # 출력 디렉토리 생성
-    output_dir = os.path.dirname(filepath)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    # timezone 제거한 복사본 생성
-    df_excel = df.copy()
-    for col in df_excel.columns:
-        if pd.api.types.is_datetime64_tz_dtype(df_excel[col]):
-            df_excel[col] = df_excel[col].dt.tz_localize(None)
-    
-    # Excel 파일 생성
-    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-        df_excel.to_excel(writer, index=False)
-        
-        # 나노초 컬럼들을 텍스트 형식으로 설정
-        workbook = writer.book
-        worksheet = writer.sheets['Sheet1']
-        
-        nano_columns = [col for col in df.columns if 'nanoTime' in col]
-        for col_name in nano_columns:
-            if col_name in df.columns:
-                col_idx = df.columns.get_loc(col_name) + 1
-                for row in range(2, len(df) + 2):
-                    cell = worksheet.cell(row=row, column=col_idx)
-                    cell.number_format = '@'  # 텍스트 형식
+    # 나노초 정수 문자열 변환한 복사본 생성 (timezone 은 기록 시 제거)
+    df_excel = nano_columns_as_text(df)
     
-    # 설명 테이블 추가
-    wb = load_workbook(filepath)
-    ws = wb.active
-    
-    start_col = len(df.columns) + 2
-    
-    for i, row in enumerate(desc_table):
-        for j, val in enumerate(row):
-            ws.cell(row=i + 1, column=start_col + j, value=val)
-    
-    wb.save(filepath)
+    # 나노초 컬럼은 텍스트 형식, 설명 테이블은 마지막 컬럼 + 2열부터 기록
+    nano_columns = [col for col in df.columns if 'nanoTime' in col]
+    write_excel_with_side_table(
+        df_excel, filepath, side_table=desc_table,
+        column_formats={col: TEXT_FORMAT for col in nano_columns}
+    )
     print(f"Excel 파일 저장 완료: {filepath}")
     
     return filepath
@@ -539,8 +439,14 @@ def main():
     parser.add_argument('--csv', type=str, help='추가 CSV 파일명 (옵션)')
     parser.add_argument('--xlsx', type=str, help='Excel 파일명 (옵션)')
     parser.add_argument('--test', action='store_true', help='정규식 패턴 테스트 실행')
+    parser.add_argument('--table_format', choices=list(TABLE_FORMAT_EXTENSIONS.keys()), default='csv',
+                        help='기본 결과 파일 형식 (기본값: csv, parquet/feather 는 pyarrow 필요)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='로그 파싱 프로세스 수 (기본값: 1, 직렬 파싱)')
+    add_binning_arguments(parser, DEFAULT_BINNING)
     
     args = parser.parse_args()
+    binning = binning_engine_from_args(parser, args)
     
     # 정규식 테스트 옵션
     if args.test:
@@ -558,7 +464,7 @@ def main():
         
         # 2. 세마포어 로그 파싱
         print(f"\n세마포어 성능 로그 파싱 중...")
-        df = parse_semaphore_events(LOG_FILE, room_number=args.room)
+        df = parse_semaphore_events(LOG_FILE, room_number=args.room, workers=args.workers)
         print(f"파싱 완료: {len(df)}개 세마포어 이벤트")
         
         if df.empty:
@@ -567,7 +473,7 @@ def main():
         
         # 3. 세마포어 성능 데이터 구축
         print(f"\n세마포어 성능 데이터 구축 중...")
-        result = build_semaphore_performance_data(df)
+        result = build_semaphore_performance_data(df, binning)
         
         if result.empty:
             print("⚠️ 유효한 세마포어 세션이 생성되지 않았습니다.")
@@ -587,7 +493,7 @@ def main():
         else:
             base_filename = 'preprocessor_performance_semaphore.csv'
         
-        csv_path = os.path.join(output_dir, base_filename)
+        csv_path = with_table_extension(os.path.join(output_dir, base_filename), args.table_format)
         save_to_csv(result, csv_path)
         
         # 6. 추가 CSV 파일 저장 (옵션)
@@ -598,7 +504,7 @@ def main():
         # 7. Excel 파일 저장 (옵션)
         if args.xlsx:
             xlsx_path = os.path.join(output_dir, args.xlsx)
-            desc_table = get_semaphore_desc_table()
+            desc_table = get_semaphore_desc_table(binning)
             save_with_side_table(result, xlsx_path, desc_table)
         
         # 8. 세마포어 결과 분석 출력
@@ -25,8 +25,19 @@ import os               # 파일/폴더 작업을 위한 라이브러리
 import argparse         # 명령줄 인자 처리를 위한 라이브러리
 from datetime import datetime  # 날짜/시간 처리를 위한 라이브러리
 import sys              # 시스템 관련 기능을 위한 라이브러리
-from openpyxl import load_workbook  # Excel 파일 편집을 위한 라이브러리
-from decimal import Decimal  # 정확한 숫자 계산을 위한 라이브러리
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.nano_time import cast_nano_columns, nano_time_diff  # 나노초 컬럼 Int64 변환/차이 계산 (float 경유 없음)
+from common.group_stats import count_by_group, aggregate_by_group  # 방/방-구간별 groupby 집계
+from common.excel_report import (ExcelReportWriter, INTEGER_FORMAT, DECIMAL_FORMAT, PERCENT_TEXT_FORMAT,
+                                 bool_as_text, column_range, time_unit_row_formats)  # Excel 스트리밍 저장 (서식 포함)
+from common.table_io import read_table  # CSV/Parquet/Feather 로드 (확장자로 결정)
+from common.throughput import (ALL_ROOMS_LABEL, THROUGHPUT_COLUMNS, throughput_time_series,
+                               detect_saturation_knee)  # 시간 창 처리량 시계열 / 포화 지점 탐지
+from common.latency_histogram import (DEFAULT_PERCENTILES, percentile_column, build_latency_histograms,
+                                     percentiles_by_room)  # 병합 가능한 지연 시간 히스토그램 / 백분위수
+
+DEFAULT_THROUGHPUT_WINDOW_MS = 100  # 처리량 시계열 시간 창 크기 기본값 (밀리초)
 
 
 def calculate_rate(count, total):
@@ -96,65 +107,21 @@ def get_stats_with_precision(series, metric_name="", unit="ns"):
     }
 
 
-def parse_nano_time_precise(nano_str):
-    """
-    나노초 문자열을 정수로 변환하는 함수
-    
-    매개변수:
-        nano_str: 나노초를 나타내는 문자열 (예: "1234567890")
-    
-    반환값:
-        정수형 나노초 값 또는 NaN (변환 실패시)
-    
-    설명:
-        CSV 파일에서 읽은 나노초 값은 문자열이므로,
-        이를 정수로 변환해야 계산이 가능합니다.
-    """
-    # 값이 없거나 'nan' 문자열인 경우 NaN 반환
-    if pd.isna(nano_str) or nano_str == 'nan':
-        return np.nan
-    
-    try:
-        if isinstance(nano_str, str):
-            # 과학적 표기법 (예: 1.23E+9) 처리
-            if 'E' in nano_str or 'e' in nano_str:
-                decimal_val = Decimal(nano_str)
-                return int(decimal_val)
-            else:
-                # 일반 숫자 문자열을 정수로 변환
-                return int(float(nano_str))
-        else:
-            # 이미 숫자인 경우 정수로 변환
-            return int(nano_str)
-    except (ValueError, TypeError):
-        # 변환 실패시 NaN 반환
-        return np.nan
-
-
-def calculate_time_diff_nano(start_nano, end_nano):
+def get_column_or_default(df, column, default):
     """
-    두 나노초 시간값의 차이를 계산하는 함수
+    컬럼을 Series로 반환하는 함수 (컬럼이 없으면 기본값으로 채운 Series)
     
     매개변수:
-        start_nano: 시작 시간 (나노초)
-        end_nano: 종료 시간 (나노초)
+        df: 대상 DataFrame
+        column: 컬럼명
+        default: 컬럼이 없을 때 사용할 값
     
     반환값:
-        시간 차이 (나노초) 또는 NaN
-    
-    예시:
-        calculate_time_diff_nano(1000, 3000) → 2000
+        df와 같은 인덱스를 가진 Series
     """
-    # 시작 또는 종료 시간이 없으면 NaN 반환
-    if pd.isna(start_nano) or pd.isna(end_nano):
-        return np.nan
-    
-    try:
-        # 종료 시간에서 시작 시간을 빼서 경과 시간 계산
-        diff_nano = int(end_nano) - int(start_nano)
-        return diff_nano
-    except (ValueError, TypeError):
-        return np.nan
+    if column in df.columns:
+        return df[column]
+    return pd.Series(default, index=df.index, dtype=object)
 
 
 def set_join_result_from_events(df):
@@ -174,34 +141,63 @@ def set_join_result_from_events(df):
         - FAIL_ENTRY: 진입 자체를 실패 (락 획득 실패 등)
         - PRE_CHECK_FAIL: 락 외부 사전 차단 (이중 확인 구조)
     """
-    def determine_join_result(row):
-        """개별 행(row)의 join_result를 결정하는 내부 함수"""
-        # 이미 join_result가 설정되어 있고 유효한 값이면 그대로 사용
-        if pd.notna(row.get('join_result')) and row.get('join_result') != '':
-            existing_result = str(row['join_result']).strip()
-            # PRE_CHECK_FAIL 포함하여 유효한 값들 확인
-            if existing_result in ['SUCCESS', 'FAIL_OVER_CAPACITY', 'FAIL_ENTRY', 'PRE_CHECK_FAIL']:
-                return existing_result
-        
-        # critical_leave_event_type을 기반으로 결과 판단
-        if pd.isna(row.get('critical_leave_event_type')) or row.get('critical_leave_event_type') == '':
-            return 'FAIL_ENTRY'
-        elif str(row['critical_leave_event_type']).strip() == 'SUCCESS':
-            return 'SUCCESS'
-        elif str(row['critical_leave_event_type']).strip() == 'FAIL_OVER_CAPACITY':
-            return 'FAIL_OVER_CAPACITY'
-        else:
-            return 'UNKNOWN'
-    
     # DataFrame 복사본 생성 (원본 데이터 보호)
     df_result = df.copy()
     
-    # 각 행에 대해 join_result 결정 함수 적용
-    df_result['join_result'] = df_result.apply(determine_join_result, axis=1)
+    existing_result = get_column_or_default(df_result, 'join_result', pd.NA).astype('string').str.strip()
+    leave_event = get_column_or_default(df_result, 'critical_leave_event_type', pd.NA).astype('string')
+    
+    # 조건은 위에서부터 우선 적용 (np.select - 행 단위 apply 없음)
+    conditions = [
+        # 이미 join_result가 설정되어 있고 유효한 값이면 그대로 사용 (PRE_CHECK_FAIL 포함)
+        existing_result.isin(['SUCCESS', 'FAIL_OVER_CAPACITY', 'FAIL_ENTRY', 'PRE_CHECK_FAIL']),
+        # critical_leave_event_type을 기반으로 결과 판단
+        leave_event.isna() | (leave_event == ''),
+        leave_event.str.strip() == 'SUCCESS',
+        leave_event.str.strip() == 'FAIL_OVER_CAPACITY'
+    ]
+    choices = [existing_result.to_numpy(dtype=object), 'FAIL_ENTRY', 'SUCCESS', 'FAIL_OVER_CAPACITY']
+    
+    df_result['join_result'] = np.select(
+        [condition.fillna(False).to_numpy(dtype=bool) for condition in conditions],
+        choices,
+        default='UNKNOWN'
+    )
     
     return df_result
 
 
+def add_time_metric_columns(df):
+    """
+    대기 시간, 체류 시간, 실패 처리 시간 컬럼을 전체 데이터에 대해 한 번에 계산하는 함수
+    
+    매개변수:
+        df: join_result 컬럼이 설정된 DataFrame
+    
+    반환값:
+        wait_time_ns, dwell_time_ns, fail_processing_time_ns 컬럼이 추가된 DataFrame (원본 수정 후 반환)
+    
+    설명:
+        - 대기 시간 = 임계 영역 진입 시간 - 대기 시작 시간
+        - 체류 시간 = 임계 영역 나간 시간 - 임계 영역 진입 시간 (SUCCESS만)
+        - 실패 처리 시간 = 임계 영역 나간 시간 - 임계 영역 진입 시간 (FAIL_OVER_CAPACITY만)
+        - PRE_CHECK_FAIL은 락 진입 전 차단이므로 대기 시간 없음
+        - 컬럼 단위 Int64 정수 연산, 시각 값이 하나라도 없으면 <NA>
+    """
+    waiting_start = get_column_or_default(df, 'waiting_start_nanoTime', pd.NA)
+    critical_enter = get_column_or_default(df, 'critical_enter_nanoTime', pd.NA)
+    critical_leave = get_column_or_default(df, 'critical_leave_nanoTime', pd.NA)
+    
+    processing_time = nano_time_diff(critical_enter, critical_leave)
+    
+    wait_time = nano_time_diff(waiting_start, critical_enter)
+    df['wait_time_ns'] = wait_time.where(df['join_result'] != 'PRE_CHECK_FAIL')
+    df['dwell_time_ns'] = processing_time.where(df['join_result'] == 'SUCCESS')
+    df['fail_processing_time_ns'] = processing_time.where(df['join_result'] == 'FAIL_OVER_CAPACITY')
+    
+    return df
+
+
 def create_summary_stats(df_total, df_success, df_lock_failed, df_capacity_failed, df_pre_check_failed):
     """
     전체 요약 통계를 생성하는 함수 (PRE_CHECK_FAIL 추가)
@@ -394,6 +390,82 @@ def create_pre_check_failed_stats(df_pre_check_failed, total_count, capacity_fai
     return pd.DataFrame(pre_check_stats_data)
 
 
+def create_group_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed, keys):
+    """
+    그룹(방 또는 방-구간)별 통계를 생성하는 함수 (PRE_CHECK_FAIL + 총합 통계 포함)
+    
+    매개변수:
+        df_total: 전체 데이터
+        df_success: 성공한 요청들
+        df_capacity_failed: 정원 초과 실패 요청들
+        df_lock_failed: 진입 실패 요청들
+        df_pre_check_failed: PRE_CHECK_FAIL 요청들
+        keys: 그룹 기준 컬럼 목록 (['roomNumber'] 또는 ['roomNumber', 'bin'])
+    
+    반환값:
+        그룹별 통계 DataFrame (df_total에 있는 모든 그룹, 그룹 키 순서로 정렬)
+    
+    설명:
+        그룹마다 DataFrame을 다시 필터링하지 않고 결과 분류별로 groupby 한 번씩 집계한 뒤
+        전체 그룹 인덱스에 맞춰 결합합니다 (해당 분류의 요청이 없는 그룹은 0).
+    """
+    # 전체 그룹 인덱스 (그룹별 전체 요청 수)
+    total_counts = df_total.groupby(keys).size()
+    group_index = total_counts.index
+    
+    # 결과 분류별 요청 수
+    success_count = count_by_group(df_success, keys, group_index)
+    capacity_failed_count = count_by_group(df_capacity_failed, keys, group_index)
+    lock_failed_count = count_by_group(df_lock_failed, keys, group_index)
+    pre_check_failed_count = count_by_group(df_pre_check_failed, keys, group_index)
+    
+    # 결과 분류별 시간 통계 (평균, 중앙값, 최댓값, 총합)
+    success_wait = aggregate_by_group(df_success, keys, 'wait_time_ns', group_index)
+    success_dwell = aggregate_by_group(df_success, keys, 'dwell_time_ns', group_index)
+    capacity_failed_wait = aggregate_by_group(df_capacity_failed, keys, 'wait_time_ns', group_index)
+    capacity_failed_fail_processing = aggregate_by_group(df_capacity_failed, keys, 'fail_processing_time_ns', group_index)
+    
+    # 통계 계산
+    stats = {
+        'total_requests': total_counts,
+        'success_count': success_count,
+        'capacity_failed_count': capacity_failed_count,
+        'entry_failed_count': lock_failed_count,
+        'pre_check_failed_count': pre_check_failed_count,  # 실제 count 개수
+        'success_rate(%)': calculate_rate(success_count, total_counts),
+        'capacity_failed_rate(%)': calculate_rate(capacity_failed_count, total_counts),
+        'pre_check_failed_rate(%)': calculate_rate(pre_check_failed_count, total_counts),
+        'entry_failed_rate(%)': calculate_rate(lock_failed_count, total_counts),
+        
+        # 성공 대기시간 통계
+        'success_avg_wait_time(ns)': success_wait['mean'],
+        'success_median_wait_time(ns)': success_wait['median'],
+        'success_max_wait_time(ns)': success_wait['max'],
+        'success_total_wait_time(ns)': success_wait['sum'],
+        
+        # 성공 작업시간 통계
+        'success_avg_dwell_time(ns)': success_dwell['mean'],
+        'success_median_dwell_time(ns)': success_dwell['median'],
+        'success_max_dwell_time(ns)': success_dwell['max'],
+        'success_total_dwell_time(ns)': success_dwell['sum'],
+        
+        # 용량 초과 실패 대기시간 통계
+        'capacity_failed_avg_wait_time(ns)': capacity_failed_wait['mean'],
+        'capacity_failed_median_wait_time(ns)': capacity_failed_wait['median'],
+        'capacity_failed_max_wait_time(ns)': capacity_failed_wait['max'],
+        'capacity_failed_total_wait_time(ns)': capacity_failed_wait['sum'],
+        
+        # 용량 초과 실패 처리시간 통계
+        'capacity_failed_avg_fail_processing_time(ns)': capacity_failed_fail_processing['mean'],
+        'capacity_failed_median_fail_processing_time(ns)': capacity_failed_fail_processing['median'],
+        'capacity_failed_max_fail_processing_time(ns)': capacity_failed_fail_processing['max'],
+        'capacity_failed_total_fail_processing_time(ns)': capacity_failed_fail_processing['sum']
+    }
+    
+    # 그룹 키를 앞쪽 컬럼으로 (roomNumber, bin)
+    return pd.DataFrame(stats, index=group_index).reset_index()
+
+
 def create_per_room_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed):
     """
     방(room)별 통계를 생성하는 함수 (PRE_CHECK_FAIL 추가 + 총합 통계 추가)
@@ -408,61 +480,7 @@ def create_per_room_stats(df_total, df_success, df_capacity_failed, df_lock_fail
     반환값:
         방별 통계 DataFrame
     """
-    # 모든 방 번호를 정렬된 순서로 가져오기
-    all_rooms = sorted(df_total['roomNumber'].unique())
-    
-    room_stats_list = []
-    
-    # 각 방별로 통계 계산
-    for room in all_rooms:
-        # 해당 방의 데이터만 필터링
-        room_total = df_total[df_total['roomNumber'] == room]
-        room_success = df_success[df_success['roomNumber'] == room] if len(df_success) > 0 else pd.DataFrame()
-        room_capacity_failed = df_capacity_failed[df_capacity_failed['roomNumber'] == room] if len(df_capacity_failed) > 0 else pd.DataFrame()
-        room_lock_failed = df_lock_failed[df_lock_failed['roomNumber'] == room] if len(df_lock_failed) > 0 else pd.DataFrame()
-        room_pre_check_failed = df_pre_check_failed[df_pre_check_failed['roomNumber'] == room] if len(df_pre_check_failed) > 0 else pd.DataFrame()  # 새로 추가
-
-        # 통계 계산
-        stats = {
-            'roomNumber': room,
-            'total_requests': len(room_total),
-            'success_count': len(room_success),
-            'capacity_failed_count': len(room_capacity_failed),
-            'entry_failed_count': len(room_lock_failed),
-            'pre_check_failed_count': len(room_pre_check_failed),  # 실제 count 개수
-            'success_rate(%)': calculate_rate(len(room_success), len(room_total)),
-            'capacity_failed_rate(%)': calculate_rate(len(room_capacity_failed), len(room_total)),
-            'pre_check_failed_rate(%)': calculate_rate(len(room_pre_check_failed), len(room_total)),  # 기존 컬럼명을 퍼센트로 변경
-            'entry_failed_rate(%)': calculate_rate(len(room_lock_failed), len(room_total)),
-            
-            # 성공 대기시간 통계 (기존 + 새로 추가)
-            'success_avg_wait_time(ns)': room_success['wait_time_ns'].mean() if len(room_success) > 0 else 0,
-            'success_median_wait_time(ns)': room_success['wait_time_ns'].median() if len(room_success) > 0 else 0,
-            'success_max_wait_time(ns)': room_success['wait_time_ns'].max() if len(room_success) > 0 else 0,
-            'success_total_wait_time(ns)': room_success['wait_time_ns'].sum() if len(room_success) > 0 else 0,  # NEW
-            
-            # 성공 작업시간 통계 (기존 + 새로 추가)
-            'success_avg_dwell_time(ns)': room_success['dwell_time_ns'].mean() if len(room_success) > 0 else 0,
-            'success_median_dwell_time(ns)': room_success['dwell_time_ns'].median() if len(room_success) > 0 else 0,
-            'success_max_dwell_time(ns)': room_success['dwell_time_ns'].max() if len(room_success) > 0 else 0,
-            'success_total_dwell_time(ns)': room_success['dwell_time_ns'].sum() if len(room_success) > 0 else 0,  # NEW
-            
-            # 용량 초과 실패 대기시간 통계 (기존 + 새로 추가)
-            'capacity_failed_avg_wait_time(ns)': room_capacity_failed['wait_time_ns'].mean() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_median_wait_time(ns)': room_capacity_failed['wait_time_ns'].median() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_max_wait_time(ns)': room_capacity_failed['wait_time_ns'].max() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_total_wait_time(ns)': room_capacity_failed['wait_time_ns'].sum() if len(room_capacity_failed) > 0 else 0,  # NEW
-            
-            # 용량 초과 실패 처리시간 통계 (기존 + 새로 추가)
-            'capacity_failed_avg_fail_processing_time(ns)': room_capacity_failed['fail_processing_time_ns'].mean() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_median_fail_processing_time(ns)': room_capacity_failed['fail_processing_time_ns'].median() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_max_fail_processing_time(ns)': room_capacity_failed['fail_processing_time_ns'].max() if len(room_capacity_failed) > 0 else 0,
-            'capacity_failed_total_fail_processing_time(ns)': room_capacity_failed['fail_processing_time_ns'].sum() if len(room_capacity_failed) > 0 else 0  # NEW
-        }
-                
-        room_stats_list.append(stats)
-    
-    return pd.DataFrame(room_stats_list)
+    return create_group_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed, ['roomNumber'])
 
 
 def create_per_bin_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed):
@@ -483,62 +501,13 @@ def create_per_bin_stats(df_total, df_success, df_capacity_failed, df_lock_faile
     if 'bin' not in df_total.columns:
         return pd.DataFrame()
     
-    # 모든 방-구간 조합 가져오기
-    all_combinations = df_total.groupby(['roomNumber', 'bin']).size().index.tolist()
+    df_bin_stats = create_group_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed, ['roomNumber', 'bin'])
     
-    bin_stats_list = []
-    
-    # 각 방-구간 조합별로 통계 계산
-    for room, bin_num in all_combinations:
-        # 해당 방-구간 조합의 데이터만 필터링
-        combo_total = df_total[(df_total['roomNumber'] == room) & (df_total['bin'] == bin_num)]
-        combo_success = df_success[(df_success['roomNumber'] == room) & (df_success['bin'] == bin_num)] if len(df_success) > 0 else pd.DataFrame()
-        combo_capacity_failed = df_capacity_failed[(df_capacity_failed['roomNumber'] == room) & (df_capacity_failed['bin'] == bin_num)] if len(df_capacity_failed) > 0 else pd.DataFrame()
-        combo_lock_failed = df_lock_failed[(df_lock_failed['roomNumber'] == room) & (df_lock_failed['bin'] == bin_num)] if len(df_lock_failed) > 0 else pd.DataFrame()
-        combo_pre_check_failed = df_pre_check_failed[(df_pre_check_failed['roomNumber'] == room) & (df_pre_check_failed['bin'] == bin_num)] if len(df_pre_check_failed) > 0 else pd.DataFrame()  # 새로 추가
-        
-        # 통계 계산
-        stats = {
-            'roomNumber': room,
-            'bin': bin_num,
-            'total_requests': len(combo_total),
-            'success_count': len(combo_success),
-            'capacity_failed_count': len(combo_capacity_failed),
-            'pre_check_failed_count': len(combo_pre_check_failed),  # F컬럼으로 이동
-            'entry_failed_count': len(combo_lock_failed),           # G컬럼으로 이동
-            'success_rate(%)': calculate_rate(len(combo_success), len(combo_total)),
-            'capacity_failed_rate(%)': calculate_rate(len(combo_capacity_failed), len(combo_total)),
-            'pre_check_failed_rate(%)': calculate_rate(len(combo_pre_check_failed), len(combo_total)),
-            'entry_failed_rate(%)': calculate_rate(len(combo_lock_failed), len(combo_total)),
-            
-            # 성공 대기시간 통계 (기존 + 새로 추가)
-            'success_avg_wait_time(ns)': combo_success['wait_time_ns'].mean() if len(combo_success) > 0 else 0,
-            'success_median_wait_time(ns)': combo_success['wait_time_ns'].median() if len(combo_success) > 0 else 0,
-            'success_max_wait_time(ns)': combo_success['wait_time_ns'].max() if len(combo_success) > 0 else 0,
-            'success_total_wait_time(ns)': combo_success['wait_time_ns'].sum() if len(combo_success) > 0 else 0,  # NEW
-            
-            # 성공 작업시간 통계 (기존 + 새로 추가)
-            'success_avg_dwell_time(ns)': combo_success['dwell_time_ns'].mean() if len(combo_success) > 0 else 0,
-            'success_median_dwell_time(ns)': combo_success['dwell_time_ns'].median() if len(combo_success) > 0 else 0,
-            'success_max_dwell_time(ns)': combo_success['dwell_time_ns'].max() if len(combo_success) > 0 else 0,
-            'success_total_dwell_time(ns)': combo_success['dwell_time_ns'].sum() if len(combo_success) > 0 else 0,  # NEW
-            
-            # 용량 초과 실패 대기시간 통계 (기존 + 새로 추가)
-            'capacity_failed_avg_wait_time(ns)': combo_capacity_failed['wait_time_ns'].mean() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_median_wait_time(ns)': combo_capacity_failed['wait_time_ns'].median() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_max_wait_time(ns)': combo_capacity_failed['wait_time_ns'].max() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_total_wait_time(ns)': combo_capacity_failed['wait_time_ns'].sum() if len(combo_capacity_failed) > 0 else 0,  # NEW
-            
-            # 용량 초과 실패 처리시간 통계 (기존 + 새로 추가)
-            'capacity_failed_avg_fail_processing_time(ns)': combo_capacity_failed['fail_processing_time_ns'].mean() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_median_fail_processing_time(ns)': combo_capacity_failed['fail_processing_time_ns'].median() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_max_fail_processing_time(ns)': combo_capacity_failed['fail_processing_time_ns'].max() if len(combo_capacity_failed) > 0 else 0,
-            'capacity_failed_total_fail_processing_time(ns)': combo_capacity_failed['fail_processing_time_ns'].sum() if len(combo_capacity_failed) > 0 else 0  # NEW
-        }
-        
-        bin_stats_list.append(stats)
-    
-    return pd.DataFrame(bin_stats_list)
+    # 방-구간별 시트는 pre_check_failed_count(F컬럼) → entry_failed_count(G컬럼) 순서
+    columns = list(df_bin_stats.columns)
+    columns.remove('pre_check_failed_count')
+    columns.insert(columns.index('entry_failed_count'), 'pre_check_failed_count')
+    return df_bin_stats[columns]
 
 
 def create_per_thread_critical_details(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed):
@@ -546,7 +515,7 @@ def create_per_thread_critical_details(df_total, df_success, df_capacity_failed,
     각 스레드별 임계구역 접근 상세 내역을 생성하는 함수 (PRE_CHECK_FAIL 추가)
     
     매개변수:
-        df_total: 전체 데이터
+        df_total: 전체 데이터 (add_time_metric_columns로 시간 컬럼 계산 완료)
         df_success: 성공한 요청들
         df_capacity_failed: 정원 초과 실패 요청들
         df_lock_failed: 진입 실패 요청들
@@ -555,121 +524,64 @@ def create_per_thread_critical_details(df_total, df_success, df_capacity_failed,
     반환값:
         각 스레드별 임계구역 접근 상세 DataFrame
     """
-    # 'bin' 컬럼이 없으면 빈 DataFrame 반환
-    if 'bin' not in df_total.columns:
+    # 'bin' 컬럼이 없거나 데이터가 없으면 빈 DataFrame 반환
+    if 'bin' not in df_total.columns or df_total.empty:
         return pd.DataFrame()
     
-    thread_details_list = []
-    
-    # 전체 데이터를 순회하면서 각 스레드별 상세 정보 생성
-    for index, row in df_total.iterrows():
-        # 기본 정보
-        room_number = row['roomNumber']
-        bin_number = row['bin']
-        
-        # 사용자/스레드 ID 찾기
-        thread_id = None
-        possible_id_columns = ['userId', 'user_id', 'threadId', 'thread_id', 'clientId', 'client_id', 'requestId', 'request_id']
-        for col in possible_id_columns:
-            if col in row and pd.notna(row[col]):
-                thread_id = row[col]
-                break
-        
-        if thread_id is None:
-            thread_id = f"thread_{index}"  # 기본값
-        
-        # 임계구역 접근 결과 판단
-        join_result = row.get('join_result', 'UNKNOWN')
-        critical_leave_event = row.get('critical_leave_event_type', 'UNKNOWN')
-        
-        # PRE_CHECK_FAIL의 경우 특별 처리
-        if join_result == 'PRE_CHECK_FAIL':
-            # PRE_CHECK_FAIL은 락 진입 전 차단이므로 임계구역 미진입
-            entered_critical_section = False
-            exited_critical_section = False
-            critical_section_success = False
-            critical_section_failure_reason = 'PRE_CHECK_BLOCKED'
-            wait_time_ns = np.nan  # 대기 시간 없음
-            dwell_time_ns = np.nan  # 체류 시간 없음
-            fail_processing_time_ns = np.nan  # 실패 처리 시간 없음
-        else:
-            # 기존 로직 (SUCCESS, FAIL_OVER_CAPACITY, FAIL_ENTRY)
-            entered_critical_section = pd.notna(row.get('critical_enter_nanoTime'))
-            exited_critical_section = pd.notna(row.get('critical_leave_nanoTime'))
-            
-            # 시간 계산
-            wait_time_ns = np.nan
-            dwell_time_ns = np.nan
-            fail_processing_time_ns = np.nan
-            
-            # 대기 시간 계산 (진입한 경우)
-            if entered_critical_section and pd.notna(row.get('waiting_start_nanoTime')):
-                wait_time_ns = calculate_time_diff_nano(
-                    row['waiting_start_nanoTime'], 
-                    row['critical_enter_nanoTime']
-                )
-            
-            # 작업 시간 또는 실패 처리 시간 계산
-            if entered_critical_section and exited_critical_section:
-                processing_time = calculate_time_diff_nano(
-                    row['critical_enter_nanoTime'], 
-                    row['critical_leave_nanoTime']
-                )
-                
-                if join_result == 'SUCCESS':
-                    dwell_time_ns = processing_time
-                elif join_result == 'FAIL_OVER_CAPACITY':
-                    fail_processing_time_ns = processing_time
-            
-            # 임계구역 작업 성공 여부
-            critical_section_success = (join_result == 'SUCCESS')
-            critical_section_failure_reason = None
-            
-            if not critical_section_success:
-                if join_result == 'FAIL_OVER_CAPACITY':
-                    critical_section_failure_reason = 'CAPACITY_EXCEEDED'
-                elif join_result == 'FAIL_ENTRY':
-                    critical_section_failure_reason = 'ENTRY_FAILED'
-                else:
-                    critical_section_failure_reason = 'UNKNOWN_FAILURE'
-        
-        # 현재 인원수와 최대 인원수 정보 (가능한 경우)
-        current_people = row.get('currentPeople', np.nan)
-        max_people = row.get('maxPeople', np.nan)
-        
-        # 각 스레드별 상세 정보
-        thread_detail = {
-            'roomNumber': room_number,
-            'bin': bin_number,
-            'thread_id': thread_id,
-            'critical_section_entered': entered_critical_section,
-            'critical_section_exited': exited_critical_section,
-            'critical_section_success': critical_section_success,
-            'failure_reason': critical_section_failure_reason,
-            'join_result': join_result,
-            'critical_leave_event_type': critical_leave_event,
-            'wait_time_ns': wait_time_ns,
-            'dwell_time_ns': dwell_time_ns,
-            'fail_processing_time_ns': fail_processing_time_ns,
-            'current_people': current_people,
-            'max_people': max_people,
-            'waiting_start_nanoTime': row.get('waiting_start_nanoTime', np.nan),
-            'critical_enter_nanoTime': row.get('critical_enter_nanoTime', np.nan),
-            'critical_leave_nanoTime': row.get('critical_leave_nanoTime', np.nan),
-            'increment_before_nanoTime': row.get('increment_before_nanoTime', np.nan),
-            'increment_after_nanoTime': row.get('increment_after_nanoTime', np.nan)
-        }
-        
-        thread_details_list.append(thread_detail)
+    # 사용자/스레드 ID 찾기 (후보 컬럼 중 값이 있는 첫 번째 컬럼, 없으면 thread_{index})
+    possible_id_columns = ['userId', 'user_id', 'threadId', 'thread_id', 'clientId', 'client_id', 'requestId', 'request_id']
+    thread_id = pd.Series([f"thread_{index}" for index in df_total.index], index=df_total.index, dtype=object)
+    for col in reversed(possible_id_columns):
+        if col in df_total.columns:
+            thread_id = df_total[col].astype(object).where(df_total[col].notna(), thread_id)
+    
+    # 임계구역 접근 결과
+    join_result = get_column_or_default(df_total, 'join_result', 'UNKNOWN')
+    
+    # 임계구역 진입 여부 (PRE_CHECK_FAIL은 락 진입 전 차단이므로 임계구역 미진입)
+    is_pre_check_failed = join_result == 'PRE_CHECK_FAIL'
+    entered_critical_section = get_column_or_default(df_total, 'critical_enter_nanoTime', np.nan).notna() & ~is_pre_check_failed
+    exited_critical_section = get_column_or_default(df_total, 'critical_leave_nanoTime', np.nan).notna() & ~is_pre_check_failed
+    
+    # 임계구역 작업 성공 여부 및 실패 사유
+    critical_section_success = join_result == 'SUCCESS'
+    critical_section_failure_reason = np.select(
+        [is_pre_check_failed, critical_section_success, join_result == 'FAIL_OVER_CAPACITY', join_result == 'FAIL_ENTRY'],
+        ['PRE_CHECK_BLOCKED', None, 'CAPACITY_EXCEEDED', 'ENTRY_FAILED'],
+        default='UNKNOWN_FAILURE'
+    )
     
-    # DataFrame 생성 및 정렬
-    result_df = pd.DataFrame(thread_details_list)
-    if not result_df.empty:
-        # 방 번호 → 구간 → 대기 시작 시간 순으로 정렬
-        sort_columns = ['roomNumber', 'bin']
-        if 'waiting_start_nanoTime' in result_df.columns:
-            sort_columns.append('waiting_start_nanoTime')
-        result_df = result_df.sort_values(sort_columns)
+    # 각 스레드별 상세 정보 (시간 값은 process_performance_data에서 계산한 컬럼 그대로 사용)
+    result_df = pd.DataFrame({
+        'roomNumber': df_total['roomNumber'],
+        'bin': df_total['bin'],
+        'thread_id': thread_id,
+        'critical_section_entered': entered_critical_section,
+        'critical_section_exited': exited_critical_section,
+        'critical_section_success': critical_section_success,
+        'failure_reason': critical_section_failure_reason,
+        'join_result': join_result,
+        'critical_leave_event_type': get_column_or_default(df_total, 'critical_leave_event_type', 'UNKNOWN'),
+        'wait_time_ns': df_total['wait_time_ns'],
+        'dwell_time_ns': df_total['dwell_time_ns'],
+        'fail_processing_time_ns': df_total['fail_processing_time_ns'],
+        'current_people': get_column_or_default(df_total, 'currentPeople', np.nan),
+        'max_people': get_column_or_default(df_total, 'maxPeople', np.nan),
+        'waiting_start_nanoTime': get_column_or_default(df_total, 'waiting_start_nanoTime', np.nan),
+        'critical_enter_nanoTime': get_column_or_default(df_total, 'critical_enter_nanoTime', np.nan),
+        'critical_leave_nanoTime': get_column_or_default(df_total, 'critical_leave_nanoTime', np.nan),
+        'increment_before_nanoTime': get_column_or_default(df_total, 'increment_before_nanoTime', np.nan),
+        'increment_after_nanoTime': get_column_or_default(df_total, 'increment_after_nanoTime', np.nan)
+    }).reset_index(drop=True)
+    
+    # 나노초 시각 컬럼은 Int64 로 유지 (값이 없으면 <NA>)
+    result_df = cast_nano_columns(result_df)
+    
+    # 방 번호 → 구간 → 대기 시작 시간 순으로 정렬
+    sort_columns = ['roomNumber', 'bin']
+    if 'waiting_start_nanoTime' in result_df.columns:
+        sort_columns.append('waiting_start_nanoTime')
+    result_df = result_df.sort_values(sort_columns)
     
     return result_df
 
@@ -709,144 +621,144 @@ def create_time_unit_comparison(df_success):
     return pd.DataFrame(comparison_stats_list)
 
 
-def format_excel_file(output_path):
+def create_throughput_stats(df_total, window_ms=DEFAULT_THROUGHPUT_WINDOW_MS):
+    """
+    고정 시간 창 처리량 시계열과 포화 지점(knee) 통계를 생성하는 함수
+    
+    매개변수:
+        df_total: join_result, wait_time_ns 가 설정된 전체 데이터
+        window_ms: 시간 창 크기 (밀리초)
+    
+    반환값:
+        (처리량 시계열 DataFrame, 포화 지점 DataFrame) - 시각 값이 없으면 빈 DataFrame
+    
+    설명:
+        - 도착 = 대기 시작 시각, 완료 = 임계 영역 나간 시각 (epochNano 우선, 값이 없으면 nanoTime)
+        - 방별/전체 초당 도착(offered) · 완료(completed) · 입장 성공(joined) 수와 처리 중(in_flight) 요청 수
+        - 창별 도착 부하와 평균 대기 시간의 관계에서 대기 시간이 급증하기 시작하는 지점 탐지
+    """
+    time_suffix = 'epochNano' if get_column_or_default(df_total, 'critical_leave_epochNano', pd.NA).notna().any() else 'nanoTime'
+    df_series = throughput_time_series(
+        df_total, f'waiting_start_{time_suffix}', f'critical_leave_{time_suffix}', 'wait_time_ns',
+        window_ms, success_mask=df_total['join_result'] == 'SUCCESS'
+    )
+    return df_series, detect_saturation_knee(df_series)
+
+
+def create_latency_histograms(df_success, df_capacity_failed):
+    """
+    방/구간별 지연 시간 히스토그램(HDR 방식 로그 버킷)을 생성하는 함수
+    
+    매개변수:
+        df_success: 유효한 성공 요청들 (wait_time_ns, dwell_time_ns)
+        df_capacity_failed: 유효한 정원 초과 실패 요청들 (wait_time_ns, fail_processing_time_ns)
+    
+    반환값:
+        히스토그램 DataFrame (roomNumber, bin, metric, bucket, lower_ns, upper_ns, count)
+    
+    설명:
+        원본 값 대신 버킷별 개수만 저장하므로 방/구간/실행 간 merge_histograms 로 병합 가능,
+        백분위수와 Box/Violin Plot 은 저장된 히스토그램에서 계산
+    """
+    return build_latency_histograms([
+        ('success_wait_time', df_success, 'wait_time_ns'),
+        ('success_dwell_time', df_success, 'dwell_time_ns'),
+        ('capacity_failed_wait_time', df_capacity_failed, 'wait_time_ns'),
+        ('capacity_failed_fail_processing_time', df_capacity_failed, 'fail_processing_time_ns')
+    ])
+
+
+def write_formatted_sheet(writer, df, sheet_name):
     """
-    Excel 파일의 포맷을 설정하는 함수 (PRE_CHECK_FAIL 추가 + 총합 통계 추가)
+    시트 한 개를 숫자 포맷과 함께 기록하는 함수 (PRE_CHECK_FAIL 추가 + 총합 통계 추가)
     
     매개변수:
-        output_path: Excel 파일 경로
+        writer: ExcelReportWriter (write-only 스트리밍 기록)
+        df: 기록할 DataFrame
+        sheet_name: 시트명
     
     설명:
-        숫자 포맷을 설정하여 가독성을 높입니다.
+        숫자 포맷을 기록 시점에 설정하여 가독성을 높입니다 (저장 후 파일을 다시 열지 않음).
         - 백분율: 0.00%
         - 나노초: #,##0 (천 단위 구분자)
         - 마이크로초/밀리초: 소수점 포함
     """
-    wb = load_workbook(output_path)
+    column_formats = {}
+    row_formats = None
     
     # Per_Bin_Stats 시트의 포맷 (PRE_CHECK_FAIL 컬럼 추가로 범위 확장)
-    if 'Per_Bin_Stats' in wb.sheetnames:
-        ws = wb['Per_Bin_Stats']
-        
+    if sheet_name == 'Per_Bin_Stats':
         # F, G컬럼 (pre_check_failed_count, entry_failed_count) - 정수 포맷 적용
-        for col in ['F', 'G']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '#,##0'
-        
+        column_formats = {col: INTEGER_FORMAT for col in ['F', 'G']}
         # 비율 컬럼들 (H, I, J, K) - 퍼센트 포맷 적용
-        for col in ['H', 'I', 'J', 'K']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '0.00"%"'
-        
+        column_formats.update({col: PERCENT_TEXT_FORMAT for col in column_range('H', 'K')})
         # 시간 컬럼들 (L~AA) - 총합 통계 추가로 범위 확장
-        for col in ['L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z', 'AA']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '#,##0'
+        column_formats.update({col: INTEGER_FORMAT for col in column_range('L', 'AA')})
     
     # 통계 시트들의 값 포맷 (PRE_CHECK_FAIL 시트 추가)
-    for sheet_name in ['Overall_Success_Stats', 'Overall_Capacity_Failed_Stats', 'Overall_PRE_CHECK_FAIL_Stats']:
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'C{row}']  # Value 컬럼
-                if cell.value is not None:
-                    cell.number_format = '#,##0'  # 천 단위 구분자
+    elif sheet_name in ['Overall_Success_Stats', 'Overall_Capacity_Failed_Stats', 'Overall_PRE_CHECK_FAIL_Stats']:
+        column_formats = {'C': INTEGER_FORMAT}  # Value 컬럼 (천 단위 구분자)
     
     # Per_Room_Stats 시트의 포맷 (PRE_CHECK_FAIL 컬럼 추가로 범위 확장)
-    if 'Per_Room_Stats' in wb.sheetnames:
-        ws = wb['Per_Room_Stats']
-        
+    elif sheet_name == 'Per_Room_Stats':
         # F컬럼 (pre_check_failed_count) - 정수 포맷 적용
-        for row in range(2, ws.max_row + 1):
-            cell = ws[f'F{row}']
-            if cell.value is not None:
-                cell.number_format = '#,##0'
-        
+        column_formats = {'F': INTEGER_FORMAT}
         # 비율 컬럼들 (G, H, I, J) - 퍼센트 포맷 적용
-        for col in ['G', 'H', 'I', 'J']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '0.00"%"'
-        
+        column_formats.update({col: PERCENT_TEXT_FORMAT for col in column_range('G', 'J')})
         # 시간 컬럼들 (K~Z) - 총합 통계 추가로 범위 대폭 확장
-        for col in ['K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '#,##0'
+        column_formats.update({col: INTEGER_FORMAT for col in column_range('K', 'Z')})
     
     # Per_Thread_Critical_Details 시트의 포맷
-    if 'Per_Thread_Critical_Details' in wb.sheetnames:
-        ws = wb['Per_Thread_Critical_Details']
+    elif sheet_name == 'Per_Thread_Critical_Details':
+        # 불리언 컬럼들 (TRUE/FALSE 문자열로 표시)
+        df = df.copy()
+        boolean_columns = ['critical_section_entered', 'critical_section_exited', 'critical_section_success']
+        for col_name in boolean_columns:
+            if col_name in df.columns:
+                df[col_name] = df[col_name].map(bool_as_text)
         
-        if ws.max_row > 0:
-            header_row = [cell.value for cell in ws[1]]
-            
-            # 불리언 컬럼들 (TRUE/FALSE 표시)
-            boolean_columns = ['critical_section_entered', 'critical_section_exited', 'critical_section_success']
-            for col_name in boolean_columns:
-                try:
-                    col_index = header_row.index(col_name) + 1
-                    col_letter = chr(64 + col_index) if col_index <= 26 else f"A{chr(64 + col_index - 26)}"
-                    for row in range(2, ws.max_row + 1):
-                        cell = ws[f'{col_letter}{row}']
-                        if cell.value is not None:
-                            # 불리언 값을 문자열로 표시
-                            if isinstance(cell.value, bool):
-                                cell.value = "TRUE" if cell.value else "FALSE"
-                except ValueError:
-                    continue
-            
-            # 나노초 시간 컬럼들에 천 단위 구분자 적용
-            nano_time_columns = ['wait_time_ns', 'dwell_time_ns', 'fail_processing_time_ns',
-                               'waiting_start_nanoTime', 'critical_enter_nanoTime', 'critical_leave_nanoTime',
-                               'increment_before_nanoTime', 'increment_after_nanoTime']
-            
-            for col_name in nano_time_columns:
-                try:
-                    col_index = header_row.index(col_name) + 1
-                    col_letter = chr(64 + col_index) if col_index <= 26 else f"A{chr(64 + col_index - 26)}"
-                    for row in range(2, ws.max_row + 1):
-                        cell = ws[f'{col_letter}{row}']
-                        if cell.value is not None and isinstance(cell.value, (int, float)) and not pd.isna(cell.value):
-                            cell.number_format = '#,##0'
-                except ValueError:
-                    continue
-    
-    # Time_Unit_Comparison 시트의 포맷
-    if 'Time_Unit_Comparison' in wb.sheetnames:
-        ws = wb['Time_Unit_Comparison']
-        for row in range(2, ws.max_row + 1):
-            unit_cell = ws[f'B{row}']  # Unit 컬럼
-            if unit_cell.value:
-                # 단위에 따라 다른 포맷 적용
-                for col in ['C', 'D', 'E']:  # Mean, Median, Max
-                    cell = ws[f'{col}{row}']
-                    if cell.value is not None:
-                        if 'nanoseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0'
-                        elif 'microseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0.000'
-                        elif 'milliseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0.000000'
-    
-    wb.save(output_path)
+        # 나노초 시간 컬럼들에 천 단위 구분자 적용
+        nano_time_columns = ['wait_time_ns', 'dwell_time_ns', 'fail_processing_time_ns',
+                           'waiting_start_nanoTime', 'critical_enter_nanoTime', 'critical_leave_nanoTime',
+                           'increment_before_nanoTime', 'increment_after_nanoTime']
+        column_formats = {col_name: INTEGER_FORMAT for col_name in nano_time_columns}
+    
+    # Time_Unit_Comparison 시트의 포맷 - Unit 컬럼(B)에 따라 Mean, Median, Max 포맷 결정
+    elif sheet_name == 'Time_Unit_Comparison':
+        row_formats = time_unit_row_formats(['C', 'D', 'E'])
+    
+    # Throughput_Time_Series 시트의 포맷 - 경과 시간, 개수, 초당 처리량, 평균 지연 시간 천 단위 구분자
+    elif sheet_name == 'Throughput_Time_Series':
+        column_formats = {col_name: INTEGER_FORMAT for col_name in THROUGHPUT_COLUMNS[2:]}
+    
+    # Throughput_Knee 시트의 포맷 - 처리량/지연 시간은 천 단위 구분자, 기울기는 소수 2자리
+    elif sheet_name == 'Throughput_Knee':
+        df = df.copy()
+        df['superlinear'] = df['superlinear'].map(bool_as_text)
+        column_formats = {col_name: INTEGER_FORMAT for col_name in ['load_levels', 'knee_offered_per_sec', 'knee_completed_per_sec',
+                                                                    'knee_mean_latency_ns', 'peak_completed_per_sec']}
+        column_formats.update({col_name: DECIMAL_FORMAT for col_name in ['latency_slope_below_knee', 'latency_slope_above_knee']})
+    
+    # Latency_Percentiles 시트의 포맷 - 개수, 백분위수 나노초 값 천 단위 구분자
+    elif sheet_name == 'Latency_Percentiles':
+        percentile_columns = ['count', 'min(ns)'] + [percentile_column(p) for p in DEFAULT_PERCENTILES] + ['max(ns)']
+        column_formats = {col_name: INTEGER_FORMAT for col_name in percentile_columns}
+    
+    # Latency_Histograms 시트의 포맷 - 버킷 경계 나노초 값, 개수 천 단위 구분자
+    elif sheet_name == 'Latency_Histograms':
+        column_formats = {col_name: INTEGER_FORMAT for col_name in ['lower_ns', 'upper_ns', 'count']}
+    
+    writer.write_sheet(df, sheet_name, column_formats=column_formats, row_formats=row_formats)
 
 
-def process_performance_data(csv_path, label):
+def process_performance_data(csv_path, label, throughput_window_ms=DEFAULT_THROUGHPUT_WINDOW_MS):
     """
     단일 CSV 파일을 처리하여 성능 통계를 계산하고 Excel로 저장하는 메인 처리 함수 (PRE_CHECK_FAIL 지원)
     
     매개변수:
         csv_path: 분석할 CSV 파일 경로
         label: 출력 파일에 사용할 레이블
+        throughput_window_ms: 처리량 시계열 시간 창 크기 (밀리초)
     
     반환값:
         성공 여부 (True/False)
@@ -861,16 +773,19 @@ def process_performance_data(csv_path, label):
             'critical_enter_nanoTime': str,
             'critical_leave_nanoTime': str,
             'increment_before_nanoTime': str,
-            'increment_after_nanoTime': str
+            'increment_after_nanoTime': str,
+            'waiting_start_epochNano': str,
+            'critical_enter_epochNano': str,
+            'critical_leave_epochNano': str,
+            'increment_before_epochNano': str,
+            'increment_after_epochNano': str
         }
         
-        df_total = pd.read_csv(csv_path, dtype=dtype_spec)
+        df_total = read_table(csv_path, dtype=dtype_spec)
         print(f"  - 총 {len(df_total)}개의 레코드 로드됨")
         
-        # 나노초 컬럼들을 정수로 변환
-        nano_columns = [col for col in dtype_spec.keys() if col in df_total.columns]
-        for col in nano_columns:
-            df_total[col] = df_total[col].apply(parse_nano_time_precise)
+        # 나노초 컬럼들을 Int64 정수로 변환 (float 경유 없이 정확한 값 유지)
+        df_total = cast_nano_columns(df_total, list(dtype_spec.keys()))
         
     except FileNotFoundError:
         print(f"오류: CSV 파일을 찾을 수 없습니다 - {csv_path}")
@@ -882,7 +797,10 @@ def process_performance_data(csv_path, label):
     # 2. join_result 컬럼 설정 (PRE_CHECK_FAIL 보존)
     df_total = set_join_result_from_events(df_total)
     
-    # 3. 데이터를 결과별로 분류 (PRE_CHECK_FAIL 추가)
+    # 3. 대기/체류/실패 처리 시간 계산 (전체 데이터 대상 컬럼 단위 정수 연산)
+    df_total = add_time_metric_columns(df_total)
+    
+    # 4. 데이터를 결과별로 분류 (PRE_CHECK_FAIL 추가)
     df_success = df_total[df_total['join_result'] == 'SUCCESS'].copy()
     df_lock_failed = df_total[df_total['join_result'] == 'FAIL_ENTRY'].copy()
     df_capacity_failed = df_total[df_total['join_result'] == 'FAIL_OVER_CAPACITY'].copy()
@@ -890,27 +808,8 @@ def process_performance_data(csv_path, label):
     
     print(f"  - 성공: {len(df_success)}, 진입실패: {len(df_lock_failed)}, 정원초과실패: {len(df_capacity_failed)}, PRE_CHECK_FAIL: {len(df_pre_check_failed)}")
     
-    # 4. 성공 그룹의 시간 계산
+    # 5. 성공 그룹의 유효 데이터 필터링 (시간 값이 있고 음수가 아닌 값)
     if len(df_success) > 0:
-        # 대기 시간 = 임계 영역 진입 시간 - 대기 시작 시간
-        df_success['wait_time_ns'] = df_success.apply(
-            lambda row: calculate_time_diff_nano(
-                row['waiting_start_nanoTime'], 
-                row['critical_enter_nanoTime']
-            ),
-            axis=1
-        )
-        
-        # 체류 시간 = 임계 영역 나간 시간 - 임계 영역 진입 시간
-        df_success['dwell_time_ns'] = df_success.apply(
-            lambda row: calculate_time_diff_nano(
-                row['critical_enter_nanoTime'], 
-                row['critical_leave_nanoTime']
-            ),
-            axis=1
-        )
-        
-        # 유효한 데이터만 필터링 (음수가 아닌 값)
         valid_success = df_success[
             (df_success['wait_time_ns'].notna()) & 
             (df_success['dwell_time_ns'].notna()) &
@@ -921,27 +820,8 @@ def process_performance_data(csv_path, label):
         print(f"  - 성공 그룹 시간 계산 완료 (유효 데이터: {len(valid_success)}개/{len(df_success)}개)")
         df_success = valid_success
     
-    # 5. 정원초과 실패 그룹의 시간 계산
+    # 6. 정원초과 실패 그룹의 유효 데이터 필터링
     if len(df_capacity_failed) > 0:
-        # 대기 시간 계산
-        df_capacity_failed['wait_time_ns'] = df_capacity_failed.apply(
-            lambda row: calculate_time_diff_nano(
-                row['waiting_start_nanoTime'], 
-                row['critical_enter_nanoTime']
-            ),
-            axis=1
-        )
-        
-        # 실패 처리 시간 = 임계 영역 나간 시간 - 임계 영역 진입 시간
-        df_capacity_failed['fail_processing_time_ns'] = df_capacity_failed.apply(
-            lambda row: calculate_time_diff_nano(
-                row['critical_enter_nanoTime'], 
-                row['critical_leave_nanoTime']
-            ),
-            axis=1
-        )
-        
-        # 유효한 데이터만 필터링
         valid_capacity_failed = df_capacity_failed[
             (df_capacity_failed['wait_time_ns'].notna()) & 
             (df_capacity_failed['fail_processing_time_ns'].notna()) &
@@ -952,7 +832,7 @@ def process_performance_data(csv_path, label):
         print(f"  - 정원초과 실패 그룹 시간 계산 완료 (유효 데이터: {len(valid_capacity_failed)}개/{len(df_capacity_failed)}개)")
         df_capacity_failed = valid_capacity_failed
     
-    # 6. 각종 통계 DataFrame 생성 (PRE_CHECK_FAIL 추가)
+    # 7. 각종 통계 DataFrame 생성 (PRE_CHECK_FAIL 추가)
     df_summary = create_summary_stats(df_total, df_success, df_lock_failed, df_capacity_failed, df_pre_check_failed)
     df_success_stats = create_success_stats(df_success)
     df_capacity_failed_stats = create_capacity_failed_stats(df_capacity_failed)
@@ -965,8 +845,11 @@ def process_performance_data(csv_path, label):
     df_per_bin_stats = create_per_bin_stats(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed)
     df_per_thread_critical_details = create_per_thread_critical_details(df_total, df_success, df_capacity_failed, df_lock_failed, df_pre_check_failed)
     df_comparison_stats = create_time_unit_comparison(df_success)
+    df_throughput_series, df_throughput_knee = create_throughput_stats(df_total, throughput_window_ms)
+    df_latency_histograms = create_latency_histograms(df_success, df_capacity_failed)
+    df_latency_percentiles = percentiles_by_room(df_latency_histograms)
     
-    # 7. 데이터 검증 출력 (PRE_CHECK_FAIL 추가)
+    # 8. 데이터 검증 출력 (PRE_CHECK_FAIL 추가)
     total_requests = len(df_total)
     success_count = len(df_success)
     lock_failed_count = len(df_lock_failed)
@@ -980,7 +863,24 @@ def process_performance_data(csv_path, label):
     print(f"    진입 실패: {lock_failed_count} ({calculate_rate(lock_failed_count, total_requests):.2f}%)")
     print(f"    PRE_CHECK_FAIL: {pre_check_failed_count} ({calculate_rate(pre_check_failed_count, total_requests):.2f}%)")
     
-    # 8. Excel 파일로 저장 (PRE_CHECK_FAIL 시트 추가)
+    # 처리량 포화 지점 출력 (전체 기준)
+    overall_knee = df_throughput_knee[df_throughput_knee['roomNumber'] == ALL_ROOMS_LABEL]
+    if not overall_knee.empty:
+        knee = overall_knee.iloc[0]
+        print(f"    최대 완료 처리량: {knee['peak_completed_per_sec']:,.0f} req/s (시간 창 {throughput_window_ms:g}ms)")
+        if pd.notna(knee['knee_offered_per_sec']):
+            print(f"    포화 지점(knee): 도착 {knee['knee_offered_per_sec']:,.0f} req/s, "
+                  f"평균 대기 시간 {knee['knee_mean_latency_ns']:,.0f} ns (초선형 증가: {bool_as_text(knee['superlinear'])})")
+        else:
+            print("    포화 지점(knee): 탐지되지 않음")
+    
+    # 지연 시간 꼬리 백분위수 출력 (전체 기준, 히스토그램에서 계산)
+    overall_percentiles = df_latency_percentiles[df_latency_percentiles['roomNumber'] == ALL_ROOMS_LABEL]
+    for row in overall_percentiles.to_dict('records'):
+        tail_values = ' / '.join(f"{row[percentile_column(p)]:,}" for p in DEFAULT_PERCENTILES)
+        print(f"    {row['metric']} p50/p90/p99/p99.9: {tail_values} ns (n={row['count']:,})")
+    
+    # 9. Excel 파일로 저장 (PRE_CHECK_FAIL 시트 추가)
     output_dir = 'performance_reports'
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -988,28 +888,31 @@ def process_performance_data(csv_path, label):
     output_path = os.path.join(output_dir, f"{label}_stats_nano.xlsx")
     
     try:
-        # pandas의 ExcelWriter를 사용하여 여러 시트를 한 파일에 저장
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df_summary.to_excel(writer, sheet_name='Overall_Summary', index=False)
-            df_success_stats.to_excel(writer, sheet_name='Overall_Success_Stats', index=False)
-            df_capacity_failed_stats.to_excel(writer, sheet_name='Overall_Capacity_Failed_Stats', index=False)
+        # write-only 스트리밍으로 여러 시트를 한 파일에 저장 (시트별 숫자 포맷은 기록 시점에 함께 설정)
+        with ExcelReportWriter(output_path) as writer:
+            write_formatted_sheet(writer, df_summary, 'Overall_Summary')
+            write_formatted_sheet(writer, df_success_stats, 'Overall_Success_Stats')
+            write_formatted_sheet(writer, df_capacity_failed_stats, 'Overall_Capacity_Failed_Stats')
             
             # PRE_CHECK_FAIL 시트 추가
             if not df_pre_check_failed_stats.empty:
-                df_pre_check_failed_stats.to_excel(writer, sheet_name='Overall_PRE_CHECK_FAIL_Stats', index=False)
+                write_formatted_sheet(writer, df_pre_check_failed_stats, 'Overall_PRE_CHECK_FAIL_Stats')
             
-            df_per_room_stats.to_excel(writer, sheet_name='Per_Room_Stats', index=False)
+            write_formatted_sheet(writer, df_per_room_stats, 'Per_Room_Stats')
             
             # 빈 DataFrame이 아닌 경우에만 저장
             if not df_per_bin_stats.empty:
-                df_per_bin_stats.to_excel(writer, sheet_name='Per_Bin_Stats', index=False)
+                write_formatted_sheet(writer, df_per_bin_stats, 'Per_Bin_Stats')
             if not df_per_thread_critical_details.empty:
-                df_per_thread_critical_details.to_excel(writer, sheet_name='Per_Thread_Critical_Details', index=False)
+                write_formatted_sheet(writer, df_per_thread_critical_details, 'Per_Thread_Critical_Details')
             if not df_comparison_stats.empty:
-                df_comparison_stats.to_excel(writer, sheet_name='Time_Unit_Comparison', index=False)
-        
-        # Excel 파일 포맷 설정
-        format_excel_file(output_path)
+                write_formatted_sheet(writer, df_comparison_stats, 'Time_Unit_Comparison')
+            if not df_throughput_series.empty:
+                write_formatted_sheet(writer, df_throughput_series, 'Throughput_Time_Series')
+                write_formatted_sheet(writer, df_throughput_knee, 'Throughput_Knee')
+            if not df_latency_histograms.empty:
+                write_formatted_sheet(writer, df_latency_percentiles, 'Latency_Percentiles')
+                write_formatted_sheet(writer, df_latency_histograms, 'Latency_Histograms')
         
         print(f"  - Excel 파일 저장 완료: {output_path}")
         return True
@@ -1058,9 +961,20 @@ def main():
         help='비교할 참조 Excel 파일 경로 (선택사항)'
     )
     
+    # --throughput_window_ms 인자: 처리량 시계열 시간 창 크기 (선택사항)
+    parser.add_argument(
+        '--throughput_window_ms',
+        type=float,
+        default=DEFAULT_THROUGHPUT_WINDOW_MS,
+        help=f'처리량 시계열 시간 창 크기, 밀리초 (기본값: {DEFAULT_THROUGHPUT_WINDOW_MS})'
+    )
+    
     # 인자 파싱
     args = parser.parse_args()
     
+    if args.throughput_window_ms <= 0:
+        parser.error("--throughput_window_ms 는 양수여야 합니다")
+    
     # 입력 파일과 레이블을 리스트로 변환
     input_files = [f.strip() for f in args.inputs.split(',')]
     labels = [l.strip() for l in args.labels.split(',')]
@@ -1078,7 +992,7 @@ def main():
     # 각 파일 처리
     success_count = 0
     for csv_path, label in zip(input_files, labels):
-        if process_performance_data(csv_path, label):
+        if process_performance_data(csv_path, label, args.throughput_window_ms):
             success_count += 1
     
     # 종료 시간 및 소요 시간 계산
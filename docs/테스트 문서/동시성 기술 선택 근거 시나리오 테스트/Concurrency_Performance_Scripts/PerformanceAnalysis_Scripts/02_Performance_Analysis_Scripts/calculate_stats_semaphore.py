@@ -28,8 +28,19 @@ import os
 import argparse
 from datetime import datetime
 import sys
-from openpyxl import load_workbook
-from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.nano_time import cast_nano_columns
+from common.group_stats import count_by_group, aggregate_by_group  # 방/방-구간별 groupby 집계
+from common.excel_report import (ExcelReportWriter, INTEGER_FORMAT, DECIMAL_FORMAT, PERCENT_TEXT_FORMAT,
+                                 bool_as_text, column_range, time_unit_row_formats)  # Excel 스트리밍 저장 (서식 포함)
+from common.table_io import read_table  # CSV/Parquet/Feather 로드 (확장자로 결정)
+from common.throughput import (ALL_ROOMS_LABEL, THROUGHPUT_COLUMNS, throughput_time_series,
+                               detect_saturation_knee)  # 시간 창 처리량 시계열 / 포화 지점 탐지
+from common.latency_histogram import (DEFAULT_PERCENTILES, percentile_column, build_latency_histograms,
+                                     percentiles_by_room)  # 병합 가능한 지연 시간 히스토그램 / 백분위수
+
+DEFAULT_THROUGHPUT_WINDOW_MS = 100  # 처리량 시계열 시간 창 크기 기본값 (밀리초)
 
 
 def calculate_rate(count, total):
@@ -90,32 +101,6 @@ def get_semaphore_stats_with_precision(series, metric_name="", unit="ns"):
     }
 
 
-def parse_semaphore_nano_time(nano_str):
-    """
-    세마포어 나노초 문자열을 정수로 변환하는 함수
-    
-    매개변수:
-        nano_str: 나노초를 나타내는 문자열
-    
-    반환값:
-        정수형 나노초 값 또는 NaN
-    """
-    if pd.isna(nano_str) or nano_str == 'nan' or nano_str == '':
-        return np.nan
-    
-    try:
-        if isinstance(nano_str, str):
-            if 'E' in nano_str or 'e' in nano_str:
-                decimal_val = Decimal(nano_str)
-                return int(decimal_val)
-            else:
-                return int(float(nano_str))
-        else:
-            return int(nano_str)
-    except (ValueError, TypeError):
-        return np.nan
-
-
 def calculate_semaphore_time_diff(start_nano, end_nano):
     """
     세마포어 두 나노초 시간값의 차이를 계산하는 함수
@@ -272,56 +257,72 @@ def create_semaphore_failure_stats(df_failed):
     return pd.DataFrame(failure_stats_data)
 
 
-def create_semaphore_per_room_stats(df_total, df_success, df_failed):
+def create_semaphore_group_stats(df_total, df_success, df_failed, keys):
     """
-    세마포어 방별 통계를 생성하는 함수
+    세마포어 그룹(방 또는 방-구간)별 통계를 생성하는 함수
     
     매개변수:
         df_total: 전체 데이터
         df_success: permit 획득 성공 요청들
         df_failed: permit 획득 실패 요청들
+        keys: 그룹 기준 컬럼 목록 (['roomNumber'] 또는 ['roomNumber', 'bin'])
     
     반환값:
-        세마포어 방별 통계 DataFrame
-    """
-    all_rooms = sorted(df_total['roomNumber'].unique())
-    room_stats_list = []
+        세마포어 그룹별 통계 DataFrame (df_total에 있는 모든 그룹, 그룹 키 순서로 정렬)
     
-    for room in all_rooms:
-        # 해당 방의 데이터만 필터링
-        room_total = df_total[df_total['roomNumber'] == room]
-        room_success = df_success[df_success['roomNumber'] == room] if len(df_success) > 0 else pd.DataFrame()
-        room_failed = df_failed[df_failed['roomNumber'] == room] if len(df_failed) > 0 else pd.DataFrame()
+    설명:
+        그룹마다 DataFrame을 다시 필터링하지 않고 결과 분류별로 groupby 한 번씩 집계한 뒤
+        전체 그룹 인덱스에 맞춰 결합합니다 (해당 분류의 요청이 없는 그룹은 0).
+    """
+    # 전체 그룹 인덱스 (그룹별 전체 요청 수)
+    total_counts = df_total.groupby(keys).size()
+    group_index = total_counts.index
+    
+    # 기본 통계
+    success_count = count_by_group(df_success, keys, group_index)
+    failed_count = count_by_group(df_failed, keys, group_index)
+    
+    # permit 처리/거절 시간 통계 (평균, 중앙값, 최댓값, 총합)
+    success_processing = aggregate_by_group(df_success, keys, 'permit_processing_time_ns', group_index)
+    failed_rejection = aggregate_by_group(df_failed, keys, 'permit_rejection_time_ns', group_index)
+    
+    stats = {
+        'total_requests': total_counts,
+        'success_count': success_count,
+        'failed_count': failed_count,
+        'permit_success_rate(%)': calculate_rate(success_count, total_counts),
+        'permit_failure_rate(%)': calculate_rate(failed_count, total_counts),
         
-        # 기본 통계
-        total_count = len(room_total)
-        success_count = len(room_success)
-        failed_count = len(room_failed)
+        # 성공 시 permit 처리 시간 통계
+        'success_avg_permit_processing_time(ns)': success_processing['mean'],
+        'success_median_permit_processing_time(ns)': success_processing['median'],
+        'success_max_permit_processing_time(ns)': success_processing['max'],
+        'success_total_permit_processing_time(ns)': success_processing['sum'],
         
-        stats = {
-            'roomNumber': room,
-            'total_requests': total_count,
-            'success_count': success_count,
-            'failed_count': failed_count,
-            'permit_success_rate(%)': calculate_rate(success_count, total_count),
-            'permit_failure_rate(%)': calculate_rate(failed_count, total_count),
-            
-            # 성공 시 permit 처리 시간 통계
-            'success_avg_permit_processing_time(ns)': room_success['permit_processing_time_ns'].mean() if success_count > 0 else 0,
-            'success_median_permit_processing_time(ns)': room_success['permit_processing_time_ns'].median() if success_count > 0 else 0,
-            'success_max_permit_processing_time(ns)': room_success['permit_processing_time_ns'].max() if success_count > 0 else 0,
-            'success_total_permit_processing_time(ns)': room_success['permit_processing_time_ns'].sum() if success_count > 0 else 0,
-            
-            # 실패 시 permit 거절 시간 통계  
-            'failed_avg_permit_rejection_time(ns)': room_failed['permit_rejection_time_ns'].mean() if failed_count > 0 else 0,
-            'failed_median_permit_rejection_time(ns)': room_failed['permit_rejection_time_ns'].median() if failed_count > 0 else 0,
-            'failed_max_permit_rejection_time(ns)': room_failed['permit_rejection_time_ns'].max() if failed_count > 0 else 0,
-            'failed_total_permit_rejection_time(ns)': room_failed['permit_rejection_time_ns'].sum() if failed_count > 0 else 0
-        }
-        
-        room_stats_list.append(stats)
+        # 실패 시 permit 거절 시간 통계
+        'failed_avg_permit_rejection_time(ns)': failed_rejection['mean'],
+        'failed_median_permit_rejection_time(ns)': failed_rejection['median'],
+        'failed_max_permit_rejection_time(ns)': failed_rejection['max'],
+        'failed_total_permit_rejection_time(ns)': failed_rejection['sum']
+    }
     
-    return pd.DataFrame(room_stats_list)
+    # 그룹 키를 앞쪽 컬럼으로 (roomNumber, bin)
+    return pd.DataFrame(stats, index=group_index).reset_index()
+
+
+def create_semaphore_per_room_stats(df_total, df_success, df_failed):
+    """
+    세마포어 방별 통계를 생성하는 함수
+    
+    매개변수:
+        df_total: 전체 데이터
+        df_success: permit 획득 성공 요청들
+        df_failed: permit 획득 실패 요청들
+    
+    반환값:
+        세마포어 방별 통계 DataFrame
+    """
+    return create_semaphore_group_stats(df_total, df_success, df_failed, ['roomNumber'])
 
 
 def create_semaphore_per_bin_stats(df_total, df_success, df_failed):
@@ -339,45 +340,7 @@ def create_semaphore_per_bin_stats(df_total, df_success, df_failed):
     if 'bin' not in df_total.columns:
         return pd.DataFrame()
     
-    all_combinations = df_total.groupby(['roomNumber', 'bin']).size().index.tolist()
-    bin_stats_list = []
-    
-    for room, bin_num in all_combinations:
-        # 해당 방-구간 조합의 데이터만 필터링
-        combo_total = df_total[(df_total['roomNumber'] == room) & (df_total['bin'] == bin_num)]
-        combo_success = df_success[(df_success['roomNumber'] == room) & (df_success['bin'] == bin_num)] if len(df_success) > 0 else pd.DataFrame()
-        combo_failed = df_failed[(df_failed['roomNumber'] == room) & (df_failed['bin'] == bin_num)] if len(df_failed) > 0 else pd.DataFrame()
-        
-        # 기본 통계
-        total_count = len(combo_total)
-        success_count = len(combo_success)
-        failed_count = len(combo_failed)
-        
-        stats = {
-            'roomNumber': room,
-            'bin': bin_num,
-            'total_requests': total_count,
-            'success_count': success_count,
-            'failed_count': failed_count,
-            'permit_success_rate(%)': calculate_rate(success_count, total_count),
-            'permit_failure_rate(%)': calculate_rate(failed_count, total_count),
-            
-            # 성공 시 permit 처리 시간 통계
-            'success_avg_permit_processing_time(ns)': combo_success['permit_processing_time_ns'].mean() if success_count > 0 else 0,
-            'success_median_permit_processing_time(ns)': combo_success['permit_processing_time_ns'].median() if success_count > 0 else 0,
-            'success_max_permit_processing_time(ns)': combo_success['permit_processing_time_ns'].max() if success_count > 0 else 0,
-            'success_total_permit_processing_time(ns)': combo_success['permit_processing_time_ns'].sum() if success_count > 0 else 0,
-            
-            # 실패 시 permit 거절 시간 통계
-            'failed_avg_permit_rejection_time(ns)': combo_failed['permit_rejection_time_ns'].mean() if failed_count > 0 else 0,
-            'failed_median_permit_rejection_time(ns)': combo_failed['permit_rejection_time_ns'].median() if failed_count > 0 else 0,
-            'failed_max_permit_rejection_time(ns)': combo_failed['permit_rejection_time_ns'].max() if failed_count > 0 else 0,
-            'failed_total_permit_rejection_time(ns)': combo_failed['permit_rejection_time_ns'].sum() if failed_count > 0 else 0
-        }
-        
-        bin_stats_list.append(stats)
-    
-    return pd.DataFrame(bin_stats_list)
+    return create_semaphore_group_stats(df_total, df_success, df_failed, ['roomNumber', 'bin'])
 
 
 def create_semaphore_thread_details(df_total):
@@ -430,6 +393,9 @@ def create_semaphore_thread_details(df_total):
     # DataFrame 생성 및 정렬
     result_df = pd.DataFrame(thread_details_list)
     if not result_df.empty:
+        # 나노초 시각 컬럼은 Int64 로 유지 (값이 없으면 <NA>)
+        result_df = cast_nano_columns(result_df)
+        
         # 방 번호 → 구간 → 시도 시간 순으로 정렬
         sort_columns = ['roomNumber', 'bin']
         if 'attempt_nanoTime' in result_df.columns:
@@ -479,118 +445,136 @@ def create_semaphore_time_comparison(df_success, df_failed):
     return pd.DataFrame(comparison_stats_list)
 
 
-def format_semaphore_excel_file(output_path):
+def create_semaphore_throughput_stats(df_total, window_ms=DEFAULT_THROUGHPUT_WINDOW_MS):
+    """
+    세마포어 고정 시간 창 처리량 시계열과 포화 지점(knee) 통계를 생성하는 함수
+    
+    매개변수:
+        df_total: 전체 세마포어 데이터 (나노초 컬럼 Int64 변환 완료)
+        window_ms: 시간 창 크기 (밀리초)
+    
+    반환값:
+        (처리량 시계열 DataFrame, 포화 지점 DataFrame) - 시각 값이 없으면 빈 DataFrame
+    
+    설명:
+        - 도착 = ATTEMPT 시점, 완료 = SUCCESS/FAIL 시점 (true_critical_section_nanoTime_start/end)
+        - 창별 도착 부하와 평균 permit 처리 시간(end - start)의 관계에서 처리 시간이 급증하기 시작하는 지점 탐지
+    """
+    start_column = 'true_critical_section_nanoTime_start'
+    end_column = 'true_critical_section_nanoTime_end'
+    
+    # permit 처리 시간 (음수는 결측값 - calculate_semaphore_time_diff 와 동일한 기준, 컬럼 단위 정수 연산)
+    df_requests = df_total
+    if start_column in df_total.columns and end_column in df_total.columns:
+        permit_time = df_total[end_column] - df_total[start_column]
+        df_requests = df_total.assign(permit_time_ns=permit_time.where(permit_time >= 0))
+    
+    df_series = throughput_time_series(
+        df_requests, start_column, end_column, 'permit_time_ns',
+        window_ms, success_mask=df_requests['join_result'] == 'SUCCESS'
+    )
+    return df_series, detect_saturation_knee(df_series)
+
+
+def create_latency_histograms(df_success, df_failed):
+    """
+    방/구간별 지연 시간 히스토그램(HDR 방식 로그 버킷)을 생성하는 함수
+    
+    매개변수:
+        df_success: 유효한 permit 획득 성공 요청들 (permit_processing_time_ns)
+        df_failed: 유효한 permit 획득 실패 요청들 (permit_rejection_time_ns)
+    
+    반환값:
+        히스토그램 DataFrame (roomNumber, bin, metric, bucket, lower_ns, upper_ns, count)
+    
+    설명:
+        원본 값 대신 버킷별 개수만 저장하므로 방/구간/실행 간 merge_histograms 로 병합 가능,
+        백분위수와 Box/Violin Plot 은 저장된 히스토그램에서 계산
+    """
+    return build_latency_histograms([
+        ('success_permit_processing_time', df_success, 'permit_processing_time_ns'),
+        ('failed_permit_rejection_time', df_failed, 'permit_rejection_time_ns')
+    ])
+
+
+def write_semaphore_formatted_sheet(writer, df, sheet_name):
     """
-    세마포어 Excel 파일의 포맷을 설정하는 함수
+    세마포어 시트 한 개를 숫자 포맷과 함께 기록하는 함수
     
     매개변수:
-        output_path: Excel 파일 경로
+        writer: ExcelReportWriter (write-only 스트리밍 기록)
+        df: 기록할 DataFrame
+        sheet_name: 시트명
     """
-    wb = load_workbook(output_path)
+    column_formats = {}
+    row_formats = None
     
     # Semaphore_Per_Room_Stats 시트 포맷
-    if 'Semaphore_Per_Room_Stats' in wb.sheetnames:
-        ws = wb['Semaphore_Per_Room_Stats']
-        
+    if sheet_name == 'Semaphore_Per_Room_Stats':
         # 비율 컬럼들 (D, E) - 퍼센트 포맷
-        for col in ['D', 'E']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '0.00"%"'
-        
+        column_formats = {col: PERCENT_TEXT_FORMAT for col in ['D', 'E']}
         # 나노초 시간 컬럼들 (F~M) - 천 단위 구분자
-        for col in ['F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '#,##0'
+        column_formats.update({col: INTEGER_FORMAT for col in column_range('F', 'M')})
     
     # Semaphore_Per_Bin_Stats 시트 포맷
-    if 'Semaphore_Per_Bin_Stats' in wb.sheetnames:
-        ws = wb['Semaphore_Per_Bin_Stats']
-        
+    elif sheet_name == 'Semaphore_Per_Bin_Stats':
         # 비율 컬럼들 (E, F) - 퍼센트 포맷
-        for col in ['E', 'F']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '0.00"%"'
-        
+        column_formats = {col: PERCENT_TEXT_FORMAT for col in ['E', 'F']}
         # 나노초 시간 컬럼들 (G~N) - 천 단위 구분자
-        for col in ['G', 'H', 'I', 'J', 'K', 'L', 'M', 'N']:
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'{col}{row}']
-                if cell.value is not None:
-                    cell.number_format = '#,##0'
-    
-    # 통계 시트들의 값 포맷
-    for sheet_name in ['Semaphore_Success_Stats', 'Semaphore_Failure_Stats']:
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for row in range(2, ws.max_row + 1):
-                cell = ws[f'C{row}']  # Value 컬럼
-                if cell.value is not None:
-                    unit_cell = ws[f'D{row}']  # Unit 컬럼
-                    if unit_cell.value == '%':
-                        cell.number_format = '0.00'  # 퍼센트는 숫자로
-                    else:
-                        cell.number_format = '#,##0'  # 나노초는 천 단위 구분자
+        column_formats.update({col: INTEGER_FORMAT for col in column_range('G', 'N')})
+    
+    # 통계 시트들의 값 포맷 - Unit 컬럼(D)이 % 이면 숫자, 나노초는 천 단위 구분자
+    elif sheet_name in ['Semaphore_Success_Stats', 'Semaphore_Failure_Stats']:
+        def row_formats(values):
+            return {'C': '0.00' if values[3] == '%' else INTEGER_FORMAT}  # Value 컬럼 (Unit: D 컬럼)
     
     # Semaphore_Thread_Details 시트 포맷
-    if 'Semaphore_Thread_Details' in wb.sheetnames:
-        ws = wb['Semaphore_Thread_Details']
+    elif sheet_name == 'Semaphore_Thread_Details':
+        # 불리언 컬럼 포맷
+        df = df.copy()
+        if 'permit_acquired' in df.columns:
+            df['permit_acquired'] = df['permit_acquired'].map(bool_as_text)
         
-        if ws.max_row > 0:
-            header_row = [cell.value for cell in ws[1]]
-            
-            # 불리언 컬럼 포맷
-            if 'permit_acquired' in header_row:
-                col_index = header_row.index('permit_acquired') + 1
-                col_letter = chr(64 + col_index)
-                for row in range(2, ws.max_row + 1):
-                    cell = ws[f'{col_letter}{row}']
-                    if isinstance(cell.value, bool):
-                        cell.value = "TRUE" if cell.value else "FALSE"
-            
-            # 나노초 컬럼들 포맷
-            nano_columns = ['permit_processing_time_ns', 'attempt_nanoTime', 'result_nanoTime']
-            for col_name in nano_columns:
-                if col_name in header_row:
-                    col_index = header_row.index(col_name) + 1
-                    col_letter = chr(64 + col_index) if col_index <= 26 else f"A{chr(64 + col_index - 26)}"
-                    for row in range(2, ws.max_row + 1):
-                        cell = ws[f'{col_letter}{row}']
-                        if cell.value is not None and isinstance(cell.value, (int, float)) and not pd.isna(cell.value):
-                            cell.number_format = '#,##0'
-    
-    # Semaphore_Time_Comparison 시트 포맷
-    if 'Semaphore_Time_Comparison' in wb.sheetnames:
-        ws = wb['Semaphore_Time_Comparison']
-        for row in range(2, ws.max_row + 1):
-            unit_cell = ws[f'B{row}']  # Unit 컬럼
-            if unit_cell.value:
-                # 단위에 따라 다른 포맷 적용
-                for col in ['C', 'D', 'E']:  # Mean, Median, Max
-                    cell = ws[f'{col}{row}']
-                    if cell.value is not None:
-                        if 'nanoseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0'
-                        elif 'microseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0.000'
-                        elif 'milliseconds' in str(unit_cell.value):
-                            cell.number_format = '#,##0.000000'
-    
-    wb.save(output_path)
-
-
-def process_semaphore_performance_data(csv_path, label):
+        # 나노초 컬럼들 포맷
+        nano_columns = ['permit_processing_time_ns', 'attempt_nanoTime', 'result_nanoTime']
+        column_formats = {col_name: INTEGER_FORMAT for col_name in nano_columns}
+    
+    # Semaphore_Time_Comparison 시트 포맷 - Unit 컬럼(B)에 따라 Mean, Median, Max 포맷 결정
+    elif sheet_name == 'Semaphore_Time_Comparison':
+        row_formats = time_unit_row_formats(['C', 'D', 'E'])
+    
+    # Throughput_Time_Series 시트의 포맷 - 경과 시간, 개수, 초당 처리량, 평균 지연 시간 천 단위 구분자
+    elif sheet_name == 'Throughput_Time_Series':
+        column_formats = {col_name: INTEGER_FORMAT for col_name in THROUGHPUT_COLUMNS[2:]}
+    
+    # Throughput_Knee 시트의 포맷 - 처리량/지연 시간은 천 단위 구분자, 기울기는 소수 2자리
+    elif sheet_name == 'Throughput_Knee':
+        df = df.copy()
+        df['superlinear'] = df['superlinear'].map(bool_as_text)
+        column_formats = {col_name: INTEGER_FORMAT for col_name in ['load_levels', 'knee_offered_per_sec', 'knee_completed_per_sec',
+                                                                    'knee_mean_latency_ns', 'peak_completed_per_sec']}
+        column_formats.update({col_name: DECIMAL_FORMAT for col_name in ['latency_slope_below_knee', 'latency_slope_above_knee']})
+    
+    # Latency_Percentiles 시트의 포맷 - 개수, 백분위수 나노초 값 천 단위 구분자
+    elif sheet_name == 'Latency_Percentiles':
+        percentile_columns = ['count', 'min(ns)'] + [percentile_column(p) for p in DEFAULT_PERCENTILES] + ['max(ns)']
+        column_formats = {col_name: INTEGER_FORMAT for col_name in percentile_columns}
+    
+    # Latency_Histograms 시트의 포맷 - 버킷 경계 나노초 값, 개수 천 단위 구분자
+    elif sheet_name == 'Latency_Histograms':
+        column_formats = {col_name: INTEGER_FORMAT for col_name in ['lower_ns', 'upper_ns', 'count']}
+    
+    writer.write_sheet(df, sheet_name, column_formats=column_formats, row_formats=row_formats)
+
+
+def process_semaphore_performance_data(csv_path, label, throughput_window_ms=DEFAULT_THROUGHPUT_WINDOW_MS):
     """
     세마포어 CSV 파일을 처리하여 성능 통계를 계산하고 Excel로 저장하는 메인 처리 함수
     
     매개변수:
         csv_path: 분석할 세마포어 CSV 파일 경로
         label: 출력 파일에 사용할 레이블
+        throughput_window_ms: 처리량 시계열 시간 창 크기 (밀리초)
     
     반환값:
         성공 여부 (True/False)
@@ -605,7 +589,7 @@ def process_semaphore_performance_data(csv_path, label):
             'true_critical_section_nanoTime_end': str
         }
         
-        df_total = pd.read_csv(csv_path, dtype=dtype_spec)
+        df_total = read_table(csv_path, dtype=dtype_spec)
         print(f"  - 총 {len(df_total)}개의 세마포어 레코드 로드됨")
         
         # 필수 컬럼 검증
@@ -615,10 +599,8 @@ def process_semaphore_performance_data(csv_path, label):
             print(f"오류: 필수 컬럼 누락 - {missing_columns}")
             return False
         
-        # 나노초 컬럼들을 정수로 변환
-        for col in ['true_critical_section_nanoTime_start', 'true_critical_section_nanoTime_end']:
-            if col in df_total.columns:
-                df_total[col] = df_total[col].apply(parse_semaphore_nano_time)
+        # 나노초 컬럼들을 Int64 정수로 변환 (float 경유 없이 정확한 값 유지)
+        df_total = cast_nano_columns(df_total, ['true_critical_section_nanoTime_start', 'true_critical_section_nanoTime_end'])
         
     except FileNotFoundError:
         print(f"오류: CSV 파일을 찾을 수 없습니다 - {csv_path}")
@@ -682,6 +664,9 @@ def process_semaphore_performance_data(csv_path, label):
     df_per_bin_stats = create_semaphore_per_bin_stats(df_total, df_success, df_failed)
     df_thread_details = create_semaphore_thread_details(df_total)
     df_time_comparison = create_semaphore_time_comparison(df_success, df_failed)
+    df_throughput_series, df_throughput_knee = create_semaphore_throughput_stats(df_total, throughput_window_ms)
+    df_latency_histograms = create_latency_histograms(df_success, df_failed)
+    df_latency_percentiles = percentiles_by_room(df_latency_histograms)
     
     # 6. 데이터 검증 출력
     total_requests = len(df_total)
@@ -695,6 +680,23 @@ def process_semaphore_performance_data(csv_path, label):
     print(f"    permit 획득 실패: {failed_count} ({calculate_rate(failed_count, total_requests):.2f}%)")
     print(f"    불완전한 데이터: {unknown_count} ({calculate_rate(unknown_count, total_requests):.2f}%)")
     
+    # 처리량 포화 지점 출력 (전체 기준)
+    overall_knee = df_throughput_knee[df_throughput_knee['roomNumber'] == ALL_ROOMS_LABEL]
+    if not overall_knee.empty:
+        knee = overall_knee.iloc[0]
+        print(f"    최대 완료 처리량: {knee['peak_completed_per_sec']:,.0f} req/s (시간 창 {throughput_window_ms:g}ms)")
+        if pd.notna(knee['knee_offered_per_sec']):
+            print(f"    포화 지점(knee): 도착 {knee['knee_offered_per_sec']:,.0f} req/s, "
+                  f"평균 permit 처리 시간 {knee['knee_mean_latency_ns']:,.0f} ns (초선형 증가: {bool_as_text(knee['superlinear'])})")
+        else:
+            print("    포화 지점(knee): 탐지되지 않음")
+    
+    # 지연 시간 꼬리 백분위수 출력 (전체 기준, 히스토그램에서 계산)
+    overall_percentiles = df_latency_percentiles[df_latency_percentiles['roomNumber'] == ALL_ROOMS_LABEL]
+    for row in overall_percentiles.to_dict('records'):
+        tail_values = ' / '.join(f"{row[percentile_column(p)]:,}" for p in DEFAULT_PERCENTILES)
+        print(f"    {row['metric']} p50/p90/p99/p99.9: {tail_values} ns (n={row['count']:,})")
+    
     # 7. Excel 파일로 저장
     output_dir = 'semaphore_performance_reports'
     if not os.path.exists(output_dir):
@@ -703,23 +705,26 @@ def process_semaphore_performance_data(csv_path, label):
     output_path = os.path.join(output_dir, f"{label}_semaphore_stats.xlsx")
     
     try:
-        # pandas의 ExcelWriter를 사용하여 세마포어 전용 시트들 저장
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df_summary.to_excel(writer, sheet_name='Semaphore_Summary', index=False)
-            df_success_stats.to_excel(writer, sheet_name='Semaphore_Success_Stats', index=False)
-            df_failure_stats.to_excel(writer, sheet_name='Semaphore_Failure_Stats', index=False)
-            df_per_room_stats.to_excel(writer, sheet_name='Semaphore_Per_Room_Stats', index=False)
+        # write-only 스트리밍으로 세마포어 전용 시트들 저장 (시트별 숫자 포맷은 기록 시점에 함께 설정)
+        with ExcelReportWriter(output_path) as writer:
+            write_semaphore_formatted_sheet(writer, df_summary, 'Semaphore_Summary')
+            write_semaphore_formatted_sheet(writer, df_success_stats, 'Semaphore_Success_Stats')
+            write_semaphore_formatted_sheet(writer, df_failure_stats, 'Semaphore_Failure_Stats')
+            write_semaphore_formatted_sheet(writer, df_per_room_stats, 'Semaphore_Per_Room_Stats')
             
             # 빈 DataFrame이 아닌 경우에만 저장
             if not df_per_bin_stats.empty:
-                df_per_bin_stats.to_excel(writer, sheet_name='Semaphore_Per_Bin_Stats', index=False)
+                write_semaphore_formatted_sheet(writer, df_per_bin_stats, 'Semaphore_Per_Bin_Stats')
             if not df_thread_details.empty:
-                df_thread_details.to_excel(writer, sheet_name='Semaphore_Thread_Details', index=False)
+                write_semaphore_formatted_sheet(writer, df_thread_details, 'Semaphore_Thread_Details')
             if not df_time_comparison.empty:
-                df_time_comparison.to_excel(writer, sheet_name='Semaphore_Time_Comparison', index=False)
-        
-        # Excel 파일 포맷 설정
-        format_semaphore_excel_file(output_path)
+                write_semaphore_formatted_sheet(writer, df_time_comparison, 'Semaphore_Time_Comparison')
+            if not df_throughput_series.empty:
+                write_semaphore_formatted_sheet(writer, df_throughput_series, 'Throughput_Time_Series')
+                write_semaphore_formatted_sheet(writer, df_throughput_knee, 'Throughput_Knee')
+            if not df_latency_histograms.empty:
+                write_semaphore_formatted_sheet(writer, df_latency_percentiles, 'Latency_Percentiles')
+                write_semaphore_formatted_sheet(writer, df_latency_histograms, 'Latency_Histograms')
         
         print(f"  - 세마포어 Excel 파일 저장 완료: {output_path}")
         return True
@@ -761,9 +766,20 @@ def main():
         help='각 세마포어 CSV 파일에 해당하는 출력 레이블 (콤마로 구분)'
     )
     
+    # --throughput_window_ms 인자: 처리량 시계열 시간 창 크기 (선택사항)
+    parser.add_argument(
+        '--throughput_window_ms',
+        type=float,
+        default=DEFAULT_THROUGHPUT_WINDOW_MS,
+        help=f'처리량 시계열 시간 창 크기, 밀리초 (기본값: {DEFAULT_THROUGHPUT_WINDOW_MS})'
+    )
+    
     # 인자 파싱
     args = parser.parse_args()
     
+    if args.throughput_window_ms <= 0:
+        parser.error("--throughput_window_ms 는 양수여야 합니다")
+    
     # 입력 파일과 레이블을 리스트로 변환
     input_files = [f.strip() for f in args.inputs.split(',')]
     labels = [l.strip() for l in args.labels.split(',')]
@@ -781,7 +797,7 @@ def main():
     # 각 파일 처리
     success_count = 0
     for csv_path, label in zip(input_files, labels):
-        if process_semaphore_performance_data(csv_path, label):
+        if process_semaphore_performance_data(csv_path, label, args.throughput_window_ms):
             success_count += 1
     
     # 종료 시간 및 소요 시간 계산
@@ -802,6 +818,10 @@ def main():
         print(f"  - Semaphore_Per_Bin_Stats: 구간별 세마포어 성능")
         print(f"  - Semaphore_Thread_Details: 스레드별 permit 획득 상세")
         print(f"  - Semaphore_Time_Comparison: 시간 단위별 비교")
+        print(f"  - Throughput_Time_Series: 시간 창별 처리량 (방별 + 전체)")
+        print(f"  - Throughput_Knee: 처리량 포화 지점 (knee)")
+        print(f"  - Latency_Percentiles: 지연 시간 백분위수 (p50/p90/p99/p99.9)")
+        print(f"  - Latency_Histograms: 방/구간별 지연 시간 히스토그램 (병합 가능)")
 
 
 # 이 스크립트가 직접 실행될 때만 main() 함수 호출
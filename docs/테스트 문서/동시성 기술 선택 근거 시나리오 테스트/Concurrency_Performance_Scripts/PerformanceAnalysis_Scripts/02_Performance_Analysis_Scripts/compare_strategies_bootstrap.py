@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+동시성 기법 간 부트스트랩 유의성 비교 스크립트 (v1.0)
+- calculate_stats_*.py 가 만든 보고서(*_stats_nano*.xlsx)의 요청 단위 상세 시트를 읽어
+  기준 기법 대비 각 기법의 중앙값/p99 차이, 성공률 차이에 대한 부트스트랩 신뢰구간 계산
+- 점 추정값만으로 비교하던 판단에 "차이가 재표본 변동 범위를 벗어나는가" 기준 추가
+
+[스크립트 목적]
+if_else, synchronized 1-phase/2-phase, ReentrantLock fair/non-fair, Semaphore 등
+여러 실행 결과를 같은 기준으로 비교하여 차이가 우연인지 판단합니다.
+
+[주요 기능]
+1. 보고서 Excel 의 Per_Thread_Critical_Details (세마포어: Semaphore_Thread_Details) 시트 로드
+   (--catalog 지정 시 results_catalog_cli.py 로 적재한 카탈로그의 requests 테이블에서 조회)
+2. 지연 시간 지표별 중앙값/p99 차이 신뢰구간 (공통 지표만 비교)
+3. 성공률 차이 신뢰구간
+4. 결과를 Excel 파일로 저장 (신뢰구간이 0을 포함하지 않으면 유의)
+"""
+
+# 필요한 라이브러리들을 가져옵니다 (import)
+import pandas as pd      # 데이터 분석을 위한 라이브러리
+import numpy as np       # 수치 계산을 위한 라이브러리
+import os               # 파일/폴더 작업을 위한 라이브러리
+import argparse         # 명령줄 인자 처리를 위한 라이브러리
+from datetime import datetime  # 날짜/시간 처리를 위한 라이브러리
+import sys              # 시스템 관련 기능을 위한 라이브러리
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.bootstrap import (BOOTSTRAP_METHODS, BOOTSTRAP_METHOD_AUTO, DEFAULT_CONFIDENCE, DEFAULT_RESAMPLES,
+                              LatencySample, bootstrap_proportions, choose_method, confidence_interval,
+                              excludes_zero)  # 벡터화 부트스트랩 재표본 / 신뢰구간
+from common.excel_report import ExcelReportWriter, INTEGER_FORMAT, DECIMAL_FORMAT, bool_as_text  # Excel 스트리밍 저장
+from common.results_catalog import ResultsCatalog  # 실행 결과 카탈로그 (SQLite)
+
+# 요청 단위 상세 시트별 지표 정의: metric 이름 → (join_result, 나노초 컬럼)
+# (metric 이름은 Latency_Histograms 시트와 동일)
+DETAIL_SHEET_METRICS = {
+    'Per_Thread_Critical_Details': {
+        'success_wait_time': ('SUCCESS', 'wait_time_ns'),
+        'success_dwell_time': ('SUCCESS', 'dwell_time_ns'),
+        'capacity_failed_wait_time': ('FAIL_OVER_CAPACITY', 'wait_time_ns'),
+        'capacity_failed_fail_processing_time': ('FAIL_OVER_CAPACITY', 'fail_processing_time_ns')
+    },
+    'Semaphore_Thread_Details': {
+        'success_permit_processing_time': ('SUCCESS', 'permit_processing_time_ns'),
+        'failed_permit_rejection_time': ('FAIL_OVER_CAPACITY', 'permit_processing_time_ns')
+    }
+}
+
+COMPARISON_PERCENTILES = {'median': 50, 'p99': 99}  # 비교할 지연 시간 통계 → 백분위수
+SUCCESS_RATE_METRIC = 'success_rate'
+
+COMPARISON_COLUMNS = [
+    'baseline', 'candidate', 'metric', 'statistic', 'unit', 'baseline_n', 'candidate_n',
+    'baseline_value', 'candidate_value', 'difference', 'ci_low', 'ci_high', 'significant', 'method'
+]
+
+
+def request_samples(df, metrics):
+    """
+    요청 단위 상세 DataFrame 에서 지표별 나노초 값 추출
+    
+    매개변수:
+        df: join_result + 지표 컬럼이 있는 DataFrame
+        metrics: metric 이름 → (join_result, 나노초 컬럼)
+    
+    반환값:
+        (지표별 나노초 값 dict, 전체 요청 수, 성공 요청 수) - 지연 시간은 결측값/음수 제외
+    """
+    join_result = df['join_result'].astype('string').str.strip()
+    samples = {}
+    for metric, (result, column) in metrics.items():
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df.loc[join_result == result, column], errors='coerce')
+        samples[metric] = values[values >= 0].to_numpy(dtype=np.float64)
+    
+    success_count = int((join_result == 'SUCCESS').sum())
+    return samples, len(df), success_count
+
+
+def detail_columns(metrics):
+    """상세 시트에서 읽을 컬럼 (join_result + 지표 컬럼)"""
+    return ['join_result'] + sorted({column for _, column in metrics.values()})
+
+
+def load_request_details(report_path):
+    """
+    보고서 Excel 에서 요청 단위 상세 시트 로드
+    
+    매개변수:
+        report_path: calculate_stats_*.py 가 만든 Excel 파일 경로
+    
+    반환값:
+        (지표별 나노초 값 dict, 전체 요청 수, 성공 요청 수) - 상세 시트가 없으면 ValueError
+    """
+    sheet_names = pd.ExcelFile(report_path).sheet_names
+    sheet_name = next((name for name in DETAIL_SHEET_METRICS if name in sheet_names), None)
+    if sheet_name is None:
+        raise ValueError(f"요청 단위 상세 시트가 없습니다 ({', '.join(DETAIL_SHEET_METRICS)})")
+    
+    metrics = DETAIL_SHEET_METRICS[sheet_name]
+    columns = detail_columns(metrics)
+    df = pd.read_excel(report_path, sheet_name=sheet_name, usecols=lambda column: column in columns)
+    return request_samples(df, metrics)
+
+
+def load_request_details_from_catalog(catalog, run_id):
+    """
+    카탈로그에서 실행의 요청 단위 상세 조회 (run_id 인덱스 쿼리, 필요한 컬럼만)
+    
+    매개변수:
+        catalog: ResultsCatalog
+        run_id: 실행 ID
+    
+    반환값:
+        load_request_details 와 동일 - 상세 시트가 적재되지 않았으면 ValueError
+    """
+    for sheet_name, metrics in DETAIL_SHEET_METRICS.items():
+        df = catalog.load_sheet(run_id, sheet_name, columns=detail_columns(metrics))
+        if df is not None:
+            return request_samples(df, metrics)
+    raise ValueError(f"카탈로그에 실행 {run_id} 의 요청 단위 상세 시트가 없습니다")
+
+
+def compare_runs(baseline, candidate, resamples, confidence, rng, method=BOOTSTRAP_METHOD_AUTO):
+    """
+    기준 실행과 비교 실행의 부트스트랩 차이 신뢰구간 계산
+    
+    매개변수:
+        baseline: 기준 실행 (label, samples, total, success_count)
+        candidate: 비교 실행 (label, samples, total, success_count)
+        resamples: 재표본 수
+        confidence: 신뢰 수준 (예: 0.95)
+        rng: numpy Generator
+        method: 재표본 방식 (auto / exact / histogram)
+    
+    반환값:
+        비교 결과 행 목록 (COMPARISON_COLUMNS)
+    
+    설명:
+        - 차이 = 비교 실행 - 기준 실행 (두 실행을 각각 독립적으로 재표본)
+        - 두 실행에 모두 값이 있는 지표만 비교, 재표본 방식은 더 큰 표본 기준으로 한 번 정해 양쪽에 동일 적용
+    """
+    base_label, base_samples, base_total, base_success = baseline
+    cand_label, cand_samples, cand_total, cand_success = candidate
+    percentiles = list(COMPARISON_PERCENTILES.values())
+    rows = []
+    
+    for metric in [name for name in base_samples if len(base_samples[name]) and len(cand_samples.get(name, []))]:
+        size = max(len(base_samples[metric]), len(cand_samples[metric]))
+        metric_method = choose_method(size, resamples, method)
+        base = LatencySample(base_samples[metric], metric_method)
+        cand = LatencySample(cand_samples[metric], metric_method)
+    
+        base_point = base.percentiles(percentiles)
+        cand_point = cand.percentiles(percentiles)
+        differences = (cand.bootstrap_percentiles(percentiles, resamples, rng)
+                       - base.bootstrap_percentiles(percentiles, resamples, rng))
+    
+        for i, statistic in enumerate(COMPARISON_PERCENTILES):
+            low, high = confidence_interval(differences[:, i], confidence)
+            rows.append({
+                'baseline': base_label, 'candidate': cand_label, 'metric': metric, 'statistic': statistic,
+                'unit': 'ns', 'baseline_n': base.size, 'candidate_n': cand.size,
+                'baseline_value': base_point[i], 'candidate_value': cand_point[i],
+                'difference': cand_point[i] - base_point[i], 'ci_low': low, 'ci_high': high,
+                'significant': excludes_zero(low, high), 'method': metric_method
+            })
+    
+    # 성공률 차이 (%p)
+    base_rate = base_success / base_total * 100 if base_total else np.nan
+    cand_rate = cand_success / cand_total * 100 if cand_total else np.nan
+    differences = (bootstrap_proportions(cand_success, cand_total, resamples, rng)
+                   - bootstrap_proportions(base_success, base_total, resamples, rng)) * 100
+    low, high = confidence_interval(differences, confidence)
+    rows.append({
+        'baseline': base_label, 'candidate': cand_label, 'metric': SUCCESS_RATE_METRIC, 'statistic': 'rate',
+        'unit': '%', 'baseline_n': base_total, 'candidate_n': cand_total,
+        'baseline_value': base_rate, 'candidate_value': cand_rate,
+        'difference': cand_rate - base_rate, 'ci_low': low, 'ci_high': high,
+        'significant': excludes_zero(low, high), 'method': 'binomial'
+    })
+    
+    return rows
+
+
+def write_comparison_sheet(writer, df):
+    """
+    비교 결과 시트를 숫자 포맷과 함께 기록하는 함수 (나노초: 천 단위 구분자, 성공률 %: 소수 2자리)
+    
+    매개변수:
+        writer: ExcelReportWriter (write-only 스트리밍 기록)
+        df: compare_runs 결과 DataFrame
+    """
+    df = df.copy()
+    df['significant'] = df['significant'].map(bool_as_text)
+    value_columns = ['baseline_value', 'candidate_value', 'difference', 'ci_low', 'ci_high']
+    
+    def row_formats(values):
+        number_format = DECIMAL_FORMAT if values[COMPARISON_COLUMNS.index('unit')] == '%' else INTEGER_FORMAT
+        return {column: number_format for column in value_columns}
+    
+    writer.write_sheet(df, 'Bootstrap_Comparison',
+                       column_formats={column: INTEGER_FORMAT for column in ['baseline_n', 'candidate_n']},
+                       row_formats=row_formats)
+
+
+def main():
+    """
+    프로그램의 메인 함수
+    
+    사용 예시:
+        python compare_strategies_bootstrap.py \
+            --inputs "performance_reports/IFELSE_stats_nano_with_sum.xlsx,performance_reports/Syncronized_1Phase_stats_nano_with_sum.xlsx" \
+            --labels "if_else,synchronized_1Phase"
+    """
+    # 명령줄 인자 파서 설정
+    parser = argparse.ArgumentParser(
+        description='calculate_stats 보고서들의 요청 단위 데이터로 기법 간 중앙값/p99/성공률 차이의 부트스트랩 신뢰구간을 계산합니다.'
+    )
+    parser.add_argument('--inputs', type=str, required=True,
+                        help='비교할 보고서 Excel 파일 경로들 (--catalog 지정 시 실행 ID, 콤마로 구분, 2개 이상)')
+    parser.add_argument('--labels', type=str,
+                        help='각 보고서에 해당하는 기법 레이블 (콤마로 구분, --catalog 지정 시 생략하면 카탈로그의 기법 레이블)')
+    parser.add_argument('--catalog', type=str,
+                        help='results_catalog_cli.py 로 적재한 카탈로그 경로 (지정하면 Excel 대신 카탈로그에서 조회)')
+    parser.add_argument('--baseline', type=str,
+                        help='기준 기법 레이블 (기본값: 첫 번째 레이블)')
+    parser.add_argument('--resamples', type=int, default=DEFAULT_RESAMPLES,
+                        help=f'부트스트랩 재표본 수 (기본값: {DEFAULT_RESAMPLES})')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help=f'신뢰 수준 (기본값: {DEFAULT_CONFIDENCE})')
+    parser.add_argument('--method', choices=BOOTSTRAP_METHODS, default=BOOTSTRAP_METHOD_AUTO,
+                        help='재표본 방식 (exact: 원본 값, histogram: HDR 버킷, auto: 표본 크기로 자동 선택)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='난수 시드 (지정하면 결과 재현 가능)')
+    parser.add_argument('--output', type=str, default='performance_reports/bootstrap_comparison.xlsx',
+                        help='결과 Excel 파일 경로 (기본값: performance_reports/bootstrap_comparison.xlsx)')
+    
+    # 인자 파싱 및 검증
+    args = parser.parse_args()
+    
+    input_files = [f.strip() for f in args.inputs.split(',')]
+    catalog = ResultsCatalog(args.catalog) if args.catalog else None
+    if args.labels:
+        labels = [l.strip() for l in args.labels.split(',')]
+    elif catalog is not None:
+        strategies = dict(catalog.runs(input_files)[['run_id', 'strategy']].itertuples(index=False))
+        labels = [strategies.get(run_id, run_id) for run_id in input_files]
+        if len(set(labels)) != len(labels):
+            labels = input_files  # 같은 기법의 실행끼리 비교하면 실행 ID 로 구분
+    else:
+        parser.error("--labels 가 필요합니다 (--catalog 미지정)")
+    if len(input_files) != len(labels):
+        parser.error("입력 파일 수와 레이블 수가 일치하지 않습니다")
+    if len(input_files) < 2:
+        parser.error("비교하려면 보고서가 2개 이상 필요합니다")
+    if args.resamples < 1:
+        parser.error("--resamples 는 양수여야 합니다")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence 는 0과 1 사이여야 합니다")
+    
+    baseline_label = args.baseline or labels[0]
+    if baseline_label not in labels:
+        parser.error(f"--baseline 레이블이 --labels 에 없습니다: {baseline_label}")
+    
+    start_time = datetime.now()
+    print(f"부트스트랩 비교 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"재표본 {args.resamples:,}회, 신뢰 수준 {args.confidence:.0%}, 기준 기법: {baseline_label}")
+    
+    # 1. 보고서별 요청 단위 데이터 로드 (카탈로그 지정 시 카탈로그 조회)
+    runs = {}
+    for report_path, label in zip(input_files, labels):
+        try:
+            if catalog is not None:
+                samples, total, success_count = load_request_details_from_catalog(catalog, report_path)
+            else:
+                samples, total, success_count = load_request_details(report_path)
+        except (OSError, ValueError) as e:
+            print(f"오류: 보고서 로드 실패 - {report_path} ({e})")
+            sys.exit(1)
+        runs[label] = (label, samples, total, success_count)
+        print(f"  - {label}: 요청 {total:,}개, 성공 {success_count:,}개, 지표 {', '.join(samples) or '없음'}")
+    
+    # 2. 기준 기법 대비 비교
+    rng = np.random.default_rng(args.seed)
+    rows = []
+    for label in labels:
+        if label != baseline_label:
+            rows.extend(compare_runs(runs[baseline_label], runs[label], args.resamples, args.confidence, rng, args.method))
+    df_comparison = pd.DataFrame(rows, columns=COMPARISON_COLUMNS)
+    if catalog is not None:
+        catalog.close()
+    
+    # 3. 결과 출력
+    print("\n  - 비교 결과 (차이 = 비교 기법 - 기준 기법):")
+    for row in df_comparison.to_dict('records'):
+        mark = '유의' if row['significant'] else '차이 불확실'
+        value_format = ',.2f' if row['unit'] == '%' else ',.0f'
+        print(f"    {row['candidate']} {row['metric']} {row['statistic']}: "
+              f"{row['difference']:{value_format}} {row['unit']} "
+              f"[{row['ci_low']:{value_format}}, {row['ci_high']:{value_format}}] → {mark}")
+    
+    # 4. Excel 파일로 저장
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    
+    with ExcelReportWriter(args.output) as writer:
+        write_comparison_sheet(writer, df_comparison)
+    
+    elapsed_time = datetime.now() - start_time
+    print(f"\n  - Excel 파일 저장 완료: {args.output}")
+    print(f"소요 시간: {elapsed_time}")
+
+
+# 이 스크립트가 직접 실행될 때만 main() 함수 호출
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+실행 결과 카탈로그 관리 스크립트 (v1.0)
+- calculate_stats_*.py 보고서(Excel)를 내장 SQLite 카탈로그에 적재하고, 여러 실행에 걸친 비교 쿼리 실행
+- 적재 후에는 create_charts_backup.py --catalog, compare_strategies_bootstrap.py --catalog 로
+  Excel 을 다시 읽지 않고 카탈로그에서 바로 조회
+
+[명령]
+1. ingest      : 보고서 Excel 적재 (기법 레이블 + 실행 ID, 같은 실행 ID 는 교체)
+2. runs        : 적재된 실행 목록 출력
+3. percentiles : 기법 × 방 수별 지연 시간 백분위수 (예: 기법별 / 방 수별 p99 대기 시간)
+4. query       : 임의 SQL 조회
+"""
+
+# 필요한 라이브러리들을 가져옵니다 (import)
+import pandas as pd      # 데이터 분석을 위한 라이브러리
+import os               # 파일/폴더 작업을 위한 라이브러리
+import argparse         # 명령줄 인자 처리를 위한 라이브러리
+import sqlite3          # 카탈로그 조회 오류 처리
+import sys              # 시스템 관련 기능을 위한 라이브러리
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.results_catalog import DEFAULT_CATALOG_PATH, ResultsCatalog  # 실행 결과 카탈로그 (SQLite)
+
+
+def ingest_reports(catalog, input_files, labels, run_ids):
+    """
+    보고서 Excel 들을 카탈로그에 적재하는 함수
+    
+    매개변수:
+        catalog: ResultsCatalog
+        input_files: 보고서 Excel 경로 목록
+        labels: 기법 레이블 목록
+        run_ids: 실행 ID 목록 (None 항목은 파일명 기준)
+    
+    반환값:
+        적재 성공 파일 수
+    """
+    success_count = 0
+    for report_path, label, run_id in zip(input_files, labels, run_ids):
+        try:
+            run = catalog.ingest_report(report_path, strategy=label, run_id=run_id)
+        except (OSError, ValueError) as e:
+            print(f"오류: 보고서 적재 실패 - {report_path} ({e})")
+            continue
+    
+        success_count += 1
+        print(f"  - {run['run_id']} (기법: {label}): 방 {run['room_count']}개, 요청 {run['request_count']}개 적재")
+    return success_count
+
+
+def print_table(df):
+    """조회 결과 DataFrame 출력 (행이 없으면 안내 문구)"""
+    if df.empty:
+        print("  (결과 없음)")
+        return
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(df.to_string(index=False))
+
+
+def main():
+    """
+    프로그램의 메인 함수
+    
+    사용 예시:
+        python results_catalog_cli.py ingest \
+            --inputs "performance_reports/IFELSE_stats_nano_with_sum.xlsx,performance_reports/Syncronized_1Phase_stats_nano_with_sum.xlsx" \
+            --labels "if_else,synchronized_1Phase"
+        python results_catalog_cli.py percentiles --metric success_wait_time --percentile 99
+    """
+    parser = argparse.ArgumentParser(
+        description='calculate_stats 보고서를 SQLite 카탈로그에 적재하고 실행 간 비교 쿼리를 실행합니다.'
+    )
+    parser.add_argument('--catalog', type=str, default=DEFAULT_CATALOG_PATH,
+                        help=f'카탈로그 파일 경로 (기본값: {DEFAULT_CATALOG_PATH})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    ingest_parser = commands.add_parser('ingest', help='보고서 Excel 적재')
+    ingest_parser.add_argument('--inputs', type=str, required=True, help='보고서 Excel 파일 경로들 (콤마로 구분)')
+    ingest_parser.add_argument('--labels', type=str, required=True, help='각 보고서의 기법 레이블 (콤마로 구분)')
+    ingest_parser.add_argument('--run_ids', type=str, help='각 보고서의 실행 ID (콤마로 구분, 기본값: 파일명)')
+    
+    commands.add_parser('runs', help='적재된 실행 목록')
+    
+    percentile_parser = commands.add_parser('percentiles', help='기법 × 방 수별 지연 시간 백분위수')
+    percentile_parser.add_argument('--metric', type=str, default='success_wait_time',
+                                   help='지연 시간 지표 (Latency_Percentiles 시트의 metric, 기본값: success_wait_time)')
+    percentile_parser.add_argument('--percentile', type=float, default=99, choices=[50, 90, 99, 99.9],
+                                   help='백분위수 (기본값: 99)')
+    
+    query_parser = commands.add_parser('query', help='SQL 조회')
+    query_parser.add_argument('sql', type=str, help='실행할 SQL (예: "SELECT * FROM room_stats WHERE run_id = \'...\'")')
+    
+    args = parser.parse_args()
+    
+    with ResultsCatalog(args.catalog) as catalog:
+        if args.command == 'ingest':
+            input_files = [f.strip() for f in args.inputs.split(',')]
+            labels = [l.strip() for l in args.labels.split(',')]
+            run_ids = [r.strip() or None for r in args.run_ids.split(',')] if args.run_ids else [None] * len(input_files)
+            if not len(input_files) == len(labels) == len(run_ids):
+                parser.error("입력 파일 수, 레이블 수, 실행 ID 수가 일치하지 않습니다")
+    
+            print(f"카탈로그 적재: {args.catalog}")
+            success_count = ingest_reports(catalog, input_files, labels, run_ids)
+            print(f"처리 결과: {success_count}/{len(input_files)} 파일 적재")
+    
+        elif args.command == 'runs':
+            print_table(catalog.runs())
+    
+        elif args.command == 'percentiles':
+            print(f"{args.metric} p{args.percentile:g} (전체 방 기준, 나노초)")
+            try:
+                print_table(catalog.percentile_by_strategy(args.metric, args.percentile))
+            except (sqlite3.Error, pd.errors.DatabaseError) as e:
+                print(f"오류: 조회 실패 - {e} (Latency_Percentiles 시트가 있는 보고서를 적재했는지 확인)")
+                sys.exit(1)
+    
+        else:
+            try:
+                print_table(catalog.query(args.sql))
+            except (sqlite3.Error, pd.errors.DatabaseError) as e:
+                print(f"오류: 조회 실패 - {e}")
+                sys.exit(1)
+
+
+# 이 스크립트가 직접 실행될 때만 main() 함수 호출
+if __name__ == "__main__":
+    main()
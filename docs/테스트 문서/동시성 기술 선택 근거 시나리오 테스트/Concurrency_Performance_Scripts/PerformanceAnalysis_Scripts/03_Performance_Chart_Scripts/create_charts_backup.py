@@ -15,16 +15,43 @@ import numpy as np
 import glob
 import os
 import sys
+import argparse
 import yaml
 import platform
 from pathlib import Path
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.chart_render import ChartRenderScheduler  # 차트 병렬 렌더링 (프로세스 풀)
+from common.latency_histogram import histogram_box_stats, histogram_violin_stats, merge_histograms  # 히스토그램 기반 분포 통계
+from common.results_catalog import ResultsCatalog  # 실행 결과 카탈로그 (SQLite)
+from common.sheet_cache import DEFAULT_SHEET_CACHE_DIR, CachedWorkbook, LazySheets  # 시트 지연 로드 + 디스크 캐시
+
+# Box Plot 데이터 키 → Latency_Histograms 시트의 metric 이름
+HISTOGRAM_METRICS = {
+    'success_wait': 'success_wait_time',
+    'success_dwell': 'success_dwell_time',
+    'failed_wait': 'capacity_failed_wait_time',
+    'failed_processing': 'capacity_failed_fail_processing_time'
+}
+
 class PerformanceVisualizer:
-    def __init__(self, config_path='config.yaml'):
+    def __init__(self, config_path='config.yaml', catalog=None, sheet_cache_dir=DEFAULT_SHEET_CACHE_DIR, workers=1):
         self.config = self.load_config(config_path)
         self.use_english_labels = False
+        self.catalog = catalog          # 지정하면 파일 대신 카탈로그 실행 ID 를 입력으로 사용
+        self.run_labels = {}
+        self.sheet_cache_dir = sheet_cache_dir  # 파싱한 시트 캐시 디렉토리 (None 이면 캐시 없음)
+        self._metric_indexes = {}       # 통계 시트별 (Metric, Statistic) → Value 색인
+        self.workers = workers          # 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
         self.setup_matplotlib()
         
+    def __getstate__(self):
+        """렌더링 워커로 전달할 상태 (카탈로그 연결과 시트 색인은 차트 렌더링에 불필요하고 pickle 불가)"""
+        state = self.__dict__.copy()
+        state['catalog'] = None
+        state['_metric_indexes'] = {}
+        return state
+        
     def load_config(self, config_path):
         """설정 파일 로드"""
         try:
@@ -122,12 +149,33 @@ class PerformanceVisualizer:
         
         return basename
     
+    def use_catalog_runs(self, run_ids=None):
+        """카탈로그 실행 목록 준비 (run_ids 없으면 전체), 레이블 = 기법 레이블 (중복되면 실행 ID)"""
+        runs = self.catalog.runs(run_ids)
+        duplicated = runs['strategy'].duplicated(keep=False)
+        self.run_labels = dict(zip(runs['run_id'], runs['strategy'].where(~duplicated, runs['run_id'])))
+        return list(runs['run_id'])
+    
+    def source_label(self, source):
+        """입력(파일 경로 또는 카탈로그 실행 ID)의 label"""
+        if self.catalog is not None:
+            return self.run_labels.get(source, source)
+        return self.extract_label_from_filename(source)
+    
+    def load_source_data(self, source):
+        """입력의 시트 dict 로드 (카탈로그 실행이면 Excel 을 읽지 않고 카탈로그 조회)"""
+        if self.catalog is None:
+            return self.load_excel_data(source)
+        sheet_names = self.catalog.sheet_names(source)
+        if not sheet_names:
+            print(f"❌ Error loading {source}: run not found in catalog")
+            return None
+        return LazySheets(sheet_names, lambda sheet_name: self.catalog.load_sheet(source, sheet_name))
+    
     def load_excel_data(self, filepath):
-        """Excel 파일 로드"""
+        """Excel 파일 로드 (시트 이름만 먼저 읽고, 시트는 차트에서 처음 사용할 때 파싱 - 파싱 결과는 디스크 캐시)"""
         try:
-            excel_file = pd.ExcelFile(filepath)
-            return {sheet_name: pd.read_excel(excel_file, sheet_name=sheet_name) 
-                    for sheet_name in excel_file.sheet_names}
+            return CachedWorkbook(filepath, cache_dir=self.sheet_cache_dir)
         except Exception as e:
             print(f"❌ Error loading {filepath}: {e}")
             return None
@@ -146,11 +194,22 @@ class PerformanceVisualizer:
             raise ValueError(f"Missing required sheets: {missing_sheets}")
         return True
     
+    def _metric_index(self, df):
+        """통계 시트의 (Metric, Statistic) → Value 색인 (시트마다 한 번 생성, 같은 키가 여러 번이면 첫 값)"""
+        entry = self._metric_indexes.get(id(df))
+        if entry is None or entry[0] is not df:
+            index = {}
+            for key, value in zip(zip(df['Metric'], df['Statistic']), df['Value']):
+                index.setdefault(key, value)
+            entry = (df, index)  # DataFrame 참조를 함께 보관 (id 재사용 방지)
+            self._metric_indexes[id(df)] = entry
+        return entry[1]
+    
     def safe_extract_value(self, df, metric, statistic, default=0):
-        """안전하게 값 추출"""
-        result = df[(df['Metric'] == metric) & (df['Statistic'] == statistic)]['Value']
-        if len(result) > 0:
-            return result.values[0]
+        """안전하게 값 추출 (색인 조회)"""
+        index = self._metric_index(df)
+        if (metric, statistic) in index:
+            return index[(metric, statistic)]
         else:
             print(f"⚠️ Warning: No value found for Metric='{metric}', Statistic='{statistic}'")
             return default
@@ -232,12 +291,20 @@ class PerformanceVisualizer:
         failed_metrics = ['Wait Time', 'Fail Processing Time']
         failed_stats = self._extract_stats_for_metrics(failed_stats_df, failed_metrics)
         
+        # 전체 방/구간을 병합한 metric 별 히스토그램 (시트가 없으면 빈 dict)
+        histograms = {}
+        if 'Latency_Histograms' in sheets_dict:
+            merged = merge_histograms(sheets_dict['Latency_Histograms'])
+            histograms = {data_key: merged[merged['metric'] == metric]
+                          for data_key, metric in HISTOGRAM_METRICS.items()}
+        
         return {
             'label': label,
             'success_wait': success_stats['wait_time'],
             'success_dwell': success_stats['dwell_time'],
             'failed_wait': failed_stats['wait_time'],
-            'failed_processing': failed_stats['fail_processing_time']
+            'failed_processing': failed_stats['fail_processing_time'],
+            'histograms': histograms
         }
     
     def extract_load_trend_data(self, sheets_dict, label):
@@ -272,31 +339,39 @@ class PerformanceVisualizer:
             'failed_wait_times': room_stats_df['capacity_failed_avg_wait_time(ns)'].tolist()
         }
     
-    def create_boxplot_data_from_stats(self, stats):
-        """통계값으로부터 Box Plot 데이터 생성"""
-        mean = stats['mean']
-        median = stats['median']
-        maximum = stats['max']
-        
-        # Min 값 추정
-        minimum = max(0, median * 0.1)
+    def extract_throughput_data(self, sheets_dict, label):
+        """처리량 시계열/포화 지점 데이터 추출 (전체(ALL) 행 기준, 시트가 없으면 None)"""
+        if 'Throughput_Time_Series' not in sheets_dict:
+            return None
         
-        # 사분위수 추정
-        q1 = minimum + (median - minimum) * 0.5
-        q3 = median + (maximum - median) * 0.5
+        series_df = sheets_dict['Throughput_Time_Series']
+        overall = series_df[series_df['roomNumber'].astype(str) == 'ALL'].sort_values('window')
+        if overall.empty:
+            return None
         
-        # 현실적인 분포 생성
-        np.random.seed(42)
-        data_points = [minimum, q1, median, mean, q3, maximum]
+        # 부하 수준(초당 도착 수)별 평균 대기시간 - Throughput_Knee 계산과 같은 기준 (도착이 있는 창만)
+        active = overall[(overall['offered'] > 0) & overall['mean_latency_ns'].notna()]
+        levels = active.groupby('offered_per_sec')['mean_latency_ns'].mean().sort_index()
         
-        # 추가 데이터 포인트 생성
-        additional_points = []
-        for _ in range(20):
-            point = np.random.lognormal(np.log(median), 0.5)
-            point = max(minimum, min(maximum, point))
-            additional_points.append(point)
+        knee_offered = None
+        knee_latency = None
+        knee_df = sheets_dict.get('Throughput_Knee')
+        if knee_df is not None:
+            overall_knee = knee_df[knee_df['roomNumber'].astype(str) == 'ALL']
+            if not overall_knee.empty and pd.notna(overall_knee['knee_offered_per_sec'].iloc[0]):
+                knee_offered = overall_knee['knee_offered_per_sec'].iloc[0]
+                knee_latency = overall_knee['knee_mean_latency_ns'].iloc[0]
         
-        return sorted(data_points + additional_points)
+        return {
+            'label': label,
+            'elapsed_ms': overall['elapsed_ms'].tolist(),
+            'offered_per_sec': overall['offered_per_sec'].tolist(),
+            'completed_per_sec': overall['completed_per_sec'].tolist(),
+            'load_levels': levels.index.tolist(),
+            'load_latencies': levels.tolist(),
+            'knee_offered': knee_offered,
+            'knee_latency': knee_latency
+        }
     
     def _setup_chart_basic(self, figsize=(10, 6)):
         """차트 기본 설정 (내부 메서드)"""
@@ -401,9 +476,9 @@ class PerformanceVisualizer:
         return self._finalize_chart(output_path)
     
     def _create_box_plot_data(self, data_list, request_type):
-        """Box Plot 데이터 생성 (내부 메서드)"""
-        all_data = []
-        box_labels = []
+        """Box Plot / Violin 통계 생성 - Latency_Histograms 시트의 히스토그램 기준 (내부 메서드)"""
+        box_stats = []
+        violin_stats = []
         colors = []
         
         if request_type == 'success':
@@ -415,7 +490,7 @@ class PerformanceVisualizer:
                 plt.matplotlib.patches.Patch(facecolor=self.config['colors']['wait_time'], alpha=0.7, label='대기시간 (Wait Time)'),
                 plt.matplotlib.patches.Patch(facecolor=self.config['colors']['processing_time'], alpha=0.7, label='실행시간 (Dwell Time)')
             ]
-            title = '성공 요청 성능 분포 분석 (Box Plot)'
+            title = '성공 요청 성능 분포 분석 (Box + Violin Plot)'
         else:
             data_config = [
                 ('failed_wait', 'Wait Time', self.config['colors']['wait_time']),
@@ -425,17 +500,21 @@ class PerformanceVisualizer:
                 plt.matplotlib.patches.Patch(facecolor=self.config['colors']['wait_time'], alpha=0.7, label='대기시간 (Wait Time)'),
                 plt.matplotlib.patches.Patch(facecolor=self.config['colors']['failure'], alpha=0.7, label='실패처리시간 (Fail Processing)')
             ]
-            title = '실패 요청 성능 분포 분석 (Box Plot)'
+            title = '실패 요청 성능 분포 분석 (Box + Violin Plot)'
         
         for data in data_list:
             label = data['label']
             for data_key, label_suffix, color in data_config:
-                box_data = self.create_boxplot_data_from_stats(data[data_key])
-                all_data.append(box_data)
-                box_labels.append(f'{label}\n{label_suffix}')
+                hist = data['histograms'].get(data_key)
+                box = histogram_box_stats(hist, f'{label}\n{label_suffix}') if hist is not None else None
+                if box is None:
+                    print(f"⚠️ Warning: No latency histogram for {label} - {label_suffix} (Latency_Histograms 시트 필요)")
+                    continue
+                box_stats.append(box)
+                violin_stats.append(histogram_violin_stats(hist, log_scale=True))  # 차트 Y축이 로그스케일
                 colors.append(color)
         
-        return all_data, box_labels, colors, legend_elements, title
+        return box_stats, violin_stats, colors, legend_elements, title
     
     def _add_box_plot_legends(self, ax, legend_elements):
         """Box Plot 범례 추가 (내부 메서드)"""
@@ -449,8 +528,9 @@ class PerformanceVisualizer:
         boxplot_elements = [
             Line2D([0], [0], color='black', linewidth=2, label='중앙값 (Median)'),
             plt.matplotlib.patches.Patch(facecolor='lightgray', alpha=0.5, label='사분위수 범위 (Q1-Q3)'),
-            Line2D([0], [0], color='black', linewidth=1, linestyle='-', label='최솟값/최댓값 범위'),
-            Line2D([0], [0], marker='o', color='red', linewidth=0, markersize=4, label='이상치 (Outliers)')
+            Line2D([0], [0], color='black', linewidth=1, linestyle='-', label='수염 (Q1/Q3 ± 1.5×IQR)'),
+            Line2D([0], [0], marker='o', color='red', linewidth=0, markersize=4, label='이상치 (Outliers)'),
+            plt.matplotlib.patches.Patch(facecolor='gray', alpha=0.25, label='분포 밀도 (Violin)')
         ]
         
         second_legend = ax.legend(handles=boxplot_elements, loc='upper right', 
@@ -458,18 +538,26 @@ class PerformanceVisualizer:
         ax.add_artist(first_legend)
     
     def create_wait_time_statistics_chart(self, data_list, request_type='success', output_path=None):
-        """차트 2-1, 2-2: Box Plot"""
-        all_data, box_labels, colors, legend_elements, title = self._create_box_plot_data(data_list, request_type)
+        """차트 2-1, 2-2: Box + Violin Plot (저장된 히스토그램의 실제 분포)"""
+        box_stats, violin_stats, colors, legend_elements, title = self._create_box_plot_data(data_list, request_type)
         
         fig, ax = self._setup_chart_basic(figsize=(12, 8))
-        
-        # Box Plot 그리기
-        bp = ax.boxplot(all_data, labels=box_labels, patch_artist=True)
-        
-        # 색상 적용
-        for patch, color in zip(bp['boxes'], colors):
-            patch.set_facecolor(color)
-            patch.set_alpha(0.7)
+        positions = list(range(1, len(box_stats) + 1))
+        
+        if box_stats:
+            # Violin (히스토그램 밀도) 위에 Box Plot 겹쳐 그리기
+            violins = ax.violin(violin_stats, positions=positions, widths=0.8, showextrema=False)
+            for body, color in zip(violins['bodies'], colors):
+                body.set_facecolor(color)
+                body.set_alpha(0.25)
+            
+            bp = ax.bxp(box_stats, positions=positions, patch_artist=True,
+                        flierprops={'marker': 'o', 'markerfacecolor': 'red', 'markeredgecolor': 'red', 'markersize': 3})
+            
+            # 색상 적용
+            for patch, color in zip(bp['boxes'], colors):
+                patch.set_facecolor(color)
+                patch.set_alpha(0.7)
         
         self._add_box_plot_legends(ax, legend_elements)
         
@@ -627,6 +715,45 @@ class PerformanceVisualizer:
                 ax.set_xlabel('룸 번호')
         
         return self._finalize_chart(output_path)
+    
+    def create_throughput_chart(self, data_list, output_path):
+        """차트 5: 처리량 시계열 및 포화 지점(knee)"""
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        colors = plt.cm.tab10(np.linspace(0, 1, len(data_list)))
+        
+        for idx, data in enumerate(data_list):
+            label = data['label']
+            
+            # 위: 시간 창별 완료 처리량(실선) / 도착 부하(점선)
+            ax1.plot(data['elapsed_ms'], data['completed_per_sec'], '-', color=colors[idx],
+                     label=f"{label} - 완료 처리량", linewidth=2)
+            ax1.plot(data['elapsed_ms'], data['offered_per_sec'], '--', color=colors[idx],
+                     label=f"{label} - 도착 부하", linewidth=1, alpha=0.6)
+            
+            # 아래: 도착 부하 수준별 평균 대기시간 + 포화 지점
+            ax2.plot(data['load_levels'], data['load_latencies'], '-o', color=colors[idx],
+                     label=label, linewidth=2, markersize=4)
+            if data['knee_offered'] is not None:
+                ax2.axvline(data['knee_offered'], color=colors[idx], linestyle=':', alpha=0.8)
+                ax2.plot([data['knee_offered']], [data['knee_latency']], '*', color=colors[idx], markersize=14,
+                         label=f"{label} - 포화 지점 ({data['knee_offered']:,.0f} req/s)")
+        
+        ax1.set_xlabel('경과 시간 (ms)')
+        ax1.set_ylabel('처리량 (req/s)')
+        ax1.set_title('시간 창별 처리량 (완료 vs 도착)')
+        ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax1.grid(True, alpha=0.3)
+        ax1.set_ylim(bottom=0)
+        
+        self.format_time_axis(ax2)
+        ax2.set_xlabel('도착 부하 (req/s)')
+        ax2.set_ylabel('평균 대기시간 (자동 단위: ns/μs/ms)')
+        ax2.set_title('부하 대비 대기시간 및 포화 지점(knee)')
+        ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax2.grid(True, alpha=0.3)
+        ax2.set_ylim(bottom=0)
+        
+        return self._finalize_chart(output_path)
         
         return self._finalize_chart(output_path)
     
@@ -637,7 +764,7 @@ class PerformanceVisualizer:
         
         print(f"🔍 Found {len(files)} files to process:")
         for f in files:
-            label = self.extract_label_from_filename(f)
+            label = self.source_label(f)
             print(f"  - {f} → label: '{label}'")
         
         # 데이터 수집
@@ -647,7 +774,8 @@ class PerformanceVisualizer:
             'failure_cost': [],
             'wait_stats': [],
             'load_trend': [],
-            'per_room': []
+            'per_room': [],
+            'throughput': []
         }
         
         extraction_methods = [
@@ -659,10 +787,10 @@ class PerformanceVisualizer:
         ]
         
         for filepath in files:
-            label = self.extract_label_from_filename(filepath)
+            label = self.source_label(filepath)
             print(f"\n📊 Processing file: {filepath} (label: {label})")
             
-            sheets = self.load_excel_data(filepath)
+            sheets = self.load_source_data(filepath)
             if sheets is None:
                 continue
             
@@ -675,6 +803,10 @@ class PerformanceVisualizer:
                 if 'Per_Room_Stats' in sheets:
                     all_data['per_room'].append(self.extract_per_room_data(sheets, label))
                 
+                throughput = self.extract_throughput_data(sheets, label)
+                if throughput is not None:
+                    all_data['throughput'].append(throughput)
+                
                 print(f"✅ Data extraction completed for {label}")
                 
             except Exception as e:
@@ -688,30 +820,32 @@ class PerformanceVisualizer:
         # 차트 생성
         prefix = 'comparison' if len(files) > 1 else all_data['distribution'][0]['label']
         
+        # (파일명, 차트 메서드, 출력 경로 앞의 인자) - 차트끼리 독립이므로 한 스케줄러에서 렌더링
         chart_configs = [
-            ('차트1-1_요청처리결과분포.png', self.create_success_failure_distribution_chart, all_data['distribution']),
-            ('차트1-2_성공요청처리비용분석.png', lambda data, path: self.create_processing_cost_chart(data, 'success', path), all_data['success_cost']),
-            ('차트1-3_실패요청처리비용분석.png', lambda data, path: self.create_processing_cost_chart(data, 'failure', path), all_data['failure_cost']),
-            ('차트2-1_성공요청대기시간분포.png', lambda data, path: self.create_wait_time_statistics_chart(data, 'success', path), all_data['wait_stats']),
-            ('차트2-2_실패요청대기시간분포.png', lambda data, path: self.create_wait_time_statistics_chart(data, 'failed', path), all_data['wait_stats']),
-            ('차트3_부하누적추이분석.png', self.create_load_trend_chart, all_data['load_trend'])
+            ('차트1-1_요청처리결과분포.png', self.create_success_failure_distribution_chart, (all_data['distribution'],)),
+            ('차트1-2_성공요청처리비용분석.png', self.create_processing_cost_chart, (all_data['success_cost'], 'success')),
+            ('차트1-3_실패요청처리비용분석.png', self.create_processing_cost_chart, (all_data['failure_cost'], 'failure')),
+            ('차트2-1_성공요청대기시간분포.png', self.create_wait_time_statistics_chart, (all_data['wait_stats'], 'success')),
+            ('차트2-2_실패요청대기시간분포.png', self.create_wait_time_statistics_chart, (all_data['wait_stats'], 'failed')),
+            ('차트3_부하누적추이분석.png', self.create_load_trend_chart, (all_data['load_trend'],))
         ]
         
-        generated_charts = []
+        # 차트 4: Room별 분석 (단일 파일인 경우에만)
+        if len(files) == 1 and all_data['per_room']:
+            chart_configs.append(('차트4_룸별성능비교분석.png', self.create_per_room_chart, (all_data['per_room'][0],)))
+        
+        # 차트 5: 처리량 시계열/포화 지점 (Throughput 시트가 있는 파일만)
+        if all_data['throughput']:
+            chart_configs.append(('차트5_처리량포화분석.png', self.create_throughput_chart, (all_data['throughput'],)))
         
         try:
             print("\n📈 Generating charts...")
             
-            for filename, method, data in chart_configs:
+            scheduler = ChartRenderScheduler(self.workers, initializer=self.setup_matplotlib)
+            for filename, method, args in chart_configs:
                 chart_path = output_dir / f'{prefix}_{filename}'
-                method(data, chart_path)
-                generated_charts.append(str(chart_path))
-            
-            # 차트 4: Room별 분석 (단일 파일인 경우에만)
-            if len(files) == 1 and all_data['per_room']:
-                chart_path = output_dir / f'{prefix}_차트4_룸별성능비교분석.png'
-                self.create_per_room_chart(all_data['per_room'][0], chart_path)
-                generated_charts.append(str(chart_path))
+                scheduler.submit(str(chart_path), method, *args, chart_path)
+            generated_charts = scheduler.run()
             
         except Exception as e:
             print(f"❌ Error creating charts: {e}")
@@ -723,19 +857,21 @@ class PerformanceVisualizer:
     
     def _print_completion_summary(self, generated_charts, output_dir):
         """완료 요약 출력 (내부 메서드)"""
-        chart_descriptions = [
-            "차트 1-1: 요청 처리 결과 분포 (성공률 vs 실패율)",
-            "차트 1-2: 성공 요청의 처리 비용 분석 (대기+실행)",
-            "차트 1-3: 실패 요청의 처리 비용 분석 (대기+거부처리)",
-            "차트 2-1: 성공 요청 대기시간 분포 (Box Plot)",
-            "차트 2-2: 실패 요청 대기시간 분포 (Box Plot)",
-            "차트 3: 부하 누적에 따른 성능 저하 추이",
-            "차트 4: Room별 성능 비교 분석 (단일파일 전용)"
-        ]
+        # 파일명의 차트 번호로 설명 결정 (차트 4, 5는 조건부 생성이므로 순서 기준이 아님)
+        chart_descriptions = {
+            '차트1-1_': "차트 1-1: 요청 처리 결과 분포 (성공률 vs 실패율)",
+            '차트1-2_': "차트 1-2: 성공 요청의 처리 비용 분석 (대기+실행)",
+            '차트1-3_': "차트 1-3: 실패 요청의 처리 비용 분석 (대기+거부처리)",
+            '차트2-1_': "차트 2-1: 성공 요청 대기시간 분포 (Box + Violin Plot)",
+            '차트2-2_': "차트 2-2: 실패 요청 대기시간 분포 (Box + Violin Plot)",
+            '차트3_': "차트 3: 부하 누적에 따른 성능 저하 추이",
+            '차트4_': "차트 4: Room별 성능 비교 분석 (단일파일 전용)",
+            '차트5_': "차트 5: 처리량 시계열 및 포화 지점(knee) 분석"
+        }
         
         print(f"\n🎉 Successfully generated {len(generated_charts)} charts:")
-        for i, chart in enumerate(generated_charts):
-            desc = chart_descriptions[i] if i < len(chart_descriptions) else "추가 분석"
+        for chart in generated_charts:
+            desc = next((text for key, text in chart_descriptions.items() if key in os.path.basename(chart)), "추가 분석")
             print(f"  ✅ {desc}")
             print(f"      📁 {chart}")
         
@@ -745,10 +881,11 @@ class PerformanceVisualizer:
             ("차트 1-1 (요청처리결과분포)", "동시성 제어 기법", "비율 (%) - 성공/실패 누적 막대"),
             ("차트 1-2 (성공요청처리비용)", "기법 (처리시간 순 정렬)", "시간 (자동단위: ns/μs/ms) - 대기+실행 누적 막대"),
             ("차트 1-3 (실패요청처리비용)", "기법 (처리시간 순 정렬)", "시간 (자동단위: ns/μs/ms) - 대기+실패처리 누적 막대"),
-            ("차트 2-1 (성공요청대기시간분포)", "기법별 성능 지표", "시간 (자동단위: ns/μs/ms, 로그스케일) - Box Plot"),
-            ("차트 2-2 (실패요청대기시간분포)", "기법별 성능 지표", "시간 (자동단위: ns/μs/ms, 로그스케일) - Box Plot"),
+            ("차트 2-1 (성공요청대기시간분포)", "기법별 성능 지표", "시간 (자동단위: ns/μs/ms, 로그스케일) - Box + Violin Plot"),
+            ("차트 2-2 (실패요청대기시간분포)", "기법별 성능 지표", "시간 (자동단위: ns/μs/ms, 로그스케일) - Box + Violin Plot"),
             ("차트 3 (부하누적추이)", "시간 진행 (구간)", "평균 대기시간 (자동단위: ns/μs/ms) - 성공/실패 라인"),
-            ("차트 4 (룸별성능비교)", "룸 번호", "성공률(%), 대기시간(자동단위: ns/μs/ms) - 3개 서브플롯")
+            ("차트 4 (룸별성능비교)", "룸 번호", "성공률(%), 대기시간(자동단위: ns/μs/ms) - 3개 서브플롯"),
+            ("차트 5 (처리량포화분석)", "경과 시간 (ms) / 도착 부하 (req/s)", "처리량 (req/s) / 평균 대기시간 (자동단위: ns/μs/ms) - 2개 서브플롯")
         ]
         
         print("\n📊 차트별 X/Y축 정리:")
@@ -798,9 +935,25 @@ def main():
     print("🚀 Performance Analysis Visualization Script v3.1 (Refactored)")
     print("=" * 70)
     
+    # 명령줄 인자 (파일 목록 또는 카탈로그)
+    parser = argparse.ArgumentParser(description='*_stats_nano.xlsx 보고서 또는 결과 카탈로그의 실행들을 시각화합니다.')
+    parser.add_argument('files', nargs='*', help='보고서 Excel 파일들 (생략하면 현재 디렉토리 자동 탐색)')
+    parser.add_argument('--catalog', help='results_catalog_cli.py 로 적재한 카탈로그 경로 (Excel 대신 카탈로그 조회)')
+    parser.add_argument('--runs', help='카탈로그 실행 ID 목록 (콤마로 구분, 생략하면 전체 실행)')
+    parser.add_argument('--workers', type=int, default=1, help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)')
+    args = parser.parse_args()
+    
     # 파일 탐색
-    if len(sys.argv) > 1:
-        files = sys.argv[1:]
+    catalog = None
+    visualizer = None
+    if args.catalog:
+        catalog = ResultsCatalog(args.catalog)
+        run_ids = [r.strip() for r in args.runs.split(',')] if args.runs else None
+        visualizer = PerformanceVisualizer(catalog=catalog, workers=args.workers)
+        files = visualizer.use_catalog_runs(run_ids)
+        print(f"📂 Using runs from catalog: {args.catalog}")
+    elif args.files:
+        files = args.files
         print(f"📂 Using files specified in command line arguments:")
     else:
         files = glob.glob('*_stats_nano.xlsx')
@@ -812,6 +965,7 @@ def main():
         print("❌ Error: No Excel files found.")
         print("Usage:")
         print("  python visualize_performance_results.py [file1.xlsx file2.xlsx ...]")
+        print("  python visualize_performance_results.py --catalog performance_reports/results_catalog.sqlite [--runs run1,run2]")
         print("  Or place *_stats_nano.xlsx (or *.xlsx) files in the current directory.")
         print("\n💡 Tip: For meaningful comparison, use files named like:")
         print("  - synchronized_stats_nano.xlsx")
@@ -826,10 +980,13 @@ def main():
     
     # 시각화 실행
     print("\n🎨 Initializing visualizer...")
-    visualizer = PerformanceVisualizer()
+    if visualizer is None:
+        visualizer = PerformanceVisualizer(workers=args.workers)
     
     print(f"\n🔄 Processing {len(files)} file(s)...")
     visualizer.process_files(files)
+    if catalog is not None:
+        catalog.close()
     
     print("\n🏁 Visualization completed!")
     return 0
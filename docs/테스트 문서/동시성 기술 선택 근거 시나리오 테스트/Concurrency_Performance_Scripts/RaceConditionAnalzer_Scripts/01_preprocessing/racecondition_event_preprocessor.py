@@ -1,13 +1,57 @@
 import pandas as pd  # 데이터 처리를 위한 라이브러리
-import re             # 정규 표현식을 위한 라이브러리
 import os             # 운영체제 기능을 위한 라이브러리
 import shutil         # 파일 복사/이동을 위한 라이브러리
 import argparse       # 명령줄 인자 처리를 위한 라이브러리
-from openpyxl import load_workbook  # Excel 파일 처리를 위한 라이브러리
+import sys            # 공통 모듈 경로 추가를 위한 라이브러리
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.event_pairing import pair_with_next_terminal_event  # 단일 패스 이벤트 페어링
+from common.log_tokenizer import build_marker_spec, tokenize_log, columns_to_dataframe  # 스트리밍 로그 파싱
+from common.excel_report import write_excel_with_side_table  # Excel 스트리밍 저장
+from common.binning import BIN_MODE_FIXED, BinningEngine, add_binning_arguments, binning_engine_from_args  # 방별 bin 할당
+from common.room_partition import RoomPartition  # 방 파티션 인덱스
+from common.nano_time import NANO_DTYPE  # 나노초 컬럼 dtype (Int64)
+from common.table_io import write_table  # CSV/Parquet/Feather 저장
 
 # 상수 정의
 LOG_FILE = 'ChatService.log'  # 기본 로그 파일명
 NEW_LOG_PATH = r'E:\devSpace\ChatServiceTest\log\ChatService.log'  # 새 로그 파일 경로
+START_EVENT = 'PRE_JOIN_CURRENT_STATE'  # 페어링 시작 이벤트
+TERMINAL_EVENTS = ['JOIN_SUCCESS_EXISTING', 'JOIN_FAIL_OVER_CAPACITY_EXISTING']  # 페어링 종료 이벤트
+DEFAULT_BINNING = BinningEngine(BIN_MODE_FIXED, bin_size=20, max_bins=10)  # 기본 bin 할당: 방별 나노초 순서 20개씩, 최대 10구간
+
+# 전처리 결과 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환)
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'int64',
+    'user_id': 'string',
+    'prev_people': 'int64',
+    'curr_people': 'int64',
+    'expected_people': 'float64',  # 첫 입장 등 기대값이 없으면 결측값
+    'max_people': 'int64',
+    'room_entry_sequence': 'int64',
+    'join_result': 'string',
+    'prev_entry_time': 'string',  # 표시용 시각 문자열 그대로 보존
+    'curr_entry_time': 'string',
+    'true_critical_section_nanoTime_start': NANO_DTYPE,
+    'true_critical_section_nanoTime_end': NANO_DTYPE
+}
+
+# 진짜 임계구역 3개 핵심 이벤트 파싱 규칙 (이벤트 부분 문자열로 사전 필터링 후 정규식 1회 적용)
+TRUE_CRITICAL_SECTION_SPEC = build_marker_spec(
+    'TRUE_CRITICAL_SECTION',
+    prefilters=['event=PRE_JOIN_CURRENT_STATE', 'event=JOIN_SUCCESS_EXISTING', 'event=JOIN_FAIL_OVER_CAPACITY_EXISTING'],
+    pattern=(
+        r'timestampIso=(?P<timestamp>\S+).*?'  # 시간 정보 추출
+        r'event=(?P<event>PRE_JOIN_CURRENT_STATE|JOIN_SUCCESS_EXISTING|JOIN_FAIL_OVER_CAPACITY_EXISTING).*?'  # 핵심 이벤트만
+        r'roomNumber=(?P<roomNumber>\d+).*?'    # 방 번호
+        r'userId=(?P<userId>\S+).*?'            # 사용자 ID
+        r'currentPeople=(?P<currentPeople>\d+).*?'  # 현재 인원수
+        r'maxPeople=(?P<maxPeople>\d+)'         # 최대 정원
+        r'(?:.*?nanoTime=(?P<nanoTime>\d+))?'   # 나노초 정밀도 정보 (정렬 및 분석용, 없으면 생략)
+    ),
+    int_fields=['roomNumber', 'currentPeople', 'maxPeople', 'nanoTime']
+)
 
 def replace_log_file():
     """
@@ -38,55 +82,16 @@ def parse_logs(filepath, room_number=None):
     출력: DataFrame - 파싱된 이벤트 데이터
     """
     
-    # 정규 표현식 패턴 정의 (3개 핵심 이벤트만)
-    pattern = re.compile(
-        r'timestampIso=(?P<timestamp>\S+).*?'  # 시간 정보 추출
-        r'event=(?P<event>PRE_JOIN_CURRENT_STATE|JOIN_SUCCESS_EXISTING|JOIN_FAIL_OVER_CAPACITY_EXISTING).*?'  # 핵심 이벤트만
-        r'roomNumber=(?P<roomNumber>\d+).*?'    # 방 번호
-        r'userId=(?P<userId>\S+).*?'            # 사용자 ID
-        r'currentPeople=(?P<currentPeople>\d+).*?'  # 현재 인원수
-        r'maxPeople=(?P<maxPeople>\d+)'         # 최대 정원
-    )
+    print("🔍 디버깅: 로그 파싱 시작")
     
-    records = []  # 파싱된 레코드들을 저장할 리스트
+    # 로그 파일을 스트리밍으로 읽으면서 컬럼별로 파싱
+    columns = tokenize_log(filepath, [TRUE_CRITICAL_SECTION_SPEC], room_number=room_number)
     
-    print("🔍 디버깅: 로그 파싱 시작")
-    line_count = 0
+    # nanoTime이 하나도 없으면 컬럼 자체를 만들지 않음
+    df = columns_to_dataframe(columns, optional_columns=['nanoTime'])
+    print(f"🔍 디버깅: 총 {len(df)}개 이벤트 파싱 완료")
     
-    # 로그 파일을 한 줄씩 읽으면서 파싱
-    with open(filepath, encoding='utf-8') as f:
-        for line in f:
-            line_count += 1
-            
-            # 정규식으로 매칭 시도
-            match = pattern.search(line)
-            if match:
-                # 매칭된 그룹들을 딕셔너리로 변환
-                data = match.groupdict()
-                
-                # 문자열로 추출된 숫자들을 정수형으로 변환
-                data['roomNumber'] = int(data['roomNumber'])
-                data['currentPeople'] = int(data['currentPeople'])
-                data['maxPeople'] = int(data['maxPeople'])
-                
-                # 🔧 나노초 정밀도 정보 추출 (정렬 및 분석용)
-                nano_match = re.search(r'nanoTime=(\d+)', line)
-                
-                if nano_match:
-                    extracted_nano = int(nano_match.group(1))
-                    data['nanoTime'] = extracted_nano
-                    
-                    # 🔍 디버깅: 추출된 nanoTime 값 출력
-                    print(f"   라인 {line_count}: {data['event']} - {data['userId']} - nanoTime: {extracted_nano}")
-                
-                # 방 번호 필터링 적용
-                if room_number is None or data['roomNumber'] == room_number:
-                    records.append(data)
-    
-    print(f"🔍 디버깅: 총 {len(records)}개 이벤트 파싱 완료")
-    
-    # 리스트를 DataFrame으로 변환해서 반환
-    return pd.DataFrame(records)
+    return df
 
 def normalize_timestamp_format(df_result):
     """
@@ -106,7 +111,7 @@ def normalize_timestamp_format(df_result):
     print("🔍 디버깅: 시간 형식 정규화 완료")
     return df_result
 
-def build_paired_data_true_critical_section(df):
+def build_paired_data_true_critical_section(df, binning=DEFAULT_BINNING):
     """
     🔧 시간순 단순 매칭 기반 페어링 로직 함수
     - pair_idx 제거하고 시간순 단순 매칭 적용
@@ -146,47 +151,15 @@ def build_paired_data_true_critical_section(df):
     # === 방별로 시간순 단순 매칭 수행 ===
     result_list = []
     
-    for room_num in df_sorted['roomNumber'].unique():
+    for room_num, room_df in df_sorted.groupby('roomNumber', sort=False):
         print(f"   방 {room_num} 페어링 중...")
-        room_df = df_sorted[df_sorted['roomNumber'] == room_num].copy()
         
-        # 방별 이벤트 시간순 매칭
-        i = 0
-        while i < len(room_df):
-            current_row = room_df.iloc[i]
-            
-            # PRE_JOIN_CURRENT_STATE 이벤트 찾기
-            if current_row['event'] == 'PRE_JOIN_CURRENT_STATE':
-                pre_event = current_row
-                
-                # 🔍 디버깅: PRE_JOIN 이벤트 nanoTime 확인
-                pre_nano = pre_event.get('nanoTime', 'None')
-                print(f"     PRE_JOIN - {pre_event['userId']} - nanoTime: {pre_nano}")
-                
-                # 다음 SUCCESS 또는 FAIL 이벤트 찾기
-                for j in range(i + 1, len(room_df)):
-                    next_row = room_df.iloc[j]
-                    
-                    # 같은 사용자의 SUCCESS/FAIL 이벤트 찾음
-                    if (next_row['userId'] == pre_event['userId'] and 
-                        next_row['event'] in ['JOIN_SUCCESS_EXISTING', 'JOIN_FAIL_OVER_CAPACITY_EXISTING']):
-                        
-                        # 🔍 디버깅: SUCCESS/FAIL 이벤트 nanoTime 확인
-                        end_nano = next_row.get('nanoTime', 'None')
-                        print(f"     {next_row['event']} - {next_row['userId']} - nanoTime: {end_nano}")
-                        
-                        # 페어링 완성
-                        paired_record = create_paired_record(pre_event, next_row)
-                        
-                        # 🔍 디버깅: 페어링 결과 nanoTime 확인
-                        paired_nano_pre = paired_record.get('nanoTime_pre', 'None')
-                        paired_nano_end = paired_record.get('nanoTime_end', 'None')
-                        print(f"     페어링 결과 - nanoTime_pre: {paired_nano_pre}, nanoTime_end: {paired_nano_end}")
-                        
-                        result_list.append(paired_record)
-                        break
-            
-            i += 1
+        # 방별 이벤트 시간순 매칭 (사용자별 대기 목록 기반 단일 패스)
+        paired_records = pair_room_events(room_df)
+        start_count = (room_df['event'] == START_EVENT).sum()
+        print(f"     PRE_JOIN {start_count}건 중 {len(paired_records)}건 페어링 완료")
+        
+        result_list.extend(paired_records)
     
     if not result_list:
         return pd.DataFrame()
@@ -225,8 +198,7 @@ def build_paired_data_true_critical_section(df):
     
     # === 🔧 방별 개별 bin 할당 (나노초 순서 기준) ===
     print("   방별 개별 bin 할당 중...")
-    result['bin'] = result.groupby('roomNumber').cumcount() // 20 + 1
-    result['bin'] = result['bin'].clip(upper=10)  # 최대 10으로 제한
+    result['bin'] = binning.assign(result, time_column='nanoTime_pre').astype('int64')  # 기본값: 20개씩, 최대 10구간
     
     # 🔍 디버깅: bin 할당 후 nanoTime 값 확인
     print(f"🔍 디버깅: bin 할당 후 nanoTime 값 확인")
@@ -299,6 +271,20 @@ def build_paired_data_true_critical_section(df):
     
     return result
 
+def pair_room_events(room_df):
+    """
+    방 단위 이벤트에서 PRE_JOIN_CURRENT_STATE마다 같은 사용자의 다음 JOIN_SUCCESS_EXISTING/JOIN_FAIL_OVER_CAPACITY_EXISTING 이벤트를 매칭
+    - 사용자별 대기 이벤트 dict 로 한 번만 순회 (행마다 전방 재탐색하지 않음)
+    - 종료 이벤트는 소비되지 않으므로 기존 전방 탐색과 매칭 결과가 동일
+    
+    입력: room_df (DataFrame) - 시간순 정렬된 단일 방 이벤트
+    출력: list - 페어링된 레코드 목록 (시작 이벤트 순서)
+    """
+    room_events = room_df.to_dict('records')
+    
+    return [create_paired_record(pre_event, end_event)
+            for pre_event, end_event in pair_with_next_terminal_event(room_events, START_EVENT, TERMINAL_EVENTS)]
+
 def create_paired_record(pre_event, end_event):
     """
     PRE_JOIN_CURRENT_STATE와 SUCCESS/FAIL 이벤트를 매칭해서 하나의 레코드 생성
@@ -336,14 +322,14 @@ def create_paired_record(pre_event, end_event):
     
     return record
 
-def get_true_critical_section_desc_table():
+def get_true_critical_section_desc_table(binning=DEFAULT_BINNING):
     """
     🔧 핵심 이벤트 나노초 포함 설명 테이블 생성 함수
     """
     return [
         ["속성명", "분석 목적", "도출 방법"],
         ["roomNumber", "방 번호 식별", "로그 필드: roomNumber"],
-        ["bin", "분석 구간 구분", "각 방별로 나노초 순서 기준 20개씩 10구간"],
+        ["bin", "분석 구간 구분", binning.describe()],
         ["user_id", "사용자 식별", "로그 필드: userId"],
         ["prev_people", "입장 전 인원수", "PRE_JOIN_CURRENT_STATE의 currentPeople"],
         ["curr_people", "입장 후 인원수", "SUCCESS/FAIL 이벤트의 currentPeople"],
@@ -360,19 +346,9 @@ def get_true_critical_section_desc_table():
 def save_with_side_table(df_result, out_xlsx, desc_table):
     """
     Excel 파일에 데이터와 설명 테이블을 함께 저장하는 함수
+    (설명 테이블은 마지막 컬럼 + 2열부터, 데이터와 같은 패스에서 스트리밍 기록)
     """
-    df_result.to_excel(out_xlsx, index=False)
-    
-    wb = load_workbook(out_xlsx)
-    ws = wb.active
-    
-    start_col = len(df_result.columns) + 2
-    
-    for i, row in enumerate(desc_table):
-        for j, val in enumerate(row):
-            ws.cell(row=i + 1, column=start_col + j, value=val)
-    
-    wb.save(out_xlsx)
+    write_excel_with_side_table(df_result, out_xlsx, side_table=desc_table)
 
 def analyze_results(df):
     """
@@ -407,8 +383,7 @@ def analyze_results(df):
     
     # 방별 bin 분포 확인
     print(f"\n=== 방별 bin 분포 ===")
-    for room_num in sorted(df['roomNumber'].unique()):
-        room_data = df[df['roomNumber'] == room_num]
+    for room_num, room_data in RoomPartition(df).iter_frames(sort=True):
         bin_counts = room_data['bin'].value_counts().sort_index()
         print(f"방 {room_num}: bin {list(bin_counts.index)} → {list(bin_counts.values)}건")
     
@@ -429,11 +404,13 @@ def main():
     """
     parser = argparse.ArgumentParser(description="Race Condition 이벤트 전처리기 (디버깅 버전)")
     parser.add_argument('--room', type=int, help='특정 방 번호만 처리 (옵션)')
-    parser.add_argument('--csv', type=str, help='CSV 파일명 (필수)')
+    parser.add_argument('--csv', type=str, help='CSV 파일명 (필수, .parquet/.feather 확장자면 컬럼형 저장)')
     parser.add_argument('--xlsx', type=str, help='Excel 파일명 (옵션)')
     parser.add_argument('--output-dir', type=str, help='출력 파일 저장 디렉토리 (옵션)')
+    add_binning_arguments(parser, DEFAULT_BINNING, separator='-')
     
     args = parser.parse_args()
+    binning = binning_engine_from_args(parser, args)
     
     # CSV 또는 XLSX 옵션이 없으면 종료
     if not args.csv and not args.xlsx:
@@ -471,7 +448,7 @@ def main():
         
         # 3단계: 시간순 단순 매칭 기반 페어링
         print("3. 시간순 단순 매칭 페어링 처리 중...")
-        result = build_paired_data_true_critical_section(df)
+        result = build_paired_data_true_critical_section(df, binning)
         print(f"   페어링된 요청 수: {len(result)}")
         
         # 4단계: 결과 저장
@@ -479,12 +456,17 @@ def main():
         
         if args.csv:
             csv_path = os.path.join(args.output_dir, args.csv) if args.output_dir else args.csv
-            result.to_csv(csv_path, index=False, encoding='utf-8-sig')
+            write_table(result, csv_path, schema=OUTPUT_TABLE_SCHEMA)
             print(f"   CSV 저장 완료: {csv_path}")
+            
+            # 다음 단계(탐지기)에서 재사용할 방 파티션 인덱스 저장
+            if not result.empty:
+                index_path = RoomPartition(result).save_for_table(csv_path)
+                print(f"   방 파티션 인덱스 저장 완료: {index_path}")
         
         if args.xlsx:
             xlsx_path = os.path.join(args.output_dir, args.xlsx) if args.output_dir else args.xlsx
-            desc_table = get_true_critical_section_desc_table()
+            desc_table = get_true_critical_section_desc_table(binning)
             save_with_side_table(result, xlsx_path, desc_table)
             print(f"   Excel 저장 완료: {xlsx_path}")
         
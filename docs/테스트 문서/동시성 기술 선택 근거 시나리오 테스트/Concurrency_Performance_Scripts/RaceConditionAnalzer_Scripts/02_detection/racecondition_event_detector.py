@@ -9,166 +9,215 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import argparse
-from openpyxl import load_workbook
+import os
+import sys
 
-def detect_race_condition_anomalies(df):
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.interval_overlap import find_overlap_groups, analyze_overlap_details, BOUNDARY_INCLUSIVE
+from common.excel_report import write_excel_with_side_table
+from common.room_partition import RoomPartition
+from common.nano_time import NANO_DTYPE
+from common.table_io import read_table, write_table
+
+# 출력 테이블 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환)
+# - 상세 컬럼은 해당 규칙이 성립한 행에만 값이 있으므로 (빈 칸 = 결측값) 숫자는 float64
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'int64',
+    'user_id': 'string',
+    'prev_people': 'int64',
+    'curr_people': 'int64',
+    'expected_people': 'float64',
+    'max_people': 'int64',
+    'prev_entry_time': 'datetime64[ns, UTC]',
+    'curr_entry_time': 'datetime64[ns, UTC]',
+    'true_critical_section_nanoTime_start': NANO_DTYPE,
+    'true_critical_section_nanoTime_end': NANO_DTYPE,
+    'anomaly_type': 'string',
+    'room_entry_sequence': 'int64',
+    'lost_update_expected': 'float64',
+    'lost_update_actual': 'float64',
+    'lost_update_diff': 'float64',
+    'contention_group_size': 'float64',
+    'contention_user_ids': 'string',
+    'over_capacity_amount': 'float64',
+    'over_capacity_curr': 'float64',
+    'over_capacity_max': 'float64',
+    'expected_curr_by_sequence': 'float64',
+    'actual_curr_people': 'float64',
+    'curr_sequence_diff': 'float64',
+    'sorted_sequence_position': 'float64',
+    'intervening_users_in_critical_section': 'string',
+    'intervening_user_count_critical': 'float64',
+    'true_critical_section_duration_nanos': 'float64'
+}
+
+def capped_expected_people(d):
+    """
+    규칙 1 기대 인원: min(expected_people, max_people) 컬럼 단위 계산
+    (object 컬럼으로 계산 → 행마다 선택된 쪽 값의 타입 유지, 예: 정원으로 제한되면 정수)
+    """
+    expected = d['expected_people'].astype(object)
+    return expected.where(~(d['max_people'] < d['expected_people']), d['max_people'].astype(object))
+
+# 4가지 규칙 선언 (규칙 순서 = anomaly_type 표기 순서)
+# - mask: 전체 DataFrame 에 대한 boolean 컬럼 식
+# - details: 규칙이 성립한 행에 기록할 상세 컬럼 식
+# 새 규칙은 Python 분기 대신 이 목록에 컬럼 식으로 추가
+ANOMALY_RULES = [
+    {
+        'name': '값 불일치',
+        'mask': lambda d: d['expected_people'].notna() & (d['curr_people'] != capped_expected_people(d)),
+        'details': {
+            'lost_update_expected': capped_expected_people,
+            'lost_update_actual': lambda d: d['curr_people'],
+            'lost_update_diff': lambda d: d['curr_people'] - capped_expected_people(d)
+        }
+    },
+    {
+        # 경합 그룹은 방별 sweep line 결과 (analyze_room_overlaps)
+        'name': '경합 발생 오류',
+        'mask': lambda d: d['contention_group_size'].notna(),
+        'details': {
+            'contention_group_size': lambda d: d['contention_group_size'],
+            'contention_user_ids': lambda d: d['contention_user_ids']
+        }
+    },
+    {
+        # 진입 당시 최대값을 넘지 않았던 경우만
+        'name': '정원 초과 오류',
+        'mask': lambda d: (d['prev_people'] <= d['max_people']) & (d['curr_people'] > d['max_people']),
+        'details': {
+            'over_capacity_amount': lambda d: d['curr_people'] - d['max_people'],
+            'over_capacity_curr': lambda d: d['curr_people'],
+            'over_capacity_max': lambda d: d['max_people']
+        }
+    },
+    {
+        # 원본 room_entry_sequence 그대로 사용
+        'name': '상태 전이 오류',
+        'mask': lambda d: (d['join_result'] == 'SUCCESS') & (d['curr_people'] != 1 + d['room_entry_sequence']),
+        'details': {
+            'expected_curr_by_sequence': lambda d: 1 + d['room_entry_sequence'],
+            'actual_curr_people': lambda d: d['curr_people'],
+            'curr_sequence_diff': lambda d: d['curr_people'] - (1 + d['room_entry_sequence']),
+            'sorted_sequence_position': lambda d: d['room_entry_sequence']
+        }
+    }
+]
+
+# 임계구역 개입 분석 컬럼 (규칙과 무관하게 이상 현상 행에 기록)
+CRITICAL_SECTION_COLUMNS = ['intervening_users_in_critical_section', 'intervening_user_count_critical',
+                            'true_critical_section_duration_nanos']
+
+def detect_race_condition_anomalies(df, partition=None):
     """
     4가지 규칙으로 이상 현상을 탐지 (원본 데이터 그대로 사용)
+    - 규칙 판정/상세 값은 전체 DataFrame 에 대한 컬럼 단위 연산으로 한 번에 계산
+    - 방 단위로는 경합 그룹/임계구역 개입 분석(sweep line)만 수행
+    - partition: df 의 방 파티션 인덱스 (None 이면 새로 계산)
+    
+    반환값:
+        (anomaly_df, detailed_analysis) - 이상 현상 행 (방 등장 순서 → 방 내 원본 순서), 상세 분석 텍스트 목록
     """
     
     print("🔍 이상 현상 탐지 시작...")
     
-    # 결과 저장 리스트
-    anomalies = []
-    detailed_analysis = []
-    
     # 시간 컬럼 변환
     df['prev_entry_time'] = pd.to_datetime(df['prev_entry_time'])
     df['curr_entry_time'] = pd.to_datetime(df['curr_entry_time'])
     
     print(f"분석 대상 방: {df['roomNumber'].unique()}")
     
-    # 방별로 분석
-    for room_num in df['roomNumber'].unique():
-        print(f"  방 {room_num} 분석 중...")
-        room_df = df[df['roomNumber'] == room_num].copy()
-        
-        # === 규칙 2를 위한 경합 그룹 찾기 ===
-        contention_groups = find_contention_groups(room_df)
-        
-        # === 각 레코드 검사 ===
-        for idx in room_df.index:
-            row = room_df.loc[idx]
-            anomaly_types = []
-            anomaly_details = {}
-            
-            # 규칙 1: 값 불일치
-            if pd.notna(row['expected_people']):
-                expected_curr = min(row['expected_people'], row['max_people'])
-                if row['curr_people'] != expected_curr:
-                    anomaly_types.append('값 불일치')
-                    anomaly_details['lost_update_expected'] = expected_curr
-                    anomaly_details['lost_update_actual'] = row['curr_people']
-                    anomaly_details['lost_update_diff'] = row['curr_people'] - expected_curr
-            
-            # 규칙 2: 경합 발생 자체
-            user_id = row['user_id']
-            if user_id in contention_groups:
-                anomaly_types.append('경합 발생 오류')
-                contention_info = contention_groups[user_id]
-                anomaly_details['contention_group_size'] = contention_info['group_size']
-                anomaly_details['contention_user_ids'] = ', '.join(contention_info['user_ids'])
-            
-            # 규칙 3: 정원 초과 오류 (진입 당시 최대값을 넘지 않았던 경우만)
-            if (row['prev_people'] <= row['max_people'] and row['curr_people'] > row['max_people']):
-                anomaly_types.append('정원 초과 오류')
-                anomaly_details['over_capacity_amount'] = row['curr_people'] - row['max_people']
-                anomaly_details['over_capacity_curr'] = row['curr_people']
-                anomaly_details['over_capacity_max'] = row['max_people']
-            
-            # 규칙 4: 상태 전이 오류 (원본 room_entry_sequence 그대로 사용)
-            if row['join_result'] == 'SUCCESS':
-                expected_curr_people = 1 + row['room_entry_sequence']
-                if row['curr_people'] != expected_curr_people:
-                    anomaly_types.append('상태 전이 오류')
-                    anomaly_details['expected_curr_by_sequence'] = expected_curr_people
-                    anomaly_details['actual_curr_people'] = row['curr_people']
-                    anomaly_details['curr_sequence_diff'] = row['curr_people'] - expected_curr_people
-                    anomaly_details['sorted_sequence_position'] = row['room_entry_sequence']
-            
-            # 임계구역 분석
-            critical_analysis = analyze_critical_section(row, room_df, idx)
-            anomaly_details.update(critical_analysis)
-            
-            # 이상 현상 발견 시 저장
-            if anomaly_types:
-                result_row = row.to_dict()
-                result_row['anomaly_type'] = ', '.join(anomaly_types)
-                
-                for key, value in anomaly_details.items():
-                    result_row[key] = value
-                
-                anomalies.append(result_row)
-                
-                # 상세 분석 텍스트 생성
-                detailed_text = generate_analysis_text(row, anomaly_types, anomaly_details, room_num)
-                detailed_analysis.append(detailed_text)
+    # === 규칙 2 / 임계구역 개입 분석을 위한 방별 겹침 분석 ===
+    overlap_df = analyze_room_overlaps(df, partition)
+    rule_df = pd.concat([df, overlap_df], axis=1)
     
-    print(f"✅ 이상 현상 탐지 완료: {len(anomalies)}건 발견")
-    return anomalies, detailed_analysis
-
-def find_contention_groups(room_df):
-    """나노초 정밀도 기반 경합 그룹 찾기"""
-    contention_groups = {}
+    # === 규칙 판정 (컬럼 단위 boolean mask) ===
+    rule_masks = [(rule, rule['mask'](rule_df).fillna(False).astype(bool)) for rule in ANOMALY_RULES]
+    anomaly_mask = df['roomNumber'].notna()
+    anomaly_mask &= np.logical_or.reduce([mask.to_numpy() for _, mask in rule_masks])
     
-    for i, row1 in room_df.iterrows():
-        # 나노초 데이터 사용으로 변경
-        start1_nano = row1['true_critical_section_nanoTime_start']
-        end1_nano = row1['true_critical_section_nanoTime_end']
-        user1 = row1['user_id']
-        
-        if pd.isna(start1_nano) or pd.isna(end1_nano):
+    # 방 등장 순서 → 방 내 원본 순서 (방별 순회 결과와 동일한 행 순서)
+    room_order = pd.factorize(df['roomNumber'])[0]
+    positions = np.flatnonzero(anomaly_mask.to_numpy())
+    positions = positions[np.argsort(room_order[positions], kind='stable')]
+    
+    anomaly_df = df.iloc[positions].copy()
+    rule_subset = rule_df.iloc[positions]
+    
+    # === anomaly_type: 성립한 규칙 이름을 규칙 순서대로 ', ' 연결 ===
+    anomaly_type = pd.Series('', index=anomaly_df.index)
+    for rule, mask in rule_masks:
+        matched = mask.iloc[positions]
+        joined = anomaly_type.where(anomaly_type == '', anomaly_type + ', ') + rule['name']
+        anomaly_type = joined.where(matched, anomaly_type)
+    anomaly_df['anomaly_type'] = anomaly_type
+    
+    # === 상세 컬럼: 규칙이 성립한 행에만 값 기록 (성립한 행이 없는 컬럼은 생성하지 않음) ===
+    detail_values = {}
+    for rule, mask in rule_masks:
+        matched = mask.iloc[positions]
+        if not matched.any():
             continue
-            
-        overlapping_users = [user1]
-        
-        for j, row2 in room_df.iterrows():
-            if i == j:
-                continue
-                
-            # 나노초 데이터 사용으로 변경
-            start2_nano = row2['true_critical_section_nanoTime_start']
-            end2_nano = row2['true_critical_section_nanoTime_end']
-            user2 = row2['user_id']
-            
-            if pd.isna(start2_nano) or pd.isna(end2_nano):
-                continue
-            
-            # 나노초 기준 겹침 확인으로 변경
-            if not (end1_nano < start2_nano or end2_nano < start1_nano):
-                overlapping_users.append(user2)
-        
-        # 2명 이상 겹치면 경합
-        if len(overlapping_users) >= 2:
-            for user_id in overlapping_users:
-                contention_groups[user_id] = {
-                    'group_size': len(overlapping_users),
-                    'user_ids': overlapping_users
-                }
+        for column, expression in rule['details'].items():
+            detail_values[column] = expression(rule_subset)[matched]
+    
+    for column in CRITICAL_SECTION_COLUMNS:
+        values = rule_subset[column].dropna()
+        if not values.empty:
+            detail_values[column] = values
+    
+    for column, values in detail_values.items():
+        anomaly_df[column] = values.reindex(anomaly_df.index).infer_objects()
     
-    return contention_groups
+    # 상세 분석 텍스트 생성 (이상 현상 행만)
+    detail_lookup = {column: values.to_dict() for column, values in detail_values.items()}
+    detailed_analysis = []
+    records = anomaly_df[df.columns].to_dict('records')
+    for idx, row, type_text in zip(anomaly_df.index, records, anomaly_type.tolist()):
+        anomaly_details = {column: values[idx] for column, values in detail_lookup.items() if idx in values}
+        anomaly_types = type_text.split(', ')
+        detailed_text = generate_analysis_text(row, anomaly_types, anomaly_details, row['roomNumber'])
+        detailed_analysis.append(detailed_text)
+    
+    print(f"✅ 이상 현상 탐지 완료: {len(anomaly_df)}건 발견")
+    return anomaly_df, detailed_analysis
 
-def analyze_critical_section(base_row, room_df, base_idx):
-    # 나노초 데이터 확인
-    start_nano = base_row.get('true_critical_section_nanoTime_start')
-    end_nano = base_row.get('true_critical_section_nanoTime_end')
+def analyze_room_overlaps(df, partition=None):
+    """
+    방별 경합 그룹(규칙 2) / 임계구역 개입 분석 결과를 df 와 같은 인덱스의 컬럼으로 생성
+    (값이 없는 행은 None, 기록된 값의 타입은 그대로 유지)
+    """
+    columns = ['contention_group_size', 'contention_user_ids'] + CRITICAL_SECTION_COLUMNS
+    overlap_df = pd.DataFrame(None, index=df.index, columns=columns, dtype=object)
     
-    if pd.isna(start_nano) or pd.isna(end_nano):
-        return {}
+    if partition is None:
+        partition = RoomPartition(df)
     
-    # 나노초 기준 개입 사용자 찾기
-    intervening_users = []
-    for idx, other_row in room_df.iterrows():
-        if idx == base_idx:
-            continue
-            
-        other_start_nano = other_row.get('true_critical_section_nanoTime_start')
-        other_end_nano = other_row.get('true_critical_section_nanoTime_end')
+    for room_num, room_df in partition.iter_frames():
+        print(f"  방 {room_num} 분석 중...")
         
-        if pd.isna(other_start_nano) or pd.isna(other_end_nano):
-            continue
+        # === 규칙 2를 위한 경합 그룹 찾기 ===
+        contention_groups = find_contention_groups(room_df)
+        if contention_groups:
+            group_info = [contention_groups.get(user_id) for user_id in room_df['user_id']]
+            overlap_df.loc[room_df.index, 'contention_group_size'] = [
+                info['group_size'] if info else None for info in group_info]
+            overlap_df.loc[room_df.index, 'contention_user_ids'] = [
+                ', '.join(info['user_ids']) if info else None for info in group_info]
         
-        # 나노초 기준 겹침 확인
-        if not (end_nano < other_start_nano or other_end_nano < start_nano):
-            intervening_users.append(other_row['user_id'])
+        # === 임계구역 개입 분석 (방 단위 일괄 계산) ===
+        critical_analyses = analyze_overlap_details(room_df, boundary=BOUNDARY_INCLUSIVE)
+        if critical_analyses:
+            critical_df = pd.DataFrame.from_dict(critical_analyses, orient='index', dtype=object)
+            overlap_df.loc[critical_df.index, CRITICAL_SECTION_COLUMNS] = critical_df[CRITICAL_SECTION_COLUMNS]
     
-    result = {
-        'intervening_users_in_critical_section': ', '.join(intervening_users) if intervening_users else '',
-        'intervening_user_count_critical': len(intervening_users),
-        'true_critical_section_duration_nanos': end_nano - start_nano
-    }
-    
-    return result
+    return overlap_df
+
+def find_contention_groups(room_df):
+    """나노초 정밀도 기반 경합 그룹 찾기 (sweep line, 끝점 맞닿음도 겹침으로 판정)"""
+    return find_overlap_groups(room_df, boundary=BOUNDARY_INCLUSIVE)
 
 def generate_analysis_text(row, anomaly_types, anomaly_details, room_num):
     """상세 분석 텍스트 생성"""
@@ -280,8 +329,8 @@ def print_statistics(df, anomaly_df):
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="Race Condition 분석기 (원본 데이터 그대로 사용)")
-    parser.add_argument('input_csv', help='입력 CSV 파일')
-    parser.add_argument('output_csv', help='출력 CSV 파일 (이상 현상만)')
+    parser.add_argument('input_csv', help='입력 CSV/Parquet/Feather 파일')
+    parser.add_argument('output_csv', help='출력 CSV/Parquet/Feather 파일 (이상 현상만)')
     parser.add_argument('--detailed_output', default='detailed_analysis.txt', help='상세 분석 텍스트 파일')
     parser.add_argument('--rooms', help='분석할 방 번호 (쉼표로 구분)')
     parser.add_argument('--xlsx_output', help='Excel 출력 파일 (선택사항)')
@@ -292,7 +341,7 @@ def main():
         print("🚀 Race Condition 분석기 시작...")
         
         # CSV 파일 읽기
-        df = pd.read_csv(args.input_csv)
+        df = read_table(args.input_csv)
         print(f"✅ CSV 파일 읽기 완료: {len(df)}행, {len(df.columns)}컬럼")
         
         # 필수 컬럼 확인
@@ -312,13 +361,14 @@ def main():
             df = df[df['roomNumber'].isin(room_numbers)]
             print(f"🔍 방 번호 {room_numbers}로 필터링: {len(df)} 레코드")
         
+        # 방 파티션 인덱스 (전처리기가 저장한 인덱스가 있고 데이터와 일치하면 재사용)
+        partition = RoomPartition.for_table(df, args.input_csv)
+        
         # 메인 분석 실행
-        anomalies, detailed_analysis = detect_race_condition_anomalies(df)
+        anomaly_df, detailed_analysis = detect_race_condition_anomalies(df, partition)
         
         # 결과 저장
-        if anomalies:
-            anomaly_df = pd.DataFrame(anomalies)
-            
+        if not anomaly_df.empty:
             # 컬럼 정리 (epochNano 관련 제거)
             basic_cols = ['roomNumber', 'bin', 'user_id', 'prev_people', 'curr_people', 'expected_people', 
                          'max_people', 'prev_entry_time', 'curr_entry_time', 
@@ -339,7 +389,7 @@ def main():
             anomaly_df = anomaly_df.fillna('')
             
             # CSV 저장
-            anomaly_df.to_csv(args.output_csv, index=False, encoding='utf-8-sig')
+            write_table(anomaly_df, args.output_csv, schema=OUTPUT_TABLE_SCHEMA)
             print(f"💾 이상 현상 {len(anomaly_df)}개가 {args.output_csv}에 저장되었습니다.")
             
             # Excel 저장 (선택사항)
@@ -352,15 +402,8 @@ def main():
                     ["규칙 4: 상태 전이 오류", "curr_people ≠ 1+room_entry_sequence", "올바른 상태를 읽지 못하고 오염된 상태로 작업"]
                 ]
                 
-                anomaly_df.to_excel(args.xlsx_output, index=False)
-                wb = load_workbook(args.xlsx_output)
-                ws = wb.active
-                
-                for i, row in enumerate(desc_table):
-                    for j, val in enumerate(row):
-                        ws.cell(row=4+i, column=10+j, value=val)
-                
-                wb.save(args.xlsx_output)
+                # 설명 테이블은 J4 셀부터, 데이터와 같은 패스에서 기록
+                write_excel_with_side_table(anomaly_df, args.xlsx_output, side_table=desc_table, side_table_start=(4, 10))
                 print(f"📊 Excel 파일도 저장됨: {args.xlsx_output}")
         
         else:
@@ -372,7 +415,7 @@ def main():
             f.write("Race Condition 상세 분석 결과\n")
             f.write(f"생성일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"입력 파일: {args.input_csv}\n")
-            f.write(f"총 이상 현상 수: {len(anomalies)}\n\n")
+            f.write(f"총 이상 현상 수: {len(anomaly_df)}\n\n")
             
             for detailed_text in detailed_analysis:
                 f.write(detailed_text)
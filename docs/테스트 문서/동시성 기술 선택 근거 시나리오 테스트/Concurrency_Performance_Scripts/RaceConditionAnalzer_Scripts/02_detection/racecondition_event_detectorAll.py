@@ -10,11 +10,52 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import argparse
-from openpyxl import load_workbook
+import os
+import sys
 
-def detect_race_condition_anomalies(df):
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.interval_overlap import find_overlap_groups, analyze_overlap_details, BOUNDARY_INCLUSIVE
+from common.excel_report import write_excel_with_side_table
+from common.room_partition import RoomPartition
+from common.nano_time import NANO_DTYPE
+from common.table_io import read_table, write_table
+
+# 출력 테이블 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환, 상세 컬럼은 모든 행에 기본값이 있음)
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'int64',
+    'user_id': 'string',
+    'prev_people': 'int64',
+    'curr_people': 'int64',
+    'expected_people': 'float64',
+    'max_people': 'int64',
+    'prev_entry_time': 'datetime64[ns, UTC]',
+    'curr_entry_time': 'datetime64[ns, UTC]',
+    'true_critical_section_nanoTime_start': NANO_DTYPE,
+    'true_critical_section_nanoTime_end': NANO_DTYPE,
+    'anomaly_type': 'string',
+    'room_entry_sequence': 'int64',
+    'lost_update_expected': 'float64',
+    'lost_update_actual': 'int64',
+    'lost_update_diff': 'float64',
+    'contention_group_size': 'int64',
+    'contention_user_ids': 'string',
+    'over_capacity_amount': 'int64',
+    'over_capacity_curr': 'int64',
+    'over_capacity_max': 'int64',
+    'expected_curr_by_sequence': 'int64',
+    'actual_curr_people': 'int64',
+    'curr_sequence_diff': 'int64',
+    'sorted_sequence_position': 'int64',
+    'intervening_users_in_critical_section': 'string',
+    'intervening_user_count_critical': 'int64',
+    'true_critical_section_duration_nanos': 'int64'
+}
+
+def detect_race_condition_anomalies(df, partition=None):
     """
     4가지 규칙으로 이상 현상을 탐지하고 모든 레코드에 대해 완전한 분석 수행
+    (partition: df 의 방 파티션 인덱스, None 이면 새로 계산)
     """
     
     print("🔍 이상 현상 탐지 시작...")
@@ -29,14 +70,18 @@ def detect_race_condition_anomalies(df):
     
     print(f"분석 대상 방: {df['roomNumber'].unique()}")
     
-    # 방별로 분석
-    for room_num in df['roomNumber'].unique():
+    # 방별로 분석 (파티션 인덱스 슬라이스 - 방마다 전체 스캔/복사 없음)
+    if partition is None:
+        partition = RoomPartition(df)
+    for room_num, room_df in partition.iter_frames():
         print(f"  방 {room_num} 분석 중...")
-        room_df = df[df['roomNumber'] == room_num].copy()
         
         # === 규칙 2를 위한 경합 그룹 찾기 ===
         contention_groups = find_contention_groups(room_df)
         
+        # === 임계구역 개입 분석 (방 단위 일괄 계산) ===
+        critical_analyses = analyze_critical_sections(room_df)
+        
         # === 각 레코드 검사 ===
         for idx in room_df.index:
             row = room_df.loc[idx]
@@ -82,8 +127,7 @@ def detect_race_condition_anomalies(df):
                     anomaly_details['sorted_sequence_position'] = row['room_entry_sequence']
             
             # 모든 레코드에 대해 임계구역 분석
-            critical_analysis = analyze_critical_section(row, room_df, idx)
-            anomaly_details.update(critical_analysis)
+            anomaly_details.update(critical_analyses[idx])
             
             # 결과 행 생성 (이상현상 여부와 관계없이)
             result_row = row.to_dict()
@@ -131,82 +175,21 @@ def detect_race_condition_anomalies(df):
     return anomalies, detailed_analysis
 
 def find_contention_groups(room_df):
-    """나노초 정밀도 기반 경합 그룹 찾기"""
-    contention_groups = {}
-    
-    for i, row1 in room_df.iterrows():
-        # 나노초 데이터 사용으로 변경
-        start1_nano = row1['true_critical_section_nanoTime_start']
-        end1_nano = row1['true_critical_section_nanoTime_end']
-        user1 = row1['user_id']
-        
-        if pd.isna(start1_nano) or pd.isna(end1_nano):
-            continue
-            
-        overlapping_users = [user1]
-        
-        for j, row2 in room_df.iterrows():
-            if i == j:
-                continue
-                
-            # 나노초 데이터 사용으로 변경
-            start2_nano = row2['true_critical_section_nanoTime_start']
-            end2_nano = row2['true_critical_section_nanoTime_end']
-            user2 = row2['user_id']
-            
-            if pd.isna(start2_nano) or pd.isna(end2_nano):
-                continue
-            
-            # 나노초 기준 겹침 확인으로 변경
-            if not (end1_nano < start2_nano or end2_nano < start1_nano):
-                overlapping_users.append(user2)
-        
-        # 2명 이상 겹치면 경합
-        if len(overlapping_users) >= 2:
-            for user_id in overlapping_users:
-                contention_groups[user_id] = {
-                    'group_size': len(overlapping_users),
-                    'user_ids': overlapping_users
-                }
-    
-    return contention_groups
+    """나노초 정밀도 기반 경합 그룹 찾기 (sweep line, 끝점 맞닿음도 겹침으로 판정)"""
+    return find_overlap_groups(room_df, boundary=BOUNDARY_INCLUSIVE)
 
-def analyze_critical_section(base_row, room_df, base_idx):
-    """모든 레코드에 대해 임계구역 분석 수행"""
-    # 나노초 데이터 확인
-    start_nano = base_row.get('true_critical_section_nanoTime_start')
-    end_nano = base_row.get('true_critical_section_nanoTime_end')
+def analyze_critical_sections(room_df):
+    """모든 레코드에 대해 임계구역 분석 수행 (방 단위 일괄 계산)"""
+    critical_analyses = analyze_overlap_details(room_df, boundary=BOUNDARY_INCLUSIVE)
     
-    if pd.isna(start_nano) or pd.isna(end_nano):
-        return {
-            'intervening_users_in_critical_section': '',
-            'intervening_user_count_critical': 0,
-            'true_critical_section_duration_nanos': 0
-        }
-    
-    # 나노초 기준 개입 사용자 찾기
-    intervening_users = []
-    for idx, other_row in room_df.iterrows():
-        if idx == base_idx:
-            continue
-            
-        other_start_nano = other_row.get('true_critical_section_nanoTime_start')
-        other_end_nano = other_row.get('true_critical_section_nanoTime_end')
-        
-        if pd.isna(other_start_nano) or pd.isna(other_end_nano):
-            continue
-        
-        # 나노초 기준 겹침 확인
-        if not (end_nano < other_start_nano or other_end_nano < start_nano):
-            intervening_users.append(other_row['user_id'])
-    
-    result = {
-        'intervening_users_in_critical_section': ', '.join(intervening_users) if intervening_users else '',
-        'intervening_user_count_critical': len(intervening_users),
-        'true_critical_section_duration_nanos': end_nano - start_nano
+    # 나노초 데이터가 없는 레코드는 기본값
+    empty_result = {
+        'intervening_users_in_critical_section': '',
+        'intervening_user_count_critical': 0,
+        'true_critical_section_duration_nanos': 0
     }
     
-    return result
+    return {idx: critical_analyses.get(idx, dict(empty_result)) for idx in room_df.index}
 
 def generate_analysis_text(row, anomaly_types, anomaly_details, room_num):
     """상세 분석 텍스트 생성"""
@@ -321,8 +304,8 @@ def print_statistics(df, anomaly_df):
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="Race Condition 분석기 (수정된 버전)")
-    parser.add_argument('input_csv', help='입력 CSV 파일')
-    parser.add_argument('output_csv', help='출력 CSV 파일')
+    parser.add_argument('input_csv', help='입력 CSV/Parquet/Feather 파일')
+    parser.add_argument('output_csv', help='출력 CSV/Parquet/Feather 파일')
     parser.add_argument('--detailed_output', default='detailed_analysis.txt', help='상세 분석 텍스트 파일')
     parser.add_argument('--rooms', help='분석할 방 번호 (쉼표로 구분)')
     parser.add_argument('--xlsx_output', help='Excel 출력 파일 (선택사항)')
@@ -333,7 +316,7 @@ def main():
         print("🚀 Race Condition 분석기 시작...")
         
         # CSV 파일 읽기
-        df = pd.read_csv(args.input_csv)
+        df = read_table(args.input_csv)
         print(f"✅ CSV 파일 읽기 완료: {len(df)}행, {len(df.columns)}컬럼")
         
         # 필수 컬럼 확인
@@ -353,8 +336,11 @@ def main():
             df = df[df['roomNumber'].isin(room_numbers)]
             print(f"🔍 방 번호 {room_numbers}로 필터링: {len(df)} 레코드")
         
+        # 방 파티션 인덱스 (전처리기가 저장한 인덱스가 있고 데이터와 일치하면 재사용)
+        partition = RoomPartition.for_table(df, args.input_csv)
+        
         # 메인 분석 실행
-        all_records, detailed_analysis = detect_race_condition_anomalies(df)
+        all_records, detailed_analysis = detect_race_condition_anomalies(df, partition)
         
         # 결과 DataFrame 생성 (모든 레코드 포함)
         result_df = pd.DataFrame(all_records)
@@ -380,11 +366,11 @@ def main():
         result_df = result_df.fillna('')
         
         # CSV 저장
-        result_df.to_csv(args.output_csv, index=False, encoding='utf-8-sig')
+        write_table(result_df, args.output_csv, schema=OUTPUT_TABLE_SCHEMA)
         print(f"💾 전체 결과 {len(result_df)}개가 {args.output_csv}에 저장되었습니다.")
         
         # Excel 저장 (항상 생성)
-        excel_filename = args.xlsx_output if args.xlsx_output else args.output_csv.replace('.csv', '.xlsx')
+        excel_filename = args.xlsx_output if args.xlsx_output else os.path.splitext(args.output_csv)[0] + '.xlsx'
         
         # Excel 저장 전에 타임존 정보 제거
         excel_df = result_df.copy()
@@ -393,7 +379,7 @@ def main():
         if 'curr_entry_time' in excel_df.columns:
             excel_df['curr_entry_time'] = pd.to_datetime(excel_df['curr_entry_time']).dt.tz_localize(None)
         
-        excel_df.to_excel(excel_filename, index=False)
+        write_excel_with_side_table(excel_df, excel_filename)  # write-only 스트리밍 저장
         print(f"📊 Excel 파일 저장됨: {excel_filename}")
         
         # 상세 분석 텍스트 저장 (이상현상이 있는 경우만)
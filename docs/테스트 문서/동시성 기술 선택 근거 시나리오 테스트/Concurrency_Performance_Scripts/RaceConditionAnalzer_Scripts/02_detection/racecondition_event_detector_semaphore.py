@@ -10,50 +10,44 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import argparse
-from openpyxl import load_workbook
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.interval_overlap import find_overlap_groups, BOUNDARY_EXCLUSIVE
+from common.excel_report import write_excel_with_side_table
+from common.room_partition import RoomPartition
+from common.nano_time import NANO_DTYPE
+from common.table_io import read_table, write_table
+
+# 출력 테이블 컬럼 스키마 (Parquet/Feather 저장 시 이 dtype 으로 변환, 상세 컬럼은 모든 행에 기본값이 있음)
+OUTPUT_TABLE_SCHEMA = {
+    'roomNumber': 'int64',
+    'bin': 'int64',
+    'user_id': 'string',
+    'prev_people': 'int64',
+    'curr_people': 'int64',
+    'max_people': 'int64',
+    'join_result': 'string',
+    'room_entry_sequence': 'int64',
+    'true_critical_section_nanoTime_start': NANO_DTYPE,
+    'true_critical_section_nanoTime_end': NANO_DTYPE,
+    'anomaly_type': 'string',
+    'over_capacity_amount': 'int64',
+    'over_capacity_curr': 'int64',
+    'over_capacity_max': 'int64',
+    'contention_group_size': 'int64',
+    'contention_user_ids': 'string'
+}
 
 def find_semaphore_concurrent_groups(room_df):
-    """세마포어 동시 실행 그룹 찾기 (나노초 정밀도 기반)"""
-    concurrent_groups = {}
-    
-    for i, row1 in room_df.iterrows():
-        start1_nano = row1['true_critical_section_nanoTime_start']
-        end1_nano = row1['true_critical_section_nanoTime_end']
-        user1 = row1['user_id']
-        
-        if pd.isna(start1_nano) or pd.isna(end1_nano):
-            continue
-            
-        overlapping_users = [user1]
-        
-        for j, row2 in room_df.iterrows():
-            if i == j:
-                continue
-                
-            start2_nano = row2['true_critical_section_nanoTime_start']
-            end2_nano = row2['true_critical_section_nanoTime_end']
-            user2 = row2['user_id']
-            
-            if pd.isna(start2_nano) or pd.isna(end2_nano):
-                continue
-            
-            # 나노초 기준 시간 겹침 확인
-            if not (end1_nano <= start2_nano or end2_nano <= start1_nano):
-                overlapping_users.append(user2)
-        
-        # 동시 실행이 발생한 경우 (2명 이상)
-        if len(overlapping_users) >= 2:
-            for user_id in overlapping_users:
-                concurrent_groups[user_id] = {
-                    'group_size': len(overlapping_users),
-                    'user_ids': overlapping_users
-                }
-    
-    return concurrent_groups
+    """세마포어 동시 실행 그룹 찾기 (나노초 정밀도 기반, sweep line, 끝점 맞닿음은 겹침 아님)"""
+    return find_overlap_groups(room_df, boundary=BOUNDARY_EXCLUSIVE)
 
-def detect_semaphore_anomalies(df):
+def detect_semaphore_anomalies(df, partition=None):
     """
     Semaphore 전용 이상 현상 탐지: 정원 초과 + 동시 실행 패턴
+    (partition: df 의 방 파티션 인덱스, None 이면 새로 계산)
     """
     
     print("🔍 Semaphore 이상 현상 탐지 시작...")
@@ -64,10 +58,11 @@ def detect_semaphore_anomalies(df):
     
     print(f"분석 대상 방: {df['roomNumber'].unique()}")
     
-    # 방별로 분석
-    for room_num in df['roomNumber'].unique():
+    # 방별로 분석 (파티션 인덱스 슬라이스 - 방마다 전체 스캔/복사 없음)
+    if partition is None:
+        partition = RoomPartition(df)
+    for room_num, room_df in partition.iter_frames():
         print(f"  방 {room_num} 분석 중...")
-        room_df = df[df['roomNumber'] == room_num].copy()
         
         # === 세마포어 동시 실행 그룹 찾기 ===
         concurrent_groups = find_semaphore_concurrent_groups(room_df)
@@ -235,8 +230,8 @@ def print_semaphore_statistics(df, anomaly_df):
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="Semaphore 전용 Race Condition 분석기")
-    parser.add_argument('input_csv', help='입력 CSV 파일 (preprocessor_semaphore.csv)')
-    parser.add_argument('output_csv', help='출력 CSV 파일')
+    parser.add_argument('input_csv', help='입력 CSV/Parquet/Feather 파일 (preprocessor_semaphore.csv)')
+    parser.add_argument('output_csv', help='출력 CSV/Parquet/Feather 파일')
     parser.add_argument('--detailed_output', default='semaphore_detailed_analysis.txt', help='상세 분석 텍스트 파일')
     parser.add_argument('--rooms', help='분석할 방 번호 (쉼표로 구분)')
     parser.add_argument('--xlsx_output', help='Excel 출력 파일 (선택사항)')
@@ -247,7 +242,7 @@ def main():
         print("🚀 Semaphore 전용 Race Condition 분석기 시작...")
         
         # CSV 파일 읽기
-        df = pd.read_csv(args.input_csv)
+        df = read_table(args.input_csv)
         print(f"✅ CSV 파일 읽기 완료: {len(df)}행, {len(df.columns)}컬럼")
         
         # 필수 컬럼 확인 (Semaphore 전용)
@@ -268,8 +263,11 @@ def main():
             df = df[df['roomNumber'].isin(room_numbers)]
             print(f"🔍 방 번호 {room_numbers}로 필터링: {len(df)} 레코드")
         
+        # 방 파티션 인덱스 (전처리기가 저장한 인덱스가 있고 데이터와 일치하면 재사용)
+        partition = RoomPartition.for_table(df, args.input_csv)
+        
         # 메인 분석 실행
-        all_records, detailed_analysis = detect_semaphore_anomalies(df)
+        all_records, detailed_analysis = detect_semaphore_anomalies(df, partition)
         
         # 결과 DataFrame 생성 (모든 레코드 포함)
         result_df = pd.DataFrame(all_records)
@@ -290,12 +288,12 @@ def main():
         result_df = result_df.fillna('')
         
         # CSV 저장
-        result_df.to_csv(args.output_csv, index=False, encoding='utf-8-sig')
+        write_table(result_df, args.output_csv, schema=OUTPUT_TABLE_SCHEMA)
         print(f"💾 Semaphore 분석 결과 {len(result_df)}개가 {args.output_csv}에 저장되었습니다.")
         
         # Excel 저장 (항상 생성)
-        excel_filename = args.xlsx_output if args.xlsx_output else args.output_csv.replace('.csv', '.xlsx')
-        result_df.to_excel(excel_filename, index=False)
+        excel_filename = args.xlsx_output if args.xlsx_output else os.path.splitext(args.output_csv)[0] + '.xlsx'
+        write_excel_with_side_table(result_df, excel_filename)  # write-only 스트리밍 저장
         print(f"📊 Excel 파일 저장됨: {excel_filename}")
         
         # 상세 분석 텍스트 저장 (정원 초과 오류가 있는 경우만)
@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler, add_span_markers  # 차트 병렬 렌더링 (프로세스 풀) / 오류 위치 음영
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (전체 방 일괄 분석)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,8 +32,68 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_rule3_single_room_chart(chart_path, chart):
+    """
+    규칙 3: 단일 방 정원 초과 분석 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_rule3_single_room_chart 반환값)
+    """
+    total_requests = chart['total_requests']
+    x_positions = list(range(total_requests))
+    max_people = chart['max_people']
+    
+    # 차트 생성
+    fig, ax = plt.subplots(figsize=(20, 12))
+    title = f'규칙 3: 정원 초과 오류 분석 - 방 {chart["room_number"]}'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 1. 최대 정원 한계선 (붉은색 점선)
+    ax.axhline(y=max_people, color='red', linestyle='--', linewidth=2, 
+               label=f'최대 정원 한계선 (max_people = {max_people})', alpha=0.8)
+    
+    # 2. 실제 기록된 인원수 (파란색 실선 + 작은 원점)
+    ax.plot(x_positions, chart['curr_people_values'], color='blue', linewidth=2,
+            marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
+            label='실제 기록된 인원수 (curr_people)', alpha=0.8)
+    
+    # 3. 정원 초과 발생 시점 강조 (detected_anomalies.csv 기반, 음영/강조점 각각 컬렉션 하나로 그림)
+    add_span_markers(ax, chart['exceeded_positions'], 0.3, color='magenta', alpha=0.3,
+                     label='정원 초과 오류 발생 시점 (anomaly_type 기반)')
+    if chart['exceeded_positions']:
+        # 초과 지점에 빨간색 강조점 추가 (detected_anomalies.csv의 실제 curr_people 값 사용)
+        ax.scatter(chart['exceeded_positions'], chart['exceeded_values'], color='red', s=30, alpha=1.0, zorder=5)
+    
+    # X축 10개 동일 간격 눈금
+    tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
+    if tick_positions and tick_positions[-1] != total_requests - 1:
+        tick_positions.append(total_requests - 1)
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(tick_positions)
+    
+    # Y축 설정
+    ax.set_ylim(1, chart['y_max'])
+    
+    # 범례를 좌측 상단에 배치
+    ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
+    
+    # 통계 정보 박스를 범례 우측에 배치 (약 2cm 간격)
+    ax.text(0.2, 0.98, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
+    
+    # 차트 마무리
+    ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class Rule3CapacityAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1, all_rooms=False):
         """
         Rule 3 Capacity 분석기 초기화
         
@@ -35,11 +102,15 @@ class Rule3CapacityAnalyzer:
             preprocessor_file (str): 전처리 데이터 파일 경로 (차트용)
             result_file (str): 분석 결과 데이터 파일 경로 (detected_anomalies.csv - CSV 보고서용)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
+            all_rooms (bool): 모든 방의 단일 방 차트/CSV 보고서를 한 번에 생성 (데이터 1회 로드)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
+        self.all_rooms = all_rooms
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -52,11 +123,11 @@ class Rule3CapacityAnalyzer:
         """CSV 파일을 로드하고 전처리"""
         try:
             # 1. 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 2. 결과 파일 로드 (detected_anomalies.csv - CSV 보고서용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일(detected_anomalies.csv) 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -140,16 +211,38 @@ class Rule3CapacityAnalyzer:
     
     def _create_rule3_single_room_chart(self):
         """규칙 3: 단일 방 정원 초과 분석 차트"""
-        room_data = self.df_preprocessor.copy()
+        chart = self._prepare_rule3_single_room_chart(self.room_number, self.df_preprocessor, self.df_result)
+        if chart is None:
+            return
+        
+        # 파일 저장 (차트 렌더링 스케줄러)
+        filename = f'rule3_capacity_exceeded_analysis_room{self.room_number}.png'
+        chart_path = os.path.join(self.output_dir, filename)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        scheduler.submit(chart_path, render_rule3_single_room_chart, chart_path, chart)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+    
+    def _prepare_rule3_single_room_chart(self, room_number, room_data, room_result):
+        """
+        규칙 3: 단일 방 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_data (DataFrame): 해당 방 전처리 데이터 (원본 순서, 0부터 인덱스)
+            room_result (DataFrame): 해당 방 분석 결과 데이터 (detected_anomalies.csv)
+        
+        Returns:
+            dict: render_rule3_single_room_chart 입력 데이터 (데이터가 비어 있으면 None)
+        """
         if room_data.empty:
             print("❌ 단일 방 데이터가 비어있어 차트 생성을 건너뜁니다.")
-            return
+            return None
         
-        print(f"🎯 단일 방 {self.room_number} Rule3 차트 생성 시작")
+        print(f"🎯 단일 방 {room_number} Rule3 차트 생성 시작")
         
         # X축: 스레드 요청 순서 (인덱스)
         total_requests = len(room_data)
-        x_positions = list(range(total_requests))
         print(f"   - 총 요청 수: {total_requests}")
         
         # Y축 데이터 준비
@@ -161,27 +254,13 @@ class Rule3CapacityAnalyzer:
         y_max = max(max(curr_people_values), max_people) * 1.2
         print(f"   - Y축 최댓값: {y_max:.1f}")
         
-        # 차트 생성
-        fig, ax = plt.subplots(figsize=(20, 12))
-        title = f'규칙 3: 정원 초과 오류 분석 - 방 {self.room_number}'
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # 1. 최대 정원 한계선 (붉은색 점선)
-        ax.axhline(y=max_people, color='red', linestyle='--', linewidth=2, 
-                   label=f'최대 정원 한계선 (max_people = {max_people})', alpha=0.8)
-        
-        # 2. 실제 기록된 인원수 (파란색 실선 + 작은 원점)
-        ax.plot(x_positions, curr_people_values, color='blue', linewidth=2,
-                marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
-                label='실제 기록된 인원수 (curr_people)', alpha=0.8)
-        
-        # 3. 정원 초과 발생 시점 강조 (detected_anomalies.csv 기반)
-        exceeded_count = 0
+        # 정원 초과 발생 시점 (detected_anomalies.csv 기반)
         exceeded_positions = []
+        exceeded_values = []
         
         # detected_anomalies.csv에서 anomaly_type에 "정원 초과 오류"가 포함된 데이터 가져오기
-        capacity_errors = self.df_result[
-            self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
+        capacity_errors = room_result[
+            room_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
         ]
         print(f"   - detected_anomalies.csv에서 발견된 정원 초과 오류: {len(capacity_errors)}건")
         
@@ -194,38 +273,16 @@ class Rule3CapacityAnalyzer:
             ]
             
             if not matching_rows.empty:
-                idx = matching_rows.index[0]
-                ax.axvspan(idx-0.3, idx+0.3, ymin=0, ymax=1, color='magenta', alpha=0.3,
-                          label='정원 초과 오류 발생 시점 (anomaly_type 기반)' if exceeded_count == 0 else '')
-                # 초과 지점에 빨간색 강조점 추가 (detected_anomalies.csv의 실제 curr_people 값 사용)
-                ax.scatter(idx, error_row['curr_people'], color='red', s=30, alpha=1.0, zorder=5)
-                exceeded_count += 1
-                exceeded_positions.append(idx)
+                exceeded_positions.append(matching_rows.index[0])
+                exceeded_values.append(error_row['curr_people'])
         
+        exceeded_count = len(exceeded_positions)
         print(f"   - 차트에 표시된 정원 초과 오류: {exceeded_count}건")
         
-        # X축 10개 동일 간격 눈금
-        tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
-        if tick_positions and tick_positions[-1] != total_requests - 1:
-            tick_positions.append(total_requests - 1)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels(tick_positions)
-        
-        # Y축 설정
-        ax.set_ylim(1, y_max)
-        
-        # 범례를 좌측 상단에 배치
-        ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
-        
-        # 통계 정보 박스를 범례 우측에 배치 (약 2cm 간격)
-        # detected_anomalies.csv의 실제 초과량 계산
+        # 통계 정보 박스 (detected_anomalies.csv의 실제 초과량 계산)
         max_exceeded = 0
-        if exceeded_count > 0:
-            capacity_errors = self.df_result[
-                self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
-            ]
-            if not capacity_errors.empty:
-                max_exceeded = max(capacity_errors['curr_people'] - capacity_errors['max_people'])
+        if exceeded_count > 0 and not capacity_errors.empty:
+            max_exceeded = max(capacity_errors['curr_people'] - capacity_errors['max_people'])
         
         stats_text = (f'총 요청: {total_requests:,}건\n'
                      f'최대 정원: {max_people}명\n'
@@ -237,63 +294,59 @@ class Rule3CapacityAnalyzer:
             if max_exceeded > 0:
                 stats_text += f'\n최대 초과: +{max_exceeded}명'
         
-        ax.text(0.2, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
-        
-        # 차트 마무리
-        ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = f'rule3_capacity_exceeded_analysis_room{self.room_number}.png'
-        chart_path = os.path.join(self.output_dir, filename)
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        return {
+            'room_number': room_number,
+            'total_requests': total_requests,
+            'curr_people_values': curr_people_values,
+            'max_people': max_people,
+            'exceeded_positions': exceeded_positions,
+            'exceeded_values': exceeded_values,
+            'y_max': y_max,
+            'stats_text': stats_text
+        }
+
+    def create_rule3_all_rooms_reports(self):
+        """규칙 3: 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성 (방별 재필터링 없이 파티션 슬라이스 사용)"""
+        preprocessor_partition = RoomPartition(self.df_preprocessor)
+        result_partition = RoomPartition(self.df_result)
+        rooms = sorted({int(room) for room in preprocessor_partition.rooms} | {int(room) for room in result_partition.rooms})
+        print(f"🏢 전체 방 일괄 분석: {len(rooms)}개 방")
+        
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        for room_number in rooms:
+            # 단일 방 모드와 같은 0부터 인덱스 (차트 위치 = 방 안 요청 순서)
+            room_data = preprocessor_partition.frame(room_number).reset_index(drop=True)
+            room_result = result_partition.frame(room_number)
+            chart = self._prepare_rule3_single_room_chart(room_number, room_data, room_result)
+            if chart is not None:
+                chart_path = os.path.join(self.output_dir, f'rule3_capacity_exceeded_analysis_room{room_number}.png')
+                scheduler.submit(chart_path, render_rule3_single_room_chart, chart_path, chart)
+            
+            self._generate_rule3_csv_report(room_number, room_result)
         
-        print(f"✅ 단일 방 차트 저장 완료: {chart_path}")
+        # 모든 방 차트를 한 스케줄러에서 렌더링 (workers > 1 이면 병렬)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+        print(f"✅ 전체 방 일괄 분석 완료: 차트/CSV {len(rooms)}개 방")
     
     def _create_rule3_multi_room_chart(self):
         """규칙 3: 전체 방 정원 초과 종합 분석 차트"""
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule3 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 없이 원본 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)  # 정렬 제거: .sort_values('curr_entry_time') 삭제
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 정렬 없이 원본 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_people_matrix = partition.padded_matrix(self.df_preprocessor['max_people'])
+        max_requests = curr_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
         
-        # 평균과 표준편차 계산
-        mean_curr, std_curr = [], []
-        mean_max_people = []
-        
-        for i in range(max_requests):
-            curr_values_at_i = []
-            max_people_values_at_i = []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-                    max_people_values_at_i.append(dataset.iloc[i]['max_people'])
-            
-            if curr_values_at_i:
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-                mean_max_people.append(np.mean(max_people_values_at_i))
-            else:
-                mean_curr.append(0)
-                std_curr.append(0)
-                mean_max_people.append(20)  # 기본값
+        # 요청 순서별 평균과 표준편차 (NaN 패딩 제외)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
+        mean_max_array = np.nanmean(max_people_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
@@ -302,11 +355,6 @@ class Rule3CapacityAnalyzer:
         title = f"규칙 3: 정원 초과 오류 분석 - 전체 {len(rooms)}개 방 평균 및 실제 값 표준편차 범위"
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
-        # numpy 배열로 변환
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
-        mean_max_array = np.array(mean_max_people)
-        
         # 1. 평균 최대 정원 한계선 (붉은색 점선)
         ax.plot(x_positions, mean_max_array, 'r--', linewidth=2,
                 label='평균 최대 정원 한계선 (max_people)', alpha=0.8)
@@ -323,31 +371,17 @@ class Rule3CapacityAnalyzer:
                 label='평균 실제 기록된 인원수 (curr_people)', alpha=0.8)
         
         # 4. 정원 초과 표식 (detected_anomalies.csv 기반)
-        exceeded_count = 0
-        
         # detected_anomalies.csv에서 anomaly_type에 "정원 초과 오류"가 포함된 데이터 가져오기
         capacity_errors = self.df_result[
             self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
         ]
         print(f"   - detected_anomalies.csv에서 발견된 전체 정원 초과 오류: {len(capacity_errors)}건")
         
-        # 전처리 데이터와 매칭하여 차트에 표시
-        for _, error_row in capacity_errors.iterrows():
-            room = error_row['roomNumber']
-            if room in room_datasets:
-                room_data = room_datasets[room]
-                # 매칭되는 인덱스 찾기
-                matching_rows = room_data[
-                    (room_data['curr_entry_time'] == error_row['curr_entry_time']) &
-                    (room_data['user_id'] == error_row['user_id'])
-                ]
-                
-                if not matching_rows.empty:
-                    idx = matching_rows.index[0]
-                    if idx < len(x_positions):
-                        ax.axvspan(idx-0.2, idx+0.2, ymin=0, ymax=1, color='magenta', alpha=0.2,
-                                  label='정원 초과 오류 발생 시점 (anomaly_type 기반)' if exceeded_count == 0 else '')
-                        exceeded_count += 1
+        # 전처리 데이터와 매칭하여 차트에 표시 (방 + curr_entry_time + user_id 가 처음 일치하는 행의 방 안 요청 순서)
+        exceeded_positions = self._match_request_positions(capacity_errors, partition)
+        add_span_markers(ax, exceeded_positions, 0.2, color='magenta', alpha=0.2,
+                         label='정원 초과 오류 발생 시점 (anomaly_type 기반)')
+        exceeded_count = len(exceeded_positions)
         
         print(f"   - 차트에 표시된 정원 초과 오류: {exceeded_count}건")
         
@@ -396,26 +430,55 @@ class Rule3CapacityAnalyzer:
         
         print(f"✅ 전체 방 차트 저장 완료: {chart_path}")
     
+    def _match_request_positions(self, error_rows, partition):
+        """
+        오류 행마다 전처리 데이터에서 (roomNumber, curr_entry_time, user_id) 가 처음 일치하는 행의 방 안 요청 순서
+        
+        Args:
+            error_rows (DataFrame): 결과 파일의 오류 행
+            partition (RoomPartition): 전처리 데이터의 방 파티션
+        
+        Returns:
+            ndarray: 일치한 오류 행의 요청 순서 (일치하지 않는 행 제외, 오류 행 순서)
+        """
+        match_keys = ['roomNumber', 'curr_entry_time', 'user_id']
+        request_positions = self.df_preprocessor[match_keys].assign(request_position=partition.within_room_rank())
+        request_positions = request_positions[request_positions['request_position'] >= 0].dropna(subset=match_keys)
+        request_positions = request_positions.drop_duplicates(match_keys)  # 방 안에서 먼저 나온 행 우선
+        
+        matched = error_rows[match_keys].dropna().merge(request_positions, on=match_keys, how='inner')
+        return matched['request_position'].to_numpy()
+    
     def generate_rule3_csv_report(self):
         """규칙 3 정원 초과 오류 CSV 보고서 생성"""
+        return self._generate_rule3_csv_report(self.room_number, self.df_result)
+    
+    def _generate_rule3_csv_report(self, room_number, result_data):
+        """
+        규칙 3 정원 초과 오류 CSV 보고서 생성 (대상 방 / 데이터 지정)
+        
+        Args:
+            room_number (int): 방 번호 (None 이면 전체 방)
+            result_data (DataFrame): 분석 결과 데이터 (해당 방 파티션 슬라이스 또는 전체)
+        """
         print("📋 Rule3 CSV 보고서 생성 시작")
         
         # detected_anomalies.csv에서 anomaly_type에 "정원 초과 오류" 문자열이 포함된 데이터만 필터링
-        capacity_exceeded = self.df_result[
-            self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
+        capacity_exceeded = result_data[
+            result_data['anomaly_type'].str.contains('정원 초과 오류', na=False)
         ].copy()
         
         print(f"   - detected_anomalies.csv 기반 정원 초과 오류: {len(capacity_exceeded)}건")
         
         # 방 번호 필터링 (이중 확인)
-        if self.room_number is not None:
+        if room_number is not None:
             before_room_filter = len(capacity_exceeded)
-            capacity_exceeded = capacity_exceeded[capacity_exceeded['roomNumber'] == self.room_number]
-            print(f"   - 방 {self.room_number} 필터링: {before_room_filter} → {len(capacity_exceeded)}건")
+            capacity_exceeded = capacity_exceeded[capacity_exceeded['roomNumber'] == room_number]
+            print(f"   - 방 {room_number} 필터링: {before_room_filter} → {len(capacity_exceeded)}건")
         
         # 파일명 생성
-        if self.room_number:
-            csv_filename = f'report_rule3_capacity_exceeded_errors_room{self.room_number}.csv'
+        if room_number:
+            csv_filename = f'report_rule3_capacity_exceeded_errors_room{room_number}.csv'
         else:
             csv_filename = 'report_rule3_capacity_exceeded_errors.csv'
         
@@ -473,11 +536,15 @@ class Rule3CapacityAnalyzer:
         self.create_output_folders()
         
         try:
-            # 3. 차트 생성 (단일방 또는 전체방)
-            self.create_rule3_capacity_exceeded_chart()
-            
-            # 4. CSV 보고서 생성
-            self.generate_rule3_csv_report()
+            if self.all_rooms:
+                # 3-4. 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성
+                self.create_rule3_all_rooms_reports()
+            else:
+                # 3. 차트 생성 (단일방 또는 전체방)
+                self.create_rule3_capacity_exceeded_chart()
+                
+                # 4. CSV 보고서 생성
+                self.generate_rule3_csv_report()
             
         except Exception as e:
             print(f"❌ 분석 중 오류 발생: {e}")
@@ -500,15 +567,25 @@ def main():
   
   # 특정 방 분석  
   python rule3_capacity_analyzer.py --room_number 1176 --preprocessor_file preprocessor.csv --result_file detected_anomalies.csv --output_dir output/
+  
+  # 모든 방의 단일 방 차트/CSV 일괄 생성
+  python rule3_capacity_analyzer.py --all_rooms --preprocessor_file preprocessor.csv --result_file detected_anomalies.csv --output_dir output/ --workers 8
         """
     )
     
-    parser.add_argument(
+    room_group = parser.add_mutually_exclusive_group()
+    room_group.add_argument(
         '--room_number', 
         type=int, 
         help='분석할 특정 방 번호 (생략시 전체 방 종합 분석)'
     )
     
+    room_group.add_argument(
+        '--all_rooms', '--all-rooms',
+        action='store_true',
+        help='모든 방의 단일 방 차트와 CSV 보고서를 한 번에 생성 (데이터 1회 로드 후 방별 파티션 재사용)'
+    )
+    
     parser.add_argument(
         '--preprocessor_file',
         type=str,
@@ -530,6 +607,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # Rule3 분석기 생성 및 실행
@@ -537,7 +621,9 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        all_rooms=args.all_rooms
     )
     
     success = analyzer.run_analysis()
@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import add_span_markers  # 오류 위치 음영 (컬렉션 하나로 그림)
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (순번별 피벗)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -52,11 +59,11 @@ class Rule3CapacityAnalyzer:
         """CSV 파일을 로드하고 전처리"""
         try:
             # 1. 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 2. 결과 파일 로드 (detected_anomalies.csv - CSV 보고서용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일(detected_anomalies.csv) 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -184,22 +191,20 @@ class Rule3CapacityAnalyzer:
             ]
             print(f"   - detected_anomalies.csv에서 발견된 정원 초과 오류: {len(capacity_errors)}건")
             
-            # 전처리 데이터와 매칭하여 차트에 표시
-            for _, error_row in capacity_errors.iterrows():
-                # curr_entry_time과 user_id로 매칭
-                matching_rows = room_data[
-                    (room_data['curr_entry_time'] == error_row['curr_entry_time']) &
-                    (room_data['user_id'] == error_row['user_id'])
-                ]
-                
-                if not matching_rows.empty:
-                    idx = matching_rows.index[0]
-                    ax.axvspan(idx-0.3, idx+0.3, ymin=0, ymax=1, color='magenta', alpha=0.3,
-                              label='정원 초과 오류 발생 시점 (anomaly_type 기반)' if exceeded_count == 0 else '')
-                    # 초과 지점에 빨간색 강조점 추가 (detected_anomalies.csv의 실제 curr_people 값 사용)
-                    ax.scatter(idx, error_row['curr_people'], color='red', s=30, alpha=1.0, zorder=5)
-                    exceeded_count += 1
-                    exceeded_positions.append(idx)
+            # 전처리 데이터와 매칭하여 차트에 표시 (curr_entry_time + user_id 가 처음 일치하는 행, 오류 행 순서)
+            match_keys = ['curr_entry_time', 'user_id']
+            request_labels = room_data[match_keys].assign(request_label=room_data.index).dropna(subset=match_keys)
+            request_labels = request_labels.drop_duplicates(match_keys)
+            matched = capacity_errors[match_keys + ['curr_people']].dropna(subset=match_keys).merge(
+                request_labels, on=match_keys, how='inner')
+            exceeded_positions = matched['request_label'].tolist()
+            exceeded_count = len(exceeded_positions)
+            
+            add_span_markers(ax, exceeded_positions, 0.3, color='magenta', alpha=0.3,
+                             label='정원 초과 오류 발생 시점 (anomaly_type 기반)')
+            # 초과 지점에 빨간색 강조점 추가 (detected_anomalies.csv의 실제 curr_people 값 사용)
+            if exceeded_count:
+                ax.scatter(exceeded_positions, matched['curr_people'], color='red', s=30, alpha=1.0, zorder=5)
         
         print(f"   - 차트에 표시된 정원 초과 오류: {exceeded_count}건")
         
@@ -258,41 +263,19 @@ class Rule3CapacityAnalyzer:
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule3 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 없이 원본 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)  # 정렬 제거: .sort_values('curr_entry_time') 삭제
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 정렬 없이 원본 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_people_matrix = partition.padded_matrix(self.df_preprocessor['max_people'])
+        max_requests = curr_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
         
-        # 평균과 표준편차 계산
-        mean_curr, std_curr = [], []
-        mean_max_people = []
-        
-        for i in range(max_requests):
-            curr_values_at_i = []
-            max_people_values_at_i = []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-                    max_people_values_at_i.append(dataset.iloc[i]['max_people'])
-            
-            if curr_values_at_i:
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-                mean_max_people.append(np.mean(max_people_values_at_i))
-            else:
-                mean_curr.append(0)
-                std_curr.append(0)
-                mean_max_people.append(20)  # 기본값
+        # 요청 순서별 평균과 표준편차 (NaN 패딩 제외)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
+        mean_max_array = np.nanmean(max_people_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
@@ -301,11 +284,6 @@ class Rule3CapacityAnalyzer:
         title = f"규칙 3: 정원 초과 오류 분석 - 전체 {len(rooms)}개 방 평균 및 실제 값 표준편차 범위"
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
-        # numpy 배열로 변환
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
-        mean_max_array = np.array(mean_max_people)
-        
         # 1. 평균 최대 정원 한계선 (붉은색 점선)
         ax.plot(x_positions, mean_max_array, 'r--', linewidth=2,
                 label='평균 최대 정원 한계선 (max_people)', alpha=0.8)
@@ -331,23 +309,11 @@ class Rule3CapacityAnalyzer:
             ]
             print(f"   - detected_anomalies.csv에서 발견된 전체 정원 초과 오류: {len(capacity_errors)}건")
             
-            # 전처리 데이터와 매칭하여 차트에 표시
-            for _, error_row in capacity_errors.iterrows():
-                room = error_row['roomNumber']
-                if room in room_datasets:
-                    room_data = room_datasets[room]
-                    # 매칭되는 인덱스 찾기
-                    matching_rows = room_data[
-                        (room_data['curr_entry_time'] == error_row['curr_entry_time']) &
-                        (room_data['user_id'] == error_row['user_id'])
-                    ]
-                    
-                    if not matching_rows.empty:
-                        idx = matching_rows.index[0]
-                        if idx < len(x_positions):
-                            ax.axvspan(idx-0.2, idx+0.2, ymin=0, ymax=1, color='magenta', alpha=0.2,
-                                      label='정원 초과 오류 발생 시점 (anomaly_type 기반)' if exceeded_count == 0 else '')
-                            exceeded_count += 1
+            # 전처리 데이터와 매칭하여 차트에 표시 (방 + curr_entry_time + user_id 가 처음 일치하는 행의 방 안 요청 순서)
+            exceeded_positions = self._match_request_positions(capacity_errors, partition)
+            add_span_markers(ax, exceeded_positions, 0.2, color='magenta', alpha=0.2,
+                             label='정원 초과 오류 발생 시점 (anomaly_type 기반)')
+            exceeded_count = len(exceeded_positions)
         
         print(f"   - 차트에 표시된 정원 초과 오류: {exceeded_count}건")
         
@@ -398,6 +364,25 @@ class Rule3CapacityAnalyzer:
         
         print(f"✅ 전체 방 차트 저장 완료: {chart_path}")
     
+    def _match_request_positions(self, error_rows, partition):
+        """
+        오류 행마다 전처리 데이터에서 (roomNumber, curr_entry_time, user_id) 가 처음 일치하는 행의 방 안 요청 순서
+        
+        Args:
+            error_rows (DataFrame): 결과 파일의 오류 행
+            partition (RoomPartition): 전처리 데이터의 방 파티션
+        
+        Returns:
+            ndarray: 일치한 오류 행의 요청 순서 (일치하지 않는 행 제외, 오류 행 순서)
+        """
+        match_keys = ['roomNumber', 'curr_entry_time', 'user_id']
+        request_positions = self.df_preprocessor[match_keys].assign(request_position=partition.within_room_rank())
+        request_positions = request_positions[request_positions['request_position'] >= 0].dropna(subset=match_keys)
+        request_positions = request_positions.drop_duplicates(match_keys)  # 방 안에서 먼저 나온 행 우선
+        
+        matched = error_rows[match_keys].dropna().merge(request_positions, on=match_keys, how='inner')
+        return matched['request_position'].to_numpy()
+    
     def generate_rule3_csv_report(self):
         """규칙 3 전체 스레드 CSV 보고서 생성 (오류 여부 무관, 모든 스레드 포함)"""
         print("📋 Rule3 전체 스레드 CSV 보고서 생성 시작")
@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler  # 차트 병렬 렌더링 (프로세스 풀)
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (전체 방 일괄 분석)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,8 +32,57 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_rule2_contention_gantt_chart(chart_path, chart):
+    """
+    규칙 2: bin 하나의 경합 발생 간트 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_rule2_contention_gantt_charts 반환값)
+    """
+    # 차트 생성
+    fig, ax = plt.subplots(1, 1, figsize=(20, 12))
+    title = f'규칙 2: 경합 발생 간트 차트 - 방 {chart["room_number"]}, bin {chart["bin_value"]} (실제 시간 위치)'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 🔥 각 사용자별 임계 구역 막대 그리기 (실제 나노초 시간 위치)
+    for y_pos, start_time, end_time, contention_label in zip(chart['y_positions'], chart['start_times'],
+                                                               chart['end_times'], chart['contention_labels']):
+        # 🔥 수평 막대 그리기 - 실제 나노초 시간 위치에 그리기
+        ax.barh(y_pos, end_time - start_time, left=start_time, height=0.6, 
+               alpha=0.7, color='red', edgecolor='red', linewidth=0.5)
+        
+        # 막대 끝에 경합 스레드 수 표기
+        ax.text(end_time, y_pos, contention_label, 
+               va='center', ha='left', fontsize=9, fontweight='bold')
+    
+    # Y축 설정 (사용자 ID)
+    ax.set_yticks(range(len(chart['user_ids'])))
+    ax.set_yticklabels(chart['user_ids'], fontsize=10)
+    ax.set_ylabel('사용자 ID (user_id)', fontsize=12, fontweight='bold')
+    
+    # 🔥 X축 설정 - 실제 나노초 시간 범위로 설정 (모든 bin 차트에서 동일 범위/단위)
+    ax.set_xlim(chart['time_start'], chart['time_end'])
+    ax.set_xticks(chart['tick_positions'])
+    ax.set_xticklabels(chart['tick_labels'], rotation=45)
+    ax.set_xlabel(chart['xlabel'], fontsize=12, fontweight='bold')
+    
+    ax.grid(True, alpha=0.3)
+    
+    # 범례 추가
+    ax.barh([], [], height=0.6, alpha=0.7, color='red', 
+           edgecolor='red', linewidth=0.5, label='임계 구역 (Critical Section)')
+    ax.legend(fontsize=12, loc='upper right')
+    
+    # 레이아웃 조정
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class Rule2ContentionAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1, all_rooms=False):
         """
         Rule 2 Contention 분석기 초기화
         
@@ -35,11 +91,15 @@ class Rule2ContentionAnalyzer:
             preprocessor_file (str): 전처리 데이터 파일 경로 (사용 안함)
             result_file (str): 분석 결과 데이터 파일 경로 (차트 및 CSV용)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
+            all_rooms (bool): 모든 방의 단일 방 차트/CSV 보고서를 한 번에 생성 (데이터 1회 로드)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file  # Rule2에서는 사용하지 않음
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
+        self.all_rooms = all_rooms
         
         # 데이터 저장용 변수
         self.df_result = None
@@ -55,7 +115,7 @@ class Rule2ContentionAnalyzer:
         """CSV 파일을 로드하고 전처리"""
         try:
             # 결과 파일 로드 (차트 및 CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -72,6 +132,10 @@ class Rule2ContentionAnalyzer:
             print(f"❌ 데이터 로딩 오류: {e}")
             return False
         
+        # 전체 방 일괄 분석은 방별 파티션 슬라이스를 사용하므로 여기서 필터링하지 않음
+        if self.all_rooms:
+            return True
+        
         # 방 번호 필터링 (Rule2는 반드시 필요)
         if self.room_number is None:
             print("❌ Rule2는 room_number가 반드시 필요합니다 (간트 차트는 단일방만 지원)")
@@ -145,16 +209,40 @@ class Rule2ContentionAnalyzer:
     
     def create_rule2_contention_gantt_chart(self):
         """규칙 2: 경합 발생 상세 분석 - bin별 간트 차트 (실제 시간 위치 기반)"""
-        print(f"🎯 Rule2 경합 발생 간트 차트 생성 시작 (방 {self.room_number}) - 실제 시간 위치 기반")
+        charts = self._prepare_rule2_contention_gantt_charts(self.room_number, self.df_result)
+        if not charts:
+            return
+        
+        # bin별 간트 차트는 서로 독립 → 차트 렌더링 스케줄러로 한 번에 렌더링 (workers > 1 이면 병렬)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        for chart_path, chart in charts:
+            scheduler.submit(chart_path, render_rule2_contention_gantt_chart, chart_path, chart)
+        for (_, chart), saved_path in zip(charts, scheduler.run()):
+            print(f"     ✅ bin {chart['bin_value']} 간트 차트 저장 완료: {saved_path}")
+        
+        print(f"✅ 모든 bin 간트 차트 생성 완료 (총 {len(charts)}개) - 실제 시간 위치 기반")
+    
+    def _prepare_rule2_contention_gantt_charts(self, room_number, room_result):
+        """
+        규칙 2: bin별 간트 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_result (DataFrame): 해당 방 분석 결과 데이터
+        
+        Returns:
+            list: [(차트 저장 경로, render_rule2_contention_gantt_chart 입력 데이터), ...] (bin 순서)
+        """
+        print(f"🎯 Rule2 경합 발생 간트 차트 생성 시작 (방 {room_number}) - 실제 시간 위치 기반")
         
         # '경합 발생 오류' 포함된 이상 현상만 필터링 (다른 파일과 동일하게)
-        contention_anomalies = self.df_result[
-            self.df_result['anomaly_type'].fillna('').str.contains('경합 발생 오류', na=False)
+        contention_anomalies = room_result[
+            room_result['anomaly_type'].fillna('').str.contains('경합 발생 오류', na=False)
         ].copy()
         
         if contention_anomalies.empty:
             print("❌ 경합 발생 데이터가 없어 차트 생성을 건너뜁니다.")
-            return
+            return []
         
         print(f"   - 경합 발생 레코드: {len(contention_anomalies)}건")
         
@@ -162,16 +250,15 @@ class Rule2ContentionAnalyzer:
         if self.has_high_precision and 'true_critical_section_nanoTime_start' in contention_anomalies.columns:
             start_col = 'true_critical_section_nanoTime_start'
             end_col = 'true_critical_section_nanoTime_end'
-            duration_col = 'true_critical_section_duration_nanos'
             print("   - 나노초 정밀도 시간 데이터 사용")
         else:
             print("❌ 나노초 데이터 없음 - 차트 생성 불가")
-            return
+            return []
         
         # 시간 컬럼 확인
         if start_col not in contention_anomalies.columns:
             print(f"❌ 필수 시간 컬럼이 없습니다: {start_col}")
-            return
+            return []
         
         # 시간 데이터 유효성 확인
         valid_time_mask = contention_anomalies[start_col].notna() & contention_anomalies[end_col].notna()
@@ -179,13 +266,13 @@ class Rule2ContentionAnalyzer:
         
         if contention_anomalies.empty:
             print("❌ 유효한 시간 데이터가 없어 차트 생성을 건너뜁니다.")
-            return
+            return []
         
         print(f"   - 유효한 시간 데이터: {len(contention_anomalies)}건")
         
         # 🔥 전체 시간 범위 계산 (실제 나노초 값)
         if not self.calculate_global_time_range(contention_anomalies):
-            return
+            return []
         
         # 🔥 전체 시간 범위 기준으로 시간 단위 결정 (모든 bin 차트에서 동일 단위 사용)
         time_range = self.global_time_end - self.global_time_start
@@ -195,17 +282,31 @@ class Rule2ContentionAnalyzer:
         # bin별로 데이터 그룹화
         if 'bin' not in contention_anomalies.columns:
             print("❌ bin 컬럼이 없습니다.")
-            return
+            return []
         
         bins = sorted(contention_anomalies['bin'].unique())
         print(f"   - 분석할 bin 수: {len(bins)}개")
         
-        # 각 bin별로 간트 차트 생성 (실제 시간 위치 기반)
+        # 🔥 X축 틱 위치 및 레이블 (실제 나노초 시간 기반, 통일된 단위 - 모든 bin 공통)
+        # 적절한 틱 개수 계산 (10~15개 정도)
+        num_ticks = 11
+        tick_positions = np.linspace(self.global_time_start, self.global_time_end, num_ticks)
+        
+        # 🔥 틱 레이블 생성 (기준점에서의 상대적 시간으로 표시)
+        tick_labels = [self.format_time_with_unit(pos - self.global_time_start, time_divisor, time_unit_symbol)
+                       for pos in tick_positions]
+        
+        # X축 레이블 (통일된 시간 단위 정보 포함)
+        time_range_display = self.format_time_with_unit(time_range, time_divisor, time_unit_symbol)
+        xlabel = f'시간 (기준점에서의 상대적 시간, 총 범위: {time_range_display})'
+        
+        # 각 bin별 간트 차트 데이터 (실제 시간 위치 기반)
+        charts = []
         for bin_value in bins:
             print(f"   📊 bin {bin_value} 간트 차트 생성 중...")
             
             # 해당 bin 데이터 필터링
-            bin_data = contention_anomalies[contention_anomalies['bin'] == bin_value].copy()
+            bin_data = contention_anomalies[contention_anomalies['bin'] == bin_value]
             
             if bin_data.empty:
                 print(f"   ❌ bin {bin_value} 데이터가 없어 건너뜀")
@@ -214,103 +315,87 @@ class Rule2ContentionAnalyzer:
             # 시간 순서로 정렬
             bin_data_sorted = bin_data.sort_values([start_col])
             
-            # 차트 생성
-            fig, ax = plt.subplots(1, 1, figsize=(20, 12))
-            title = f'규칙 2: 경합 발생 간트 차트 - 방 {self.room_number}, bin {bin_value} (실제 시간 위치)'
-            ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-            
             # user_id별 Y축 위치 설정
             user_ids = bin_data_sorted['user_id'].unique()
             y_positions = {user_id: i for i, user_id in enumerate(user_ids)}
             
             print(f"     - bin {bin_value} 고유 사용자 수: {len(user_ids)}")
             
-            # 🔥 각 사용자별 임계 구역 막대 그리기 (실제 나노초 시간 위치)
-            for i, (_, row) in enumerate(bin_data_sorted.iterrows()):
-                user_id = row['user_id']
-                contention_size = row.get('contention_group_size', 1)
-                
-                # 실제 나노초 시간 값
-                start_time = row[start_col]
-                end_time = row[end_col]
-                duration_nanos = end_time - start_time
-                
-                y_pos = y_positions[user_id]
-                
-                # 🔥 수평 막대 그리기 - 실제 나노초 시간 위치에 그리기
-                ax.barh(y_pos, duration_nanos, left=start_time, height=0.6, 
-                       alpha=0.7, color='red', edgecolor='red', linewidth=0.5)
-                
-                # 막대 끝에 경합 스레드 수 표기
-                ax.text(end_time, y_pos, f' {int(contention_size)}', 
-                       va='center', ha='left', fontsize=9, fontweight='bold')
-                
-                # 디버그 정보
-                if i < 3:  # 처음 3개만 출력
-                    print(f"     - 사용자 {user_id}: {start_time}→{end_time} 나노초 "
-                          f"(duration: {duration_nanos} 나노초)")
-            
-            # Y축 설정 (사용자 ID)
-            ax.set_yticks(range(len(user_ids)))
-            ax.set_yticklabels(user_ids, fontsize=10)
-            ax.set_ylabel('사용자 ID (user_id)', fontsize=12, fontweight='bold')
-            
-            # 🔥 X축 설정 - 실제 나노초 시간 범위로 설정
-            ax.set_xlim(self.global_time_start, self.global_time_end)
-            
-            # 🔥 X축 틱 위치 및 레이블 (실제 나노초 시간 기반, 통일된 단위)
-            # 적절한 틱 개수 계산 (10~15개 정도)
-            num_ticks = 11
-            tick_positions = np.linspace(self.global_time_start, self.global_time_end, num_ticks)
-            
-            # 🔥 틱 레이블 생성 (전체 범위 기준으로 결정된 통일 단위 사용)
-            tick_labels = []
-            for pos in tick_positions:
-                # 기준점에서의 상대적 시간으로 표시
-                relative_time = pos - self.global_time_start
-                tick_labels.append(self.format_time_with_unit(relative_time, time_divisor, time_unit_symbol))
-            
-            ax.set_xticks(tick_positions)
-            ax.set_xticklabels(tick_labels, rotation=45)
-            
-            # X축 레이블 (통일된 시간 단위 정보 포함)
-            time_range_display = self.format_time_with_unit(time_range, time_divisor, time_unit_symbol)
-            ax.set_xlabel(f'시간 (기준점에서의 상대적 시간, 총 범위: {time_range_display})', 
-                         fontsize=12, fontweight='bold')
-            
-            ax.grid(True, alpha=0.3)
-            
-            # 범례 추가
-            ax.barh([], [], height=0.6, alpha=0.7, color='red', 
-                   edgecolor='red', linewidth=0.5, label='임계 구역 (Critical Section)')
-            ax.legend(fontsize=12, loc='upper right')
+            start_times = bin_data_sorted[start_col].tolist()
+            end_times = bin_data_sorted[end_col].tolist()
+            if 'contention_group_size' in bin_data_sorted.columns:
+                contention_sizes = bin_data_sorted['contention_group_size'].tolist()
+            else:
+                contention_sizes = [1] * len(bin_data_sorted)
             
-            # 레이아웃 조정
-            plt.tight_layout()
+            # 디버그 정보 (처음 3개만 출력)
+            for user_id, start_time, end_time in list(zip(bin_data_sorted['user_id'], start_times, end_times))[:3]:
+                print(f"     - 사용자 {user_id}: {start_time}→{end_time} 나노초 "
+                      f"(duration: {end_time - start_time} 나노초)")
             
-            # 파일 저장
-            chart_filename = f'contention_gantt_chart_room{self.room_number}_bin{bin_value}_actual_time.png'
-            chart_path = os.path.join(self.output_dir, chart_filename)
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_filename = f'contention_gantt_chart_room{room_number}_bin{bin_value}_actual_time.png'
+            charts.append((os.path.join(self.output_dir, chart_filename), {
+                'room_number': room_number,
+                'bin_value': bin_value,
+                'user_ids': list(user_ids),
+                'y_positions': [y_positions[user_id] for user_id in bin_data_sorted['user_id']],
+                'start_times': start_times,
+                'end_times': end_times,
+                'contention_labels': [f' {int(size)}' for size in contention_sizes],
+                'time_start': self.global_time_start,
+                'time_end': self.global_time_end,
+                'tick_positions': tick_positions,
+                'tick_labels': tick_labels,
+                'xlabel': xlabel
+            }))
+        
+        return charts
+
+    def create_rule2_all_rooms_reports(self):
+        """규칙 2: 모든 방의 bin별 간트 차트 + CSV 보고서 일괄 생성 (방별 재필터링 없이 파티션 슬라이스 사용)"""
+        result_partition = RoomPartition(self.df_result)
+        rooms = sorted(int(room) for room in result_partition.rooms)
+        print(f"🏢 전체 방 일괄 분석: {len(rooms)}개 방")
+        
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        all_charts = []
+        for room_number in rooms:
+            room_result = result_partition.frame(room_number)
+            charts = self._prepare_rule2_contention_gantt_charts(room_number, room_result)
+            for chart_path, chart in charts:
+                scheduler.submit(chart_path, render_rule2_contention_gantt_chart, chart_path, chart)
+            all_charts.extend(charts)
             
-            print(f"     ✅ bin {bin_value} 간트 차트 저장 완료: {chart_path}")
+            self._generate_rule2_csv_report(room_number, room_result)
         
-        print(f"✅ 모든 bin 간트 차트 생성 완료 (총 {len(bins)}개) - 실제 시간 위치 기반")
+        # 모든 방의 bin별 간트 차트를 한 스케줄러에서 렌더링 (workers > 1 이면 병렬)
+        for (_, chart), saved_path in zip(all_charts, scheduler.run()):
+            print(f"     ✅ 방 {chart['room_number']} bin {chart['bin_value']} 간트 차트 저장 완료: {saved_path}")
+        print(f"✅ 전체 방 일괄 분석 완료: {len(rooms)}개 방, 간트 차트 {len(all_charts)}개")
     
     def generate_rule2_csv_report(self):
         """규칙 2 경합 발생 CSV 보고서 생성 (원본 duration 값 유지)"""
+        return self._generate_rule2_csv_report(self.room_number, self.df_result)
+    
+    def _generate_rule2_csv_report(self, room_number, result_data):
+        """
+        규칙 2 경합 발생 CSV 보고서 생성 (원본 duration 값 유지) (대상 방 / 데이터 지정)
+        
+        Args:
+            room_number (int): 방 번호
+            result_data (DataFrame): 해당 방 분석 결과 데이터
+        """
         print("📋 Rule2 CSV 보고서 생성 시작")
         
         # '경합 발생 오류' 포함된 이상 현상만 필터링 (다른 파일과 동일하게)
-        contention_anomalies = self.df_result[
-            self.df_result['anomaly_type'].fillna('').str.contains('경합 발생 오류', na=False)
+        contention_anomalies = result_data[
+            result_data['anomaly_type'].fillna('').str.contains('경합 발생 오류', na=False)
         ].copy()
         
         print(f"   - 경합 발생 이상 현상: {len(contention_anomalies)}건")
         
         # 파일명 생성 (Rule2는 항상 단일방)
-        csv_filename = f'report_rule2_contention_details_room{self.room_number}_actual_time.csv'
+        csv_filename = f'report_rule2_contention_details_room{room_number}_actual_time.csv'
         csv_path = os.path.join(self.output_dir, csv_filename)
         
         # 출력할 컬럼 정의 (원본 duration_nanos 유지)
@@ -372,10 +457,10 @@ class Rule2ContentionAnalyzer:
         """전체 분석 실행"""
         print("🚀 Rule 2: Contention 분석 시작 (실제 시간 위치 기반)")
         
-        # room_number 필수 체크
-        if self.room_number is None:
+        # room_number 필수 체크 (전체 방 일괄 분석 제외)
+        if self.room_number is None and not self.all_rooms:
             print("❌ Rule2는 room_number가 반드시 필요합니다 (간트 차트는 단일방만 지원)")
-            print("   사용법: --room_number {방번호} 옵션을 추가해주세요")
+            print("   사용법: --room_number {방번호} 또는 --all_rooms 옵션을 추가해주세요")
             return False
         
         # 1. 데이터 로딩
@@ -387,11 +472,15 @@ class Rule2ContentionAnalyzer:
         self.create_output_folders()
         
         try:
-            # 3. 간트 차트 생성 (실제 시간 위치 기반)
-            self.create_rule2_contention_gantt_chart()
-            
-            # 4. CSV 보고서 생성 (원본 데이터 유지)
-            self.generate_rule2_csv_report()
+            if self.all_rooms:
+                # 3-4. 모든 방의 간트 차트 + CSV 보고서 일괄 생성
+                self.create_rule2_all_rooms_reports()
+            else:
+                # 3. 간트 차트 생성 (실제 시간 위치 기반)
+                self.create_rule2_contention_gantt_chart()
+                
+                # 4. CSV 보고서 생성 (원본 데이터 유지)
+                self.generate_rule2_csv_report()
             
         except Exception as e:
             print(f"❌ 분석 중 오류 발생: {e}")
@@ -412,6 +501,9 @@ def main():
   # 방 1170 경합 분석 (실제 시간 위치 기반)
   python rule2_contention_analyzer_actual_time.py --room_number 1170 --result_file detected_anomalies.csv --output_dir output/
   
+  # 모든 방의 bin별 간트 차트/CSV 일괄 생성
+  python rule2_contention_analyzer_actual_time.py --all_rooms --result_file detected_anomalies.csv --output_dir output/ --workers 8
+  
 수정 사항:
   - 막대 그래프가 실제 나노초 시간 위치에 정확히 그려짐
   - X축이 실제 나노초 시간 범위로 설정됨
@@ -419,11 +511,17 @@ def main():
         """
     )
     
-    parser.add_argument(
+    room_group = parser.add_mutually_exclusive_group(required=True)
+    room_group.add_argument(
         '--room_number', 
         type=int, 
-        required=True,
-        help='분석할 특정 방 번호 (필수 - 간트 차트는 단일방만 지원)'
+        help='분석할 특정 방 번호 (--all_rooms 를 쓰지 않으면 필수 - 간트 차트는 단일방만 지원)'
+    )
+    
+    room_group.add_argument(
+        '--all_rooms', '--all-rooms',
+        action='store_true',
+        help='모든 방의 단일 방 차트와 CSV 보고서를 한 번에 생성 (데이터 1회 로드 후 방별 파티션 재사용)'
     )
     
     parser.add_argument(
@@ -446,6 +544,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # Rule2 분석기 생성 및 실행
@@ -453,7 +558,9 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        all_rooms=args.all_rooms
     )
     
     success = analyzer.run_analysis()
@@ -7,10 +7,15 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -56,7 +61,7 @@ class Rule2ContentionAnalyzer:
         """CSV 파일을 로드하고 전처리"""
         try:
             # 결과 파일 로드 (차트 및 CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
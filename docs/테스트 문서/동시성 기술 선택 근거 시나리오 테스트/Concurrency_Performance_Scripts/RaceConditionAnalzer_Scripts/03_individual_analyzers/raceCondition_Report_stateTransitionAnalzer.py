@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler, add_span_markers  # 차트 병렬 렌더링 (프로세스 풀) / 오류 위치 음영
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (전체 방 일괄 분석)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,8 +32,64 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_rule4_single_room_chart(chart_path, chart):
+    """
+    규칙 4: 단일 방 상태 전이 분석 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_rule4_single_room_chart 반환값)
+    """
+    total_requests = chart['total_requests']
+    x_positions = list(range(total_requests))
+    
+    # 차트 생성
+    fig, ax = plt.subplots(figsize=(20, 12))
+    title = f'규칙 4: 상태 전이 오류 분석 - 방 {chart["room_number"]}'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 1. 이상적 기대값 (파란색 점선 + 작은 원점)
+    ax.plot(x_positions, chart['ideal_expected_values'], 'b--', linewidth=2, 
+            marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
+            label='이상적 기대 인원수', alpha=0.8)
+    
+    # 2. 실제 기록된 인원수 (주황색 실선 + 작은 원점)
+    ax.plot(x_positions, chart['curr_people_values'], color='orange', linewidth=2,
+            marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
+            label='실제 기록된 인원수 (curr_people)', alpha=0.8)
+    
+    # 3. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영, 컬렉션 하나로 그림)
+    add_span_markers(ax, list(chart['error_positions']), 0.3, color='red', alpha=0.3, label='상태 전이 오류 발생')
+    
+    # X축 10개 동일 간격 눈금
+    tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
+    if tick_positions and tick_positions[-1] != total_requests - 1:
+        tick_positions.append(total_requests - 1)
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(tick_positions)
+    
+    # Y축 설정
+    ax.set_ylim(1, chart['y_max'])
+    
+    # 범례를 좌측 상단에 배치
+    ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
+    
+    # 통계 정보 박스를 범례 우측에 배치
+    ax.text(0.2, 0.98, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
+    
+    # 차트 마무리
+    ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class Rule4StateTransitionAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1, all_rooms=False):
         """
         Rule 4 State Transition 분석기 초기화
         
@@ -35,11 +98,15 @@ class Rule4StateTransitionAnalyzer:
             preprocessor_file (str): 전처리 데이터 파일 경로 (차트용)
             result_file (str): 분석 결과 데이터 파일 경로 (CSV용)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
+            all_rooms (bool): 모든 방의 단일 방 차트/CSV 보고서를 한 번에 생성 (데이터 1회 로드)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
+        self.all_rooms = all_rooms
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -52,11 +119,11 @@ class Rule4StateTransitionAnalyzer:
         """CSV 파일들을 로드하고 전처리"""
         try:
             # 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 결과 파일 로드 (CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -126,16 +193,38 @@ class Rule4StateTransitionAnalyzer:
     
     def _create_rule4_single_room_chart(self):
         """규칙 4: 단일 방 상태 전이 분석 차트 - detected_anomalies 기반"""
-        room_data = self.df_preprocessor.copy()
+        chart = self._prepare_rule4_single_room_chart(self.room_number, self.df_preprocessor, self.df_result)
+        if chart is None:
+            return
+        
+        # 파일 저장 (차트 렌더링 스케줄러)
+        filename = f'rule4_state_transition_analysis_room{self.room_number}.png'
+        chart_path = os.path.join(self.output_dir, filename)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        scheduler.submit(chart_path, render_rule4_single_room_chart, chart_path, chart)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+    
+    def _prepare_rule4_single_room_chart(self, room_number, room_data, room_result):
+        """
+        규칙 4: 단일 방 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_data (DataFrame): 해당 방 전처리 데이터 (원본 순서)
+            room_result (DataFrame): 분석 결과 데이터 (detected_anomalies)
+        
+        Returns:
+            dict: render_rule4_single_room_chart 입력 데이터 (데이터가 비어 있으면 None)
+        """
         if room_data.empty:
             print("❌ 단일 방 데이터가 비어있어 차트 생성을 건너뜁니다.")
-            return
+            return None
         
-        print(f"🎯 단일 방 {self.room_number} Rule4 차트 생성 시작")
+        print(f"🎯 단일 방 {room_number} Rule4 차트 생성 시작")
         
         # X축: 스레드 요청 순서 (인덱스)
         total_requests = len(room_data)
-        x_positions = list(range(total_requests))
         print(f"   - 총 요청 수: {total_requests}")
         
         # 해당 방의 최대 정원 확인
@@ -143,7 +232,7 @@ class Rule4StateTransitionAnalyzer:
         print(f"   - 최대 정원: {max_people}")
         
         # 데이터 1: 이상적 기대값 (알고리즘으로 생성: index + 2, 단 max_people 초과 안함)
-        ideal_expected_values = [min(i + 2, max_people) for i in x_positions]
+        ideal_expected_values = [min(i + 2, max_people) for i in range(total_requests)]
         print(f"   - 이상적 기대값 범위: {min(ideal_expected_values)} ~ {max(ideal_expected_values)}")
         
         # 데이터 2: 실제 기록된 인원수
@@ -151,15 +240,14 @@ class Rule4StateTransitionAnalyzer:
         print(f"   - 실제값 범위: {min(curr_people_values)} ~ {max(curr_people_values)}")
         
         # detected_anomalies에서 해당 방의 상태 전이 오류 위치 확인
-        room_state_errors = self.df_result[
-            (self.df_result['roomNumber'] == self.room_number) &
-            (self.df_result['anomaly_type'].str.contains('상태 전이 오류', na=False))
+        room_state_errors = room_result[
+            (room_result['roomNumber'] == room_number) &
+            (room_result['anomaly_type'].str.contains('상태 전이 오류', na=False))
         ]
         
         # room_entry_sequence를 request_index로 변환 (1-based → 0-based)
         error_positions = set()
-        for _, error_row in room_state_errors.iterrows():
-            sequence = error_row['room_entry_sequence']
+        for sequence in room_state_errors['room_entry_sequence']:
             if sequence >= 1 and sequence <= total_requests:
                 error_positions.add(sequence - 1)  # 0-based index로 변환
         
@@ -168,45 +256,9 @@ class Rule4StateTransitionAnalyzer:
         # Y축 최댓값 동적 계산
         y_max = max(max(ideal_expected_values), max(curr_people_values)) * 1.2
         print(f"   - Y축 최댓값: {y_max:.1f}")
-        
-        # 차트 생성
-        fig, ax = plt.subplots(figsize=(20, 12))
-        title = f'규칙 4: 상태 전이 오류 분석 - 방 {self.room_number}'
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # 1. 이상적 기대값 (파란색 점선 + 작은 원점)
-        ax.plot(x_positions, ideal_expected_values, 'b--', linewidth=2, 
-                marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
-                label='이상적 기대 인원수', alpha=0.8)
-        
-        # 2. 실제 기록된 인원수 (주황색 실선 + 작은 원점)
-        ax.plot(x_positions, curr_people_values, color='orange', linewidth=2,
-                marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
-                label='실제 기록된 인원수 (curr_people)', alpha=0.8)
-        
-        # 3. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영)
-        error_marked = False
-        for i in error_positions:
-            ax.axvspan(i-0.3, i+0.3, ymin=0, ymax=1, color='red', alpha=0.3,
-                    label='상태 전이 오류 발생' if not error_marked else '')
-            error_marked = True
-        
         print(f"   - 차트에 표시된 상태 전이 오류: {len(error_positions)}건")
         
-        # X축 10개 동일 간격 눈금
-        tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
-        if tick_positions and tick_positions[-1] != total_requests - 1:
-            tick_positions.append(total_requests - 1)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels(tick_positions)
-        
-        # Y축 설정
-        ax.set_ylim(1, y_max)
-        
-        # 범례를 좌측 상단에 배치
-        ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
-        
-        # 통계 정보 박스를 범례 우측에 배치
+        # 통계 정보 박스
         stats_text = (f'총 요청: {total_requests:,}건\n'
                     f'상태 전이 오류: {len(error_positions):,}건')
         
@@ -214,38 +266,49 @@ class Rule4StateTransitionAnalyzer:
             error_rate = len(error_positions) / total_requests * 100
             stats_text += f'\n오류 비율: {error_rate:.1f}%'
         
-        ax.text(0.2, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
-        
-        # 차트 마무리
-        ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = f'rule4_state_transition_analysis_room{self.room_number}.png'
-        chart_path = os.path.join(self.output_dir, filename)
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        return {
+            'room_number': room_number,
+            'total_requests': total_requests,
+            'ideal_expected_values': ideal_expected_values,
+            'curr_people_values': curr_people_values,
+            'error_positions': list(error_positions),
+            'y_max': y_max,
+            'stats_text': stats_text
+        }
+
+    def create_rule4_all_rooms_reports(self):
+        """규칙 4: 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성 (방별 재필터링 없이 파티션 슬라이스 사용)"""
+        preprocessor_partition = RoomPartition(self.df_preprocessor)
+        result_partition = RoomPartition(self.df_result)
+        rooms = sorted({int(room) for room in preprocessor_partition.rooms} | {int(room) for room in result_partition.rooms})
+        print(f"🏢 전체 방 일괄 분석: {len(rooms)}개 방")
+        
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        for room_number in rooms:
+            # 단일 방 모드와 같은 0부터 인덱스 (차트 위치 = 방 안 요청 순서)
+            room_data = preprocessor_partition.frame(room_number).reset_index(drop=True)
+            room_result = result_partition.frame(room_number)
+            chart = self._prepare_rule4_single_room_chart(room_number, room_data, room_result)
+            if chart is not None:
+                chart_path = os.path.join(self.output_dir, f'rule4_state_transition_analysis_room{room_number}.png')
+                scheduler.submit(chart_path, render_rule4_single_room_chart, chart_path, chart)
+            
+            self._generate_rule4_csv_report(room_number, room_result)
         
-        print(f"✅ 단일 방 차트 저장 완료: {chart_path}")
+        # 모든 방 차트를 한 스케줄러에서 렌더링 (workers > 1 이면 병렬)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+        print(f"✅ 전체 방 일괄 분석 완료: 차트/CSV {len(rooms)}개 방")
     
     def _create_rule4_multi_room_chart(self):
         """규칙 4: 전체 방 상태 전이 종합 분석 차트 - detected_anomalies 기반"""
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule4 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 제거 - 원천 데이터 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 원천 데이터 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_requests = curr_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
@@ -257,22 +320,9 @@ class Rule4StateTransitionAnalyzer:
         # 이상적 기대값 (평균 최대 정원 초과 안함: index + 2, 단 avg_max_people 초과 안함)
         ideal_expected_values = [min(i + 2, avg_max_people) for i in x_positions]
         
-        # 평균과 표준편차 계산 (실제값만)
-        mean_curr, std_curr = [], []
-        
-        for i in range(max_requests):
-            curr_values_at_i = []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-            
-            if curr_values_at_i:
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-            else:
-                mean_curr.append(0)
-                std_curr.append(0)
+        # 요청 순서별 평균과 표준편차 (실제값만, NaN 패딩 제외)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
@@ -281,22 +331,9 @@ class Rule4StateTransitionAnalyzer:
             self.df_result['anomaly_type'].str.contains('상태 전이 오류', na=False)
         ]
         
-        # 방별 오류 위치 매핑
-        room_error_positions = {}
-        total_error_count = 0
-        
-        for room in rooms:
-            room_errors = all_state_errors[all_state_errors['roomNumber'] == room]
-            error_positions = set()
-            
-            for _, error_row in room_errors.iterrows():
-                sequence = error_row['room_entry_sequence']
-                room_data_length = len(room_datasets[room])
-                if sequence >= 1 and sequence <= room_data_length:
-                    error_positions.add(sequence - 1)  # 0-based index로 변환
-            
-            room_error_positions[room] = error_positions
-            total_error_count += len(error_positions)
+        # 방별 오류 위치 (room_entry_sequence 1-based → 0-based, 방 요청 수 범위 안, 방별 중복 제거)
+        error_positions = self._room_error_positions(all_state_errors, partition)
+        total_error_count = len(error_positions)
         
         print(f"   - detected_anomalies 기반 전체 상태 전이 오류: {total_error_count}건")
         
@@ -306,8 +343,6 @@ class Rule4StateTransitionAnalyzer:
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
         # numpy 배열로 변환
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
         ideal_expected_array = np.array(ideal_expected_values)
         
         # 1. 이상적 기대값 (파란색 점선 + 작은 원점)
@@ -326,14 +361,8 @@ class Rule4StateTransitionAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='평균 실제 기록된 인원수 (curr_people)', alpha=0.8)
         
-        # 4. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영)
-        error_marked = False
-        for room, error_positions in room_error_positions.items():
-            for i in error_positions:
-                if i < len(x_positions):
-                    ax.axvspan(i-0.2, i+0.2, ymin=0, ymax=1, color='red', alpha=0.2,
-                            label='상태 전이 오류 발생' if not error_marked else '')
-                    error_marked = True
+        # 4. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영, 컬렉션 하나로 그림)
+        add_span_markers(ax, error_positions, 0.2, color='red', alpha=0.2, label='상태 전이 오류 발생')
         
         print(f"   - 차트에 표시된 상태 전이 오류: {total_error_count}건")
         
@@ -385,27 +414,54 @@ class Rule4StateTransitionAnalyzer:
         
         print(f"✅ 전체 방 차트 저장 완료: {chart_path}")
     
+    def _room_error_positions(self, error_rows, partition):
+        """
+        오류 행의 room_entry_sequence 를 방 안 요청 순서(0부터)로 변환
+        
+        Args:
+            error_rows (DataFrame): 결과 파일의 상태 전이 오류 행
+            partition (RoomPartition): 전처리 데이터의 방 파티션 (방별 요청 수 기준)
+        
+        Returns:
+            ndarray: 모든 방의 오류 위치 (방마다 같은 위치는 한 번만, 전처리 데이터에 없는 방 제외)
+        """
+        room_lengths = pd.Series(partition.room_sizes(), index=partition.rooms)
+        room_errors = error_rows[['roomNumber', 'room_entry_sequence']].dropna().drop_duplicates()
+        sequences = room_errors['room_entry_sequence']
+        in_range = (sequences >= 1) & (sequences <= room_errors['roomNumber'].map(room_lengths))
+        return (sequences[in_range] - 1).astype(int).to_numpy()
+    
     def generate_rule4_csv_report(self):
         """규칙 4 상태 전이 오류 CSV 보고서 생성 - 단순화된 버전"""
+        return self._generate_rule4_csv_report(self.room_number, self.df_result)
+    
+    def _generate_rule4_csv_report(self, room_number, result_data):
+        """
+        규칙 4 상태 전이 오류 CSV 보고서 생성 - 단순화된 버전 (대상 방 / 데이터 지정)
+        
+        Args:
+            room_number (int): 방 번호 (None 이면 전체 방)
+            result_data (DataFrame): 분석 결과 데이터 (해당 방 파티션 슬라이스 또는 전체)
+        """
         print("📋 Rule4 CSV 보고서 생성 시작")
         
         # 단순히 '상태 전이 오류' 포함된 레코드만 필터링
-        state_transition_anomalies = self.df_result[
-            self.df_result['anomaly_type'].str.contains('상태 전이 오류', na=False)
+        state_transition_anomalies = result_data[
+            result_data['anomaly_type'].str.contains('상태 전이 오류', na=False)
         ].copy()
         
         print(f"   - 상태 전이 오류: {len(state_transition_anomalies)}건")
         
         # 방 번호 필터링 (지정된 경우만)
-        if self.room_number is not None:
+        if room_number is not None:
             state_transition_anomalies = state_transition_anomalies[
-                state_transition_anomalies['roomNumber'] == self.room_number
+                state_transition_anomalies['roomNumber'] == room_number
             ]
-            print(f"   - 방 {self.room_number} 필터링 후: {len(state_transition_anomalies)}건")
+            print(f"   - 방 {room_number} 필터링 후: {len(state_transition_anomalies)}건")
         
         # 파일명 생성
-        if self.room_number:
-            csv_filename = f'report_rule4_state_transition_errors_room{self.room_number}.csv'
+        if room_number:
+            csv_filename = f'report_rule4_state_transition_errors_room{room_number}.csv'
         else:
             csv_filename = 'report_rule4_state_transition_errors.csv'
         
@@ -459,11 +515,15 @@ class Rule4StateTransitionAnalyzer:
         self.create_output_folders()
         
         try:
-            # 3. 차트 생성 (단일방 또는 전체방)
-            self.create_rule4_state_transition_chart()
-            
-            # 4. CSV 보고서 생성
-            self.generate_rule4_csv_report()
+            if self.all_rooms:
+                # 3-4. 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성
+                self.create_rule4_all_rooms_reports()
+            else:
+                # 3. 차트 생성 (단일방 또는 전체방)
+                self.create_rule4_state_transition_chart()
+                
+                # 4. CSV 보고서 생성
+                self.generate_rule4_csv_report()
             
         except Exception as e:
             print(f"❌ 분석 중 오류 발생: {e}")
@@ -486,15 +546,25 @@ def main():
   
   # 특정 방 분석  
   python rule4_state_transition_analyzer.py --room_number 1135 --preprocessor_file data.csv --result_file result.csv --output_dir output/
+  
+  # 모든 방의 단일 방 차트/CSV 일괄 생성
+  python rule4_state_transition_analyzer.py --all_rooms --preprocessor_file data.csv --result_file result.csv --output_dir output/ --workers 8
         """
     )
     
-    parser.add_argument(
+    room_group = parser.add_mutually_exclusive_group()
+    room_group.add_argument(
         '--room_number', 
         type=int, 
         help='분석할 특정 방 번호 (생략시 전체 방 종합 분석)'
     )
     
+    room_group.add_argument(
+        '--all_rooms', '--all-rooms',
+        action='store_true',
+        help='모든 방의 단일 방 차트와 CSV 보고서를 한 번에 생성 (데이터 1회 로드 후 방별 파티션 재사용)'
+    )
+    
     parser.add_argument(
         '--preprocessor_file',
         type=str,
@@ -516,6 +586,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # Rule4 분석기 생성 및 실행
@@ -523,7 +600,9 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        all_rooms=args.all_rooms
     )
     
     success = analyzer.run_analysis()
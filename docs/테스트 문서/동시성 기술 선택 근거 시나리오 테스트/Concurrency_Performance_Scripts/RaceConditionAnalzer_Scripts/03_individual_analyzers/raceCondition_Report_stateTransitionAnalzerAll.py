@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import add_span_markers  # 오류 위치 음영 (컬렉션 하나로 그림)
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (순번별 피벗)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -52,11 +59,11 @@ class Rule4StateTransitionAnalyzer:
         """CSV 파일들을 로드하고 전처리"""
         try:
             # 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 결과 파일 로드 (CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -160,18 +167,17 @@ class Rule4StateTransitionAnalyzer:
         print(f"   - 실제값 범위: {min(curr_people_values)} ~ {max(curr_people_values)}")
         
         # detected_anomalies에서 해당 방의 상태 전이 오류 위치 확인
-        error_positions = set()
+        error_positions = np.array([], dtype=np.int64)
         if 'anomaly_type' in self.df_result.columns:
             room_state_errors = self.df_result[
                 (self.df_result['roomNumber'] == self.room_number) &
                 (self.df_result['anomaly_type'].str.contains('상태 전이 오류', na=False))
             ]
             
-            # room_entry_sequence를 request_index로 변환 (1-based → 0-based)
-            for _, error_row in room_state_errors.iterrows():
-                sequence = error_row['room_entry_sequence']
-                if sequence >= 1 and sequence <= total_requests:
-                    error_positions.add(sequence - 1)  # 0-based index로 변환
+            # room_entry_sequence를 request_index로 변환 (1-based → 0-based, 중복 순번은 한 번만)
+            sequences = room_state_errors['room_entry_sequence']
+            in_range = sequences[(sequences >= 1) & (sequences <= total_requests)]
+            error_positions = np.unique(in_range.to_numpy()) - 1
         
         print(f"   - detected_anomalies 기반 상태 전이 오류: {len(error_positions)}건")
         
@@ -194,12 +200,8 @@ class Rule4StateTransitionAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='실제 기록된 인원수 (curr_people)', alpha=0.8)
         
-        # 3. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영)
-        error_marked = False
-        for i in error_positions:
-            ax.axvspan(i-0.3, i+0.3, ymin=0, ymax=1, color='red', alpha=0.3,
-                    label='상태 전이 오류 발생' if not error_marked else '')
-            error_marked = True
+        # 3. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영, 컬렉션 하나로 그림)
+        add_span_markers(ax, error_positions, 0.3, color='red', alpha=0.3, label='상태 전이 오류 발생')
         
         print(f"   - 차트에 표시된 상태 전이 오류: {len(error_positions)}건")
         
@@ -246,16 +248,10 @@ class Rule4StateTransitionAnalyzer:
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule4 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 제거 - 원천 데이터 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 원천 데이터 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_requests = curr_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
@@ -267,47 +263,24 @@ class Rule4StateTransitionAnalyzer:
         # 이상적 기대값 (평균 최대 정원 초과 안함: index + 2, 단 avg_max_people 초과 안함)
         ideal_expected_values = [min(i + 2, avg_max_people) for i in x_positions]
         
-        # 평균과 표준편차 계산 (실제값만)
-        mean_curr, std_curr = [], []
-        
-        for i in range(max_requests):
-            curr_values_at_i = []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-            
-            if curr_values_at_i:
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-            else:
-                mean_curr.append(0)
-                std_curr.append(0)
+        # 요청 순서별 평균과 표준편차 (실제값만, NaN 패딩 제외)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
         # detected_anomalies에서 모든 방의 상태 전이 오류 위치 확인
-        room_error_positions = {}
-        total_error_count = 0
+        error_positions = []
         
         if 'anomaly_type' in self.df_result.columns:
             all_state_errors = self.df_result[
                 self.df_result['anomaly_type'].str.contains('상태 전이 오류', na=False)
             ]
             
-            # 방별 오류 위치 매핑
-            for room in rooms:
-                room_errors = all_state_errors[all_state_errors['roomNumber'] == room]
-                error_positions = set()
-                
-                for _, error_row in room_errors.iterrows():
-                    sequence = error_row['room_entry_sequence']
-                    room_data_length = len(room_datasets[room])
-                    if sequence >= 1 and sequence <= room_data_length:
-                        error_positions.add(sequence - 1)  # 0-based index로 변환
-                
-                room_error_positions[room] = error_positions
-                total_error_count += len(error_positions)
+            # 방별 오류 위치 (room_entry_sequence 1-based → 0-based, 방 요청 수 범위 안, 방별 중복 제거)
+            error_positions = self._room_error_positions(all_state_errors, partition)
+        
+        total_error_count = len(error_positions)
         
         print(f"   - detected_anomalies 기반 전체 상태 전이 오류: {total_error_count}건")
         
@@ -317,8 +290,6 @@ class Rule4StateTransitionAnalyzer:
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
         # numpy 배열로 변환
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
         ideal_expected_array = np.array(ideal_expected_values)
         
         # 1. 이상적 기대값 (파란색 점선 + 작은 원점)
@@ -337,14 +308,8 @@ class Rule4StateTransitionAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='평균 실제 기록된 인원수 (curr_people)', alpha=0.8)
         
-        # 4. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영)
-        error_marked = False
-        for room, error_positions in room_error_positions.items():
-            for i in error_positions:
-                if i < len(x_positions):
-                    ax.axvspan(i-0.2, i+0.2, ymin=0, ymax=1, color='red', alpha=0.2,
-                            label='상태 전이 오류 발생' if not error_marked else '')
-                    error_marked = True
+        # 4. detected_anomalies 기반 상태 전이 오류 표식 (빨간색 수직 음영, 컬렉션 하나로 그림)
+        add_span_markers(ax, error_positions, 0.2, color='red', alpha=0.2, label='상태 전이 오류 발생')
         
         print(f"   - 차트에 표시된 상태 전이 오류: {total_error_count}건")
         
@@ -401,6 +366,23 @@ class Rule4StateTransitionAnalyzer:
         
         print(f"✅ 전체 방 차트 저장 완료: {chart_path}")
     
+    def _room_error_positions(self, error_rows, partition):
+        """
+        오류 행의 room_entry_sequence 를 방 안 요청 순서(0부터)로 변환
+        
+        Args:
+            error_rows (DataFrame): 결과 파일의 상태 전이 오류 행
+            partition (RoomPartition): 전처리 데이터의 방 파티션 (방별 요청 수 기준)
+        
+        Returns:
+            ndarray: 모든 방의 오류 위치 (방마다 같은 위치는 한 번만, 전처리 데이터에 없는 방 제외)
+        """
+        room_lengths = pd.Series(partition.room_sizes(), index=partition.rooms)
+        room_errors = error_rows[['roomNumber', 'room_entry_sequence']].dropna().drop_duplicates()
+        sequences = room_errors['room_entry_sequence']
+        in_range = (sequences >= 1) & (sequences <= room_errors['roomNumber'].map(room_lengths))
+        return (sequences[in_range] - 1).astype(int).to_numpy()
+    
     def generate_rule4_csv_report(self):
         """규칙 4 전체 스레드 CSV 보고서 생성 (오류 여부 무관, 모든 스레드 포함)"""
         print("📋 Rule4 전체 스레드 CSV 보고서 생성 시작")
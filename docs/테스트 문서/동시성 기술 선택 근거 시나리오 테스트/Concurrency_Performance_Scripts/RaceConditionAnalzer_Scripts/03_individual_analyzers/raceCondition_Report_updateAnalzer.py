@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler, add_span_markers  # 차트 병렬 렌더링 (프로세스 풀) / 오류 위치 음영
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (전체 방 일괄 분석)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,8 +32,64 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_rule1_single_room_chart(chart_path, chart):
+    """
+    규칙 1: 단일 방 상세 분석 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_rule1_single_room_chart 반환값)
+    """
+    total_requests = chart['total_requests']
+    x_positions = list(range(total_requests))
+    
+    # 차트 생성
+    fig, ax = plt.subplots(figsize=(20, 12))
+    title = f'규칙 1: 값 불일치(Lost Update) 분석 - 방 {chart["room_number"]}'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 1. 연산 시점의 기대값 (파란색 실선 + 작은 원점)
+    ax.plot(x_positions, chart['expected_people_viz'], 'b-', linewidth=2, 
+            marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
+            label='연산 시점의 기대값 (expected_people)', alpha=0.8)
+    
+    # 2. 실제 기록된 최종값 (주황색 실선 + 작은 원점)
+    ax.plot(x_positions, chart['curr_people_values'], color='orange', linewidth=2,
+            marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
+            label='실제 기록된 최종값 (curr_people)', alpha=0.8)
+    
+    # 3. 값 불일치 강조 표식 (빨간색 수직 음영, 컬렉션 하나로 그림)
+    add_span_markers(ax, chart['mismatch_positions'], 0.3, color='red', alpha=0.3, label='값 불일치 (Lost Update)')
+    
+    # X축 10개 동일 간격 눈금
+    tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
+    if tick_positions and tick_positions[-1] != total_requests - 1:
+        tick_positions.append(total_requests - 1)
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(tick_positions)
+    
+    # Y축 설정
+    ax.set_ylim(1, chart['y_max'])
+    
+    # 범례를 좌측 상단에 배치
+    ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
+    
+    # 통계 정보 박스를 범례 우측에 배치 (약 2cm 간격)
+    ax.text(0.2, 0.98, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
+    
+    # 차트 마무리
+    ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class Rule1LostUpdateAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1, all_rooms=False):
         """
         Rule 1 Lost Update 분석기 초기화
         
@@ -35,11 +98,15 @@ class Rule1LostUpdateAnalyzer:
             preprocessor_file (str): 전처리 데이터 파일 경로 (차트용)
             result_file (str): 분석 결과 데이터 파일 경로 (CSV용)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
+            all_rooms (bool): 모든 방의 단일 방 차트/CSV 보고서를 한 번에 생성 (데이터 1회 로드)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
+        self.all_rooms = all_rooms
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -52,11 +119,11 @@ class Rule1LostUpdateAnalyzer:
         """CSV 파일들을 로드하고 전처리"""
         try:
             # 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 결과 파일 로드 (CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -113,76 +180,62 @@ class Rule1LostUpdateAnalyzer:
     
     def create_rule1_single_room_chart(self):
         """규칙 1: 단일 방 상세 분석 차트 생성"""
-        room_data = self.df_preprocessor.copy()
+        chart = self._prepare_rule1_single_room_chart(self.room_number, self.df_preprocessor)
+        if chart is None:
+            return
+        
+        # 파일 저장 (차트 렌더링 스케줄러)
+        filename = f'rule1_lost_update_analysis_room{self.room_number}.png'
+        chart_path = os.path.join(self.output_dir, filename)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        scheduler.submit(chart_path, render_rule1_single_room_chart, chart_path, chart)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+    
+    def _prepare_rule1_single_room_chart(self, room_number, room_data):
+        """
+        규칙 1: 단일 방 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_data (DataFrame): 해당 방 전처리 데이터 (원본 순서)
+        
+        Returns:
+            dict: render_rule1_single_room_chart 입력 데이터 (데이터가 비어 있으면 None)
+        """
         if room_data.empty:
             print("❌ 단일 방 데이터가 비어있어 차트 생성을 건너뜁니다.")
-            return
+            return None
         
-        print(f"🎯 단일 방 {self.room_number} Rule1 차트 생성 시작")
+        print(f"🎯 단일 방 {room_number} Rule1 차트 생성 시작")
         
         # X축: 스레드 요청 순서 (인덱스)
         total_requests = len(room_data)
-        x_positions = list(range(total_requests))
         print(f"   - 총 요청 수: {total_requests}")
         
         # Y축 데이터 준비
-        expected_people_raw = room_data['expected_people'].tolist()
+        expected_people_raw = room_data['expected_people']
         curr_people_values = room_data['curr_people'].tolist()
         max_people = room_data['max_people'].iloc[0] if not room_data.empty else 20
         print(f"   - 최대 정원: {max_people}")
         
         # expected_people 시각화용 처리 (NaN을 max_people로 대체)
-        expected_people_viz = [max_people if pd.isna(x) else x for x in expected_people_raw]
-        nan_count = sum(1 for x in expected_people_raw if pd.isna(x))
+        expected_people_viz = [max_people if pd.isna(x) else x for x in expected_people_raw.tolist()]
+        nan_count = int(expected_people_raw.isna().sum())
         print(f"   - NaN 값 {nan_count}개를 max_people({max_people})로 대체")
         
         # Y축 최댓값 동적 계산
         y_max = max(max(expected_people_viz), max(curr_people_values)) * 1.2
         print(f"   - Y축 최댓값: {y_max:.1f}")
         
-        # 차트 생성
-        fig, ax = plt.subplots(figsize=(20, 12))
-        title = f'규칙 1: 값 불일치(Lost Update) 분석 - 방 {self.room_number}'
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # 1. 연산 시점의 기대값 (파란색 실선 + 작은 원점)
-        ax.plot(x_positions, expected_people_viz, 'b-', linewidth=2, 
-                marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
-                label='연산 시점의 기대값 (expected_people)', alpha=0.8)
-        
-        # 2. 실제 기록된 최종값 (주황색 실선 + 작은 원점)
-        ax.plot(x_positions, curr_people_values, color='orange', linewidth=2,
-                marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
-                label='실제 기록된 최종값 (curr_people)', alpha=0.8)
-        
-        # 3. 값 불일치 강조 표식 (빨간색 수직 음영)
-        mismatch_count = 0
-        for i in range(total_requests):
-            original_expected = room_data.iloc[i]['expected_people']
-            actual = curr_people_values[i]
-            
-            if pd.notna(original_expected) and original_expected != actual:
-                ax.axvspan(i-0.3, i+0.3, ymin=0, ymax=1, color='red', alpha=0.3, 
-                        label='값 불일치 (Lost Update)' if mismatch_count == 0 else '')
-                mismatch_count += 1
-        
+        # 값 불일치 위치 (기대값이 있고 실제 기록값과 다른 요청)
+        mismatch_mask = expected_people_raw.notna() & (expected_people_raw != room_data['curr_people'])
+        mismatch_positions = np.flatnonzero(mismatch_mask.to_numpy()).tolist()
+        mismatch_count = len(mismatch_positions)
         print(f"   - 값 불일치 발생: {mismatch_count}건")
         
-        # X축 10개 동일 간격 눈금
-        tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
-        if tick_positions and tick_positions[-1] != total_requests - 1:
-            tick_positions.append(total_requests - 1)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels(tick_positions)
-        
-        # Y축 설정
-        ax.set_ylim(1, y_max)
-        
-        # 범례를 좌측 상단에 배치
-        ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
-        
-        # 통계 정보 박스를 범례 우측에 배치 (약 2cm 간격)
-        valid_expected_count = len([x for x in expected_people_raw if pd.notna(x)])
+        # 통계 정보 박스
+        valid_expected_count = total_requests - nan_count
         stats_text = (f'총 요청: {total_requests:,}건\n'
                     f'유효 기대값: {valid_expected_count:,}건\n'
                     f'값 불일치: {mismatch_count:,}건')
@@ -191,66 +244,58 @@ class Rule1LostUpdateAnalyzer:
             mismatch_rate = mismatch_count / valid_expected_count * 100
             stats_text += f'\n불일치 비율: {mismatch_rate:.1f}%'
         
-        ax.text(0.2, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
-        
-        # 차트 마무리
-        ax.set_xlabel('스레드 요청 순서 (Index)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('측정값', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = f'rule1_lost_update_analysis_room{self.room_number}.png'
-        chart_path = os.path.join(self.output_dir, filename)
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        return {
+            'room_number': room_number,
+            'total_requests': total_requests,
+            'expected_people_viz': expected_people_viz,
+            'curr_people_values': curr_people_values,
+            'mismatch_positions': mismatch_positions,
+            'y_max': y_max,
+            'stats_text': stats_text
+        }
+
+    def create_rule1_all_rooms_reports(self):
+        """규칙 1: 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성 (방별 재필터링 없이 파티션 슬라이스 사용)"""
+        preprocessor_partition = RoomPartition(self.df_preprocessor)
+        result_partition = RoomPartition(self.df_result)
+        rooms = sorted({int(room) for room in preprocessor_partition.rooms} | {int(room) for room in result_partition.rooms})
+        print(f"🏢 전체 방 일괄 분석: {len(rooms)}개 방")
+        
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        for room_number in rooms:
+            room_data = preprocessor_partition.frame(room_number).reset_index(drop=True)
+            chart = self._prepare_rule1_single_room_chart(room_number, room_data)
+            if chart is not None:
+                chart_path = os.path.join(self.output_dir, f'rule1_lost_update_analysis_room{room_number}.png')
+                scheduler.submit(chart_path, render_rule1_single_room_chart, chart_path, chart)
+            
+            self._generate_rule1_csv_report(room_number, result_partition.frame(room_number))
         
-        print(f"✅ 단일 방 차트 저장 완료: {chart_path}")
+        # 모든 방 차트를 한 스케줄러에서 렌더링 (workers > 1 이면 병렬)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 차트 저장 완료: {saved_path}")
+        print(f"✅ 전체 방 일괄 분석 완료: 차트/CSV {len(rooms)}개 방")
     
     def create_rule1_multi_room_chart(self):
         """규칙 1: 전체 방 종합 분석 차트 생성"""
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule1 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 제거 - 원본 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)  # 정렬 제거, 원본 순서 유지
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 원본 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        expected_viz = self.df_preprocessor['expected_people'].fillna(self.df_preprocessor['max_people'])
+        expected_matrix = partition.padded_matrix(expected_viz)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_requests = expected_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
         
-        # 평균과 표준편차 계산
-        mean_expected, std_expected, mean_curr, std_curr = [], [], [], []
-        
-        for i in range(max_requests):
-            expected_values_at_i, curr_values_at_i = [], []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    expected_val = dataset.iloc[i]['expected_people']
-                    if pd.isna(expected_val):
-                        expected_val = dataset.iloc[i]['max_people']
-                    expected_values_at_i.append(expected_val)
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-            
-            if expected_values_at_i and curr_values_at_i:
-                mean_expected.append(np.mean(expected_values_at_i))
-                std_expected.append(np.std(expected_values_at_i))
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-            else:
-                mean_expected.append(0)
-                std_expected.append(0)
-                mean_curr.append(0)
-                std_curr.append(0)
+        # 요청 순서별 평균과 표준편차 (NaN 패딩 제외)
+        mean_expected_array = np.nanmean(expected_matrix, axis=0)
+        std_expected_array = np.nanstd(expected_matrix, axis=0)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
@@ -259,12 +304,6 @@ class Rule1LostUpdateAnalyzer:
         title = f"규칙 1: 값 불일치(Lost Update) 분석 - 전체 {len(rooms)}개 방 평균 및 표준편차"
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
-        # numpy 배열로 변환
-        mean_expected_array = np.array(mean_expected)
-        std_expected_array = np.array(std_expected)
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
-        
         # 표준편차 시각화 (평균 ± 표준편차)
         ax.fill_between(x_positions, 
                     mean_expected_array - std_expected_array, 
@@ -284,16 +323,13 @@ class Rule1LostUpdateAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='실제 기록된 최종값 (curr_people)', alpha=0.4)
         
-        # 값 불일치 표식 - 수직 음영
-        mismatch_count = 0
-        for room, dataset in room_datasets.items():
-            for i, row in dataset.iterrows():
-                original_expected = row['expected_people']
-                actual = row['curr_people']
-                if pd.notna(original_expected) and original_expected != actual and i < len(x_positions):
-                    ax.axvspan(i-0.2, i+0.2, ymin=0, ymax=1, color='red', alpha=0.2,
-                            label='값 불일치 (Lost Update)' if mismatch_count == 0 else '')
-                    mismatch_count += 1
+        # 값 불일치 표식 - 수직 음영 (모든 방의 불일치 위치 = 방 안 요청 순서, 컬렉션 하나로 그림)
+        expected_people = self.df_preprocessor['expected_people']
+        mismatch_mask = (expected_people.notna() & (expected_people != self.df_preprocessor['curr_people'])).to_numpy()
+        request_order = partition.within_room_rank()
+        mismatch_positions = request_order[mismatch_mask & (request_order >= 0)]
+        add_span_markers(ax, mismatch_positions, 0.2, color='red', alpha=0.2, label='값 불일치 (Lost Update)')
+        mismatch_count = len(mismatch_positions)
         
         print(f"   - 전체 값 불일치: {mismatch_count}건")
         
@@ -347,18 +383,28 @@ class Rule1LostUpdateAnalyzer:
     
     def generate_rule1_csv_report(self):
         """규칙 1 오류 데이터 CSV 보고서 생성"""
+        return self._generate_rule1_csv_report(self.room_number, self.df_result)
+    
+    def _generate_rule1_csv_report(self, room_number, result_data):
+        """
+        규칙 1 오류 데이터 CSV 보고서 생성 (대상 방 / 데이터 지정)
+        
+        Args:
+            room_number (int): 방 번호 (None 이면 전체 방)
+            result_data (DataFrame): 분석 결과 데이터 (해당 방 파티션 슬라이스 또는 전체)
+        """
         print("📋 Rule1 CSV 보고서 생성 시작")
         
         # anomaly_type에 '값 불일치' 포함된 레코드 필터링
-        lost_update_anomalies = self.df_result[
-            self.df_result['anomaly_type'].fillna('').str.contains('값 불일치', na=False)
+        lost_update_anomalies = result_data[
+            result_data['anomaly_type'].fillna('').str.contains('값 불일치', na=False)
         ].copy()
         
         print(f"   - 값 불일치 이상 현상: {len(lost_update_anomalies)}건")
         
         # 파일명 생성
-        if self.room_number:
-            csv_filename = f'report_rule1_lost_update_errors_room{self.room_number}.csv'
+        if room_number:
+            csv_filename = f'report_rule1_lost_update_errors_room{room_number}.csv'
         else:
             csv_filename = 'report_rule1_lost_update_errors.csv'
         
@@ -390,8 +436,8 @@ class Rule1LostUpdateAnalyzer:
             csv_df = csv_df[required_columns]
             
             # 방 번호 필터링 (이중 확인)
-            if self.room_number is not None:
-                csv_df = csv_df[csv_df['roomNumber'] == self.room_number]
+            if room_number is not None:
+                csv_df = csv_df[csv_df['roomNumber'] == room_number]
             
             # 정렬 (CSV 출력용 - 보고서 가독성을 위해 유지)
             if not csv_df.empty:
@@ -419,14 +465,18 @@ class Rule1LostUpdateAnalyzer:
         self.create_output_folders()
         
         try:
-            # 3. 차트 생성 (단일방 또는 전체방)
-            if self.room_number is not None:
-                self.create_rule1_single_room_chart()
+            if self.all_rooms:
+                # 3-4. 모든 방의 단일 방 차트 + CSV 보고서 일괄 생성
+                self.create_rule1_all_rooms_reports()
             else:
-                self.create_rule1_multi_room_chart()
-            
-            # 4. CSV 보고서 생성
-            self.generate_rule1_csv_report()
+                # 3. 차트 생성 (단일방 또는 전체방)
+                if self.room_number is not None:
+                    self.create_rule1_single_room_chart()
+                else:
+                    self.create_rule1_multi_room_chart()
+                
+                # 4. CSV 보고서 생성
+                self.generate_rule1_csv_report()
             
         except Exception as e:
             print(f"❌ 분석 중 오류 발생: {e}")
@@ -449,15 +499,25 @@ def main():
   
   # 특정 방 분석  
   python rule1_lost_update_analyzer.py --room_number 1135 --preprocessor_file data.csv --result_file result.csv --output_dir output/
+  
+  # 모든 방의 단일 방 차트/CSV 일괄 생성
+  python rule1_lost_update_analyzer.py --all_rooms --preprocessor_file data.csv --result_file result.csv --output_dir output/ --workers 8
         """
     )
     
-    parser.add_argument(
+    room_group = parser.add_mutually_exclusive_group()
+    room_group.add_argument(
         '--room_number', 
         type=int, 
         help='분석할 특정 방 번호 (생략시 전체 방 종합 분석)'
     )
     
+    room_group.add_argument(
+        '--all_rooms', '--all-rooms',
+        action='store_true',
+        help='모든 방의 단일 방 차트와 CSV 보고서를 한 번에 생성 (데이터 1회 로드 후 방별 파티션 재사용)'
+    )
+    
     parser.add_argument(
         '--preprocessor_file',
         type=str,
@@ -479,6 +539,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # Rule1 분석기 생성 및 실행
@@ -486,7 +553,9 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        all_rooms=args.all_rooms
     )
     
     success = analyzer.run_analysis()
@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.chart_render import add_span_markers  # 오류 위치 음영 (컬렉션 하나로 그림)
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (순번별 피벗)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -52,11 +59,11 @@ class Rule1LostUpdateAnalyzer:
         """CSV 파일들을 로드하고 전처리"""
         try:
             # 전처리 파일 로드 (차트용)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 결과 파일 로드 (CSV용)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 결과 파일 로드 완료: {len(self.df_result)}건")
             
             # 나노초 정밀도 데이터 확인
@@ -155,16 +162,12 @@ class Rule1LostUpdateAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='실제 기록된 최종값 (curr_people)', alpha=0.8)
         
-        # 3. 값 불일치 강조 표식 (빨간색 수직 음영)
-        mismatch_count = 0
-        for i in range(total_requests):
-            original_expected = room_data.iloc[i]['expected_people']
-            actual = curr_people_values[i]
-            
-            if pd.notna(original_expected) and original_expected != actual:
-                ax.axvspan(i-0.3, i+0.3, ymin=0, ymax=1, color='red', alpha=0.3, 
-                        label='값 불일치 (Lost Update)' if mismatch_count == 0 else '')
-                mismatch_count += 1
+        # 3. 값 불일치 강조 표식 (빨간색 수직 음영, 기대값이 있고 실제 기록값과 다른 요청 위치를 컬렉션 하나로 그림)
+        expected_people = room_data['expected_people']
+        mismatch_mask = expected_people.notna() & (expected_people != room_data['curr_people'])
+        mismatch_positions = np.flatnonzero(mismatch_mask.to_numpy())
+        mismatch_count = len(mismatch_positions)
+        add_span_markers(ax, mismatch_positions, 0.3, color='red', alpha=0.3, label='값 불일치 (Lost Update)')
         
         print(f"   - 값 불일치 발생: {mismatch_count}건")
         
@@ -213,44 +216,21 @@ class Rule1LostUpdateAnalyzer:
         rooms = self.df_preprocessor['roomNumber'].unique()
         print(f"🎯 전체 {len(rooms)}개 방 Rule1 종합 차트 생성 시작")
         
-        # 각 방별 데이터 정리 (정렬 제거 - 원본 순서 유지)
-        room_datasets = {}
-        max_requests = 0
-        
-        for room in rooms:
-            room_subset = self.df_preprocessor[
-                self.df_preprocessor['roomNumber'] == room
-            ].reset_index(drop=True)  # 정렬 제거, 원본 순서 유지
-            room_datasets[room] = room_subset
-            max_requests = max(max_requests, len(room_subset))
+        # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩 - 원본 순서 유지)
+        partition = RoomPartition(self.df_preprocessor)
+        expected_viz = self.df_preprocessor['expected_people'].fillna(self.df_preprocessor['max_people'])
+        expected_matrix = partition.padded_matrix(expected_viz)
+        curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+        max_requests = expected_matrix.shape[1]
         
         print(f"   - 최대 요청 수: {max_requests}")
         x_positions = list(range(max_requests))
         
-        # 평균과 표준편차 계산
-        mean_expected, std_expected, mean_curr, std_curr = [], [], [], []
-        
-        for i in range(max_requests):
-            expected_values_at_i, curr_values_at_i = [], []
-            
-            for room, dataset in room_datasets.items():
-                if i < len(dataset):
-                    expected_val = dataset.iloc[i]['expected_people']
-                    if pd.isna(expected_val):
-                        expected_val = dataset.iloc[i]['max_people']
-                    expected_values_at_i.append(expected_val)
-                    curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-            
-            if expected_values_at_i and curr_values_at_i:
-                mean_expected.append(np.mean(expected_values_at_i))
-                std_expected.append(np.std(expected_values_at_i))
-                mean_curr.append(np.mean(curr_values_at_i))
-                std_curr.append(np.std(curr_values_at_i))
-            else:
-                mean_expected.append(0)
-                std_expected.append(0)
-                mean_curr.append(0)
-                std_curr.append(0)
+        # 요청 순서별 평균과 표준편차 (NaN 패딩 제외)
+        mean_expected_array = np.nanmean(expected_matrix, axis=0)
+        std_expected_array = np.nanstd(expected_matrix, axis=0)
+        mean_curr_array = np.nanmean(curr_matrix, axis=0)
+        std_curr_array = np.nanstd(curr_matrix, axis=0)
         
         print(f"   - 평균/표준편차 계산 완료")
         
@@ -259,12 +239,6 @@ class Rule1LostUpdateAnalyzer:
         title = f"규칙 1: 값 불일치(Lost Update) 분석 - 전체 {len(rooms)}개 방 평균 및 표준편차"
         ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
         
-        # numpy 배열로 변환
-        mean_expected_array = np.array(mean_expected)
-        std_expected_array = np.array(std_expected)
-        mean_curr_array = np.array(mean_curr)
-        std_curr_array = np.array(std_curr)
-        
         # 표준편차 시각화 (평균 ± 표준편차)
         ax.fill_between(x_positions, 
                     mean_expected_array - std_expected_array, 
@@ -284,16 +258,13 @@ class Rule1LostUpdateAnalyzer:
                 marker='o', markersize=3, markerfacecolor='orange', markeredgecolor='orange',
                 label='실제 기록된 최종값 (curr_people)', alpha=0.4)
         
-        # 값 불일치 표식 - 수직 음영
-        mismatch_count = 0
-        for room, dataset in room_datasets.items():
-            for i, row in dataset.iterrows():
-                original_expected = row['expected_people']
-                actual = row['curr_people']
-                if pd.notna(original_expected) and original_expected != actual and i < len(x_positions):
-                    ax.axvspan(i-0.2, i+0.2, ymin=0, ymax=1, color='red', alpha=0.2,
-                            label='값 불일치 (Lost Update)' if mismatch_count == 0 else '')
-                    mismatch_count += 1
+        # 값 불일치 표식 - 수직 음영 (모든 방의 불일치 위치 = 방 안 요청 순서, 컬렉션 하나로 그림)
+        expected_people = self.df_preprocessor['expected_people']
+        mismatch_mask = (expected_people.notna() & (expected_people != self.df_preprocessor['curr_people'])).to_numpy()
+        request_order = partition.within_room_rank()
+        mismatch_positions = request_order[mismatch_mask & (request_order >= 0)]
+        add_span_markers(ax, mismatch_positions, 0.2, color='red', alpha=0.2, label='값 불일치 (Lost Update)')
+        mismatch_count = len(mismatch_positions)
         
         print(f"   - 전체 값 불일치: {mismatch_count}건")
         
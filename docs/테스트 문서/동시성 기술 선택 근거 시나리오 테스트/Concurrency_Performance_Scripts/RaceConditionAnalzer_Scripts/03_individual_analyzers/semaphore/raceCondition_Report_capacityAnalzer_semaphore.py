@@ -6,10 +6,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler, add_span_markers  # 차트 병렬 렌더링 (프로세스 풀) / 오류 위치 음영
+from common.room_partition import RoomPartition  # 방별 행 위치 인덱스 (순번별 피벗)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,15 +32,101 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_semaphore_capacity_single_room_chart(chart_path, chart):
+    """단일 방 세마포어 정원 초과 방지 효과성 차트 렌더링 (차트 렌더링 작업 단위, chart = _prepare_single_room_semaphore_chart 반환값)"""
+    room_number = chart['room_number']
+    total_requests = chart['total_requests']
+    max_people = chart['max_people']
+    
+    # 차트 생성
+    fig, ax = plt.subplots(figsize=(20, 12))
+    
+    if chart['data_exists']:
+        # X축: 세마포어 permit 요청 순서
+        x_positions = list(range(total_requests))
+        curr_people_values = chart['curr_people_values']
+        
+        # 성공 상태에 따른 제목 설정
+        if chart['capacity_exceeded_count'] == 0:
+            success_indicator = "완벽한 성공"
+        else:
+            success_indicator = "오류 발견"
+        
+        title = "세마포어 정원 초과 방지 효과성 분석 - 방 " + str(room_number) + " (" + success_indicator + ")"
+        
+        # 1. 최대 permit 한계선
+        ax.axhline(y=max_people, color='red', linestyle='--', linewidth=3, 
+                   label='세마포어 permit 한계선 (max_people = ' + str(max_people) + ')', alpha=0.9)
+        
+        # 2. 실제 permit 사용량
+        if curr_people_values:
+            ax.plot(x_positions, curr_people_values, color='blue', linewidth=2,
+                    marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
+                    label='실제 permit 사용량 (curr_people)', alpha=0.8)
+    else:
+        # 데이터 없음 제목
+        title = "세마포어 정원 초과 방지 효과성 분석 - 방 " + str(room_number) + " (데이터 없음)"
+        
+        # 기본 permit 한계선
+        ax.axhline(y=max_people, color='red', linestyle='--', linewidth=3, 
+                   label='세마포어 permit 한계선 (기본값 = ' + str(max_people) + ')', alpha=0.9)
+        
+        # 데이터 없음 표시
+        no_data_text = "방 " + str(room_number) + "에\n세마포어 데이터가 없습니다"
+        ax.text(0.5, 0.5, no_data_text, 
+               transform=ax.transAxes, fontsize=20, fontweight='bold',
+               ha='center', va='center', 
+               bbox=dict(boxstyle='round,pad=1', facecolor='lightgray', alpha=0.8))
+    
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 3. 정원 초과 발생 시점 강조 (음영/강조점 각각 컬렉션 하나로 그림)
+    add_span_markers(ax, chart['error_positions'], 0.3, color='red', alpha=0.5, label='정원 초과 오류 발생')
+    if chart['error_positions']:
+        ax.scatter(chart['error_positions'], chart['error_values'], color='red', s=50, alpha=1.0, zorder=5)
+    
+    # X축 눈금 설정
+    if chart['data_exists'] and total_requests > 0:
+        tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
+        if tick_positions and tick_positions[-1] != total_requests - 1:
+            tick_positions.append(total_requests - 1)
+        ax.set_xticks(tick_positions)
+        ax.set_xticklabels(tick_positions)
+    else:
+        ax.set_xticks([0, 10, 20, 30, 40, 50])
+        ax.set_xticklabels([0, 10, 20, 30, 40, 50])
+    
+    # Y축 설정
+    ax.set_ylim(0, chart['y_max'])
+    
+    # 범례 설정
+    ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
+    
+    # 통계 정보 박스
+    ax.text(0.22, 0.98, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', 
+            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
+    
+    # 축 레이블
+    ax.set_xlabel('세마포어 permit 요청 순서', fontsize=12, fontweight='bold')
+    ax.set_ylabel('permit 개수', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class SemaphoreCapacityAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1):
         """
-        Semaphore 정원 초과 방지 효과성 분석기 초기화
+        Semaphore 정원 초과 방지 효과성 분석기 초기화 (workers = 차트 렌더링 프로세스 수)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -48,11 +141,11 @@ class SemaphoreCapacityAnalyzer:
         """CSV 파일을 로드하고 세마포어 데이터 전처리"""
         try:
             # 1. 전처리 파일 로드
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print("전처리 파일 로드 완료: " + str(len(self.df_preprocessor)) + "건")
             
             # 2. 결과 파일 로드
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print("결과 파일 로드 완료: " + str(len(self.df_result)) + "건")
             
             # 3. 세마포어 특화 데이터 검증
@@ -165,21 +258,35 @@ class SemaphoreCapacityAnalyzer:
     
     def _create_single_room_semaphore_chart(self):
         """단일 방 세마포어 정원 초과 방지 효과성 차트"""
-        room_data = self.df_preprocessor.copy()
+        chart = self._prepare_single_room_semaphore_chart(self.room_number, self.df_preprocessor, self.df_result)
+        
+        # 파일 저장 (차트 렌더링 스케줄러)
+        filename = 'semaphore_capacity_analysis_room' + str(self.room_number) + '.png'
+        chart_path = os.path.join(self.output_dir, filename)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        scheduler.submit(chart_path, render_semaphore_capacity_single_room_chart, chart_path, chart)
+        scheduler.run()
+    
+    def _prepare_single_room_semaphore_chart(self, room_number, room_data, room_result):
+        """단일 방 세마포어 차트 데이터 계산 (room_data/room_result = 해당 방 전처리/결과 데이터, 렌더링 작업에는 이 결과만 전달)"""
         data_exists = not room_data.empty
         
         if data_exists:
-            print("방 " + str(self.room_number) + " 세마포어 효과성 차트 생성 시작")
+            print("방 " + str(room_number) + " 세마포어 효과성 차트 생성 시작")
         else:
-            print("방 " + str(self.room_number) + " 세마포어 효과성 차트 생성 시작 (데이터 없음)")
+            print("방 " + str(room_number) + " 세마포어 효과성 차트 생성 시작 (데이터 없음)")
         
-        # 차트 생성
-        fig, ax = plt.subplots(figsize=(20, 12))
+        capacity_errors = room_result[
+            room_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
+        ]
+        capacity_exceeded_count = len(capacity_errors)
         
+        curr_people_values = []
+        error_positions = []
+        error_values = []
         if data_exists:
             # X축: 세마포어 permit 요청 순서
             total_requests = len(room_data)
-            x_positions = list(range(total_requests))
             
             # Y축 데이터: permit 개수
             curr_people_values = room_data['curr_people'].tolist()
@@ -191,113 +298,50 @@ class SemaphoreCapacityAnalyzer:
             else:
                 y_max = max_people * 1.2
             
-            # 성공 상태에 따른 제목 설정
-            if self.perfect_success:
-                success_indicator = "완벽한 성공"
-            else:
-                success_indicator = "오류 발견"
-            
-            title = "세마포어 정원 초과 방지 효과성 분석 - 방 " + str(self.room_number) + " (" + success_indicator + ")"
-            
-            # 1. 최대 permit 한계선
-            ax.axhline(y=max_people, color='red', linestyle='--', linewidth=3, 
-                       label='세마포어 permit 한계선 (max_people = ' + str(max_people) + ')', alpha=0.9)
-            
-            # 2. 실제 permit 사용량
-            if curr_people_values:
-                ax.plot(x_positions, curr_people_values, color='blue', linewidth=2,
-                        marker='o', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
-                        label='실제 permit 사용량 (curr_people)', alpha=0.8)
-        else:
-            # 데이터가 없는 경우 기본 설정
-            total_requests = 0
-            max_people = 20
-            y_max = max_people * 1.2
-            
-            # 데이터 없음 제목
-            title = "세마포어 정원 초과 방지 효과성 분석 - 방 " + str(self.room_number) + " (데이터 없음)"
-            
-            # 기본 permit 한계선
-            ax.axhline(y=max_people, color='red', linestyle='--', linewidth=3, 
-                       label='세마포어 permit 한계선 (기본값 = ' + str(max_people) + ')', alpha=0.9)
-            
-            # 데이터 없음 표시
-            no_data_text = "방 " + str(self.room_number) + "에\n세마포어 데이터가 없습니다"
-            ax.text(0.5, 0.5, no_data_text, 
-                   transform=ax.transAxes, fontsize=20, fontweight='bold',
-                   ha='center', va='center', 
-                   bbox=dict(boxstyle='round,pad=1', facecolor='lightgray', alpha=0.8))
-        
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # 3. 정원 초과 발생 시점 강조
-        if data_exists and self.capacity_exceeded_count > 0:
-            capacity_errors = self.df_result[
-                self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
-            ]
+            # 정원 초과 발생 시점 (user_id 로 전처리 데이터와 매칭)
+            if capacity_exceeded_count > 0:
+                for _, error_row in capacity_errors.iterrows():
+                    matching_rows = room_data[room_data['user_id'] == error_row['user_id']]
+                    
+                    if not matching_rows.empty:
+                        error_positions.append(matching_rows.index[0])
+                        error_values.append(error_row['curr_people'])
             
-            error_marked = False
-            for _, error_row in capacity_errors.iterrows():
-                matching_rows = room_data[room_data['user_id'] == error_row['user_id']]
-                
-                if not matching_rows.empty:
-                    idx = matching_rows.index[0]
-                    ax.axvspan(idx-0.3, idx+0.3, ymin=0, ymax=1, color='red', alpha=0.5,
-                              label='정원 초과 오류 발생' if not error_marked else '')
-                    ax.scatter(idx, error_row['curr_people'], color='red', s=50, alpha=1.0, zorder=5)
-                    error_marked = True
-        
-        # X축 눈금 설정
-        if data_exists and total_requests > 0:
-            tick_positions = [int(i * total_requests / 10) for i in range(11) if int(i * total_requests / 10) < total_requests]
-            if tick_positions and tick_positions[-1] != total_requests - 1:
-                tick_positions.append(total_requests - 1)
-            ax.set_xticks(tick_positions)
-            ax.set_xticklabels(tick_positions)
-        else:
-            ax.set_xticks([0, 10, 20, 30, 40, 50])
-            ax.set_xticklabels([0, 10, 20, 30, 40, 50])
-        
-        # Y축 설정
-        ax.set_ylim(0, y_max)
-        
-        # 범례 설정
-        ax.legend(fontsize=12, loc='upper left', framealpha=0.9)
-        
-        # 통계 정보 박스
-        if data_exists:
+            # 통계 정보 박스
             stats_text = ('총 permit 요청: ' + str(total_requests) + '건\n' +
                          '최대 permit 한계: ' + str(max_people) + '개\n' +
-                         '정원 초과 오류: ' + str(self.capacity_exceeded_count) + '건')
+                         '정원 초과 오류: ' + str(capacity_exceeded_count) + '건')
             
-            if self.capacity_exceeded_count == 0:
+            if capacity_exceeded_count == 0:
                 stats_text += '\n\n세마포어 방어 성공률: 100%'
             else:
-                error_rate = (self.capacity_exceeded_count / total_requests * 100) if total_requests > 0 else 0.0
+                error_rate = (capacity_exceeded_count / total_requests * 100) if total_requests > 0 else 0.0
                 stats_text += '\n오류 비율: ' + str(round(error_rate, 2)) + '%'
         else:
-            no_data_msg = '방 ' + str(self.room_number) + '에 대한\n세마포어 데이터가 없습니다'
+            # 데이터가 없는 경우 기본 설정
+            total_requests = 0
+            max_people = 20
+            y_max = max_people * 1.2
+            
+            no_data_msg = '방 ' + str(room_number) + '에 대한\n세마포어 데이터가 없습니다'
             stats_text = ('총 permit 요청: 0건\n' +
                          '최대 permit 한계: ' + str(max_people) + '개 (기본값)\n' +
                          '정원 초과 오류: 0건\n' +
                          '\n' + no_data_msg)
         
-        ax.text(0.22, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', 
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9))
-        
-        # 축 레이블
-        ax.set_xlabel('세마포어 permit 요청 순서', fontsize=12, fontweight='bold')
-        ax.set_ylabel('permit 개수', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = 'semaphore_capacity_analysis_room' + str(self.room_number) + '.png'
-        chart_path = os.path.join(self.output_dir, filename)
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-    
+        return {
+            'room_number': room_number,
+            'data_exists': data_exists,
+            'total_requests': total_requests,
+            'curr_people_values': curr_people_values,
+            'max_people': max_people,
+            'capacity_exceeded_count': capacity_exceeded_count,
+            'error_positions': error_positions,
+            'error_values': error_values,
+            'y_max': y_max,
+            'stats_text': stats_text
+        }
+
     def _create_multi_room_semaphore_chart(self):
         """전체 방 세마포어 정원 초과 방지 효과성 종합 차트"""
         rooms = self.df_preprocessor['roomNumber'].unique()
@@ -312,16 +356,11 @@ class SemaphoreCapacityAnalyzer:
         fig, ax = plt.subplots(figsize=(20, 12))
         
         if has_data:
-            # 방별 데이터 정리
-            room_datasets = {}
-            max_requests = 0
-            
-            for room in rooms:
-                room_subset = self.df_preprocessor[
-                    self.df_preprocessor['roomNumber'] == room
-                ].reset_index(drop=True)
-                room_datasets[room] = room_subset
-                max_requests = max(max_requests, len(room_subset))
+            # 방별 요청 순서 피벗 (행 = 방, 열 = 방 안 요청 순서, 짧은 방은 NaN 패딩)
+            partition = RoomPartition(self.df_preprocessor)
+            curr_matrix = partition.padded_matrix(self.df_preprocessor['curr_people'])
+            max_people_matrix = partition.padded_matrix(self.df_preprocessor['max_people'])
+            max_requests = curr_matrix.shape[1]
             
             if max_requests == 0:
                 has_data = False
@@ -329,27 +368,10 @@ class SemaphoreCapacityAnalyzer:
         if has_data:
             x_positions = list(range(max_requests))
             
-            # 평균과 표준편차 계산
-            mean_curr, std_curr = [], []
-            mean_max_people = []
-            
-            for i in range(max_requests):
-                curr_values_at_i = []
-                max_people_values_at_i = []
-                
-                for room, dataset in room_datasets.items():
-                    if i < len(dataset):
-                        curr_values_at_i.append(dataset.iloc[i]['curr_people'])
-                        max_people_values_at_i.append(dataset.iloc[i]['max_people'])
-                
-                if curr_values_at_i:
-                    mean_curr.append(np.mean(curr_values_at_i))
-                    std_curr.append(np.std(curr_values_at_i))
-                    mean_max_people.append(np.mean(max_people_values_at_i))
-                else:
-                    mean_curr.append(0)
-                    std_curr.append(0)
-                    mean_max_people.append(20)
+            # 요청 순서별 평균과 표준편차 (NaN 패딩 제외)
+            mean_curr_array = np.nanmean(curr_matrix, axis=0)
+            std_curr_array = np.nanstd(curr_matrix, axis=0)
+            mean_max_array = np.nanmean(max_people_matrix, axis=0)
             
             # 성공 상태에 따른 제목
             if self.perfect_success:
@@ -359,11 +381,6 @@ class SemaphoreCapacityAnalyzer:
             
             title = "세마포어 정원 초과 방지 효과성 분석 - 전체 " + str(len(rooms)) + "개 방 종합 (" + success_indicator + ")"
             
-            # numpy 배열로 변환
-            mean_curr_array = np.array(mean_curr)
-            std_curr_array = np.array(std_curr)
-            mean_max_array = np.array(mean_max_people)
-            
             # 1. 평균 permit 한계선
             ax.plot(x_positions, mean_max_array, 'r--', linewidth=3,
                     label='평균 세마포어 permit 한계선', alpha=0.9)
@@ -424,19 +441,9 @@ class SemaphoreCapacityAnalyzer:
                 self.df_result['anomaly_type'].str.contains('정원 초과 오류', na=False)
             ]
             
-            exceeded_marked = 0
-            for _, error_row in capacity_errors.iterrows():
-                room = error_row['roomNumber']
-                if room in room_datasets:
-                    room_data = room_datasets[room]
-                    matching_rows = room_data[room_data['user_id'] == error_row['user_id']]
-                    
-                    if not matching_rows.empty:
-                        idx = matching_rows.index[0]
-                        if idx < len(x_positions):
-                            ax.axvspan(idx-0.2, idx+0.2, ymin=0, ymax=1, color='red', alpha=0.3,
-                                      label='정원 초과 오류 발생' if exceeded_marked == 0 else '')
-                            exceeded_marked += 1
+            # 방 + user_id 가 처음 일치하는 행의 방 안 요청 순서 (컬렉션 하나로 그림)
+            exceeded_positions = self._match_request_positions(capacity_errors, partition)
+            add_span_markers(ax, exceeded_positions, 0.2, color='red', alpha=0.3, label='정원 초과 오류 발생')
         
         # Y축 설정
         ax.set_ylim(0, y_max)
@@ -478,6 +485,25 @@ class SemaphoreCapacityAnalyzer:
         plt.savefig(chart_path, dpi=300, bbox_inches='tight')
         plt.close()
     
+    def _match_request_positions(self, error_rows, partition):
+        """
+        오류 행마다 전처리 데이터에서 (roomNumber, user_id) 가 처음 일치하는 행의 방 안 요청 순서
+        
+        Args:
+            error_rows (DataFrame): 결과 파일의 정원 초과 오류 행
+            partition (RoomPartition): 전처리 데이터의 방 파티션
+        
+        Returns:
+            ndarray: 일치한 오류 행의 요청 순서 (일치하지 않는 행 제외, 오류 행 순서)
+        """
+        match_keys = ['roomNumber', 'user_id']
+        request_positions = self.df_preprocessor[match_keys].assign(request_position=partition.within_room_rank())
+        request_positions = request_positions[request_positions['request_position'] >= 0].dropna(subset=match_keys)
+        request_positions = request_positions.drop_duplicates(match_keys)  # 방 안에서 먼저 나온 행 우선
+        
+        matched = error_rows[match_keys].dropna().merge(request_positions, on=match_keys, how='inner')
+        return matched['request_position'].to_numpy()
+    
     def generate_semaphore_csv_report(self):
         """세마포어 정원 초과 방지 효과성 CSV 보고서 생성"""
         print("세마포어 효과성 CSV 보고서 생성 시작")
@@ -632,6 +658,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # 세마포어 효과성 분석기 생성 및 실행
@@ -639,7 +672,8 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers
     )
     
     success = analyzer.run_analysis()
@@ -6,10 +6,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler  # 차트 병렬 렌더링 (프로세스 풀)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -25,8 +31,59 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_semaphore_concurrency_gantt_chart(chart_path, chart):
+    """
+    bin 하나의 세마포어 동시 실행 패턴 간트 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_semaphore_concurrency_gantt_charts 반환값)
+    """
+    # 차트 생성
+    fig, ax = plt.subplots(1, 1, figsize=(20, 12))
+    ax.set_title(chart['title'], fontsize=16, fontweight='bold', pad=20)
+    
+    # 동시 실행 막대 그리기 (결과 파일 기반 동시 실행 레벨별 색상/투명도)
+    for y_pos, start_time, end_time, color, alpha, level_label in zip(
+            chart['y_positions'], chart['start_times'], chart['end_times'],
+            chart['colors'], chart['alphas'], chart['level_labels']):
+        ax.barh(y_pos, end_time - start_time, left=start_time, height=0.6,
+               alpha=alpha, color=color, edgecolor=color, linewidth=1)
+        
+        # 동시 실행 수준 표시
+        ax.text(end_time, y_pos, level_label, 
+               va='center', ha='left', fontsize=9, fontweight='bold')
+    
+    # Y축 설정
+    ax.set_yticks(range(len(chart['user_ids'])))
+    ax.set_yticklabels(chart['user_ids'], fontsize=10)
+    ax.set_ylabel('사용자 ID (permit 획득 순서)', fontsize=12, fontweight='bold')
+    
+    # 범례 설정 (통합된 단일 범례)
+    ax.barh([], [], height=0.6, alpha=0.7, color='blue', 
+           label='동시 실행 구간 표시')
+    ax.legend(fontsize=12, loc='upper right', framealpha=0.9)
+    
+    # 축 설정
+    ax.set_xlim(chart['time_start'], chart['time_end'])
+    ax.set_xticks(chart['tick_positions'])
+    ax.set_xticklabels(chart['tick_labels'], rotation=45)
+    ax.set_xlabel(chart['xlabel'], fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    
+    # 통계 정보 박스 (결과 파일 기반)
+    ax.text(0.02, 0.98, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', 
+            bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.9))
+    
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class SemaphoreConcurrencyAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, result_file=None, output_dir=None, workers=1):
         """
         세마포어 동시 실행 패턴 분석기 초기화
         
@@ -35,11 +92,13 @@ class SemaphoreConcurrencyAnalyzer:
             preprocessor_file (str): 전처리 데이터 파일 경로 (preprocessor_semaphore.csv)
             result_file (str): 분석 결과 파일 경로 (semaphore_analysis_result.csv)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.result_file = result_file
         self.output_dir = output_dir
+        self.workers = workers
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -58,11 +117,11 @@ class SemaphoreConcurrencyAnalyzer:
         """CSV 파일을 로드하고 세마포어 데이터 전처리"""
         try:
             # 1. 전처리 파일 로드 (차트용 - preprocessor_semaphore.csv)
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 세마포어 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             
             # 2. 결과 파일 로드 (분석용 - semaphore_analysis_result.csv)
-            self.df_result = pd.read_csv(self.result_file)
+            self.df_result = read_table(self.result_file)
             print(f"✅ 세마포어 분석 결과 파일 로드 완료: {len(self.df_result)}건")
             
         except FileNotFoundError as e:
@@ -138,17 +197,20 @@ class SemaphoreConcurrencyAnalyzer:
         else:
             print(f"✅ 출력 디렉토리 확인: {self.output_dir}")
     
-    def calculate_global_time_range(self):
-        """전체 시간 범위 계산"""
-        if ('true_critical_section_nanoTime_start' not in self.df_preprocessor.columns or
-            'true_critical_section_nanoTime_end' not in self.df_preprocessor.columns):
+    def calculate_global_time_range(self, preprocessor_data=None):
+        """전체 시간 범위 계산 (preprocessor_data 생략 시 self.df_preprocessor 기준)"""
+        if preprocessor_data is None:
+            preprocessor_data = self.df_preprocessor
+        
+        if ('true_critical_section_nanoTime_start' not in preprocessor_data.columns or
+            'true_critical_section_nanoTime_end' not in preprocessor_data.columns):
             print("❌ 나노초 데이터 없음 - 시간 범위 계산 불가")
             return False
         
         # 유효한 시간 데이터만 필터링
-        valid_data = self.df_preprocessor[
-            self.df_preprocessor['true_critical_section_nanoTime_start'].notna() & 
-            self.df_preprocessor['true_critical_section_nanoTime_end'].notna()
+        valid_data = preprocessor_data[
+            preprocessor_data['true_critical_section_nanoTime_start'].notna() & 
+            preprocessor_data['true_critical_section_nanoTime_end'].notna()
         ]
         
         if valid_data.empty:
@@ -193,26 +255,60 @@ class SemaphoreConcurrencyAnalyzer:
             print("❌ 간트 차트는 단일 방만 지원합니다. --room_number 옵션을 추가해주세요.")
             return
         
-        print(f"📊 세마포어 동시 실행 패턴 간트 차트 생성 (방 {self.room_number})")
+        charts = self._prepare_semaphore_concurrency_gantt_charts(self.room_number, self.df_preprocessor, self.df_result)
+        
+        # bin별 차트는 서로 독립 → 차트 렌더링 스케줄러로 한 번에 렌더링 (workers > 1 이면 병렬)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        for chart_path, chart in charts:
+            scheduler.submit(chart_path, render_semaphore_concurrency_gantt_chart, chart_path, chart)
+        for (_, chart), saved_path in zip(charts, scheduler.run()):
+            print(f"✅ bin {chart['bin_value']} 차트 저장: {saved_path}")
+    
+    def _prepare_semaphore_concurrency_gantt_charts(self, room_number, room_preprocessor, room_result):
+        """
+        bin별 세마포어 동시 실행 패턴 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_preprocessor (DataFrame): 해당 방 전처리 데이터
+            room_result (DataFrame): 해당 방 분석 결과 데이터
+        
+        Returns:
+            list: [(차트 저장 경로, render_semaphore_concurrency_gantt_chart 입력 데이터), ...] (bin 순서)
+        """
+        print(f"📊 세마포어 동시 실행 패턴 간트 차트 생성 (방 {room_number})")
         
         # 나노초 데이터 확인
-        if not self.calculate_global_time_range():
-            return
+        if not self.calculate_global_time_range(room_preprocessor):
+            return []
         
         # 시간 단위 결정
         time_range = self.global_time_end - self.global_time_start
         time_unit_name, time_divisor, time_unit_symbol = self.determine_time_unit(time_range)
         
-        # bin별로 차트 생성
-        bins = sorted(self.df_preprocessor['bin'].unique())
+        # X축 틱/레이블 (모든 bin 공통)
+        num_ticks = 11
+        tick_positions = np.linspace(self.global_time_start, self.global_time_end, num_ticks)
+        tick_labels = [self.format_time_with_unit(pos - self.global_time_start, time_divisor, time_unit_symbol)
+                       for pos in tick_positions]
+        time_range_display = self.format_time_with_unit(time_range, time_divisor, time_unit_symbol)
+        xlabel = f'세마포어 permit 실행 시간 (총 범위: {time_range_display})'
+        
+        # 성공적인 동시 실행 강조 제목 (해당 방 결과 파일 기준)
+        concurrent_executions = int((room_result['contention_group_size'] >= 2).sum())
+        success_indicator = "✅ CAS 기반 동시 실행 성공" if concurrent_executions > 0 else "단일 실행"
+        
+        # bin별로 차트 데이터 생성
+        bins = sorted(room_preprocessor['bin'].unique())
         print(f"분석할 bin 수: {len(bins)}개")
         
+        charts = []
         for bin_value in bins:
             print(f"📊 bin {bin_value} 세마포어 동시 실행 패턴 차트 생성...")
             
             # 해당 bin 데이터 필터링 (전처리 파일과 결과 파일 매칭)
-            bin_preprocessor = self.df_preprocessor[self.df_preprocessor['bin'] == bin_value].copy()
-            bin_result = self.df_result[self.df_result['bin'] == bin_value].copy()
+            bin_preprocessor = room_preprocessor[room_preprocessor['bin'] == bin_value]
+            bin_result = room_result[room_result['bin'] == bin_value]
             
             if bin_preprocessor.empty or bin_result.empty:
                 print(f"❌ bin {bin_value} 데이터 없음")
@@ -221,118 +317,61 @@ class SemaphoreConcurrencyAnalyzer:
             # 시간 순서로 정렬
             bin_preprocessor_sorted = bin_preprocessor.sort_values('true_critical_section_nanoTime_start')
             
-            # 차트 생성
-            fig, ax = plt.subplots(1, 1, figsize=(20, 12))
-            
-            # 성공적인 동시 실행 강조 제목
-            success_indicator = "✅ CAS 기반 동시 실행 성공" if self.concurrent_executions > 0 else "단일 실행"
-            title = f'세마포어 동시 실행 패턴 분석 - 방 {self.room_number}, bin {bin_value} ({success_indicator})'
-            ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+            chart = self._concurrent_execution_bars(bin_preprocessor_sorted, bin_result)
+            chart.update({
+                'room_number': room_number,
+                'bin_value': bin_value,
+                'title': f'세마포어 동시 실행 패턴 분석 - 방 {room_number}, bin {bin_value} ({success_indicator})',
+                'time_start': self.global_time_start,
+                'time_end': self.global_time_end,
+                'tick_positions': tick_positions,
+                'tick_labels': tick_labels,
+                'xlabel': xlabel,
+                'stats_text': self._statistics_text(bin_result)
+            })
             
-            # 동시 실행 레벨 계산 및 시각화 (결과 파일 기반)
-            self._draw_concurrent_execution_bars(ax, bin_preprocessor_sorted, bin_result)
-            
-            # 범례 설정
-            self._setup_legend(ax)
-            
-            # 축 설정
-            self._setup_axes(ax, bin_preprocessor_sorted, time_range, time_divisor, time_unit_symbol)
-            
-            # 통계 정보 박스 (결과 파일 기반)
-            self._add_statistics_box(ax, bin_result)
-            
-            plt.tight_layout()
-            
-            # 파일 저장
-            filename = f'semaphore_concurrency_pattern_room{self.room_number}_bin{bin_value}.png'
-            chart_path = os.path.join(self.output_dir, filename)
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            print(f"✅ bin {bin_value} 차트 저장: {chart_path}")
+            filename = f'semaphore_concurrency_pattern_room{room_number}_bin{bin_value}.png'
+            charts.append((os.path.join(self.output_dir, filename), chart))
+        
+        return charts
     
-    def _draw_concurrent_execution_bars(self, ax, preprocessor_data, result_data):
-        """동시 실행 막대 그리기 (결과 파일 기반)"""
+    def _concurrent_execution_bars(self, preprocessor_data, result_data):
+        """동시 실행 막대 데이터 (결과 파일의 contention_group_size 기반 색상/투명도)"""
         user_ids = preprocessor_data['user_id'].unique()
         y_positions = {user_id: i for i, user_id in enumerate(user_ids)}
         
-        # 결과 파일을 user_id 기준으로 딕셔너리 생성
-        result_dict = {row['user_id']: row for _, row in result_data.iterrows()}
+        # 결과 파일을 user_id 기준으로 딕셔너리 생성 (동시 실행 레벨)
+        level_by_user = dict(zip(result_data['user_id'], result_data['contention_group_size']))
         
-        for _, row in preprocessor_data.iterrows():
-            user_id = row['user_id']
-            start_time = row['true_critical_section_nanoTime_start']
-            end_time = row['true_critical_section_nanoTime_end']
-            duration = end_time - start_time
-            
-            y_pos = y_positions[user_id]
-            
+        colors, alphas, level_labels = [], [], []
+        for user_id in preprocessor_data['user_id']:
             # 결과 파일에서 동시 실행 레벨 가져오기
-            concurrent_level = 1  # 기본값
-            if user_id in result_dict:
-                concurrent_level = result_dict[user_id]['contention_group_size']
+            concurrent_level = level_by_user.get(user_id, 1)  # 기본값 1
             
             # 색상과 투명도 결정 (동시 실행 수준에 따라)
             if concurrent_level == 1:
-                color = 'lightblue'
-                alpha = 0.6
-                label_text = '단독 실행 (permit 1개)'
+                color, alpha = 'lightblue', 0.6     # 단독 실행 (permit 1개)
             elif concurrent_level <= 3:
-                color = 'blue'
-                alpha = 0.7
-                label_text = f'동시 실행 (permit {concurrent_level}개)'
+                color, alpha = 'blue', 0.7          # 동시 실행
             else:
-                color = 'darkblue'
-                alpha = 0.8
-                label_text = f'고도 동시 실행 (permit {concurrent_level}개)'
-            
-            # 막대 그리기
-            ax.barh(y_pos, duration, left=start_time, height=0.6,
-                   alpha=alpha, color=color, edgecolor=color, linewidth=1)
+                color, alpha = 'darkblue', 0.8      # 고도 동시 실행
             
-            # 동시 실행 수준 표시
-            ax.text(end_time, y_pos, f' {concurrent_level}', 
-                   va='center', ha='left', fontsize=9, fontweight='bold')
-        
-        # Y축 설정
-        ax.set_yticks(range(len(user_ids)))
-        ax.set_yticklabels(user_ids, fontsize=10)
-        ax.set_ylabel('사용자 ID (permit 획득 순서)', fontsize=12, fontweight='bold')
-    
-    def _setup_legend(self, ax):
-        """범례 설정"""
-        # 통합된 단일 범례
-        ax.barh([], [], height=0.6, alpha=0.7, color='blue', 
-               label='동시 실행 구간 표시')
-        
-        ax.legend(fontsize=12, loc='upper right', framealpha=0.9)
-    
-    def _setup_axes(self, ax, data, time_range, time_divisor, time_unit_symbol):
-        """축 설정"""
-        # X축 범위 설정
-        ax.set_xlim(self.global_time_start, self.global_time_end)
-        
-        # X축 틱 설정
-        num_ticks = 11
-        tick_positions = np.linspace(self.global_time_start, self.global_time_end, num_ticks)
-        
-        tick_labels = []
-        for pos in tick_positions:
-            relative_time = pos - self.global_time_start
-            tick_labels.append(self.format_time_with_unit(relative_time, time_divisor, time_unit_symbol))
-        
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels(tick_labels, rotation=45)
-        
-        # X축 레이블
-        time_range_display = self.format_time_with_unit(time_range, time_divisor, time_unit_symbol)
-        ax.set_xlabel(f'세마포어 permit 실행 시간 (총 범위: {time_range_display})', 
-                     fontsize=12, fontweight='bold')
-        
-        ax.grid(True, alpha=0.3)
+            colors.append(color)
+            alphas.append(alpha)
+            level_labels.append(f' {concurrent_level}')
+        
+        return {
+            'user_ids': list(user_ids),
+            'y_positions': [y_positions[user_id] for user_id in preprocessor_data['user_id']],
+            'start_times': preprocessor_data['true_critical_section_nanoTime_start'].tolist(),
+            'end_times': preprocessor_data['true_critical_section_nanoTime_end'].tolist(),
+            'colors': colors,
+            'alphas': alphas,
+            'level_labels': level_labels
+        }
     
-    def _add_statistics_box(self, ax, result_data):
-        """통계 정보 박스 추가 (결과 파일 기반)"""
+    def _statistics_text(self, result_data):
+        """통계 정보 박스 문자열 (결과 파일 기반)"""
         bin_requests = len(result_data)
         bin_concurrent = len(result_data[result_data['join_result'] == 'SUCCESS'])
         
@@ -347,10 +386,8 @@ class SemaphoreConcurrencyAnalyzer:
             concurrency_rate = concurrent_permits / bin_requests * 100
             stats_text += f'\n동시성 활용률: {concurrency_rate:.1f}%'
         
-        ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', 
-                bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.9))
-    
+        return stats_text
+
     def generate_semaphore_concurrency_csv_report(self):
         """세마포어 동시성 패턴 CSV 보고서 생성"""
         print("📋 세마포어 동시성 패턴 CSV 보고서 생성")
@@ -503,6 +540,13 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # 세마포어 동시성 분석기 생성 및 실행
@@ -510,7 +554,8 @@ def main():
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
         result_file=args.result_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers
     )
     
     success = analyzer.run_analysis()
@@ -8,10 +8,16 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
 import warnings
 import platform
 import matplotlib.font_manager as fm
 import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from common.table_io import read_table
+from common.chart_render import ChartRenderScheduler  # 차트 병렬 렌더링 (프로세스 풀)
+
 warnings.filterwarnings('ignore')
 
 def setup_korean_font():
@@ -38,8 +44,67 @@ def setup_korean_font():
 # 한글 폰트 설정 실행
 setup_korean_font()
 
+def render_sequential_consistency_single_room_chart(chart_path, chart):
+    """
+    단일 방 순차적 일관성 비교 차트 렌더링 (차트 렌더링 작업 단위)
+    
+    Args:
+        chart_path (str): 차트 저장 경로
+        chart (dict): 미리 계산한 차트 데이터 (_prepare_single_room_chart 반환값)
+    """
+    x_positions = chart['x_positions']
+    actual_values = chart['actual_values']
+    ideal_sequential_state = chart['ideal_sequential_state']
+    
+    # 차트 생성
+    fig, ax = plt.subplots(figsize=(20, 12))
+    
+    # 제목 설정
+    title = f'세마포어 순차적 일관성 검증 - 방 {chart["room_number"]}'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    
+    # 1. 이상적인 기대 인원수 (파란색 점선) - 요구사항대로
+    ax.plot(x_positions, ideal_sequential_state, color='blue', linewidth=2, linestyle='--',
+            marker='s', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
+            label='이상적인 기대 인원수 (순차 처리시)', alpha=0.8)
+    
+    # 2. 실제 기록된 인원수 (주황색 실선) - 요구사항대로
+    ax.plot(x_positions, actual_values, color='orange', linewidth=3, 
+            marker='o', markersize=4, markerfacecolor='orange', markeredgecolor='orange',
+            label='실제 기록된 인원수 (curr_people)', alpha=0.9)
+    
+    # 3. 불일치 지점 강조
+    for seq, actual, ideal in zip(x_positions, actual_values, ideal_sequential_state):
+        if actual != ideal:
+            # 불일치 구간 강조
+            ax.axvspan(seq-0.3, seq+0.3, ymin=0, ymax=1, color='red', alpha=0.2)
+    
+    # y 좌표를 0.9에서 0.85로 조정 (약간 아래로)
+    ax.legend(fontsize=12, loc='upper left', bbox_to_anchor=(0.02, 0.88), framealpha=0.9)
+    
+    # 통계 정보 박스
+    ax.text(0.02, 0.92, chart['stats_text'], transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', 
+            bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.9))
+    
+    # 축 설정
+    ax.set_xlabel('room_entry_sequence (시간의 흐름)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('people_count (인원수)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    
+    # Y축 범위 설정
+    all_values = actual_values + ideal_sequential_state
+    y_max = max(all_values) * 1.2 if all_values else 10
+    ax.set_ylim(0, y_max)
+    
+    plt.tight_layout()
+    
+    # 파일 저장
+    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
 class SemaphoreSequentialConsistencyAnalyzer:
-    def __init__(self, room_number=None, preprocessor_file=None, output_dir=None):
+    def __init__(self, room_number=None, preprocessor_file=None, output_dir=None, workers=1):
         """
         세마포어 순차적 일관성 검증 분석기 초기화 (최종 수정버전)
         
@@ -47,10 +112,12 @@ class SemaphoreSequentialConsistencyAnalyzer:
             room_number (int, optional): 분석할 특정 방 번호
             preprocessor_file (str): 전처리 데이터 파일 경로 (preprocessor_semaphore.csv)
             output_dir (str): 출력 디렉토리 경로
+            workers (int): 차트 렌더링 프로세스 수 (1 이면 직렬 렌더링)
         """
         self.room_number = room_number
         self.preprocessor_file = preprocessor_file
         self.output_dir = output_dir
+        self.workers = workers
         
         # 데이터 저장용 변수
         self.df_preprocessor = None
@@ -63,7 +130,7 @@ class SemaphoreSequentialConsistencyAnalyzer:
     def load_data(self):
         """CSV 파일을 로드하고 세마포어 데이터 검증"""
         try:
-            self.df_preprocessor = pd.read_csv(self.preprocessor_file)
+            self.df_preprocessor = read_table(self.preprocessor_file)
             print(f"✅ 세마포어 전처리 파일 로드 완료: {len(self.df_preprocessor)}건")
             print(f"   컬럼: {list(self.df_preprocessor.columns)}")
             
@@ -143,12 +210,34 @@ class SemaphoreSequentialConsistencyAnalyzer:
     
     def _create_single_room_chart(self):
         """단일 방 순차적 일관성 비교 차트 (2개 라인)"""
-        room_data = self.df_preprocessor.copy()
+        chart = self._prepare_single_room_chart(self.room_number, self.df_preprocessor)
+        if chart is None:
+            return
+        
+        # 파일 저장 (차트 렌더링 스케줄러)
+        filename = f'semaphore_sequential_consistency_room{self.room_number}.png'
+        chart_path = os.path.join(self.output_dir, filename)
+        scheduler = ChartRenderScheduler(self.workers, initializer=setup_korean_font)
+        scheduler.submit(chart_path, render_sequential_consistency_single_room_chart, chart_path, chart)
+        for saved_path in scheduler.run():
+            print(f"✅ 단일 방 순차적 일관성 차트 저장: {saved_path}")
+    
+    def _prepare_single_room_chart(self, room_number, room_data):
+        """
+        단일 방 순차적 일관성 차트 데이터 계산 (렌더링 작업에는 이 결과만 전달)
+        
+        Args:
+            room_number (int): 방 번호
+            room_data (DataFrame): 해당 방 전처리 데이터
+        
+        Returns:
+            dict: render_sequential_consistency_single_room_chart 입력 데이터 (데이터가 비어 있으면 None)
+        """
         if room_data.empty:
             print("❌ 단일 방 데이터가 비어있어 차트 생성을 건너뜁니다.")
-            return
+            return None
         
-        print(f"📊 방 {self.room_number} 순차적 일관성 비교 차트 생성 시작")
+        print(f"📊 방 {room_number} 순차적 일관성 비교 차트 생성 시작")
         
         # room_entry_sequence 순서로 정렬
         room_data = room_data.sort_values('room_entry_sequence').reset_index(drop=True)
@@ -159,78 +248,32 @@ class SemaphoreSequentialConsistencyAnalyzer:
         # Y축 데이터 계산 (2개 라인만)
         actual_values = room_data['curr_people'].tolist()  # 실제 기록된 인원수 (주황색 실선)
         
-        # 이상적인 기대 인원수 계산 (최대 정원 제한 적용)
-        ideal_sequential_state = []
-        for i, seq in enumerate(x_positions):
-            ideal_value = self.initial_people_count + seq
-            max_people = room_data.iloc[i]['max_people']
-            
-            # 최대 정원을 넘지 않도록 제한
-            capped_ideal = min(ideal_value, max_people)
-            ideal_sequential_state.append(capped_ideal)
-        
-        # 차트 생성
-        fig, ax = plt.subplots(figsize=(20, 12))
-        
-        # 제목 설정
-        title = f'세마포어 순차적 일관성 검증 - 방 {self.room_number}'
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        
-        # 1. 이상적인 기대 인원수 (파란색 점선) - 요구사항대로
-        ax.plot(x_positions, ideal_sequential_state, color='blue', linewidth=2, linestyle='--',
-                marker='s', markersize=3, markerfacecolor='blue', markeredgecolor='blue',
-                label='이상적인 기대 인원수 (순차 처리시)', alpha=0.8)
-        
-        # 2. 실제 기록된 인원수 (주황색 실선) - 요구사항대로
-        ax.plot(x_positions, actual_values, color='orange', linewidth=3, 
-                marker='o', markersize=4, markerfacecolor='orange', markeredgecolor='orange',
-                label='실제 기록된 인원수 (curr_people)', alpha=0.9)
-        
-        # 3. 불일치 지점 강조
-        for i, (actual, ideal) in enumerate(zip(actual_values, ideal_sequential_state)):
-            if actual != ideal:
-                seq = x_positions[i]
-                # 불일치 구간 강조
-                ax.axvspan(seq-0.3, seq+0.3, ymin=0, ymax=1, color='red', alpha=0.2)
+        # 이상적인 기대 인원수 계산 (최대 정원을 넘지 않도록 제한)
+        ideal_sequential_state = [min(self.initial_people_count + seq, max_people)
+                                  for seq, max_people in zip(x_positions, room_data['max_people'].tolist())]
         
-        # y 좌표를 0.9에서 0.85로 조정 (약간 아래로)
-        ax.legend(fontsize=12, loc='upper left', bbox_to_anchor=(0.02, 0.88), framealpha=0.9)
+        # 순차적 일관성 위반 수 (해당 방 기준)
+        violations = sum(1 for actual, ideal in zip(actual_values, ideal_sequential_state) if actual != ideal)
         
         # 통계 정보 박스
         stats_text = (f'총 permit 요청: {len(room_data)}건\n'
-                     f'순차적 일관성 위반: {self.sequential_consistency_violations}건')
+                     f'순차적 일관성 위반: {violations}건')
         
-        if self.sequential_consistency_violations == 0:
+        if violations == 0:
             stats_text += '\n\nO 완벽한 순차적 일관성 유지'
             stats_text += '\n목표: 세마포어가 순차 처리를 완벽 보장!'
         else:
-            violation_rate = self.sequential_consistency_violations / len(room_data) * 100
+            violation_rate = violations / len(room_data) * 100
             stats_text += f'\n위반률: {violation_rate:.1f}%'
         
-        ax.text(0.02, 0.92, stats_text, transform=ax.transAxes, fontsize=11,
-                verticalalignment='top', 
-                bbox=dict(boxstyle='round', facecolor='lightcyan', alpha=0.9))
-        
-        # 축 설정
-        ax.set_xlabel('room_entry_sequence (시간의 흐름)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('people_count (인원수)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3, linestyle='--')
-        
-        # Y축 범위 설정
-        all_values = actual_values + ideal_sequential_state
-        y_max = max(all_values) * 1.2 if all_values else 10
-        ax.set_ylim(0, y_max)
-        
-        plt.tight_layout()
-        
-        # 파일 저장
-        filename = f'semaphore_sequential_consistency_room{self.room_number}.png'
-        chart_path = os.path.join(self.output_dir, filename)
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"✅ 단일 방 순차적 일관성 차트 저장: {chart_path}")
-    
+        return {
+            'room_number': room_number,
+            'x_positions': x_positions,
+            'actual_values': actual_values,
+            'ideal_sequential_state': ideal_sequential_state,
+            'stats_text': stats_text
+        }
+
     def _create_multi_room_chart(self):
         """전체 방 순차적 일관성 종합 차트 (최대 정원 제한 및 마지막 유효값 고정 적용)"""
         rooms = self.df_preprocessor['roomNumber'].unique()
@@ -543,13 +586,21 @@ def main():
         help='분석 결과를 저장할 디렉토리 경로'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='차트 렌더링 프로세스 수 (기본값: 1, 직렬 렌더링)'
+    )
+    
     args = parser.parse_args()
     
     # 세마포어 순차적 일관성 분석기 생성 및 실행
     analyzer = SemaphoreSequentialConsistencyAnalyzer(
         room_number=args.room_number,
         preprocessor_file=args.preprocessor_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers
     )
     
     success = analyzer.run_analysis()
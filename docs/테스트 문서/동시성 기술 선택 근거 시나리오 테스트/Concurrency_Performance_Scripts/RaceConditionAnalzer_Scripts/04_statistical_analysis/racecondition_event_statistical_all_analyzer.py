@@ -14,17 +14,23 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 import traceback
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.group_stats import occurrence_stats_by_group  # 방 / (방, bin) 단위 발생 통계 groupby 집계
 
 def load_and_validate_data(preprocessor_file, analysis_file):
     """데이터 로드 및 필수 컬럼 검증"""
     print("📂 데이터 파일 로드 중...")
     
     # 전처리 데이터 로드
-    preprocessor_df = pd.read_csv(preprocessor_file)
+    preprocessor_df = read_table(preprocessor_file)
     print(f"✅ 전처리 데이터 로드 완료: {len(preprocessor_df)}행")
     
     # 이상현상 분석 데이터 로드
-    analysis_df = pd.read_csv(analysis_file)
+    analysis_df = read_table(analysis_file)
     print(f"✅ 이상현상 분석 데이터 로드 완료: {len(analysis_df)}행")
     
     # 전처리 데이터 필수 컬럼 검증
@@ -100,14 +106,13 @@ def calculate_overall_statistics(filtered_df, value_column, total_info, rule_nam
     
     # 이상현상이 있는 경우에만 실제 통계 계산
     if len(filtered_df) > 0:
-        # 해당 값들 추출 (NaN 제거)
-        values = filtered_df[value_column].dropna()
+        # 전체를 한 그룹으로 보고 공통 커널로 값 통계 계산 (NaN 값 제외)
+        overall = occurrence_stats_by_group(filtered_df, [], value_column,
+                                            pd.DataFrame({'total_requests': [total_requests]}),
+                                            use_absolute=use_absolute).iloc[0]
+        occurrence_count = overall['occurrence_count']
         
-        if len(values) > 0:
-            # 기본 발생 통계
-            occurrence_count = len(values)
-            occurrence_rate = (occurrence_count / total_requests * 100) if total_requests > 0 else 0
-            
+        if occurrence_count > 0:
             # 영향받은 방과 bin 조합 계산
             affected_rooms = filtered_df['roomNumber'].nunique()
             affected_bins = len(filtered_df.groupby(['roomNumber', 'bin']))
@@ -135,24 +140,19 @@ def calculate_overall_statistics(filtered_df, value_column, total_info, rule_nam
             
             # 결과 업데이트
             result['발생 건수'] = int(occurrence_count)
-            result['발생률 (%)'] = round(occurrence_rate, 2)
+            result['발생률 (%)'] = overall['occurrence_rate']
             result['영향받은 방 수'] = int(affected_rooms)
             result['영향받은 (방×bin) 조합수'] = int(affected_bins)
             result['방별 평균 발생률 (%)'] = round(avg_room_rate, 2)
             result['bin별 평균 발생률 (%)'] = round(avg_bin_rate, 2)
             
-            # 값 통계 계산 (절댓값 옵션 적용)
-            if use_absolute:
-                result['총합 값'] = round(values.abs().sum(), 2)
-                result['평균 값'] = round(values.abs().mean(), 2)
-            else:
-                result['총합 값'] = round(values.sum(), 2)
-                result['평균 값'] = round(values.mean(), 2)
-            
-            result['최소 값'] = round(values.min(), 2)
-            result['최대 값'] = round(values.max(), 2)
-            result['중간 값'] = round(values.median(), 2)
-            result['표준편차 값'] = round(values.std(), 4) if len(values) > 1 else 0.0
+            # 값 통계 (총합/평균은 절댓값 옵션 적용)
+            result['총합 값'] = overall['sum_value']
+            result['평균 값'] = overall['avg_value']
+            result['최소 값'] = overall['min_value']
+            result['최대 값'] = overall['max_value']
+            result['중간 값'] = overall['median_value']
+            result['표준편차 값'] = overall['std_value']
     
     return result
 
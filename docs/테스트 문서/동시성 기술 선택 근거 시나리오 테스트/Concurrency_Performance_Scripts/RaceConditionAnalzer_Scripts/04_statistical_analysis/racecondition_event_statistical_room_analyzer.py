@@ -6,7 +6,6 @@ Race Condition 방별 통계 분석기
 """
 
 import pandas as pd
-import numpy as np
 from datetime import datetime
 import argparse
 from openpyxl import Workbook
@@ -14,17 +13,23 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 import traceback
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from common.table_io import read_table
+from common.group_stats import occurrence_stats_by_group  # 방 / (방, bin) 단위 발생 통계 groupby 집계
 
 def load_and_validate_data(preprocessor_file, analysis_file):
     """데이터 로드 및 필수 컬럼 검증"""
     print("📂 데이터 파일 로드 중...")
     
     # 전처리 데이터 로드
-    preprocessor_df = pd.read_csv(preprocessor_file)
+    preprocessor_df = read_table(preprocessor_file)
     print(f"✅ 전처리 데이터 로드 완료: {len(preprocessor_df)}행")
     
     # 이상현상 분석 데이터 로드
-    analysis_df = pd.read_csv(analysis_file)
+    analysis_df = read_table(analysis_file)
     print(f"✅ 이상현상 분석 데이터 로드 완료: {len(analysis_df)}행")
     
     # 전처리 데이터 필수 컬럼 검증
@@ -61,60 +66,10 @@ def calculate_total_requests_per_room(preprocessor_df):
 
 def calculate_statistics(filtered_df, value_column, total_requests_df, use_absolute=False):
     """방별 통계 계산 함수 - 모든 방 포함"""
-    # 전체 방 리스트를 기준으로 결과 생성
-    result_stats = total_requests_df.copy()
-    
-    # 통계 컬럼들 초기화 (이상현상 없는 방은 0 또는 NaN)
-    result_stats['occurrence_count'] = 0
-    result_stats['occurrence_rate'] = 0.0
-    result_stats['sum_value'] = 0.0
-    result_stats['avg_value'] = np.nan
-    result_stats['min_value'] = np.nan
-    result_stats['max_value'] = np.nan
-    result_stats['median_value'] = np.nan
-    result_stats['std_value'] = 0.0
-    
-    # 이상현상이 있는 경우에만 실제 통계 계산
-    if len(filtered_df) > 0:
-        # roomNumber 단위로 그룹화
-        grouped = filtered_df.groupby(['roomNumber'])
-        
-        for room_num, group in grouped:
-            # 해당 방의 모든 값들 추출 (NaN 제거)
-            values = group[value_column].dropna()
-            
-            if len(values) == 0:
-                continue
-            
-            # 결과 DataFrame에서 해당 방 찾기
-            mask = (result_stats['roomNumber'] == room_num)
-            row_idx = result_stats[mask].index
-            
-            if len(row_idx) == 0:
-                continue
-                
-            row_idx = row_idx[0]
-            total_requests = result_stats.loc[row_idx, 'total_requests']
-            
-            # 통계 계산
-            occurrence_count = len(values)
-            occurrence_rate = (occurrence_count / total_requests * 100) if total_requests > 0 else 0
-            
-            # 결과 업데이트 (절댓값 옵션 적용)
-            result_stats.loc[row_idx, 'occurrence_count'] = int(occurrence_count)
-            result_stats.loc[row_idx, 'occurrence_rate'] = round(occurrence_rate, 2)
-            
-            if use_absolute:
-                result_stats.loc[row_idx, 'sum_value'] = round(values.abs().sum(), 2)
-                result_stats.loc[row_idx, 'avg_value'] = round(values.abs().mean(), 2)
-            else:
-                result_stats.loc[row_idx, 'sum_value'] = round(values.sum(), 2)
-                result_stats.loc[row_idx, 'avg_value'] = round(values.mean(), 2)
-            
-            result_stats.loc[row_idx, 'min_value'] = round(values.min(), 2)
-            result_stats.loc[row_idx, 'max_value'] = round(values.max(), 2)
-            result_stats.loc[row_idx, 'median_value'] = round(values.median(), 2)
-            result_stats.loc[row_idx, 'std_value'] = round(values.std(), 4) if len(values) > 1 else 0.0
+    # roomNumber 단위 groupby 한 번 → 전체 목록(total_requests_df)에 left merge
+    # (이상현상 없는 방은 건수/발생률/총합/표준편차 0, 평균/최소/최대/중간값 NaN)
+    result_stats = occurrence_stats_by_group(filtered_df, ['roomNumber'], value_column,
+                                             total_requests_df, use_absolute=use_absolute)
     
     # 데이터 타입 정리
     result_stats['roomNumber'] = result_stats['roomNumber'].astype(int)
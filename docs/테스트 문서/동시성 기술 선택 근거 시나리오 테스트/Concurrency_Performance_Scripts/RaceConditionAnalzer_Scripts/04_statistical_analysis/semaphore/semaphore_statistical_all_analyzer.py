@@ -8,7 +8,6 @@ Semaphore 전용 전체 통합 통계 분석기 - 완성판
 """
 
 import pandas as pd
-import numpy as np
 from datetime import datetime
 import argparse
 from openpyxl import Workbook
@@ -16,17 +15,23 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 import traceback
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from common.table_io import read_table
+from common.group_stats import occurrence_stats_by_group  # 방 / (방, bin) 단위 발생 통계 groupby 집계
 
 def load_and_validate_semaphore_data(preprocessor_file, analysis_file):
     """세마포어 데이터 로드 및 필수 컬럼 검증"""
     print("📂 세마포어 데이터 파일 로드 중...")
     
     # 전처리 데이터 로드
-    preprocessor_df = pd.read_csv(preprocessor_file)
+    preprocessor_df = read_table(preprocessor_file)
     print(f"✅ 세마포어 전처리 데이터 로드 완료: {len(preprocessor_df)}행")
     
     # 분석 결과 데이터 로드
-    analysis_df = pd.read_csv(analysis_file)
+    analysis_df = read_table(analysis_file)
     print(f"✅ 세마포어 분석 결과 데이터 로드 완료: {len(analysis_df)}행")
     
     # 세마포어 전처리 데이터 필수 컬럼 검증 (10개 컬럼)
@@ -129,15 +134,16 @@ def analyze_concurrent_execution_observation(preprocessor_df, analysis_df, total
     
     total_requests = total_info['total_requests']
     
+    # contention_group_size 기반 통계 계산 (전체를 한 그룹으로 보고 공통 커널 사용, 레코드가 없으면 건수 0 / 통계 NaN)
+    contention_stats = occurrence_stats_by_group(concurrent_records, [], 'contention_group_size',
+                                                 pd.DataFrame({'total_requests': [total_requests]})).iloc[0]
+    
     if len(concurrent_records) > 0:
-        # contention_group_size 기반 통계 계산 (기존 방식과 동일)
-        contention_sizes = concurrent_records['contention_group_size'].dropna()
-        
         # 통계 계산
-        concurrent_executions = len(contention_sizes)
-        max_concurrent_level = contention_sizes.max() if len(contention_sizes) > 0 else 1
-        avg_concurrent_level = contention_sizes.mean() if len(contention_sizes) > 0 else 1.0
-        total_concurrent_threads = contention_sizes.sum() if len(contention_sizes) > 0 else 0
+        concurrent_executions = int(contention_stats['occurrence_count'])
+        max_concurrent_level = int(contention_stats['max_value'])
+        avg_concurrent_level = contention_stats['avg_value']
+        total_concurrent_threads = contention_stats['sum_value']
         
         # 영향받은 방과 bin 계산
         affected_rooms = concurrent_records['roomNumber'].nunique()
@@ -165,8 +171,8 @@ def analyze_concurrent_execution_observation(preprocessor_df, analysis_df, total
         '총 경합 스레드 수': int(total_concurrent_threads),
         '평균 경합 스레드 수': round(avg_concurrent_level, 2),
         '최대 경합 스레드 수': int(max_concurrent_level),
-        '중간값 경합 그룹 크기': round(contention_sizes.median(), 2) if len(contention_sizes) > 0 else np.nan,
-        '경합 강도 표준편차': round(contention_sizes.std(), 4) if len(contention_sizes) > 1 else 0.0,
+        '중간값 경합 그룹 크기': contention_stats['median_value'],
+        '경합 강도 표준편차': contention_stats['std_value'],
         '관찰된 패턴': 'CAS 기반 효율적 동시성 구현' if concurrent_executions > 0 else '순차적 실행',
         '해석': '의도된 정상 동작 (오류 아님)'
     }
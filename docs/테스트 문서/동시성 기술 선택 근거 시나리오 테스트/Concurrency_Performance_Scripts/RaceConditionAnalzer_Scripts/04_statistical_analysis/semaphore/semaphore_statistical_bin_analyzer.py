@@ -16,17 +16,23 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 import traceback
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+from common.table_io import read_table
+from common.group_stats import occurrence_stats_by_group  # 방 / (방, bin) 단위 발생 통계 groupby 집계
 
 def load_and_validate_semaphore_data(preprocessor_file, analysis_file):
     """세마포어 데이터 로드 및 필수 컬럼 검증"""
     print("📂 세마포어 데이터 파일 로드 중...")
     
     # 전처리 데이터 로드
-    preprocessor_df = pd.read_csv(preprocessor_file)
+    preprocessor_df = read_table(preprocessor_file)
     print(f"✅ 세마포어 전처리 데이터 로드 완료: {len(preprocessor_df)}행")
     
     # 분석 결과 데이터 로드
-    analysis_df = pd.read_csv(analysis_file)
+    analysis_df = read_table(analysis_file)
     print(f"✅ 세마포어 분석 결과 데이터 로드 완료: {len(analysis_df)}행")
     
     # 세마포어 전처리 데이터 필수 컬럼 검증 (10개 컬럼)
@@ -140,60 +146,10 @@ def analyze_sequential_consistency_per_bin(preprocessor_df, analysis_df, total_r
 
 def calculate_statistics(filtered_df, value_column, total_requests_df, use_absolute=False):
     """bin별 통계 계산 함수 - 기존 동시성 측정과 동일한 방식"""
-    # 전체 (roomNumber, bin) 조합을 기준으로 결과 생성
-    result_stats = total_requests_df.copy()
-    
-    # 통계 컬럼들 초기화 (기존 방식과 동일)
-    result_stats['occurrence_count'] = 0
-    result_stats['occurrence_rate'] = 0.0
-    result_stats['sum_value'] = 0.0
-    result_stats['avg_value'] = np.nan
-    result_stats['min_value'] = np.nan
-    result_stats['max_value'] = np.nan
-    result_stats['median_value'] = np.nan
-    result_stats['std_value'] = 0.0
-    
-    # 이상현상이 있는 경우에만 실제 통계 계산
-    if len(filtered_df) > 0:
-        # (roomNumber, bin) 단위로 그룹화
-        grouped = filtered_df.groupby(['roomNumber', 'bin'])
-        
-        for (room_num, bin_num), group in grouped:
-            # 해당 값들 추출 (NaN 제거)
-            values = group[value_column].dropna()
-            
-            if len(values) == 0:
-                continue
-            
-            # 결과 DataFrame에서 해당 row 찾기
-            mask = (result_stats['roomNumber'] == room_num) & (result_stats['bin'] == bin_num)
-            row_idx = result_stats[mask].index
-            
-            if len(row_idx) == 0:
-                continue
-                
-            row_idx = row_idx[0]
-            total_requests = result_stats.loc[row_idx, 'total_requests']
-            
-            # 통계 계산
-            occurrence_count = len(values)
-            occurrence_rate = (occurrence_count / total_requests * 100) if total_requests > 0 else 0
-            
-            # 결과 업데이트 (절댓값 옵션 적용)
-            result_stats.loc[row_idx, 'occurrence_count'] = int(occurrence_count)
-            result_stats.loc[row_idx, 'occurrence_rate'] = round(occurrence_rate, 2)
-            
-            if use_absolute:
-                result_stats.loc[row_idx, 'sum_value'] = round(values.abs().sum(), 2)
-                result_stats.loc[row_idx, 'avg_value'] = round(values.abs().mean(), 2)
-            else:
-                result_stats.loc[row_idx, 'sum_value'] = round(values.sum(), 2)
-                result_stats.loc[row_idx, 'avg_value'] = round(values.mean(), 2)
-            
-            result_stats.loc[row_idx, 'min_value'] = round(values.min(), 2)
-            result_stats.loc[row_idx, 'max_value'] = round(values.max(), 2)
-            result_stats.loc[row_idx, 'median_value'] = round(values.median(), 2)
-            result_stats.loc[row_idx, 'std_value'] = round(values.std(), 4) if len(values) > 1 else 0.0
+    # (roomNumber, bin) 단위 groupby 한 번 → 전체 목록(total_requests_df)에 left merge
+    # (이상현상 없는 bin은 건수/발생률/총합/표준편차 0, 평균/최소/최대/중간값 NaN)
+    result_stats = occurrence_stats_by_group(filtered_df, ['roomNumber', 'bin'], value_column,
+                                             total_requests_df, use_absolute=use_absolute)
     
     # 데이터 타입 정리
     result_stats['roomNumber'] = result_stats['roomNumber'].astype(int)
@@ -248,57 +204,24 @@ def analyze_capacity_prevention_per_bin(preprocessor_df, analysis_df, total_requ
     # anomaly_type이 NaN인 경우 빈 문자열로 처리
     analysis_df['anomaly_type'] = analysis_df['anomaly_type'].fillna('')
     
-    # 전체 (roomNumber, bin) 조합을 기준으로 결과 생성
-    result_stats = total_requests_df.copy()
-    
-    # 통계 컬럼들 초기화
-    result_stats['정원 초과 발생 건수'] = 0
-    result_stats['정원 초과 발생률 (%)'] = 0.0
-    result_stats['정원 초과 방지 성공률 (%)'] = 100.0
-    result_stats['평균 초과 인원'] = 0.0
-    result_stats['최소 초과 인원'] = np.nan
-    result_stats['최대 초과 인원'] = np.nan
-    result_stats['중간값 초과 인원'] = np.nan
-    result_stats['초과 규모 표준편차'] = 0.0
-    
     # 정원 초과 오류 필터링
     capacity_exceeded = analysis_df[analysis_df['anomaly_type'].str.contains('정원 초과 오류', na=False)]
     
-    if len(capacity_exceeded) > 0:
-        # (roomNumber, bin) 단위로 그룹화하여 통계 계산
-        grouped = capacity_exceeded.groupby(['roomNumber', 'bin'])
-        
-        for (room_num, bin_num), group in grouped:
-            # 해당 bin의 모든 초과 인원 값들 추출
-            exceeded_amounts = group['over_capacity_amount'].dropna()
-            
-            if len(exceeded_amounts) == 0:
-                continue
-            
-            # 결과 DataFrame에서 해당 bin 찾기
-            mask = (result_stats['roomNumber'] == room_num) & (result_stats['bin'] == bin_num)
-            row_idx = result_stats[mask].index
-            
-            if len(row_idx) == 0:
-                continue
-                
-            row_idx = row_idx[0]
-            total_requests = result_stats.loc[row_idx, 'total_requests']
-            
-            # 통계 계산
-            exceeded_count = len(exceeded_amounts)
-            exceeded_rate = (exceeded_count / total_requests * 100) if total_requests > 0 else 0
-            prevention_rate = ((total_requests - exceeded_count) / total_requests * 100) if total_requests > 0 else 100
-            
-            # 결과 업데이트
-            result_stats.loc[row_idx, '정원 초과 발생 건수'] = exceeded_count
-            result_stats.loc[row_idx, '정원 초과 발생률 (%)'] = round(exceeded_rate, 2)
-            result_stats.loc[row_idx, '정원 초과 방지 성공률 (%)'] = round(prevention_rate, 2)
-            result_stats.loc[row_idx, '평균 초과 인원'] = round(exceeded_amounts.mean(), 2)
-            result_stats.loc[row_idx, '최소 초과 인원'] = round(exceeded_amounts.min(), 2)
-            result_stats.loc[row_idx, '최대 초과 인원'] = round(exceeded_amounts.max(), 2)
-            result_stats.loc[row_idx, '중간값 초과 인원'] = round(exceeded_amounts.median(), 2)
-            result_stats.loc[row_idx, '초과 규모 표준편차'] = round(exceeded_amounts.std(), 4) if len(exceeded_amounts) > 1 else 0.0
+    # (roomNumber, bin) 단위 groupby 한 번 → 전체 목록(total_requests_df)에 left merge
+    exceeded_stats = occurrence_stats_by_group(capacity_exceeded, ['roomNumber', 'bin'], 'over_capacity_amount', total_requests_df)
+    total_requests = exceeded_stats['total_requests']
+    exceeded_count = exceeded_stats['occurrence_count']
+    
+    # 전체 (방×bin) 조합 기준 결과 (정원 초과 없는 조합: 방지 성공률 100, 평균 0, 최소/최대/중간값 NaN)
+    result_stats = total_requests_df.copy()
+    result_stats['정원 초과 발생 건수'] = exceeded_count
+    result_stats['정원 초과 발생률 (%)'] = exceeded_stats['occurrence_rate']
+    result_stats['정원 초과 방지 성공률 (%)'] = ((total_requests - exceeded_count) / total_requests * 100).where(total_requests > 0, 100.0).round(2)
+    result_stats['평균 초과 인원'] = exceeded_stats['avg_value'].fillna(0.0)
+    result_stats['최소 초과 인원'] = exceeded_stats['min_value']
+    result_stats['최대 초과 인원'] = exceeded_stats['max_value']
+    result_stats['중간값 초과 인원'] = exceeded_stats['median_value']
+    result_stats['초과 규모 표준편차'] = exceeded_stats['std_value']
     
     # 컬럼명 정리
     final_columns = {
@@ -0,0 +1,5 @@
+"""
+Concurrency_Performance_Scripts 공통 모듈
+- RaceConditionAnalzer_Scripts / PerformanceAnalysis_Scripts 스크립트들이 함께 사용하는 분석 엔진 모음
+- 각 스크립트는 sys.path 에 Concurrency_Performance_Scripts 디렉토리를 추가한 뒤 import 한다
+"""
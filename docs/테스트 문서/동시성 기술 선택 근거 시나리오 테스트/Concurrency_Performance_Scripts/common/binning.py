@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+방별 bin(분석 구간) 할당 공통 엔진
+- 스크립트마다 달랐던 bin 할당 방식(방별 pd.cut 반복, cumcount // 20 + 1 등)을 한 곳에서 배열 연산으로 처리
+- 모드
+    fixed: 방 안 순번 기준 bin_size 개씩 (예: 20개씩, 최대 10구간)
+    equal: 방별 요청을 bin_count 개 구간으로 균등 분할 (pd.cut(range(n), bin_count) 와 같은 경계)
+    time : 방의 첫 요청 시각 기준 고정 시간 창(window_ms) 단위 (나노초 컬럼 기준)
+- 방 안 순번은 DataFrame 의 현재 행 순서 기준 (호출 전에 방 → 시각 순으로 정렬되어 있어야 함)
+- 전처리기 CLI 공통 옵션(--bin_mode 등) 등록/해석 함수 제공
+"""
+
+import numpy as np
+import pandas as pd
+
+from common.nano_time import to_nano_int64
+from common.room_partition import ROOM_COLUMN, RoomPartition
+
+BIN_MODE_FIXED = 'fixed'
+BIN_MODE_EQUAL = 'equal'
+BIN_MODE_TIME = 'time'
+BIN_MODES = [BIN_MODE_FIXED, BIN_MODE_EQUAL, BIN_MODE_TIME]
+
+NANOS_PER_MILLI = 1_000_000
+
+
+class BinningEngine:
+    """
+    방별 bin 번호 할당기
+
+    사용 예:
+        engine = BinningEngine(BIN_MODE_EQUAL, bin_count=10)
+        df['bin'] = engine.assign(df, time_column='waiting_start_nanoTime')
+    """
+
+    def __init__(self, mode=BIN_MODE_EQUAL, bin_count=10, bin_size=20, window_ms=10.0, max_bins=None):
+        """
+        매개변수:
+            mode: 할당 방식 (fixed / equal / time)
+            bin_count: equal 모드 구간 수
+            bin_size: fixed 모드 구간당 요청 수
+            window_ms: time 모드 시간 창 크기 (밀리초)
+            max_bins: 최대 bin 번호 (초과분은 마지막 bin 에 포함, None 이면 제한 없음)
+        """
+        if mode not in BIN_MODES:
+            raise ValueError(f"지원하지 않는 bin 모드: {mode} (선택: {', '.join(BIN_MODES)})")
+        if bin_count < 1 or bin_size < 1 or window_ms <= 0 or (max_bins is not None and max_bins < 1):
+            raise ValueError("bin_count, bin_size, window_ms, max_bins 는 양수여야 합니다")
+
+        self.mode = mode
+        self.bin_count = int(bin_count)
+        self.bin_size = int(bin_size)
+        self.window_ms = float(window_ms)
+        self.max_bins = None if max_bins is None else int(max_bins)
+
+    @property
+    def window_ns(self):
+        """시간 창 크기 (나노초)"""
+        return max(1, int(round(self.window_ms * NANOS_PER_MILLI)))
+
+    def describe(self):
+        """설명 테이블(bin 행 '도출 방법')에 기록할 할당 방식 설명"""
+        if self.mode == BIN_MODE_FIXED:
+            limit = f"{self.max_bins}구간" if self.max_bins else "구간 분할"
+            return f"각 방별로 나노초 순서 기준 {self.bin_size}개씩 {limit}"
+
+        if self.mode == BIN_MODE_EQUAL:
+            text = f"각 방의 요청을 {self.bin_count}개 구간으로 균등 분할"
+        else:
+            text = f"각 방의 첫 요청 나노초 기준 {self.window_ms:g}ms 시간 창 단위 구간"
+        return text + (f" (최대 {self.max_bins}구간)" if self.max_bins else "")
+
+    def assign(self, df, time_column=None, partition=None, column=ROOM_COLUMN):
+        """
+        행별 bin 번호 계산
+
+        매개변수:
+            df: 방 → 시각 순으로 정렬된 DataFrame
+            time_column: time 모드 기준 나노초 컬럼 (Int64 또는 정수 문자열)
+            partition: df 의 RoomPartition (없으면 새로 계산)
+            column: 방 번호 컬럼
+
+        반환값:
+            float64 배열 (df 행 순서, 1부터 시작) - 방 번호가 없는 행은 NaN
+
+        설명:
+            방별 반복 없이 방 안 순번/방 크기/방별 시작 시각을 배열로 계산한 뒤 한 번에 할당
+        """
+        if partition is None:
+            partition = RoomPartition(df, column=column)
+
+        bins = np.full(len(df), np.nan)
+        if len(partition.order) == 0:
+            return bins
+
+        # 방 정렬 순서(partition.order) 기준 방 안 순번 / 방 크기
+        sizes = partition.room_sizes()
+        rank = np.arange(len(partition.order)) - np.repeat(partition.offsets[:-1], sizes)
+        room_size = np.repeat(sizes, sizes)
+
+        if self.mode == BIN_MODE_FIXED:
+            labels = rank // self.bin_size + 1
+        elif self.mode == BIN_MODE_EQUAL:
+            labels = self._equal_count_labels(rank, room_size)
+        else:
+            if time_column is None or time_column not in df.columns:
+                raise ValueError(f"time 모드에는 나노초 컬럼이 필요합니다: {time_column}")
+            times = to_nano_int64(df[time_column]).iloc[partition.order]
+            labels = self._time_window_labels(times, partition.offsets, sizes)
+
+        if self.max_bins:
+            labels = np.minimum(labels, self.max_bins)
+
+        bins[partition.order] = labels
+        return bins
+
+    def _equal_count_labels(self, rank, room_size):
+        """
+        방 크기별 균등 분할 (pd.cut(range(n), bins=bin_count) 와 같은 실수 경계, 같은 크기의 방은 한 번에 계산)
+        - 요청 수가 bin_count 이하인 방은 요청마다 하나의 bin
+        """
+        labels = rank + 1
+        for size in np.unique(room_size[room_size > self.bin_count]):
+            rows = room_size == size
+            edges = np.linspace(0, size - 1, self.bin_count + 1)
+            edges[0] -= (size - 1) * 0.001  # pd.cut 과 동일한 첫 경계 확장 (오른쪽 닫힌 구간)
+            labels[rows] = np.searchsorted(edges, rank[rows], side='left')
+        return labels
+
+    def _time_window_labels(self, times, offsets, sizes):
+        """
+        방 정렬 순서의 나노초 값으로 방별 시작 시각 기준 시간 창 번호 계산
+        - 시각이 없는 행은 같은 방의 마지막 bin, 방 전체에 시각이 없으면 1
+        """
+        valid = times.notna().to_numpy()
+        values = times.to_numpy(dtype=np.int64, na_value=0)
+        starts = offsets[:-1]
+
+        room_start = np.minimum.reduceat(np.where(valid, values, np.iinfo(np.int64).max), starts)
+        labels = np.where(valid, (values - np.repeat(room_start, sizes)) // self.window_ns + 1, 0)
+
+        room_last = np.maximum(np.maximum.reduceat(labels, starts), 1)
+        return np.where(valid, labels, np.repeat(room_last, sizes))
+
+
+def add_binning_arguments(parser, default_engine, separator='_'):
+    """
+    전처리기 CLI 에 bin 할당 옵션 등록
+
+    매개변수:
+        parser: argparse.ArgumentParser
+        default_engine: 기본값으로 사용할 BinningEngine (스크립트별 기존 할당 방식)
+        separator: 옵션명 단어 구분자 ('_' → --bin_mode, '-' → --bin-mode)
+    """
+    def option(name):
+        return '--' + name.replace('_', separator)
+
+    group = parser.add_argument_group('bin 구간 설정')
+    group.add_argument(option('bin_mode'), dest='bin_mode', choices=BIN_MODES, default=default_engine.mode,
+                       help=f'bin 할당 방식 (fixed: N개씩, equal: N등분, time: 시간 창, 기본값: {default_engine.mode})')
+    group.add_argument(option('bin_count'), dest='bin_count', type=int, default=default_engine.bin_count,
+                       help=f'equal 모드 구간 수 (기본값: {default_engine.bin_count})')
+    group.add_argument(option('bin_size'), dest='bin_size', type=int, default=default_engine.bin_size,
+                       help=f'fixed 모드 구간당 요청 수 (기본값: {default_engine.bin_size})')
+    group.add_argument(option('bin_window_ms'), dest='bin_window_ms', type=float, default=default_engine.window_ms,
+                       help=f'time 모드 시간 창 크기, 밀리초 (기본값: {default_engine.window_ms:g})')
+    group.add_argument(option('bin_max'), dest='bin_max', type=int, default=default_engine.max_bins,
+                       help=f'최대 bin 번호, 초과분은 마지막 bin, 0 이면 제한 없음 (기본값: {default_engine.max_bins or "제한 없음"})')
+
+
+def binning_engine_from_args(parser, args):
+    """add_binning_arguments 로 등록한 옵션으로 BinningEngine 생성 (잘못된 값이면 parser.error 로 종료)"""
+    try:
+        return BinningEngine(mode=args.bin_mode, bin_count=args.bin_count, bin_size=args.bin_size,
+                             window_ms=args.bin_window_ms, max_bins=args.bin_max or None)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def summarize_bins_by_room(df, bins, column=ROOM_COLUMN):
+    """방별 요청 수(requests)와 bin 개수(bins) - 방 등장 순서, 진행 상황 출력용"""
+    summary = pd.Series(bins, index=df.index).groupby(df[column], sort=False).agg(['size', 'nunique'])
+    return summary.rename(columns={'size': 'requests', 'nunique': 'bins'})
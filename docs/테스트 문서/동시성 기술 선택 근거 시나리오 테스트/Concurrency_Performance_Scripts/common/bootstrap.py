@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+부트스트랩 신뢰구간 공통 함수 (동시성 기법 간 유의성 비교)
+- 두 실행 결과의 지연 시간 백분위수(중앙값, p99 등) 차이 / 성공률 차이에 대한 백분위 부트스트랩 신뢰구간
+- 재표본 추출은 NumPy 배열 연산 (행마다 반복하지 않음)
+    exact    : 정렬된 값의 인덱스 행렬(재표본 수 × n)을 덩어리 단위로 생성, np.partition 으로 순서 통계량 선택
+    histogram: HDR 버킷(common.latency_histogram) 개수에 대한 다항분포 재표본 (재표본 수 × 버킷 수)
+               → 100만 행 × 1만 회도 수 초 안에 계산 (값은 버킷 상한, 상대 오차 < 0.8%)
+- 성공률은 이항분포 재표본 (행 단위 성공/실패 복원 추출과 같은 분포)
+- 백분위수 정의는 Latency_Percentiles 시트와 동일 (누적 개수가 ceil(n × p / 100) 에 처음 도달하는 값)
+"""
+
+import numpy as np
+
+from common.latency_histogram import bucket_bounds, bucket_index
+
+BOOTSTRAP_METHOD_AUTO = 'auto'
+BOOTSTRAP_METHOD_EXACT = 'exact'
+BOOTSTRAP_METHOD_HISTOGRAM = 'histogram'
+BOOTSTRAP_METHODS = [BOOTSTRAP_METHOD_AUTO, BOOTSTRAP_METHOD_EXACT, BOOTSTRAP_METHOD_HISTOGRAM]
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_CHUNK_ELEMENTS = 20_000_000      # 덩어리 하나의 재표본 행렬 원소 수 (int64 기준 약 160MB)
+EXACT_ELEMENT_LIMIT = 100_000_000        # auto 모드: n × 재표본 수가 이 값 이하이면 exact, 초과하면 histogram
+
+
+def choose_method(sample_size, resamples, method=BOOTSTRAP_METHOD_AUTO):
+    """재표본 방식 결정 (auto 이면 표본 크기 × 재표본 수로 exact / histogram 선택)"""
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"지원하지 않는 부트스트랩 방식: {method} (선택: {', '.join(BOOTSTRAP_METHODS)})")
+    if method != BOOTSTRAP_METHOD_AUTO:
+        return method
+    return BOOTSTRAP_METHOD_EXACT if sample_size * resamples <= EXACT_ELEMENT_LIMIT else BOOTSTRAP_METHOD_HISTOGRAM
+
+
+def _ranks(sample_size, percentiles):
+    """백분위수별 순위 (1부터, ceil(n × p / 100), 최소 1)"""
+    ranks = np.ceil(np.round(sample_size * np.asarray(percentiles, dtype=float) / 100, 9))
+    return np.clip(ranks, 1, sample_size).astype(np.int64)
+
+
+def _chunk_sizes(resamples, row_elements, chunk_elements):
+    """재표본 수를 덩어리 크기 목록으로 분할 (덩어리당 원소 수 ≤ chunk_elements, 최소 1행)"""
+    rows = max(1, int(chunk_elements // max(row_elements, 1)))
+    return [min(rows, resamples - start) for start in range(0, resamples, rows)]
+
+
+class LatencySample:
+    """
+    한 실행의 지연 시간 표본 (정렬된 나노초 값 또는 HDR 버킷 개수)
+
+    사용 예:
+        sample = LatencySample(df['wait_time_ns'], method='exact')
+        point = sample.percentiles([50, 99])
+        resampled = sample.bootstrap_percentiles([50, 99], 10000, rng)   # (10000, 2)
+    """
+
+    def __init__(self, values, method=BOOTSTRAP_METHOD_EXACT):
+        """
+        매개변수:
+            values: 나노초 값 (결측값/음수 제외)
+            method: exact (원본 값) / histogram (HDR 버킷)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values) & (values >= 0)]
+        self.method = method
+        self.size = len(values)
+
+        if method == BOOTSTRAP_METHOD_HISTOGRAM:
+            buckets, counts = np.unique(bucket_index(np.round(values).astype(np.int64)), return_counts=True)
+            self.values = bucket_bounds(buckets)[1].astype(np.float64)  # 버킷 상한 (HDR highestEquivalentValue)
+            self.counts = counts
+        else:
+            self.values = np.sort(values)
+            self.counts = None
+
+    def percentiles(self, percentiles):
+        """원본 표본의 백분위수 (method 기준 값)"""
+        if self.size == 0:
+            return np.full(len(percentiles), np.nan)
+        ranks = _ranks(self.size, percentiles)
+        if self.counts is None:
+            return self.values[ranks - 1]
+        return self.values[np.searchsorted(np.cumsum(self.counts), ranks, side='left')]
+
+    def bootstrap_percentiles(self, percentiles, resamples, rng, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+        """
+        재표본별 백분위수
+
+        반환값:
+            ndarray (resamples × len(percentiles)), 표본이 비어 있으면 NaN
+
+        설명:
+            - exact: 인덱스 행렬을 정렬된 값의 위치로 사용 → k번째 작은 인덱스 = k번째 작은 값 (np.partition)
+            - histogram: 버킷 개수 다항분포 재표본 → 누적 개수가 순위에 처음 도달하는 버킷 상한
+        """
+        result = np.full((resamples, len(percentiles)), np.nan)
+        if self.size == 0:
+            return result
+
+        ranks = _ranks(self.size, percentiles)
+        start = 0
+        if self.counts is None:
+            for rows in _chunk_sizes(resamples, self.size, chunk_elements):
+                indices = rng.integers(0, self.size, size=(rows, self.size))
+                selected = np.partition(indices, ranks - 1, axis=1)[:, ranks - 1]
+                result[start:start + rows] = self.values[selected]
+                start += rows
+            return result
+
+        probabilities = self.counts / self.size
+        for rows in _chunk_sizes(resamples, len(self.counts), chunk_elements):
+            cumulative = np.cumsum(rng.multinomial(self.size, probabilities, size=rows), axis=1)
+            for i, rank in enumerate(ranks):
+                result[start:start + rows, i] = self.values[np.argmax(cumulative >= rank, axis=1)]
+            start += rows
+        return result
+
+
+def bootstrap_proportions(successes, total, resamples, rng):
+    """성공률 재표본 (0~1, 이항분포), total 이 0이면 NaN"""
+    if total == 0:
+        return np.full(resamples, np.nan)
+    return rng.binomial(total, successes / total, size=resamples) / total
+
+
+def confidence_interval(differences, confidence=DEFAULT_CONFIDENCE):
+    """차이 재표본의 백분위 신뢰구간 (하한, 상한), 값이 없으면 (NaN, NaN)"""
+    differences = differences[~np.isnan(differences)]
+    if len(differences) == 0:
+        return np.nan, np.nan
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(differences, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def excludes_zero(low, high):
+    """신뢰구간이 0을 포함하지 않으면 True (유의한 차이)"""
+    return bool(not np.isnan(low) and not np.isnan(high) and (low > 0 or high < 0))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+차트(figure) 병렬 렌더링 스케줄러 (분석기 / 시각화 스크립트 공통)
+- 서로 독립인 차트를 작업으로 모아 두었다가 workers > 1 이면 프로세스 풀에서 동시에 렌더링
+- 작업 = (출력 경로, 렌더링 함수, 인자), 인자는 미리 계산한 배열/리스트/스칼라만 전달
+  (DataFrame 전체나 분석기 객체를 넘기지 않으므로 프로세스 간 직렬화 비용이 작음)
+- 워커 프로세스는 비대화형 Agg 백엔드 사용 (화면 없이 PNG 저장만 수행)
+- 렌더링 함수는 모듈 최상위 함수여야 함 (프로세스 풀로 전달하려면 pickle 가능해야 함)
+- workers <= 1 이거나 작업이 1개이면 현재 프로세스에서 순서대로 렌더링 (기존 직렬 처리와 동일)
+- 오류 위치 표식(세로 음영)은 axvspan 반복 대신 컬렉션 하나로 그리는 add_span_markers 사용
+"""
+
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+
+class ChartRenderError(RuntimeError):
+    """렌더링에 실패한 차트가 있을 때 (나머지 차트는 모두 렌더링한 뒤 발생)"""
+
+    def __init__(self, failures, output_paths):
+        self.failures = failures            # [(출력 경로, 예외), ...]
+        self.output_paths = output_paths    # 렌더링에 성공한 출력 경로 목록
+        first_path, first_error = failures[0]
+        super().__init__(f"차트 {len(failures)}개 렌더링 실패 (첫 실패: {first_path} - {first_error})")
+
+
+def add_span_markers(ax, positions, half_width, color, alpha, label=None):
+    """
+    x 위치마다 축 전체 높이의 세로 음영을 PolyCollection 하나로 그림 (위치별 axvspan 반복 대체)
+
+    매개변수:
+        ax: 대상 Axes
+        positions: 음영 중심 x 위치 목록 (중복 위치는 겹쳐 그려져 더 진하게 표시 - axvspan 반복과 동일)
+        half_width: 음영 반폭 (x 데이터 단위)
+        color: 음영 색 (면/테두리)
+        alpha: 투명도
+        label: 범례 레이블 (None 이면 범례에 표시하지 않음)
+
+    반환값:
+        PolyCollection (위치가 없으면 None)
+    """
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) == 0:
+        return None
+
+    left = positions - half_width
+    right = positions + half_width
+    bottom = np.zeros(len(positions))
+    top = np.ones(len(positions))
+    verts = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                      np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+
+    # x = 데이터 좌표, y = 축 좌표(0~1) → axvspan(ymin=0, ymax=1) 과 같은 영역
+    markers = PolyCollection(verts, transform=ax.get_xaxis_transform(), facecolors=color,
+                             edgecolors=color, alpha=alpha, label=label if label is not None else '_nolegend_')
+    ax.add_collection(markers, autolim=False)
+
+    # axvspan 처럼 x 자동 범위에만 음영 폭을 반영
+    ax.update_datalim(np.column_stack([np.concatenate([left, right]), np.zeros(2 * len(positions))]), updatey=False)
+    ax.autoscale_view(scaley=False)
+    return markers
+
+
+def _init_render_worker(initializer, initargs):
+    """워커 초기화 (Agg 백엔드 + 폰트/스타일 설정, 설정 메시지는 메인 프로세스에서 이미 출력했으므로 숨김)"""
+    matplotlib.use('Agg', force=True)
+    if initializer is not None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            initializer(*initargs)
+
+
+def _render_task(render_func, args):
+    """프로세스 풀 작업 단위 (차트 하나 렌더링)"""
+    render_func(*args)
+
+
+class ChartRenderScheduler:
+    """
+    차트 렌더링 작업 스케줄러
+
+    사용 예:
+        scheduler = ChartRenderScheduler(workers=8, initializer=setup_korean_font)
+        for room, chart in charts.items():
+            path = f'rule1_room{room}.png'
+            scheduler.submit(path, render_rule1_single_room_chart, path, chart)
+        paths = scheduler.run()      # 제출 순서대로 출력 경로 반환
+    """
+
+    def __init__(self, workers=1, initializer=None, initargs=()):
+        """
+        매개변수:
+            workers: 렌더링 프로세스 수 (1 이하이면 직렬 렌더링)
+            initializer: 워커 프로세스 시작 시 실행할 함수 (한글 폰트, 스타일 등 rcParams 설정)
+            initargs: initializer 인자
+        """
+        self.workers = workers if workers is not None else 1
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self._tasks = []
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def submit(self, output_path, render_func, *args):
+        """
+        렌더링 작업 추가 (run() 에서 실행)
+
+        매개변수:
+            output_path: 차트 저장 경로 (결과/오류 보고용)
+            render_func: 모듈 최상위 렌더링 함수 (render_func(*args) 로 호출)
+            args: 미리 계산한 차트 데이터 (pickle 가능한 값)
+        """
+        self._tasks.append((output_path, render_func, args))
+
+    def run(self):
+        """
+        추가된 작업을 모두 렌더링
+
+        반환값:
+            list - 렌더링에 성공한 출력 경로 (제출 순서)
+
+        설명:
+            - 실패한 차트가 있어도 나머지 차트는 끝까지 렌더링한 뒤 ChartRenderError 발생
+              (첫 실패의 원인 예외를 __cause__ 로 연결)
+        """
+        tasks, self._tasks = self._tasks, []
+        output_paths, failures = [], []
+
+        if self.workers <= 1 or len(tasks) <= 1:
+            for output_path, render_func, args in tasks:
+                try:
+                    render_func(*args)
+                    output_paths.append(output_path)
+                except Exception as e:
+                    failures.append((output_path, e))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)), initializer=_init_render_worker,
+                                     initargs=(self.initializer, self.initargs)) as executor:
+                futures = [(output_path, executor.submit(_render_task, render_func, args))
+                           for output_path, render_func, args in tasks]
+                for output_path, future in futures:
+                    try:
+                        future.result()
+                        output_paths.append(output_path)
+                    except Exception as e:
+                        failures.append((output_path, e))
+
+        if failures:
+            raise ChartRenderError(failures, output_paths) from failures[0][1]
+        return output_paths
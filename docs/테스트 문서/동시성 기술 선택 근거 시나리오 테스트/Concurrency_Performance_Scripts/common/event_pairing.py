@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+시작/종료 이벤트 페어링 공통 엔진
+- 시간순 정렬된 방 단위 이벤트에서 시작 이벤트마다 같은 사용자의 "다음" 종료 이벤트를 매칭
+- 기존 전방 탐색(room_df.iloc[j] 반복, O(n²))을 사용자별 대기 목록 dict 기반 단일 패스(O(n))로 대체
+"""
+
+
+def pair_with_next_terminal_event(events, start_event, terminal_events,
+                                  user_key='userId', event_key='event'):
+    """
+    시작 이벤트마다 이후에 처음 나타나는 같은 사용자의 종료 이벤트를 매칭
+
+    기존 전방 탐색과 동일한 매칭 규칙:
+    - 종료 이벤트는 소비되지 않음 → 같은 사용자의 시작 이벤트가 연속되면 모두 같은 종료 이벤트와 매칭
+    - 이후에 종료 이벤트가 없는 시작 이벤트는 결과에서 제외
+    - 시작 이벤트보다 앞선 종료 이벤트는 무시
+
+    매개변수:
+        events: 시간순으로 정렬된 이벤트 레코드 목록 (dict 또는 Series)
+        start_event: 시작 이벤트명 (예: 'PRE_JOIN_CURRENT_STATE')
+        terminal_events: 종료 이벤트명 목록 (예: ['JOIN_SUCCESS_EXISTING', ...])
+        user_key, event_key: 사용자/이벤트 필드명
+
+    반환값:
+        list[tuple] - (시작 이벤트, 종료 이벤트) 목록, 시작 이벤트 순서
+    """
+    terminal_events = set(terminal_events)
+    pending_starts = {}                 # 사용자별 아직 종료 이벤트를 만나지 못한 시작 이벤트 위치
+    matched_end = [None] * len(events)  # 시작 이벤트 위치 → 매칭된 종료 이벤트 위치
+
+    for pos, event in enumerate(events):
+        event_name = event[event_key]
+
+        if event_name == start_event:
+            pending_starts.setdefault(event[user_key], []).append(pos)
+        elif event_name in terminal_events:
+            for start_pos in pending_starts.pop(event[user_key], ()):
+                matched_end[start_pos] = pos
+
+    return [(events[start_pos], events[end_pos])
+            for start_pos, end_pos in enumerate(matched_end) if end_pos is not None]
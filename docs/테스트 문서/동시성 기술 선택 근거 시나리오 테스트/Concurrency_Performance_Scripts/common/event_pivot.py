@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+세션(방, 사용자)별 이벤트 피벗 공통 함수
+- (방, 사용자)마다 이벤트를 정렬하고 iterrows 로 태그별 dict 를 만들던 처리를 정렬 1회 + 피벗 1회로 대체
+- 결과는 세션당 한 행, 태그별 '<접두사>_<접미사>' 컬럼 (예: critical_enter_nanoTime)
+- 같은 세션에 같은 태그가 여러 번 있으면 정렬 기준 마지막 이벤트 사용 (기존 dict 덮어쓰기와 동일)
+- 같은 사용자의 재시도는 시작 이벤트 누적 합으로 시도(attempt_id) 단위로 분리한 뒤 피벗
+"""
+
+import pandas as pd
+
+# 세션 식별 컬럼 기본값
+SESSION_KEYS = ['roomNumber', 'userId']
+
+# 시도 번호 컬럼 / 시도 단위 세션 식별 컬럼
+ATTEMPT_COLUMN = 'attempt_id'
+ATTEMPT_KEYS = SESSION_KEYS + [ATTEMPT_COLUMN]
+
+
+def assign_attempt_ids(events, start_tag, keys=SESSION_KEYS, tag_column='tag', order_column='nanoTime'):
+    """
+    세션(방, 사용자)별 이벤트 흐름을 시작 이벤트 기준 시도(attempt) 단위로 분할
+
+    매개변수:
+        events: 이벤트 DataFrame (인덱스 중복 없음)
+        start_tag: 시도 시작 태그 (예: WAITING_START, SEMAPHORE_EXISTING_ATTEMPT)
+        keys: 세션 식별 컬럼 목록
+        tag_column: 태그 컬럼명
+        order_column: 세션 내 이벤트 정렬 기준 컬럼
+
+    반환값:
+        Series (events 와 같은 인덱스) - 세션별 1부터 시작하는 시도 번호
+        (첫 시작 이벤트보다 앞선 이벤트는 0 - 시작 이벤트 없는 불완전한 시도)
+
+    설명:
+        order_column 순으로 정렬한 뒤 시작 이벤트 여부의 세션별 누적 합 (groupby cumsum, 행 단위 반복 없음)
+    """
+    keys = list(keys)
+    if events.empty:
+        return pd.Series(0, index=events.index, dtype='int64')
+
+    ordered = events.sort_values(keys + [order_column], kind='stable')
+    is_start = (ordered[tag_column] == start_tag).fillna(False).astype('int64')
+    attempt_ids = is_start.groupby([ordered[key] for key in keys], sort=False).cumsum()
+    return attempt_ids.reindex(events.index)
+
+
+def pivot_events_by_tag(events, tag_prefixes, fields, keys=SESSION_KEYS,
+                        tag_column='tag', order_column='nanoTime'):
+    """
+    세션별 이벤트를 태그 기준으로 펼쳐 세션당 한 행으로 변환
+
+    매개변수:
+        events: 이벤트 DataFrame (keys, tag_column, order_column, fields 컬럼 포함)
+        tag_prefixes: {태그: 컬럼 접두사} - 이 순서대로 결과 컬럼 배치
+        fields: {이벤트 컬럼: 컬럼 접미사} (예: {'timestamp': 'time', 'nanoTime': 'nanoTime'})
+        keys: 세션 식별 컬럼 목록 (기본값: roomNumber, userId)
+        tag_column: 태그 컬럼명
+        order_column: 세션 내 이벤트 정렬 기준 컬럼
+
+    반환값:
+        DataFrame - keys 컬럼 + 태그별 컬럼, keys 오름차순 (groupby 순회 순서와 동일)
+
+    설명:
+        - 한 세션에라도 나타난 태그만 컬럼 생성, 해당 태그가 없는 세션의 값은 결측값
+        - 컬럼 dtype 은 원본 컬럼 dtype 유지 (나노초 Int64, 시각 datetime 등)
+    """
+    keys = list(keys)
+    if events.empty:
+        return pd.DataFrame(columns=keys)
+
+    ordered = events.sort_values(keys + [order_column], kind='stable')
+    last_events = ordered.drop_duplicates(keys + [tag_column], keep='last')
+    wide = last_events.set_index(keys + [tag_column])[list(fields)].unstack(tag_column).sort_index()
+
+    present_tags = set(wide.columns.get_level_values(tag_column))
+    columns = {}
+    for tag, prefix in tag_prefixes.items():
+        if tag in present_tags:
+            for field, suffix in fields.items():
+                columns[f'{prefix}_{suffix}'] = wide[(field, tag)]
+
+    return pd.DataFrame(columns, index=wide.index).reset_index()
+
+
+def as_record_frame(df):
+    """
+    레코드(dict) 목록으로 만든 DataFrame(dtype=object)과 같은 형태로 변환
+    (결측값은 NaN, 이후 cast_nano_columns(...).infer_objects() 로 기존과 같은 dtype 추론)
+    """
+    records = df.astype(object)
+    return records.where(df.notna(), float('nan'))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Excel 보고서 스트리밍 저장 공통 모듈
+- openpyxl write-only 워크북에 행 단위로 기록 → 시트 전체를 셀 객체로 메모리에 올리지 않음
+- 숫자 서식(number_format)은 기록 시점에 셀별로 지정 → 저장 후 load_workbook 으로 다시 열어 셀을 순회하지 않음
+- 설명 테이블(side table)도 같은 패스에서 데이터 행 옆에 함께 기록
+- 헤더/날짜 서식/빈 값 처리는 pandas to_excel(openpyxl) 결과와 동일
+"""
+
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+TEXT_FORMAT = '@'
+INTEGER_FORMAT = '#,##0'
+DECIMAL_FORMAT = '#,##0.00'
+PERCENT_TEXT_FORMAT = '0.00"%"'
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Unit 컬럼 문자열별 시간 값 서식 (나노초: 정수, 마이크로초: 소수 3자리, 밀리초: 소수 6자리)
+TIME_UNIT_FORMATS = [
+    ('nanoseconds', '#,##0'),
+    ('microseconds', '#,##0.000'),
+    ('milliseconds', '#,##0.000000')
+]
+
+
+def _column_position(column, columns):
+    """컬럼 지정(문자 'C' / 컬럼명 / 1부터 시작하는 번호)을 0부터 시작하는 위치로 변환, 없으면 None"""
+    if isinstance(column, int):
+        return column - 1
+    if column in columns:
+        return columns.index(column)
+    if isinstance(column, str) and column.isalpha() and column.isupper():
+        return column_index_from_string(column) - 1
+    return None
+
+
+def _excel_value(value):
+    """셀 기록용 값 변환 (결측값 → 빈 셀, inf → 'inf' 문자열, 시간대 있는 시각 → 시간대 제거)"""
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return 'inf' if value > 0 else '-inf'
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def _column_values(series):
+    """컬럼 값을 Python 객체 리스트로 변환 (시간대 정보는 제거, Excel 은 시간대 미지원)"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+    return [_excel_value(value) for value in series.astype(object).tolist()]
+
+
+def column_range(first, last):
+    """Excel 열 문자 범위 (예: column_range('I', 'L') → ['I', 'J', 'K', 'L'])"""
+    return [get_column_letter(index)
+            for index in range(column_index_from_string(first), column_index_from_string(last) + 1)]
+
+
+def bool_as_text(value):
+    """불리언 값을 'TRUE'/'FALSE' 문자열로 변환 (그 외 값은 그대로)"""
+    if isinstance(value, (bool, np.bool_)):
+        return "TRUE" if value else "FALSE"
+    return value
+
+
+def time_unit_number_format(unit):
+    """Unit 컬럼 값에 맞는 시간 값 서식 (해당 단위가 없으면 None)"""
+    for unit_name, number_format in TIME_UNIT_FORMATS:
+        if unit_name in str(unit):
+            return number_format
+    return None
+
+
+def time_unit_row_formats(value_columns, unit_position=1):
+    """
+    Unit 컬럼(기본값: B열)에 따라 값 컬럼 서식을 정하는 row_formats 함수 생성
+
+    매개변수:
+        value_columns: 서식을 적용할 값 컬럼 목록 (예: ['C', 'D', 'E'])
+        unit_position: Unit 컬럼 위치 (0부터 시작)
+    """
+    def row_formats(values):
+        unit = values[unit_position]
+        number_format = time_unit_number_format(unit) if unit else None
+        if number_format is None:
+            return None
+        return {column: number_format for column in value_columns}
+    return row_formats
+
+
+class ExcelReportWriter:
+    """
+    write-only 워크북 기반 Excel 보고서 작성기
+
+    사용 예:
+        with ExcelReportWriter(output_path) as writer:
+            writer.write_sheet(df, 'Sheet1', column_formats={'C': INTEGER_FORMAT})
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+        return False
+
+    def write_sheet(self, df, sheet_name, column_formats=None, row_formats=None,
+                    side_table=None, side_table_start=None):
+        """
+        DataFrame 한 개를 시트로 기록 (헤더 1행 + 데이터 행)
+
+        매개변수:
+            df: 기록할 DataFrame (인덱스는 기록하지 않음)
+            sheet_name: 시트명
+            column_formats: {컬럼: number_format} - 컬럼은 Excel 문자('C'), 컬럼명, 1부터 시작하는 번호 중 하나
+            row_formats: 행 값(tuple)을 받아 {컬럼: number_format} 을 반환하는 함수
+                         (같은 열이라도 행마다 서식이 다른 경우, 예: 단위 컬럼에 따른 소수 자릿수)
+            side_table: 데이터 옆에 함께 기록할 2차원 리스트 (설명 테이블 등)
+            side_table_start: 설명 테이블 시작 위치 (행, 열), 1부터 시작 (기본값: 1행, 마지막 컬럼 + 2열)
+
+        설명:
+            - 서식은 값이 있는 데이터 셀에만 적용
+            - 설명 테이블 셀이 데이터 셀과 겹치면 설명 테이블 값으로 기록
+        """
+        worksheet = self.workbook.create_sheet(sheet_name)
+        columns = list(df.columns)
+
+        formats = [None] * len(columns)
+        for column, number_format in (column_formats or {}).items():
+            position = _column_position(column, columns)
+            if position is not None and 0 <= position < len(columns):
+                formats[position] = number_format
+
+        side_rows = {}
+        side_col = len(columns) + 1
+        if side_table:
+            start_row, start_col = side_table_start or (1, len(columns) + 2)
+            side_col = start_col - 1
+            side_rows = {start_row + offset: list(row) for offset, row in enumerate(side_table)}
+
+        # 헤더 행
+        header = [str(column) for column in columns]
+        worksheet.append(self._merge_side_row(header, side_rows.get(1), side_col))
+
+        # 데이터 행
+        column_values = [_column_values(df[column]) for column in columns]
+        excel_row = 1
+        for excel_row, values in enumerate(zip(*column_values), start=2):
+            row_format_map = row_formats(values) if row_formats else None
+            row_formats_list = formats
+            if row_format_map:
+                row_formats_list = list(formats)
+                for column, number_format in row_format_map.items():
+                    position = _column_position(column, columns)
+                    if position is not None and 0 <= position < len(columns):
+                        row_formats_list[position] = number_format
+
+            cells = []
+            for value, number_format in zip(values, row_formats_list):
+                if number_format is not None and value is not None:
+                    cell = WriteOnlyCell(worksheet, value=value)
+                    cell.number_format = number_format
+                    cells.append(cell)
+                else:
+                    cells.append(self._plain_cell(worksheet, value))
+            worksheet.append(self._merge_side_row(cells, side_rows.get(excel_row), side_col))
+
+        # 데이터보다 긴 설명 테이블의 나머지 행
+        for row_number in sorted(r for r in side_rows if r > excel_row):
+            while excel_row < row_number - 1:
+                excel_row += 1
+                worksheet.append([])
+            excel_row = row_number
+            worksheet.append(self._merge_side_row([], side_rows[row_number], side_col))
+
+    @staticmethod
+    def _plain_cell(worksheet, value):
+        """서식 지정이 없는 셀 (날짜는 pandas 와 동일한 날짜 서식 적용)"""
+        if isinstance(value, datetime):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.number_format = DATETIME_FORMAT
+            return cell
+        return value
+
+    @staticmethod
+    def _merge_side_row(cells, side_values, side_col):
+        """데이터 행에 설명 테이블 행을 합침 (side_col: 0부터 시작하는 시작 열)"""
+        if not side_values:
+            return cells
+        row = list(cells)
+        if len(row) < side_col + len(side_values):
+            row.extend([None] * (side_col + len(side_values) - len(row)))
+        for offset, value in enumerate(side_values):
+            row[side_col + offset] = value
+        return row
+
+    def save(self):
+        """워크북 저장 (출력 디렉토리가 없으면 생성)"""
+        output_dir = os.path.dirname(self.path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self.workbook.save(self.path)
+        return self.path
+
+
+def write_excel_with_side_table(df, path, side_table=None, side_table_start=None,
+                                column_formats=None, sheet_name='Sheet1'):
+    """
+    DataFrame 단일 시트 + 설명 테이블을 한 번에 기록
+
+    매개변수:
+        df: 기록할 DataFrame
+        path: 출력 xlsx 경로
+        side_table: 설명 테이블 2차원 리스트 (없으면 데이터만 기록)
+        side_table_start: 설명 테이블 시작 위치 (행, 열), 1부터 시작 (기본값: 1행, 마지막 컬럼 + 2열)
+        column_formats: {컬럼: number_format}
+        sheet_name: 시트명 (기본값: Sheet1, pandas to_excel 과 동일)
+
+    반환값:
+        저장된 파일 경로
+    """
+    with ExcelReportWriter(path) as writer:
+        writer.write_sheet(df, sheet_name, column_formats=column_formats,
+                           side_table=side_table, side_table_start=side_table_start)
+    return path
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+그룹(방 / 방-구간)별 집계 공통 함수
+- 그룹마다 전체 DataFrame 을 다시 필터링하지 않고 groupby 한 번으로 모든 그룹을 집계
+- 결과는 전체 그룹 인덱스(df_total 기준)에 맞춰 결합 → 해당 분류의 행이 없는 그룹은 0
+- 이상현상 발생 통계(occurrence_stats_by_group)는 groupby().agg 한 번 + 전체 그룹 목록에 left merge
+"""
+
+import pandas as pd
+
+# 시간 지표 기본 통계 (평균, 중앙값, 최댓값, 총합)
+GROUP_TIME_STATS = ['mean', 'median', 'max', 'sum']
+
+# 이상현상 발생 통계 컬럼 (occurrence_stats_by_group 결과 순서)
+OCCURRENCE_STAT_COLUMNS = ['occurrence_count', 'occurrence_rate', 'sum_value', 'avg_value',
+                           'min_value', 'max_value', 'median_value', 'std_value']
+
+# keys 가 빈 목록일 때 전체를 한 그룹으로 묶는 임시 키 컬럼
+_WHOLE_GROUP_KEY = '_whole_group'
+
+
+def count_by_group(df, keys, group_index):
+    """
+    그룹별 행 수
+
+    매개변수:
+        df: 집계 대상 DataFrame (비어 있을 수 있음)
+        keys: 그룹 기준 컬럼 목록 (예: ['roomNumber'], ['roomNumber', 'bin'])
+        group_index: 결과를 맞출 전체 그룹 인덱스
+
+    반환값:
+        Series - group_index 순서, 행이 없는 그룹은 0
+    """
+    if df.empty:
+        return pd.Series(0, index=group_index)
+    return df.groupby(keys).size().reindex(group_index, fill_value=0)
+
+
+def aggregate_by_group(df, keys, column, group_index, stats=GROUP_TIME_STATS):
+    """
+    그룹별 컬럼 통계
+
+    매개변수:
+        df: 집계 대상 DataFrame (비어 있을 수 있음)
+        keys: 그룹 기준 컬럼 목록
+        column: 통계를 계산할 컬럼
+        group_index: 결과를 맞출 전체 그룹 인덱스
+        stats: 계산할 통계 목록 (기본값: mean, median, max, sum)
+
+    반환값:
+        DataFrame - 컬럼은 stats, 행은 group_index 순서 (행이 없는 그룹은 0)
+    """
+    if df.empty:
+        return pd.DataFrame(0, index=group_index, columns=list(stats))
+    return df.groupby(keys)[column].agg(list(stats)).reindex(group_index, fill_value=0)
+
+
+def occurrence_stats_by_group(df, keys, column, total_requests_df, use_absolute=False):
+    """
+    그룹별 이상현상 발생 통계 (건수, 발생률, 총합, 평균, 최소, 최대, 중간값, 표준편차)
+
+    매개변수:
+        df: 이상현상 레코드만 거른 DataFrame (비어 있을 수 있음)
+        keys: 그룹 기준 컬럼 목록 (예: ['roomNumber'], ['roomNumber', 'bin'], 빈 목록이면 전체를 한 그룹으로 집계)
+        column: 통계를 계산할 값 컬럼 (NaN 값은 건수/통계에서 제외)
+        total_requests_df: 전체 그룹 목록 + 'total_requests' 컬럼 (keys 가 빈 목록이면 1행)
+        use_absolute: True 이면 총합/평균을 절댓값 기준으로 계산 (최소/최대/중간값/표준편차는 원래 값 기준)
+
+    반환값:
+        DataFrame - total_requests_df 의 행/인덱스 그대로 + OCCURRENCE_STAT_COLUMNS
+        (값이 없는 그룹: 건수/발생률/총합/표준편차 0, 평균/최소/최대/중간값 NaN)
+
+    설명:
+        - 발생률(%) = 건수 / total_requests * 100 (소수 2자리, total_requests 가 0 이면 0)
+        - 총합/평균/최소/최대/중간값은 소수 2자리, 표준편차는 소수 4자리 (값이 1개이면 0)
+        - total_requests_df 에 없는 그룹의 레코드는 무시
+    """
+    group_keys = list(keys) if keys else [_WHOLE_GROUP_KEY]
+    values = df.assign(**{_WHOLE_GROUP_KEY: 0})[group_keys + [column]].dropna(subset=[column])
+    values['_stat_value'] = values[column].abs() if use_absolute else values[column]
+
+    stats = values.groupby(group_keys).agg(
+        occurrence_count=(column, 'size'),
+        sum_value=('_stat_value', 'sum'),
+        avg_value=('_stat_value', 'mean'),
+        min_value=(column, 'min'),
+        max_value=(column, 'max'),
+        median_value=(column, 'median'),
+        std_value=(column, 'std'),
+    ).reset_index()
+
+    result = total_requests_df.assign(**{_WHOLE_GROUP_KEY: 0}).merge(stats, on=group_keys, how='left')
+    result.index = total_requests_df.index
+
+    total_requests = result['total_requests']
+    occurrence_count = result['occurrence_count'].fillna(0).astype(int)
+    result['occurrence_count'] = occurrence_count
+    result['occurrence_rate'] = (occurrence_count / total_requests * 100).where(total_requests > 0, 0.0).round(2)
+    result['sum_value'] = result['sum_value'].astype(float).fillna(0.0).round(2)
+    for stat_column in ['avg_value', 'min_value', 'max_value', 'median_value']:
+        result[stat_column] = result[stat_column].astype(float).round(2)
+    result['std_value'] = result['std_value'].astype(float).round(4).where(occurrence_count > 1, 0.0)
+
+    return result[list(total_requests_df.columns) + OCCURRENCE_STAT_COLUMNS]
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+임계구역 구간 겹침(경합) 탐지 공통 엔진
+- 방 단위로 true_critical_section_nanoTime_start/end 를 한 번만 정렬한 뒤 sweep line 으로 겹침 쌍을 찾음
+- 기존 iterrows 이중 루프(O(n²))를 O(n log n + 겹침 쌍 수)로 대체
+- 경계 규칙 선택 가능
+    inclusive : 끝점이 맞닿아도 겹침으로 판정  → not (end1 <  start2 or end2 <  start1)
+    exclusive : 끝점이 맞닿으면 겹치지 않음     → not (end1 <= start2 or end2 <= start1)
+"""
+
+import numpy as np
+import pandas as pd
+
+BOUNDARY_INCLUSIVE = 'inclusive'
+BOUNDARY_EXCLUSIVE = 'exclusive'
+
+DEFAULT_START_COLUMN = 'true_critical_section_nanoTime_start'
+DEFAULT_END_COLUMN = 'true_critical_section_nanoTime_end'
+
+
+def _is_overlapping(start1, end1, start2, end2, boundary):
+    """기존 스크립트와 동일한 겹침 판정식 (numpy 배열 브로드캐스트 가능)"""
+    if boundary == BOUNDARY_INCLUSIVE:
+        return ~((end1 < start2) | (end2 < start1))
+    return ~((end1 <= start2) | (end2 <= start1))
+
+
+def find_overlap_partners(starts, ends, boundary=BOUNDARY_INCLUSIVE):
+    """
+    구간 목록에서 위치별로 겹치는 상대 구간 위치를 sweep line 으로 찾기
+
+    매개변수:
+        starts, ends: 구간 시작/끝 값 배열 (같은 길이, NaN 포함 가능)
+        boundary: 'inclusive' 또는 'exclusive'
+
+    반환값:
+        list[list[int]] - 각 위치와 겹치는 다른 구간의 위치 (오름차순)
+                          시작/끝 중 하나라도 NaN 인 구간은 빈 리스트
+    """
+    if boundary not in (BOUNDARY_INCLUSIVE, BOUNDARY_EXCLUSIVE):
+        raise ValueError(f"지원하지 않는 경계 규칙: {boundary}")
+
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    n = len(starts)
+    partners = [[] for _ in range(n)]
+
+    valid_mask = ~(pd.isna(starts) | pd.isna(ends))
+    valid_positions = np.flatnonzero(valid_mask)
+
+    # 같은 시각에서의 처리 순서가 경계 규칙을 결정
+    # inclusive: 시작 → 끝 (맞닿은 구간도 활성 상태에서 만남)
+    # exclusive: 끝 → 길이 0 구간 → 시작 (맞닿은 구간은 만나지 않음)
+    if boundary == BOUNDARY_INCLUSIVE:
+        kind_start, kind_point, kind_end = 0, None, 1
+    else:
+        kind_end, kind_point, kind_start = 0, 1, 2
+
+    events = []
+    inverted_positions = []
+    for p in valid_positions:
+        start, end = starts[p], ends[p]
+        if start > end:
+            # 시작 > 끝인 비정상 구간은 sweep 대상에서 제외하고 아래에서 직접 비교
+            inverted_positions.append(p)
+        elif kind_point is not None and start == end:
+            events.append((start, kind_point, p))
+        else:
+            events.append((start, kind_start, p))
+            events.append((end, kind_end, p))
+
+    events.sort()
+
+    active = {}
+    for _, kind, p in events:
+        if kind == kind_end:
+            del active[p]
+            continue
+        for q in active:
+            partners[p].append(q)
+            partners[q].append(p)
+        if kind == kind_start:
+            active[p] = None
+
+    # 비정상 구간: 기존 판정식을 그대로 벡터 비교 (판정식은 대칭이므로 한 번만 기록)
+    if inverted_positions:
+        inverted_set = set(inverted_positions)
+        valid_starts = starts[valid_positions]
+        valid_ends = ends[valid_positions]
+        for p in inverted_positions:
+            hits = _is_overlapping(starts[p], ends[p], valid_starts, valid_ends, boundary)
+            for q in valid_positions[hits]:
+                if q == p:
+                    continue
+                partners[p].append(q)
+                if q not in inverted_set:
+                    partners[q].append(p)
+
+    for others in partners:
+        others.sort()
+
+    return partners
+
+
+def find_overlap_groups(room_df, boundary=BOUNDARY_INCLUSIVE,
+                        start_col=DEFAULT_START_COLUMN, end_col=DEFAULT_END_COLUMN,
+                        user_col='user_id'):
+    """
+    방 데이터프레임에서 임계구역이 겹치는 사용자 그룹 찾기
+
+    기존 이중 루프와 동일한 결과를 반환:
+    - 각 행마다 [자기 자신] + [겹치는 사용자들(행 순서)] 목록을 만들고
+    - 2명 이상이면 목록의 모든 사용자에게 해당 그룹을 기록 (뒤쪽 행이 앞쪽 기록을 덮어씀)
+
+    매개변수:
+        room_df: 단일 방의 데이터프레임
+        boundary: 'inclusive' 또는 'exclusive'
+        start_col, end_col, user_col: 사용할 컬럼명
+
+    반환값:
+        dict - {user_id: {'group_size': int, 'user_ids': list}}
+    """
+    users = room_df[user_col].tolist()
+    partners = find_overlap_partners(room_df[start_col].to_numpy(),
+                                     room_df[end_col].to_numpy(),
+                                     boundary)
+
+    overlap_groups = {}
+    for p, others in enumerate(partners):
+        if not others:
+            continue
+
+        overlapping_users = [users[p]] + [users[q] for q in others]
+        for user_id in overlapping_users:
+            overlap_groups[user_id] = {
+                'group_size': len(overlapping_users),
+                'user_ids': overlapping_users
+            }
+
+    return overlap_groups
+
+
+def analyze_overlap_details(room_df, boundary=BOUNDARY_INCLUSIVE,
+                            start_col=DEFAULT_START_COLUMN, end_col=DEFAULT_END_COLUMN,
+                            user_col='user_id'):
+    """
+    방 전체 레코드의 임계구역 개입 분석을 한 번에 수행
+
+    행마다 room_df 전체를 다시 훑던 방식 대신 find_overlap_partners 의 sweep 결과 한 번으로
+    모든 행의 개입 사용자 목록/개수/지속시간을 계산
+
+    매개변수:
+        room_df: 단일 방의 데이터프레임
+        boundary: 'inclusive' 또는 'exclusive'
+        start_col, end_col, user_col: 사용할 컬럼명
+
+    반환값:
+        dict - {행 index: {'intervening_users_in_critical_section': str,
+                           'intervening_user_count_critical': int,
+                           'true_critical_section_duration_nanos': 끝 - 시작}}
+               시작/끝 나노초가 없는 행은 포함하지 않음
+    """
+    starts = room_df[start_col].to_numpy()
+    ends = room_df[end_col].to_numpy()
+    users = room_df[user_col].tolist()
+    partners = find_overlap_partners(starts, ends, boundary)
+    valid_mask = ~(pd.isna(starts) | pd.isna(ends))
+
+    details = {}
+    for p, idx in enumerate(room_df.index):
+        if not valid_mask[p]:
+            continue
+
+        intervening_users = [users[q] for q in partners[p]]
+        details[idx] = {
+            'intervening_users_in_critical_section': ', '.join(intervening_users) if intervening_users else '',
+            'intervening_user_count_critical': len(intervening_users),
+            'true_critical_section_duration_nanos': ends[p] - starts[p]
+        }
+
+    return details
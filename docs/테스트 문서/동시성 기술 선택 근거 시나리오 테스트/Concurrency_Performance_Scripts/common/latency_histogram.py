@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+병합 가능한 지연 시간 히스토그램 (HDR 방식 로그 버킷) 공통 함수
+- 나노초 값을 2의 거듭제곱 구간마다 SUB_BUCKET_HALF 개의 선형 하위 버킷으로 나눠 셈 (상대 오차 < 1 / SUB_BUCKET_HALF)
+- 버킷 번호는 값만으로 정해지므로 방/구간/실행이 달라도 같은 버킷끼리 개수만 더하면 병합 완료 (원본 데이터 불필요)
+- 결과는 비어 있지 않은 버킷만 담은 긴 형식 테이블 (roomNumber, bin, metric, bucket, lower_ns, upper_ns, count)
+- 백분위수(p50/p90/p99/p99.9), Box Plot 통계, Violin 밀도는 저장된 히스토그램에서 계산
+"""
+
+import numpy as np
+import pandas as pd
+
+ROOM_COLUMN = 'roomNumber'
+ALL_ROOMS_LABEL = 'ALL'
+
+SUB_BUCKET_BITS = 8
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS   # 256 미만 값은 1ns 단위 정확한 버킷
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1   # 그 이상은 2의 거듭제곱 구간마다 128개 버킷
+
+HISTOGRAM_KEYS = [ROOM_COLUMN, 'bin']
+BUCKET_COLUMNS = ['lower_ns', 'upper_ns', 'count']
+HISTOGRAM_COLUMNS = HISTOGRAM_KEYS + ['metric', 'bucket'] + BUCKET_COLUMNS
+DEFAULT_PERCENTILES = [50, 90, 99, 99.9]
+
+
+def percentile_column(percentile):
+    """백분위수 컬럼명 (예: 99.9 → 'p99.9(ns)')"""
+    return f'p{percentile:g}(ns)'
+
+
+def bucket_index(values):
+    """
+    나노초 정수 배열의 버킷 번호
+
+    설명:
+        - 값 < SUB_BUCKET_COUNT: 버킷 번호 = 값 (정확)
+        - 그 외: 비트 길이에서 SUB_BUCKET_BITS 를 뺀 만큼 오른쪽 시프트한 상위 비트로 하위 버킷 결정
+    """
+    values = np.asarray(values, dtype=np.int64)
+    bit_length = np.frexp(values.astype(np.float64))[1]  # 0 → 0, 그 외 = 비트 길이
+    shift = np.maximum(bit_length - SUB_BUCKET_BITS, 0)
+    return shift * SUB_BUCKET_HALF + (values >> shift)
+
+
+def bucket_bounds(index):
+    """버킷 번호의 (하한, 상한) 나노초 값 배열 (양 끝 포함)"""
+    index = np.asarray(index, dtype=np.int64)
+    shift = np.maximum(index // SUB_BUCKET_HALF - 1, 0)
+    sub_bucket = index - shift * SUB_BUCKET_HALF
+    return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+
+def _with_bounds(hist):
+    """bucket 컬럼으로 lower_ns / upper_ns 컬럼 계산"""
+    lower, upper = bucket_bounds(hist['bucket'].to_numpy(dtype=np.int64))
+    hist['lower_ns'] = lower
+    hist['upper_ns'] = upper
+    hist['count'] = hist['count'].astype('int64')
+    return hist[[col for col in hist.columns if col not in BUCKET_COLUMNS] + BUCKET_COLUMNS]
+
+
+def build_latency_histograms(sources, keys=HISTOGRAM_KEYS):
+    """
+    방/구간별 지연 시간 히스토그램 생성
+
+    매개변수:
+        sources: [(metric 이름, DataFrame, 나노초 값 컬럼)] 목록
+                 (예: ('success_wait_time', df_success, 'wait_time_ns'))
+        keys: 히스토그램을 나눌 컬럼 (DataFrame 에 없는 컬럼은 결측값)
+
+    반환값:
+        DataFrame (keys + metric, bucket, lower_ns, upper_ns, count) - 비어 있지 않은 버킷만
+
+    설명:
+        값이 없거나 음수인 행은 제외, metric 마다 버킷 번호 계산 후 groupby 한 번으로 개수 집계
+    """
+    keys = list(keys)
+    frames = []
+    for metric, df, column in sources:
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df[column], errors='coerce')
+        valid = (values.notna() & (values >= 0)).to_numpy(dtype=bool)
+        if not valid.any():
+            continue
+
+        table = pd.DataFrame({key: df[key].to_numpy()[valid] if key in df.columns else pd.NA for key in keys},
+                             index=np.arange(np.count_nonzero(valid)))
+        table['metric'] = metric
+        table['bucket'] = bucket_index(values[valid].round().astype('int64').to_numpy())
+        frames.append(table.groupby(keys + ['metric', 'bucket'], dropna=False, sort=True).size()
+                      .rename('count').reset_index())
+
+    if not frames:
+        return pd.DataFrame(columns=keys + ['metric', 'bucket'] + BUCKET_COLUMNS)
+    return _with_bounds(pd.concat(frames, ignore_index=True))
+
+
+def merge_histograms(histograms, by=()):
+    """
+    히스토그램 병합 (방/구간/실행 간 같은 버킷의 개수 합)
+
+    매개변수:
+        histograms: 히스토그램 DataFrame 또는 그 목록 (여러 방, 여러 보고서 파일)
+        by: 병합 후에도 나눠 둘 컬럼 (예: [ROOM_COLUMN] → 방별로 bin 병합, () → 전체)
+
+    반환값:
+        DataFrame (by + metric, bucket, lower_ns, upper_ns, count)
+    """
+    if isinstance(histograms, pd.DataFrame):
+        histograms = [histograms]
+    group = list(by) + ['metric', 'bucket']
+    hist = pd.concat(list(histograms), ignore_index=True)
+    if hist.empty:
+        return pd.DataFrame(columns=group + BUCKET_COLUMNS)
+
+    hist['count'] = hist['count'].astype('int64')
+    merged = hist.groupby(group, dropna=False, sort=True)['count'].sum().reset_index()
+    return _with_bounds(merged)
+
+
+def histogram_percentiles(histograms, by=(), percentiles=DEFAULT_PERCENTILES):
+    """
+    히스토그램에서 metric 별 백분위수 계산
+
+    매개변수:
+        histograms: 히스토그램 DataFrame 또는 그 목록
+        by: 나눠서 계산할 컬럼 (() 이면 전체)
+        percentiles: 계산할 백분위수 목록
+
+    반환값:
+        DataFrame (by + metric, count, min(ns), p50(ns) ..., max(ns))
+
+    설명:
+        누적 개수가 ceil(전체 × p / 100) 에 처음 도달하는 버킷의 상한 값 (HDR highestEquivalentValue 기준)
+    """
+    group = list(by) + ['metric']
+    merged = merge_histograms(histograms, by)
+    value_columns = ['count', 'min(ns)'] + [percentile_column(p) for p in percentiles] + ['max(ns)']
+    if merged.empty:
+        return pd.DataFrame(columns=group + value_columns)
+
+    grouped = merged.groupby(group, dropna=False, sort=False)
+    cumulative = grouped['count'].cumsum()
+    total = grouped['count'].transform('sum')
+
+    result = pd.DataFrame({'count': grouped['count'].sum(), 'min(ns)': grouped['lower_ns'].first()})
+    for percentile in percentiles:
+        rank = np.maximum(np.ceil(np.round(total * percentile / 100, 9)), 1)
+        reached = merged[cumulative >= rank]
+        result[percentile_column(percentile)] = reached.groupby(group, dropna=False, sort=False)['upper_ns'].first()
+    result['max(ns)'] = grouped['upper_ns'].last()
+    return result.reset_index()[group + value_columns]
+
+
+def percentiles_by_room(histograms, percentiles=DEFAULT_PERCENTILES, column=ROOM_COLUMN):
+    """방별 백분위수 + 전체(ALL) 백분위수 (방 번호 오름차순 → ALL, metric 은 히스토그램 순서)"""
+    per_room = histogram_percentiles(histograms, by=[column], percentiles=percentiles)
+    overall = histogram_percentiles(histograms, percentiles=percentiles)
+    overall.insert(0, column, ALL_ROOMS_LABEL)
+    return pd.concat([per_room, overall], ignore_index=True)
+
+
+def _single_metric_buckets(hist):
+    """한 metric 의 버킷별 (하한, 상한, 대표값, 개수) 배열 - 버킷 번호 오름차순"""
+    merged = hist.groupby('bucket', sort=True)['count'].sum()
+    lower, upper = bucket_bounds(merged.index.to_numpy(dtype=np.int64))
+    middle = (lower + upper) / 2
+    return lower, upper, middle, merged.to_numpy(dtype=np.int64)
+
+
+def _value_at(upper, cumulative, total, percentile):
+    """누적 개수로 백분위수 버킷 상한 값 찾기"""
+    rank = max(np.ceil(round(total * percentile / 100, 9)), 1)
+    return float(upper[np.searchsorted(cumulative, rank, side='left')])
+
+
+def histogram_box_stats(hist, label=None, whisker=1.5):
+    """
+    한 metric 히스토그램의 Box Plot 통계 (matplotlib Axes.bxp 입력 형식)
+
+    매개변수:
+        hist: 한 metric 의 히스토그램 행 (여러 방/구간이면 버킷별로 합산)
+        label: 상자 레이블
+        whisker: 수염 길이 (IQR 배수)
+
+    반환값:
+        dict (label, mean, med, q1, q3, whislo, whishi, fliers), 개수가 0이면 None
+
+    설명:
+        사분위수는 버킷 상한 값, 수염은 [Q1 - whisker×IQR, Q3 + whisker×IQR] 안의 가장 바깥 버킷 값,
+        이상치는 수염 밖 버킷의 대표값(중간값) - 버킷 하나당 점 하나
+    """
+    lower, upper, middle, counts = _single_metric_buckets(hist)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    cumulative = np.cumsum(counts)
+    q1, median, q3 = (_value_at(upper, cumulative, total, p) for p in (25, 50, 75))
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - whisker * iqr, q3 + whisker * iqr
+
+    inside_low = lower >= low_limit
+    inside_high = upper <= high_limit
+    whislo = float(lower[inside_low].min()) if inside_low.any() else q1
+    whishi = float(upper[inside_high].max()) if inside_high.any() else q3
+
+    return {
+        'label': label,
+        'mean': float((middle * counts).sum() / total),
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        'whislo': min(whislo, q1),
+        'whishi': max(whishi, q3),
+        'fliers': middle[~(inside_low & inside_high)]
+    }
+
+
+def histogram_violin_stats(hist, log_scale=False):
+    """
+    한 metric 히스토그램의 Violin 통계 (matplotlib Axes.violin 입력 형식)
+
+    매개변수:
+        hist: 한 metric 의 히스토그램 행
+        log_scale: 로그 축에 그릴 때 True (버킷 폭을 log(1 + 값) 기준으로 계산)
+
+    반환값:
+        dict (coords, vals, mean, median, min, max), 개수가 0이면 None
+
+    설명:
+        버킷 대표값 위치의 밀도 = 개수 / 버킷 폭 (최댓값 1로 정규화)
+    """
+    lower, upper, middle, counts = _single_metric_buckets(hist)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    if log_scale:
+        width = np.log1p(upper + 1) - np.log1p(lower)
+    else:
+        width = upper - lower + 1
+    density = counts / width
+    return {
+        'coords': middle,
+        'vals': density / density.max(),
+        'mean': float((middle * counts).sum() / total),
+        'median': _value_at(upper, np.cumsum(counts), total, 50),
+        'min': float(lower[0]),
+        'max': float(upper[-1])
+    }
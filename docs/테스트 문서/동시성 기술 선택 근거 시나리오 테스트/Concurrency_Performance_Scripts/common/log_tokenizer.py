@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+ChatService.log 스트리밍 토크나이저 (전처리기 공통)
+- 마커 문자열(CRITICAL_SECTION_MARK, SEMAPHORE_PERFORMANCE_MARK, event=PRE_JOIN_CURRENT_STATE, event=INCREMENT_ 등)
+  바이트 부분 문자열 검사로 먼저 걸러낸 뒤, 통과한 라인만 디코딩하여 정규식 적용
+- 마커별 정규식은 하나만 컴파일 (nanoTime 등 부가 필드도 같은 정규식의 그룹으로 추출)
+- 결과는 라인별 dict 목록이 아닌 컬럼별 리스트에 누적 → pd.DataFrame(columns) 로 바로 변환
+  (컬럼별 그룹 번호/정수 변환 여부를 파싱 전에 한 번 계산, 라인마다 match.group(번호) 를 리스트에 바로 추가)
+- 파일을 한 줄씩 바이너리로 읽으므로 로그 크기와 무관하게 메모리 사용량은 결과 크기에만 비례
+- workers > 1 이면 파일을 개행 경계의 바이트 구간으로 나누어 프로세스 풀에서 병렬 파싱 후 구간 순서대로 병합
+  (직렬 파싱과 동일한 결과)
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def build_marker_spec(name, prefilters, pattern, int_fields=(), copy_fields=None, constant_fields=None):
+    """
+    마커(로그 유형) 하나에 대한 파싱 규칙 생성
+
+    매개변수:
+        name: 마커 이름 (로그 출력용)
+        prefilters: 라인에 하나라도 포함되어야 정규식을 적용하는 부분 문자열 목록
+        pattern: 명명 그룹을 가진 정규식 (문자열 또는 컴파일된 패턴)
+        int_fields: 정수로 변환할 그룹명 목록
+        copy_fields: {추가 컬럼명: 복사할 그룹명} (예: {'event_type': 'event'})
+        constant_fields: {추가 컬럼명: 고정값} (예: {'event_type': None})
+
+    반환값:
+        dict - tokenize_log / tokenize_line 에 전달할 마커 규칙
+    """
+    compiled = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+    return {
+        'name': name,
+        'prefilters': tuple(p.encode('utf-8') for p in prefilters),
+        'pattern': compiled,
+        'fields': list(compiled.groupindex),
+        'group_index': dict(compiled.groupindex),
+        'int_fields': frozenset(int_fields),
+        'copy_fields': dict(copy_fields or {}),
+        'constant_fields': dict(constant_fields or {})
+    }
+
+
+def get_columns(specs):
+    """마커 규칙 목록의 전체 출력 컬럼 (규칙 순서 → 그룹 순서 → 추가 컬럼 순서)"""
+    columns = []
+    for spec in specs:
+        for column in spec['fields'] + list(spec['copy_fields']) + list(spec['constant_fields']):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def _match_line(raw_line, specs):
+    """바이트 라인에 첫 번째로 일치하는 (규칙 위치, match) 반환, 없으면 (None, None)"""
+    for spec_index, spec in enumerate(specs):
+        if not any(prefilter in raw_line for prefilter in spec['prefilters']):
+            continue
+
+        match = spec['pattern'].search(raw_line.decode('utf-8', errors='replace'))
+        if match:
+            return spec_index, match
+
+    return None, None
+
+
+def _column_sources(spec, columns):
+    """
+    규칙 하나의 출력 컬럼별 값 출처 (파싱 전에 한 번 계산)
+
+    반환값:
+        list[tuple] - columns 순서의 (그룹 번호 또는 None, 정수 변환 여부, 고정값)
+        (고정값 > 복사 > 그룹 순으로 적용, 규칙에 없는 컬럼은 None 고정값)
+    """
+    sources = []
+    for column in columns:
+        if column in spec['constant_fields']:
+            sources.append((None, False, spec['constant_fields'][column]))
+            continue
+
+        field = spec['copy_fields'].get(column, column)
+        if field in spec['group_index']:
+            sources.append((spec['group_index'][field], field in spec['int_fields'], None))
+        else:
+            sources.append((None, False, None))
+    return sources
+
+
+def _source_value(match, source):
+    """_column_sources 항목 하나의 값"""
+    group, to_int, constant = source
+    if group is None:
+        return constant
+    value = match.group(group)
+    return int(value) if to_int and value is not None else value
+
+
+def tokenize_line(line, specs):
+    """
+    단일 라인 파싱 (테스트/디버깅용)
+
+    반환값:
+        dict 또는 None - 일치한 규칙의 컬럼 값
+    """
+    raw_line = line.encode('utf-8') if isinstance(line, str) else line
+    spec_index, match = _match_line(raw_line, specs)
+    if spec_index is None:
+        return None
+
+    columns = get_columns([specs[spec_index]])
+    sources = _column_sources(specs[spec_index], columns)
+    return {column: _source_value(match, source) for column, source in zip(columns, sources)}
+
+
+def tokenize_log(filepath, specs, room_number=None, room_field='roomNumber', start=0, end=None):
+    """
+    로그 파일을 스트리밍으로 읽어 컬럼별 리스트로 파싱
+
+    매개변수:
+        filepath: 로그 파일 경로
+        specs: build_marker_spec 으로 만든 규칙 목록 (앞쪽 규칙 우선)
+        room_number: 특정 방 번호만 필터링 (None이면 모든 방)
+        room_field: 방 번호 그룹명 (int_fields 에 포함되어야 함)
+        start, end: 파싱할 바이트 구간 [start, end) - 라인 시작 위치 기준 (end=None이면 파일 끝까지)
+
+    반환값:
+        dict - {컬럼명: 값 리스트}, 해당 규칙에 없는 컬럼은 None
+    """
+    columns = get_columns(specs)
+    data = {column: [] for column in columns}
+
+    # 규칙별 (컬럼 리스트 append, 그룹 번호, 정수 변환 여부, 고정값) + 방 번호 출처 - 라인마다 dict 를 만들지 않음
+    plans = []
+    for spec in specs:
+        sources = _column_sources(spec, columns)
+        appenders = [(data[column].append,) + source for column, source in zip(columns, sources)]
+        room_source = _column_sources(spec, [room_field])[0]
+        plans.append((appenders, room_source))
+
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        position = start
+        for raw_line in f:
+            if end is not None and position >= end:
+                break
+            position += len(raw_line)
+
+            spec_index, match = _match_line(raw_line, specs)
+            if spec_index is None:
+                continue
+
+            appenders, room_source = plans[spec_index]
+            if room_number is not None and _source_value(match, room_source) != room_number:
+                continue
+
+            for append, group, to_int, constant in appenders:
+                if group is None:
+                    append(constant)
+                else:
+                    value = match.group(group)
+                    append(int(value) if to_int and value is not None else value)
+
+    return data
+
+
+def split_line_aligned_offsets(filepath, chunk_count):
+    """
+    파일을 개행 경계에 맞춘 바이트 구간으로 분할
+
+    매개변수:
+        filepath: 로그 파일 경로
+        chunk_count: 목표 구간 수 (파일이 작으면 더 적게 반환될 수 있음)
+
+    반환값:
+        list[tuple] - [(start, end), ...] 파일 순서, 모든 구간은 라인 시작 위치에서 시작
+    """
+    file_size = os.path.getsize(filepath)
+    if file_size == 0 or chunk_count <= 1:
+        return [(0, file_size)]
+
+    boundaries = [0]
+    with open(filepath, 'rb') as f:
+        for i in range(1, chunk_count):
+            target = file_size * i // chunk_count
+            if target <= boundaries[-1]:
+                continue
+
+            # target 직전 바이트가 속한 라인의 끝(다음 라인 시작)으로 이동
+            f.seek(target - 1)
+            f.readline()
+            boundary = f.tell()
+            if boundaries[-1] < boundary < file_size:
+                boundaries.append(boundary)
+
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _tokenize_chunk(args):
+    """프로세스 풀 작업 단위 (구간 하나 파싱)"""
+    filepath, specs, room_number, room_field, start, end = args
+    return tokenize_log(filepath, specs, room_number=room_number, room_field=room_field, start=start, end=end)
+
+
+def tokenize_log_parallel(filepath, specs, room_number=None, room_field='roomNumber', workers=1):
+    """
+    로그 파일을 구간별로 병렬 파싱 (workers <= 1 이면 tokenize_log 와 동일한 직렬 처리)
+
+    매개변수:
+        filepath, specs, room_number, room_field: tokenize_log 와 동일
+        workers: 프로세스 수
+
+    반환값:
+        dict - {컬럼명: 값 리스트}, 구간 순서대로 이어 붙여 직렬 파싱과 동일한 순서
+    """
+    if workers is None or workers <= 1:
+        return tokenize_log(filepath, specs, room_number=room_number, room_field=room_field)
+
+    offsets = split_line_aligned_offsets(filepath, workers)
+    if len(offsets) == 1:
+        return tokenize_log(filepath, specs, room_number=room_number, room_field=room_field)
+
+    tasks = [(filepath, specs, room_number, room_field, start, end) for start, end in offsets]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        chunk_results = list(executor.map(_tokenize_chunk, tasks))  # map 은 입력 순서 유지
+
+    data = {column: [] for column in get_columns(specs)}
+    for chunk in chunk_results:
+        for column, values in chunk.items():
+            data[column].extend(values)
+    return data
+
+
+def columns_to_dataframe(data, optional_columns=(), dtypes=None):
+    """
+    컬럼별 리스트를 DataFrame 으로 변환
+
+    매개변수:
+        data: tokenize_log 결과
+        optional_columns: 값이 하나도 없으면(전부 None) 컬럼 자체를 제거할 컬럼 목록
+                          (기존 라인별 dict 방식에서 키가 없던 경우와 동일한 결과)
+        dtypes: {컬럼명: dtype} - 리스트에서 바로 지정 dtype 배열 생성
+                (예: 나노초 컬럼을 float 추론 없이 'Int64' 로 생성)
+
+    반환값:
+        DataFrame - 파싱 결과 (레코드가 없으면 빈 DataFrame)
+    """
+    if not data or not any(len(values) for values in data.values()):
+        return pd.DataFrame()
+
+    data = {column: values for column, values in data.items()
+            if column not in optional_columns or any(v is not None for v in values)}
+    for column, dtype in (dtypes or {}).items():
+        if column in data:
+            data[column] = pd.array(data[column], dtype=dtype)
+    return pd.DataFrame(data)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+나노초 컬럼 공통 스키마 (nanoTime / epochNano)
+- 파이프라인 전 단계에서 나노초 값을 nullable 정수(Int64)로 유지
+- epochNano(약 1.75e18)는 float64 정확 표현 범위(2^53)를 넘으므로 float 경유 변환 금지
+- 정수 연산/정렬은 Int64 컬럼에서 바로 수행, 출력 시에만 지수 표기 없는 정수 문자열로 변환
+"""
+
+from decimal import Decimal, InvalidOperation
+
+import pandas as pd
+
+NANO_DTYPE = 'Int64'
+
+# 로그 파싱 결과의 나노초 필드 dtype (columns_to_dataframe 의 dtypes 인자)
+LOG_NANO_DTYPES = {'nanoTime': NANO_DTYPE, 'epochNano': NANO_DTYPE}
+
+
+def is_nano_column(column):
+    """나노초 컬럼 여부 (컬럼명에 nanoTime 또는 epochNano 포함)"""
+    return 'nanoTime' in column or 'epochNano' in column
+
+
+def get_nano_columns(df):
+    """DataFrame 의 나노초 컬럼 목록 (컬럼 순서 유지)"""
+    return [col for col in df.columns if is_nano_column(col)]
+
+
+def _parse_nano_text(text):
+    """정수 형식이 아닌 나노초 문자열 변환 (예: '1.23E+9', '123.0'), 실패시 NA"""
+    try:
+        return int(Decimal(text))
+    except (InvalidOperation, ValueError, TypeError):
+        return pd.NA
+
+
+def to_nano_int64(values):
+    """
+    나노초 값을 float 경유 없이 Int64 Series 로 변환
+
+    매개변수:
+        values: Series 또는 리스트 (정수, 정수 문자열, 빈 문자열/'nan'/None 혼합 가능)
+
+    반환값:
+        Series (dtype=Int64) - 변환할 수 없는 값은 <NA>
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype(NANO_DTYPE)
+
+    text = series.astype('string').str.strip()
+    is_integer_text = text.str.fullmatch(r'-?\d+').fillna(False).astype(bool)
+
+    result = pd.Series(pd.NA, index=series.index, dtype=NANO_DTYPE)
+    result[is_integer_text] = text[is_integer_text].astype(NANO_DTYPE)
+
+    # 지수 표기/소수점 표기 등 예외 형식만 개별 변환 (빈 값/'nan' 은 NA 유지)
+    other_mask = ~is_integer_text & text.notna() & ~text.str.lower().isin(['', 'nan', '<na>', 'none'])
+    if other_mask.any():
+        result[other_mask] = pd.array([_parse_nano_text(v) for v in text[other_mask]], dtype=NANO_DTYPE)
+
+    return result
+
+
+def cast_nano_columns(df, columns=None):
+    """
+    나노초 컬럼들을 Int64 로 변환 (원본 DataFrame 수정 후 반환)
+
+    매개변수:
+        df: 대상 DataFrame
+        columns: 변환할 컬럼 목록 (None이면 컬럼명 기준 자동 탐지)
+    """
+    for col in (get_nano_columns(df) if columns is None else columns):
+        if col in df.columns:
+            df[col] = to_nano_int64(df[col])
+    return df
+
+
+def nano_time_diff(start, end):
+    """
+    두 나노초 시각 컬럼의 차이 (end - start) 를 컬럼 단위 정수 연산으로 계산
+
+    매개변수:
+        start: 시작 시각 Series
+        end: 종료 시각 Series
+
+    반환값:
+        Series (dtype=Int64) - 어느 한쪽이라도 값이 없으면 <NA>
+    """
+    return to_nano_int64(end) - to_nano_int64(start)
+
+
+def nano_columns_as_text(df):
+    """
+    Excel 출력용 복사본 생성 - 나노초 컬럼을 정수 문자열로 변환 (NA는 빈 셀)
+    (Excel 숫자 셀은 15자리 정밀도이므로 텍스트로 기록)
+    """
+    df_text = df.copy()
+    for col in get_nano_columns(df_text):
+        text = to_nano_int64(df_text[col]).astype('string')
+        df_text[col] = text.astype(object).where(text.notna(), None)
+    return df_text
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+실행 결과 카탈로그 (내장 SQLite 데이터베이스)
+- calculate_stats_*.py 보고서(Excel)의 시트를 실행(run_id)/기법(strategy) 키와 함께 테이블로 적재
+- 한 번 적재하면 차트/비교 스크립트가 Excel 을 다시 읽지 않고 인덱스 쿼리로 필요한 행만 조회
+- 테이블
+    runs     : 실행 목록 (run_id, strategy, source_path, ingested_at, room_count, request_count, success_count)
+    sheets   : 실행별 원본 시트 목록 (시트명 → 테이블, 원본 컬럼 순서) - 보고서 시트 dict 그대로 복원
+    requests : 요청 단위 상세 (Per_Thread_Critical_Details / Semaphore_Thread_Details)
+    room_stats, bin_stats, summary : 방별 / 방-구간별 / 전체 요약 통계 (세마포어 시트 포함)
+    그 외 시트 : 시트명 소문자 테이블 (예: Latency_Percentiles → latency_percentiles)
+- 시트마다 컬럼이 다르면 (락 기법 vs 세마포어) 없는 컬럼을 테이블에 추가 (ALTER TABLE)
+- 같은 run_id 를 다시 적재하면 기존 행을 지우고 교체
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+ROOM_COLUMN = 'roomNumber'
+ALL_ROOMS_LABEL = 'ALL'
+DEFAULT_CATALOG_PATH = os.path.join('performance_reports', 'results_catalog.sqlite')
+
+# 보고서 시트명 → 카탈로그 테이블 (락 기법 / 세마포어 보고서의 같은 성격 시트는 한 테이블)
+SHEET_TABLES = {
+    'Per_Thread_Critical_Details': 'requests',
+    'Semaphore_Thread_Details': 'requests',
+    'Per_Room_Stats': 'room_stats',
+    'Semaphore_Per_Room_Stats': 'room_stats',
+    'Per_Bin_Stats': 'bin_stats',
+    'Semaphore_Per_Bin_Stats': 'bin_stats',
+    'Overall_Summary': 'summary',
+    'Semaphore_Summary': 'summary'
+}
+
+# 테이블별 인덱스 컬럼 (run_id 인덱스는 모든 테이블 공통)
+TABLE_INDEXES = {
+    'requests': [['run_id', ROOM_COLUMN, 'join_result']],
+    'room_stats': [['run_id', ROOM_COLUMN]],
+    'bin_stats': [['run_id', ROOM_COLUMN, 'bin']],
+    'latency_percentiles': [['metric', ROOM_COLUMN, 'run_id']],
+    'latency_histograms': [['run_id', 'metric']]
+}
+
+RUN_COLUMNS = ['run_id', 'strategy', 'source_path', 'ingested_at', 'room_count', 'request_count', 'success_count']
+
+
+def sheet_table_name(sheet_name):
+    """보고서 시트명에 대응하는 카탈로그 테이블명"""
+    return SHEET_TABLES.get(sheet_name, sheet_name.lower())
+
+
+def _quote(name):
+    """SQLite 식별자 인용 (컬럼명에 괄호/% 가 있으므로 항상 인용)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class ResultsCatalog:
+    """
+    실행 결과 카탈로그
+
+    사용 예:
+        with ResultsCatalog('performance_reports/results_catalog.sqlite') as catalog:
+            catalog.ingest_report('IFELSE_stats_nano_with_sum.xlsx', strategy='if_else')
+            sheets = catalog.load_sheets('IFELSE_stats_nano_with_sum')      # 보고서와 같은 {시트명: DataFrame}
+            p99 = catalog.percentile_by_strategy('success_wait_time', 99)
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY, strategy TEXT NOT NULL, source_path TEXT, ingested_at TEXT,
+                room_count INTEGER, request_count INTEGER, success_count INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_strategy ON runs (strategy, room_count);
+            CREATE TABLE IF NOT EXISTS sheets (
+                run_id TEXT NOT NULL, sheet_name TEXT NOT NULL, table_name TEXT NOT NULL,
+                columns TEXT NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (run_id, sheet_name)
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """연결 종료"""
+        self.connection.close()
+
+    def _table_columns(self, table):
+        """테이블의 컬럼 목록 (테이블이 없으면 빈 목록)"""
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info({_quote(table)})')]
+
+    def _ensure_table(self, table, df):
+        """
+        테이블이 없으면 생성 + 인덱스, 있으면 df 에만 있는 컬럼 추가
+        - 컬럼 타입을 선언하지 않음 → 값의 타입 그대로 저장 (roomNumber 처럼 방 번호와 'ALL' 이 섞인 컬럼 유지)
+        """
+        existing = self._table_columns(table)
+        if not existing:
+            column_list = ', '.join(_quote(column) for column in df.columns)
+            self.connection.execute(f'CREATE TABLE {_quote(table)} ({column_list})')
+            for columns in [['run_id']] + TABLE_INDEXES.get(table, []):
+                if all(column in df.columns for column in columns):
+                    index_name = f"idx_{table}_{'_'.join(columns)}".lower()
+                    column_list = ', '.join(_quote(column) for column in columns)
+                    self.connection.execute(f'CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table)} ({column_list})')
+            return
+
+        for column in [column for column in df.columns if column not in existing]:
+            self.connection.execute(f'ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}')
+
+    def delete_run(self, run_id):
+        """실행의 모든 테이블 행 삭제"""
+        tables = [row[0] for row in self.connection.execute('SELECT DISTINCT table_name FROM sheets WHERE run_id = ?', (run_id,))]
+        for table in tables:
+            self.connection.execute(f'DELETE FROM {_quote(table)} WHERE run_id = ?', (run_id,))
+        self.connection.execute('DELETE FROM sheets WHERE run_id = ?', (run_id,))
+        self.connection.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+
+    def ingest_sheets(self, sheets, run_id, strategy, source_path=None):
+        """
+        보고서 시트 dict 적재
+
+        매개변수:
+            sheets: {시트명: DataFrame} (보고서 Excel 을 읽은 결과)
+            run_id: 실행 ID (기존 실행이면 교체)
+            strategy: 기법 레이블
+            source_path: 원본 보고서 경로 (기록용)
+
+        반환값:
+            runs 테이블에 기록한 행 dict
+        """
+        with self.connection:
+            self.delete_run(run_id)
+            for position, (sheet_name, df) in enumerate(sheets.items()):
+                table = sheet_table_name(sheet_name)
+                rows = df.copy()
+                rows.insert(0, 'run_id', run_id)
+                rows.insert(1, 'strategy', strategy)
+                self._ensure_table(table, rows)
+                rows.to_sql(table, self.connection, index=False, if_exists='append')
+                self.connection.execute('INSERT INTO sheets VALUES (?, ?, ?, ?, ?)',
+                                        (run_id, sheet_name, table, json.dumps([str(c) for c in df.columns]), position))
+
+            run = self._run_summary(sheets, run_id, strategy, source_path)
+            self.connection.execute(f"INSERT INTO runs VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+                                    [run[column] for column in RUN_COLUMNS])
+        return run
+
+    @staticmethod
+    def _run_summary(sheets, run_id, strategy, source_path):
+        """runs 행 계산 (방 수 = 방별 통계 행 수, 요청/성공 수 = 요청 단위 상세 기준)"""
+        room_sheet = next((df for name, df in sheets.items() if sheet_table_name(name) == 'room_stats'), None)
+        request_sheet = next((df for name, df in sheets.items() if sheet_table_name(name) == 'requests'), None)
+        has_requests = request_sheet is not None and 'join_result' in request_sheet.columns
+        return {
+            'run_id': run_id,
+            'strategy': strategy,
+            'source_path': None if source_path is None else os.path.abspath(source_path),
+            'ingested_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'room_count': None if room_sheet is None else int(room_sheet[ROOM_COLUMN].nunique()),
+            'request_count': len(request_sheet) if request_sheet is not None else None,
+            'success_count': int((request_sheet['join_result'] == 'SUCCESS').sum()) if has_requests else None
+        }
+
+    def ingest_report(self, report_path, strategy, run_id=None):
+        """보고서 Excel 한 개 적재 (run_id 기본값 = 파일명에서 확장자를 뺀 이름)"""
+        if run_id is None:
+            run_id = os.path.splitext(os.path.basename(report_path))[0]
+        excel_file = pd.ExcelFile(report_path)
+        sheets = {sheet_name: pd.read_excel(excel_file, sheet_name=sheet_name) for sheet_name in excel_file.sheet_names}
+        return self.ingest_sheets(sheets, run_id, strategy, report_path)
+
+    def query(self, sql, params=()):
+        """SQL 조회 결과 DataFrame"""
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def runs(self, run_ids=None):
+        """실행 목록 (run_ids 지정 시 해당 실행만, 적재 순서)"""
+        if not run_ids:
+            return self.query('SELECT * FROM runs ORDER BY rowid')
+        placeholders = ', '.join('?' * len(run_ids))
+        return self.query(f'SELECT * FROM runs WHERE run_id IN ({placeholders}) ORDER BY rowid', list(run_ids))
+
+    def load_sheet(self, run_id, sheet_name, columns=None):
+        """
+        실행의 시트 한 개 조회 (원본 컬럼 순서, 시트가 없으면 None)
+
+        매개변수:
+            columns: 조회할 컬럼 (None 이면 원본 시트 전체 컬럼)
+        """
+        row = self.connection.execute('SELECT table_name, columns FROM sheets WHERE run_id = ? AND sheet_name = ?',
+                                      (run_id, sheet_name)).fetchone()
+        if row is None:
+            return None
+        table, sheet_columns = row[0], json.loads(row[1])
+        selected = [column for column in (columns or sheet_columns) if column in sheet_columns]
+        column_list = ', '.join(_quote(column) for column in selected)
+        df = self.query(f'SELECT {column_list} FROM {_quote(table)} WHERE run_id = ? ORDER BY rowid', (run_id,))
+
+        # 값이 모두 NULL 인 컬럼은 None 객체 대신 NaN (Excel 빈 셀을 읽은 결과와 동일)
+        empty_columns = [column for column in df.columns if df[column].dtype == object and df[column].isna().all()]
+        df[empty_columns] = df[empty_columns].astype('float64')
+        return df
+
+    def sheet_names(self, run_id):
+        """실행의 시트명 목록 (보고서 순서)"""
+        rows = self.connection.execute('SELECT sheet_name FROM sheets WHERE run_id = ? ORDER BY position', (run_id,))
+        return [row[0] for row in rows]
+
+    def load_sheets(self, run_id):
+        """실행의 모든 시트 {시트명: DataFrame} (보고서 Excel 을 읽은 결과와 같은 형태)"""
+        return {sheet_name: self.load_sheet(run_id, sheet_name) for sheet_name in self.sheet_names(run_id)}
+
+    def percentile_by_strategy(self, metric, percentile=99):
+        """
+        기법 × 방 수별 지연 시간 백분위수 (Latency_Percentiles 시트의 전체(ALL) 행 기준)
+
+        매개변수:
+            metric: 지연 시간 지표 (예: success_wait_time)
+            percentile: 백분위수 (50, 90, 99, 99.9)
+
+        반환값:
+            DataFrame (strategy, room_count, runs, mean/min/max 백분위수)
+        """
+        column = _quote(f'p{percentile:g}(ns)')
+        return self.query(f"""
+            SELECT r.strategy, r.room_count, COUNT(*) AS runs,
+                   AVG(p.{column}) AS mean_value_ns, MIN(p.{column}) AS min_value_ns, MAX(p.{column}) AS max_value_ns
+            FROM latency_percentiles p JOIN runs r ON r.run_id = p.run_id
+            WHERE p.metric = ? AND p.{_quote(ROOM_COLUMN)} = ?
+            GROUP BY r.strategy, r.room_count
+            ORDER BY r.room_count, mean_value_ns
+        """, (metric, ALL_ROOMS_LABEL))
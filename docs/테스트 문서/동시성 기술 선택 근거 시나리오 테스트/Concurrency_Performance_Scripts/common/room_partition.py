@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+방(roomNumber) 파티션 인덱스
+- roomNumber 안정 정렬(argsort) 한 번 + 방별 경계 오프셋으로 모든 방의 행 위치를 표현
+- 방마다 df[df['roomNumber'] == room] 로 전체를 다시 스캔/복사하던 O(방 수 × 행 수) 비용을 O(n log n) 한 번으로 대체
+- 방 안의 행 순서는 원본 순서 유지 (안정 정렬), 방 번호가 없는 행은 어느 방에도 속하지 않음 (기존 필터와 동일)
+- 인덱스는 중간 산출물 옆에 저장(<파일명>.rooms.npz)하여 다음 단계에서 재사용 가능
+- 방 안 일부 행만 재정렬하는 위치 연산(sort_subset_within_rooms)도 함께 제공
+- 방별 값을 (방 × 방 안 순번) NaN 패딩 2차원 배열로 피벗 (padded_matrix) → 순번별 평균/표준편차를 nanmean/nanstd 로 계산
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+ROOM_COLUMN = 'roomNumber'
+PARTITION_INDEX_SUFFIX = '.rooms.npz'
+
+
+def partition_index_path(table_path):
+    """중간 산출물 경로에 대응하는 파티션 인덱스 파일 경로 (예: result.csv → result.csv.rooms.npz)"""
+    return str(table_path) + PARTITION_INDEX_SUFFIX
+
+
+def sort_subset_within_rooms(df, mask, sort_column, column=ROOM_COLUMN):
+    """
+    mask 행들만 방별로 sort_column 기준 재정렬하고 나머지 행은 제자리 유지
+
+    매개변수:
+        df: 대상 DataFrame
+        mask: 재정렬할 행 여부 (boolean 배열/Series)
+        sort_column: mask 행들의 방 내 정렬 기준 컬럼 (값이 없으면 마지막)
+        column: 방 번호 컬럼
+
+    반환값:
+        재배치된 DataFrame (인덱스는 0부터)
+
+    설명:
+        방마다 mask 행이 있던 자리(원래 순서)에 정렬된 mask 행을 차례로 채움
+        - 대상 자리/정렬 결과를 위치 배열로 계산한 뒤 한 번에 take (행 단위 반복 없음)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    positions = np.flatnonzero(mask)
+    if len(positions) == 0:
+        return df.reset_index(drop=True)
+
+    keys = df.iloc[positions][[column, sort_column]].reset_index(drop=True)
+    slots = positions[keys.sort_values(column, kind='stable').index.to_numpy()]
+    rows = positions[keys.sort_values([column, sort_column], kind='stable', na_position='last').index.to_numpy()]
+
+    order = np.arange(len(df))
+    order[slots] = rows
+    return df.take(order).reset_index(drop=True)
+
+
+class RoomPartition:
+    """
+    DataFrame 의 방별 행 위치 인덱스
+
+    속성:
+        rooms: 방 번호 배열 (오름차순)
+        order: 방 번호 기준 안정 정렬된 행 위치 (방 번호가 없는 행 제외)
+        offsets: 방 i 의 행 위치 = order[offsets[i]:offsets[i + 1]]
+
+    사용 예:
+        partition = RoomPartition(df)
+        for room_num, room_df in partition.iter_frames():       # 등장 순서 (df['roomNumber'].unique() 와 동일)
+            ...
+        for room_num, positions in partition.iter_positions(sort=True):   # 방 번호 오름차순
+            ...
+    """
+
+    def __init__(self, df, column=ROOM_COLUMN, index_arrays=None):
+        self.df = df
+        self.column = column
+        self._sorted_frame = None
+
+        if index_arrays is not None:
+            self.rooms, self.order, self.offsets = index_arrays
+        else:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            order = np.argsort(codes, kind='stable')
+            missing_count = int(np.count_nonzero(codes < 0))
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+            self.rooms = np.asarray(uniques)
+            self.order = order[missing_count:]  # 방 번호가 없는 행(-1)은 맨 앞에 모이므로 제외
+            self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        # 방별 첫 등장 위치 (안정 정렬이므로 각 구간의 첫 원소) → 등장 순서 순회에 사용
+        self._first_positions = self.order[self.offsets[:-1]] if len(self.rooms) else np.array([], dtype=np.int64)
+        self._room_lookup = {room: i for i, room in enumerate(self.rooms.tolist())}
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def room_indices(self, sort=False):
+        """순회할 방 번호 위치 목록 (sort=False: 등장 순서, sort=True: 방 번호 오름차순)"""
+        if sort:
+            return np.arange(len(self.rooms))
+        return np.argsort(self._first_positions, kind='stable')
+
+    def room_list(self, sort=False):
+        """방 번호 목록 (sort=False 이면 df['roomNumber'].unique() 와 같은 등장 순서)"""
+        return self.rooms[self.room_indices(sort)]
+
+    def room_sizes(self):
+        """방별 행 수 (rooms 순서)"""
+        return np.diff(self.offsets)
+
+    def positions(self, room):
+        """방의 행 위치 배열 (원본 순서, order 의 슬라이스 - 복사 없음), 없는 방이면 빈 배열"""
+        i = self._room_lookup.get(room)
+        if i is None:
+            return self.order[:0]
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def iter_positions(self, sort=False):
+        """(방 번호, 행 위치 배열) 순회"""
+        for i in self.room_indices(sort):
+            yield self.rooms[i], self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def sorted_frame(self):
+        """방 번호 기준 안정 정렬된 DataFrame (한 번만 생성, 원본 인덱스 라벨 유지)"""
+        if self._sorted_frame is None:
+            self._sorted_frame = self.df.take(self.order)
+        return self._sorted_frame
+
+    def frame(self, room):
+        """방의 DataFrame 슬라이스 (정렬된 DataFrame 의 연속 구간), 없는 방이면 빈 DataFrame"""
+        i = self._room_lookup.get(room)
+        if i is None:
+            return self.df.iloc[:0]
+        return self.sorted_frame().iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    def iter_frames(self, sort=False):
+        """(방 번호, 방 DataFrame 슬라이스) 순회 - 정렬된 DataFrame 한 번 생성 후 구간 슬라이스만 반환"""
+        sorted_frame = self.sorted_frame()
+        for i in self.room_indices(sort):
+            yield self.rooms[i], sorted_frame.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    def padded_matrix(self, values, sort=False, fill_value=np.nan):
+        """
+        방별 값을 2차원 배열로 피벗 (행 = 방, 열 = 방 안 순번, 원본 순서 기준)
+
+        매개변수:
+            values: df 와 같은 길이의 값 (배열/Series)
+            sort: 행 순서 (False: 등장 순서, True: 방 번호 오름차순)
+            fill_value: 가장 긴 방보다 짧은 방의 빈 칸 값 (기본 NaN → nanmean/nanstd 에서 제외)
+
+        반환값:
+            float 배열 (방 수 × 가장 긴 방의 행 수)
+
+        설명:
+            방마다 iloc 으로 순번별 값을 꺼내던 O(방 수 × 최대 행 수) 스칼라 조회를 위치 배열 대입 한 번으로 대체
+        """
+        values = np.asarray(values, dtype=float)
+        sizes = self.room_sizes()
+        matrix = np.full((len(self.rooms), int(sizes.max()) if len(sizes) else 0), fill_value, dtype=float)
+        room_of_row = np.repeat(np.arange(len(self.rooms)), sizes)
+        rank = np.arange(len(self.order)) - np.repeat(self.offsets[:-1], sizes)
+        matrix[room_of_row, rank] = values[self.order]
+        return matrix[self.room_indices(sort)]
+
+    def within_room_rank(self):
+        """행별 방 안 순번 (0부터, 원본 순서 기준), 방 번호가 없는 행은 -1"""
+        rank = np.full(len(self.df), -1, dtype=np.int64)
+        rank[self.order] = np.arange(len(self.order)) - np.repeat(self.offsets[:-1], self.room_sizes())
+        return rank
+
+    def save(self, path):
+        """파티션 인덱스를 npz 파일로 저장"""
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        # object 배열은 pickle 없이 저장할 수 없으므로 문자열로 저장 (로드 시 값이 다르면 재계산)
+        rooms = self.rooms.astype(str) if self.rooms.dtype == object else self.rooms
+        with open(path, 'wb') as f:
+            np.savez(f, rooms=rooms, order=self.order, offsets=self.offsets,
+                     row_count=np.array([len(self.df)]))
+
+    def save_for_table(self, table_path):
+        """중간 산출물 옆에 파티션 인덱스 저장 (<파일명>.rooms.npz)"""
+        path = partition_index_path(table_path)
+        self.save(path)
+        return path
+
+    def matches(self, df):
+        """저장된 인덱스가 df 와 일치하는지 확인 (행 수 + 정렬된 방 번호 열이 구간 경계와 일치)"""
+        if len(df) != len(self.df) or self.column not in df.columns:
+            return False
+        values = df[self.column].to_numpy()
+        if len(self.order) and (self.order.max() >= len(df)):
+            return False
+        expected = np.repeat(self.rooms, self.room_sizes())
+        return (np.count_nonzero(pd.notna(values)) == len(self.order)
+                and np.array_equal(values[self.order], expected))
+
+    @classmethod
+    def load(cls, path, df, column=ROOM_COLUMN):
+        """저장된 파티션 인덱스 로드 (df 와 일치하지 않거나 읽을 수 없으면 None)"""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = (data['rooms'], data['order'], data['offsets'])
+                row_count = int(data['row_count'][0])
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if row_count != len(df):
+            return None
+        partition = cls(df, column=column, index_arrays=arrays)
+        return partition if partition.matches(df) else None
+
+    @classmethod
+    def for_table(cls, df, table_path=None, column=ROOM_COLUMN):
+        """
+        중간 산출물에 저장된 파티션 인덱스가 있으면 재사용, 없거나 맞지 않으면 새로 계산
+
+        매개변수:
+            df: table_path 에서 읽은 DataFrame
+            table_path: 중간 산출물 경로 (None 이면 항상 새로 계산)
+        """
+        if table_path:
+            path = partition_index_path(table_path)
+            if os.path.exists(path):
+                partition = cls.load(path, df, column=column)
+                if partition is not None:
+                    return partition
+        return cls(df, column=column)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+보고서 Excel 시트 지연 로드 + 디스크 캐시 공통 모듈
+- 시트 이름 목록만 먼저 읽고, 시트는 처음 요청될 때 한 번만 파싱 (스레드 단위 상세 같은 큰 시트는 쓰지 않으면 읽지 않음)
+- 파싱한 시트는 캐시 디렉토리에 pickle 로 저장, 키 = 파일 절대 경로 + 수정 시각(mtime) + 크기
+  → 같은 보고서로 차트를 다시 만들 때 Excel 파싱 없이 로드, 파일이 바뀌면 자동으로 다시 파싱
+- 파일별 캐시 디렉토리에는 현재 버전의 시트만 유지 (이전 버전 캐시는 새 버전을 저장할 때 삭제)
+"""
+
+import hashlib
+import os
+from collections.abc import Mapping
+
+import pandas as pd
+
+DEFAULT_SHEET_CACHE_DIR = os.path.join('performance_charts', '.sheet_cache')
+
+
+class LazySheets(Mapping):
+    """
+    {시트명: DataFrame} 처럼 사용하는 지연 로드 매핑 (시트는 처음 접근할 때 loader 로 로드)
+
+    사용 예:
+        sheets = LazySheets(['Overall_Summary', 'Per_Bin_Stats'], lambda name: load(name))
+        if 'Per_Bin_Stats' in sheets:      # 시트 이름만 확인 (로드하지 않음)
+            df = sheets['Per_Bin_Stats']   # 이 시점에 한 번 로드
+    """
+
+    def __init__(self, sheet_names, loader):
+        self._sheet_names = list(sheet_names)
+        self._loader = loader
+        self._loaded = {}
+
+    def __getitem__(self, sheet_name):
+        if sheet_name not in self._loaded:
+            if sheet_name not in self._sheet_names:
+                raise KeyError(sheet_name)
+            self._loaded[sheet_name] = self._loader(sheet_name)
+        return self._loaded[sheet_name]
+
+    def __contains__(self, sheet_name):
+        return sheet_name in self._sheet_names
+
+    def __iter__(self):
+        return iter(self._sheet_names)
+
+    def __len__(self):
+        return len(self._sheet_names)
+
+    @property
+    def loaded_sheets(self):
+        """지금까지 로드한 시트명 목록"""
+        return list(self._loaded)
+
+
+class CachedWorkbook(LazySheets):
+    """
+    보고서 Excel 지연 로드 매핑 (파싱한 시트는 디스크 캐시에 저장/재사용)
+
+    사용 예:
+        sheets = CachedWorkbook('IFELSE_stats_nano_with_sum.xlsx')
+        summary = sheets['Overall_Summary']     # 캐시가 있으면 pickle 로드, 없으면 파싱 후 저장
+    """
+
+    def __init__(self, path, cache_dir=DEFAULT_SHEET_CACHE_DIR):
+        """
+        매개변수:
+            path: 보고서 Excel 경로
+            cache_dir: 캐시 디렉토리 (None 이면 디스크 캐시 없이 지연 로드만)
+        """
+        self.path = os.path.abspath(path)
+        stat = os.stat(self.path)
+        self.version = f'{stat.st_mtime_ns}_{stat.st_size}'
+        self.cache_dir = None
+        if cache_dir is not None:
+            path_key = hashlib.sha1(self.path.encode('utf-8')).hexdigest()[:16]
+            self.cache_dir = os.path.join(cache_dir, path_key)
+
+        self._excel_file = None
+        super().__init__(self._read_sheet_names(), self._load_sheet)
+
+    def _excel(self):
+        """pd.ExcelFile (처음 파싱이 필요할 때 한 번만 열기)"""
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.path)
+        return self._excel_file
+
+    def _cache_path(self, name):
+        """현재 버전의 캐시 파일 경로 (name = 시트명 또는 시트 목록 '__sheets__')"""
+        file_key = hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f'{self.version}_{file_key}.pkl')
+
+    def _read_cache(self, name):
+        """캐시 로드 (캐시가 없거나 읽을 수 없으면 None)"""
+        if self.cache_dir is None:
+            return None
+        try:
+            return pd.read_pickle(self._cache_path(name))
+        except (OSError, EOFError, ValueError, ImportError, AttributeError):
+            return None
+
+    def _write_cache(self, name, value):
+        """캐시 저장 (이전 버전 캐시 파일 삭제, 저장 실패는 무시 - 캐시는 선택 사항)"""
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for filename in os.listdir(self.cache_dir):
+                if not filename.startswith(self.version + '_'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+            pd.to_pickle(value, self._cache_path(name))
+        except OSError:
+            pass
+
+    def _read_sheet_names(self):
+        """시트명 목록 (캐시 → 없으면 워크북을 열어 이름만 읽음)"""
+        sheet_names = self._read_cache('__sheets__')
+        if sheet_names is None:
+            sheet_names = self._excel().sheet_names
+            self._write_cache('__sheets__', sheet_names)
+        return sheet_names
+
+    def _load_sheet(self, sheet_name):
+        """시트 한 개 로드 (캐시 → 없으면 해당 시트만 파싱 후 캐시 저장)"""
+        df = self._read_cache(sheet_name)
+        if df is None:
+            df = pd.read_excel(self._excel(), sheet_name=sheet_name)
+            self._write_cache(sheet_name, df)
+        return df
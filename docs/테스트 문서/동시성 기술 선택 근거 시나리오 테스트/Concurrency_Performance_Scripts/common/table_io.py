@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계 간 중간 산출물 입출력 (CSV / Parquet / Feather)
+- 파일 확장자로 형식 결정: .parquet → Parquet, .feather/.arrow → Feather(Arrow IPC), 그 외 → CSV
+- 컬럼형 형식은 단계별로 선언한 스키마({컬럼명: dtype})로 변환해 저장 → 재로딩 시 문자열 파싱/dtype 추론 없음
+- CSV 재로딩 dtype 은 pandas 추론 결과라 스키마와 다를 수 있음 (예: 숫자로만 된 user_id 는 CSV 에서 int64, 컬럼형에서 string)
+- Feather 는 비압축으로 저장하여 메모리 매핑 로딩 가능
+- 컬럼형 형식은 pyarrow 가 필요 (없으면 CSV 만 사용 가능, 선택 의존성)
+- CSV/Excel 은 사람이 보는 내보내기 형식으로 계속 지원
+"""
+
+import os
+
+import pandas as pd
+
+from common.nano_time import cast_nano_columns, is_nano_column
+
+try:
+    import pyarrow.feather as pa_feather
+except ImportError:  # 선택 의존성
+    pa_feather = None
+
+TABLE_FORMAT_CSV = 'csv'
+TABLE_FORMAT_PARQUET = 'parquet'
+TABLE_FORMAT_FEATHER = 'feather'
+
+TABLE_FORMAT_EXTENSIONS = {
+    TABLE_FORMAT_CSV: '.csv',
+    TABLE_FORMAT_PARQUET: '.parquet',
+    TABLE_FORMAT_FEATHER: '.feather'
+}
+
+_EXTENSION_FORMATS = {
+    '.parquet': TABLE_FORMAT_PARQUET,
+    '.feather': TABLE_FORMAT_FEATHER,
+    '.arrow': TABLE_FORMAT_FEATHER
+}
+
+_EMPTY_VALUES = ('', 'nan', 'NaN', 'None')
+
+
+def get_table_format(path):
+    """파일 경로 확장자로 형식 판단 ('csv' / 'parquet' / 'feather')"""
+    return _EXTENSION_FORMATS.get(os.path.splitext(str(path))[1].lower(), TABLE_FORMAT_CSV)
+
+
+def is_columnar_path(path):
+    """컬럼형(Parquet/Feather) 파일 경로 여부"""
+    return get_table_format(path) != TABLE_FORMAT_CSV
+
+
+def with_table_extension(path, table_format):
+    """경로의 확장자를 지정 형식의 확장자로 교체 (예: room1.csv → room1.parquet)"""
+    return os.path.splitext(path)[0] + TABLE_FORMAT_EXTENSIONS[table_format]
+
+
+def _require_pyarrow(path):
+    if pa_feather is None:
+        raise ImportError(
+            f"Parquet/Feather 입출력에는 pyarrow 가 필요합니다 (pip install pyarrow): {path}"
+        )
+
+
+def _is_text_like(series):
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def _cast_column(series, dtype):
+    """
+    컬럼 하나를 선언된 dtype 으로 변환 (값별 타입 검사 없이 컬럼 단위 변환)
+    - object/문자열 컬럼의 빈 문자열/'nan' 은 결측값 (예: fillna('') 로 채운 빈 칸)
+    - 숫자 dtype: pd.to_numeric 후 변환, 시각 dtype: pd.to_datetime(utc=True) 후 변환
+    """
+    target = pd.api.types.pandas_dtype(dtype)
+    if _is_text_like(series):
+        series = series.mask(series.isin(_EMPTY_VALUES))
+        if pd.api.types.is_numeric_dtype(target) and not pd.api.types.is_bool_dtype(target):
+            series = pd.to_numeric(series)
+
+    if pd.api.types.is_datetime64_any_dtype(target):
+        series = pd.to_datetime(series, utc=True)
+    return series.astype(target)
+
+
+def apply_table_schema(df, schema=None):
+    """
+    컬럼형 저장용 명시적 스키마 적용 (복사본 반환)
+    - schema: {컬럼명: dtype} - 단계별로 선언한 컬럼 타입 (df 에 없는 컬럼은 무시)
+    - 나노초 컬럼(nanoTime/epochNano): 먼저 Int64 로 변환 (float 경유 없음)
+    - 스키마에 없는 object 컬럼: 문자열 (혼합 타입 저장 오류 방지), 그 외 컬럼은 현재 dtype 유지
+    - 인덱스: RangeIndex 로 초기화 (Feather 요구사항)
+    """
+    table = df.reset_index(drop=True).copy()
+    table = cast_nano_columns(table)
+    schema = schema or {}
+
+    for col in table.columns:
+        if col in schema:
+            table[col] = _cast_column(table[col], schema[col])
+        elif not is_nano_column(col) and _is_text_like(table[col]):
+            table[col] = _cast_column(table[col], 'string')
+
+    table.columns = [str(col) for col in table.columns]
+    return table
+
+
+def write_table(df, path, schema=None, encoding='utf-8-sig'):
+    """
+    DataFrame 저장 (확장자로 형식 결정)
+
+    매개변수:
+        df: 저장할 DataFrame
+        path: 출력 경로 (.parquet / .feather / .arrow / 그 외 CSV)
+        schema: 컬럼형 저장 시 적용할 {컬럼명: dtype} (apply_table_schema, CSV 는 값 그대로 기록)
+        encoding: CSV 저장 인코딩 (기본값: utf-8-sig, Excel 한글 호환)
+    """
+    output_dir = os.path.dirname(path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    table_format = get_table_format(path)
+    if table_format == TABLE_FORMAT_CSV:
+        df.to_csv(path, index=False, encoding=encoding)
+        return
+
+    _require_pyarrow(path)
+    table = apply_table_schema(df, schema)
+    if table_format == TABLE_FORMAT_PARQUET:
+        table.to_parquet(path, engine='pyarrow', index=False)
+    else:
+        # 비압축 Feather → 메모리 매핑으로 복사 없이 로딩 가능
+        table.to_feather(path, compression='uncompressed')
+
+
+def read_table(path, columns=None, **csv_kwargs):
+    """
+    중간 산출물 로드 (확장자로 형식 결정)
+
+    매개변수:
+        path: 입력 경로
+        columns: 읽을 컬럼 목록 (None이면 전체)
+        csv_kwargs: CSV 인 경우 pd.read_csv 에 전달할 인자 (dtype, encoding 등)
+
+    반환값:
+        DataFrame - 컬럼형 형식은 저장 시 스키마 그대로 (파싱/추론 없음),
+                    CSV 는 pd.read_csv 추론 결과 (csv_kwargs 의 dtype 으로 지정 가능)
+    """
+    table_format = get_table_format(path)
+    if table_format == TABLE_FORMAT_CSV:
+        return pd.read_csv(path, usecols=columns, **csv_kwargs)
+
+    _require_pyarrow(path)
+    if table_format == TABLE_FORMAT_PARQUET:
+        return pd.read_parquet(path, engine='pyarrow', columns=columns, memory_map=True)
+    return pa_feather.read_table(path, columns=columns, memory_map=True).to_pandas()
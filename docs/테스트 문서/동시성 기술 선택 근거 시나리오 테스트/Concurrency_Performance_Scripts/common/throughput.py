@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+처리량 시계열 / 포화 지점(knee) 분석 공통 함수
+- 요청 시작 시각(도착)과 종료 시각(완료)을 고정 시간 창으로 나눠 방별/전체 처리량 시계열 생성
+  (도착 수 = offered load, 완료 수 = completed, 성공 완료 수 = joined, 창 끝 시점 처리 중 요청 수 = in_flight)
+- 창마다 도착한 요청의 평균 지연(대기) 시간과 offered load 의 관계에서
+  지연 시간이 부하에 비해 급격히(초선형) 증가하기 시작하는 지점을 Kneedle 방식으로 탐지
+- 시간 창 경계는 전체 요청의 가장 이른 시각 기준 (방끼리 같은 창 번호 = 같은 시간대)
+"""
+
+import numpy as np
+import pandas as pd
+
+from common.nano_time import to_nano_int64
+
+ROOM_COLUMN = 'roomNumber'
+ALL_ROOMS_LABEL = 'ALL'
+NANOS_PER_SECOND = 1_000_000_000
+NANOS_PER_MILLI = 1_000_000
+
+# 처리량 시계열 시트 컬럼 순서
+THROUGHPUT_COLUMNS = [
+    ROOM_COLUMN, 'window', 'elapsed_ms', 'offered', 'completed', 'joined',
+    'offered_per_sec', 'completed_per_sec', 'joined_per_sec', 'in_flight', 'mean_latency_ns'
+]
+
+# 포화 지점 시트 컬럼 순서
+KNEE_COLUMNS = [
+    ROOM_COLUMN, 'load_levels', 'knee_offered_per_sec', 'knee_completed_per_sec', 'knee_mean_latency_ns',
+    'peak_completed_per_sec', 'latency_slope_below_knee', 'latency_slope_above_knee', 'superlinear'
+]
+
+
+def throughput_time_series(df, start_column, end_column, latency_column, window_ms,
+                           success_mask=None, column=ROOM_COLUMN):
+    """
+    방별 + 전체(ALL) 고정 시간 창 처리량 시계열
+
+    매개변수:
+        df: 요청 단위 DataFrame
+        start_column: 요청 시작(도착) 나노초 컬럼 (예: waiting_start_epochNano)
+        end_column: 요청 종료(완료) 나노초 컬럼 (예: critical_leave_epochNano)
+        latency_column: 창별 평균을 낼 지연 시간 컬럼 (나노초, 예: wait_time_ns)
+        window_ms: 시간 창 크기 (밀리초)
+        success_mask: 성공 요청 여부 (joined 집계용, None 이면 완료 요청 전체)
+        column: 방 번호 컬럼
+
+    반환값:
+        DataFrame (THROUGHPUT_COLUMNS) - 방 번호 오름차순 → ALL, 창 번호 순
+        (요청이 없는 창도 0으로 포함, 시각 값이 없으면 빈 DataFrame)
+
+    설명:
+        - 창 번호 = (시각 - 전체 최초 시각) // 창 크기, 방/창별 개수는 groupby 한 번으로 집계
+        - in_flight = 창 끝까지 누적 도착 수 - 누적 완료 수 (시작/종료 시각이 모두 있는 요청만)
+        - mean_latency_ns 는 해당 창에 도착한 요청 기준 (도착이 없는 창은 결측값)
+        - 0 이하 시각은 기록 없음으로 간주 (전처리기가 이벤트가 없는 요청에 0을 채우는 경우)
+    """
+    window_ns = max(1, int(round(window_ms * NANOS_PER_MILLI)))
+    start = _event_times(df, start_column)
+    end = _event_times(df, end_column)
+
+    origin = pd.concat([start, end]).min()
+    if pd.isna(origin):
+        return pd.DataFrame(columns=THROUGHPUT_COLUMNS)
+
+    events = pd.DataFrame({
+        column: df[column].to_numpy(),
+        'arrival': (start - origin) // window_ns,
+        'completion': (end - origin) // window_ns,
+        'latency': pd.to_numeric(df[latency_column], errors='coerce').astype('float64') if latency_column in df.columns else np.nan,
+        'joined': True if success_mask is None else pd.Series(success_mask, index=df.index).fillna(False).astype(bool)
+    }, index=df.index)
+    events = events[events[column].notna()]
+    if events.empty:
+        return pd.DataFrame(columns=THROUGHPUT_COLUMNS)
+
+    last_window = int(pd.concat([events['arrival'], events['completion']]).max())
+    windows = pd.RangeIndex(last_window + 1, name='window')
+    rooms = sorted(events[column].unique())
+
+    room_frames = [
+        _window_counts(events, rooms, windows, column),
+        _window_counts(events.assign(**{column: ALL_ROOMS_LABEL}), [ALL_ROOMS_LABEL], windows, column)
+    ]
+
+    series = pd.concat(room_frames, ignore_index=True)
+    window_seconds = window_ns / NANOS_PER_SECOND
+    series['elapsed_ms'] = series['window'] * (window_ns / NANOS_PER_MILLI)
+    for count_column in ['offered', 'completed', 'joined']:
+        series[f'{count_column}_per_sec'] = series[count_column] / window_seconds
+    return series[THROUGHPUT_COLUMNS]
+
+
+def _event_times(df, column):
+    """나노초 컬럼을 Int64 로 변환 (컬럼이 없거나 0 이하인 값은 결측값)"""
+    if column not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype='Int64')
+    times = to_nano_int64(df[column])
+    return times.where(times > 0)
+
+
+def _window_counts(events, rooms, windows, column):
+    """방 × 창 격자에 도착/완료/성공 완료 수, in_flight, 평균 지연 시간 집계 (요청이 없는 칸은 0)"""
+    grid = pd.MultiIndex.from_product([rooms, windows], names=[column, 'window'])
+
+    arrived = events[events['arrival'].notna()]
+    completed = events[events['completion'].notna()]
+    tracked = arrived[arrived['completion'].notna()]  # 시작/종료가 모두 있는 요청 (in_flight 계산 대상)
+
+    counts = pd.DataFrame({
+        'offered': arrived.groupby([column, 'arrival']).size(),
+        'completed': completed.groupby([column, 'completion']).size(),
+        'joined': completed[completed['joined']].groupby([column, 'completion']).size()
+    })
+    counts.index = counts.index.set_names([column, 'window'])
+    counts = counts.reindex(grid, fill_value=0).fillna(0).astype('int64')
+
+    # 시작 시각이 없는 완료는 도착에도 잡히지 않으므로 완료 쪽도 tracked 요청만 차감
+    tracked_arrivals = _grid_sizes(tracked, 'arrival', grid, column)
+    tracked_completions = _grid_sizes(tracked, 'completion', grid, column)
+    net = (tracked_arrivals - tracked_completions).groupby(level=column, sort=False).cumsum()
+    counts['in_flight'] = net.astype('int64')
+
+    latency = arrived.groupby([column, 'arrival'])['latency'].mean()
+    latency.index = latency.index.set_names([column, 'window'])
+    counts['mean_latency_ns'] = latency.reindex(grid)
+
+    return counts.reset_index()
+
+
+def _grid_sizes(events, window_column, grid, column):
+    """방 × 창 격자 칸별 요청 수 (요청이 없는 칸은 0)"""
+    sizes = events.groupby([column, window_column]).size()
+    sizes.index = sizes.index.set_names([column, 'window'])
+    return sizes.reindex(grid, fill_value=0)
+
+
+def detect_saturation_knee(series, column=ROOM_COLUMN):
+    """
+    처리량 시계열에서 방별/전체 포화 지점(knee) 탐지
+
+    매개변수:
+        series: throughput_time_series 결과
+        column: 방 번호 컬럼
+
+    반환값:
+        DataFrame (KNEE_COLUMNS) - series 의 방 순서 (ALL 포함), 탐지할 수 없으면 knee 값은 결측값
+
+    설명:
+        - 도착이 있는 창을 offered_per_sec 값(부하 수준)별로 묶어 평균 지연 시간/완료 처리량 계산
+        - 두 축을 0~1 로 정규화한 곡선에서 (부하 - 지연) 이 가장 큰 지점 = 지연이 부하보다 빠르게 늘기 시작하는 지점
+        - knee 앞/뒤 구간의 log(지연)-log(부하) 기울기(탄력성)를 함께 기록, knee 뒤 기울기 > 1 이면 초선형(superlinear)
+    """
+    rows = []
+    for room, room_series in series.groupby(column, sort=False):
+        rows.append(_room_knee(room, room_series, column))
+    return pd.DataFrame(rows, columns=KNEE_COLUMNS)
+
+
+def _room_knee(room, room_series, column):
+    """방 하나의 포화 지점 계산 (부하 수준이 3개 미만이거나 지연 시간이 늘지 않으면 knee 결측값)"""
+    active = room_series[(room_series['offered'] > 0) & room_series['mean_latency_ns'].notna()]
+    levels = active.groupby('offered_per_sec').agg(
+        mean_latency_ns=('mean_latency_ns', 'mean'),
+        completed_per_sec=('completed_per_sec', 'mean')
+    ).sort_index()
+
+    row = {
+        column: room,
+        'load_levels': len(levels),
+        'knee_offered_per_sec': np.nan,
+        'knee_completed_per_sec': np.nan,
+        'knee_mean_latency_ns': np.nan,
+        'peak_completed_per_sec': float(room_series['completed_per_sec'].max()) if len(room_series) else np.nan,
+        'latency_slope_below_knee': np.nan,
+        'latency_slope_above_knee': np.nan,
+        'superlinear': False
+    }
+    if len(levels) < 3:
+        return row
+
+    load = levels.index.to_numpy(dtype=float)
+    latency = levels['mean_latency_ns'].to_numpy(dtype=float)
+    load_range = load.max() - load.min()
+    latency_range = latency.max() - latency.min()
+    if load_range <= 0 or latency_range <= 0:
+        return row
+
+    difference = (load - load.min()) / load_range - (latency - latency.min()) / latency_range
+    knee = int(np.argmax(difference))
+    if difference[knee] <= 0 or knee == len(levels) - 1:
+        return row
+
+    below = _log_slope(load[:knee + 1], latency[:knee + 1])
+    above = _log_slope(load[knee:], latency[knee:])
+    row.update({
+        'knee_offered_per_sec': float(load[knee]),
+        'knee_completed_per_sec': float(levels['completed_per_sec'].iloc[knee]),
+        'knee_mean_latency_ns': float(latency[knee]),
+        'latency_slope_below_knee': below,
+        'latency_slope_above_knee': above,
+        'superlinear': bool(pd.notna(above) and above > 1)
+    })
+    return row
+
+
+def _log_slope(load, latency):
+    """log(지연) 대 log(부하) 1차 회귀 기울기 (양수 점이 2개 미만이면 NaN)"""
+    positive = (load > 0) & (latency > 0)
+    if np.count_nonzero(positive) < 2 or np.ptp(load[positive]) == 0:
+        return np.nan
+    return float(np.polyfit(np.log(load[positive]), np.log(latency[positive]), 1)[0])
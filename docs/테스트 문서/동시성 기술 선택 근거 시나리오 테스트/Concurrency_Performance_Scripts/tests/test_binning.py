@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+common.binning.BinningEngine 회귀 테스트
+- equal 모드가 기존 방별 pd.cut(range(n), bins=N) 할당과 같은 bin 을 주는지 (오른쪽 경계 포함) 검증
+- time 모드의 시간 창 번호 (비어 있는 창 건너뜀, 시각 없는 행 처리) 검증
+- 실행: python -m pytest tests/test_binning.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from common.binning import BIN_MODE_EQUAL, BIN_MODE_TIME, BinningEngine
+
+WINDOW_NS = 1_000_000  # window_ms=1.0
+
+
+def reference_equal_bins(total_requests, bins_count):
+    """기존 전처리기의 방별 bin 할당 (요청 수가 구간 수 이하이면 요청마다 하나의 bin) - 비교 기준"""
+    if total_requests <= bins_count:
+        return list(range(1, total_requests + 1))
+    return list(pd.cut(range(total_requests), bins=bins_count, labels=range(1, bins_count + 1)).astype(int))
+
+
+def interleaved_rooms(room_sizes):
+    """방 크기 목록으로 방이 섞여 있는 DataFrame 생성 (방 안 순서는 유지)"""
+    rows = []
+    remaining = dict(room_sizes)
+    while remaining:
+        for room_number in list(remaining):
+            rows.append(room_number)
+            remaining[room_number] -= 1
+            if remaining[room_number] == 0:
+                del remaining[room_number]
+    return pd.DataFrame({'roomNumber': rows})
+
+
+@pytest.mark.parametrize('bins_count', [3, 10])
+def test_equal_mode_matches_pd_cut(bins_count):
+    sizes = [1, bins_count - 1, bins_count, bins_count + 1, bins_count + 2,
+             2 * bins_count + 1, 3 * bins_count, 99, 100, 101]
+    room_sizes = {1000 + i: size for i, size in enumerate(sizes)}
+    df = interleaved_rooms(room_sizes)
+
+    bins = BinningEngine(BIN_MODE_EQUAL, bin_count=bins_count).assign(df)
+
+    for room_number, size in room_sizes.items():
+        room_bins = bins[(df['roomNumber'] == room_number).to_numpy()]
+        assert room_bins.tolist() == reference_equal_bins(size, bins_count)
+        if size > bins_count:
+            # 오른쪽 닫힌 구간: 마지막 요청은 항상 마지막 bin, 모든 bin 이 채워짐 (빈 bin 없음)
+            assert room_bins[-1] == bins_count
+            assert set(room_bins) == set(range(1, bins_count + 1))
+
+
+def test_equal_mode_right_edge():
+    # 21개 / 10구간 → 폭 2.0, 경계 값(2, 4, ...)은 왼쪽 bin 에 포함
+    df = pd.DataFrame({'roomNumber': [1] * 21})
+    bins = BinningEngine(BIN_MODE_EQUAL, bin_count=10).assign(df)
+
+    assert bins[[0, 1, 2, 3, 4, 19, 20]].tolist() == [1, 1, 1, 2, 2, 10, 10]
+
+
+def test_rows_without_room_get_nan():
+    df = pd.DataFrame({'roomNumber': [1, np.nan, 1, 1]})
+    bins = BinningEngine(BIN_MODE_EQUAL, bin_count=10).assign(df)
+
+    assert np.isnan(bins[1])
+    assert bins[[0, 2, 3]].tolist() == [1, 2, 3]
+
+
+def test_time_mode_windows():
+    start = 5_000_000_000
+    df = pd.DataFrame({
+        'roomNumber': [1, 1, 1, 1, 1, 2, 2, 3],
+        'nanoTime': pd.array([
+            start,                          # 창 1 (방 시작)
+            start + WINDOW_NS - 1,          # 창 1 (오른쪽 끝)
+            start + WINDOW_NS,              # 창 2
+            start + 3 * WINDOW_NS + 500,    # 창 4 (창 3 은 비어 있음)
+            None,                           # 시각 없음 → 같은 방의 마지막 bin
+            start + 7 * WINDOW_NS,          # 방 2 는 자기 첫 요청 기준으로 창 1
+            start + 8 * WINDOW_NS,          # 창 2
+            None,                           # 방 전체에 시각 없음 → 1
+        ], dtype='Int64'),
+    })
+
+    bins = BinningEngine(BIN_MODE_TIME, window_ms=1.0).assign(df, time_column='nanoTime')
+    assert bins.tolist() == [1, 1, 2, 4, 4, 1, 2, 1]
+
+    # 최대 bin 번호 제한 시 초과분은 마지막 bin 에 포함
+    capped = BinningEngine(BIN_MODE_TIME, window_ms=1.0, max_bins=2).assign(df, time_column='nanoTime')
+    assert capped.tolist() == [1, 1, 2, 2, 2, 1, 2, 1]
+
+
+def test_time_mode_requires_time_column():
+    df = pd.DataFrame({'roomNumber': [1, 1]})
+    with pytest.raises(ValueError):
+        BinningEngine(BIN_MODE_TIME).assign(df, time_column='nanoTime')
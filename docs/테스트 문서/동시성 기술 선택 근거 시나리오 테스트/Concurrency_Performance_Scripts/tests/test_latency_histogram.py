@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+common.latency_histogram 버킷 계산 / 백분위수 회귀 테스트
+- 256 미만 정확 버킷과 그 이상 하위 버킷의 경계, bucket_index ↔ bucket_bounds 왕복 (2의 거듭제곱 경계 포함) 검증
+- 히스토그램 백분위수가 순위 값(ceil(n × p / 100)번째)이 속한 버킷 상한과 같고, np.percentile 과의 상대 오차가 버킷 폭 이내인지 검증
+- 실행: python -m pytest tests/test_latency_histogram.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from common.latency_histogram import (ALL_ROOMS_LABEL, DEFAULT_PERCENTILES, ROOM_COLUMN, SUB_BUCKET_COUNT,
+                                      SUB_BUCKET_HALF, bucket_bounds, bucket_index, build_latency_histograms,
+                                      histogram_percentiles, merge_histograms, percentile_column,
+                                      percentiles_by_room)
+
+
+def power_of_two_boundaries(max_exponent=62):
+    """2^k - 1, 2^k, 2^k + 1 값 (k = 1..max_exponent)"""
+    values = {value for k in range(1, max_exponent + 1) for value in (2 ** k - 1, 2 ** k, 2 ** k + 1)}
+    return np.array(sorted(values), dtype=np.int64)
+
+
+def ranked_value(values, percentile):
+    """ceil(n × p / 100)번째 값 (histogram_percentiles 와 같은 순위, n × p / 100 의 float 오차는 소수 9자리 반올림으로 제거)"""
+    rank = max(int(np.ceil(round(len(values) * percentile / 100, 9))), 1)
+    return int(np.sort(values)[rank - 1])
+
+
+def latency_frame(values, rooms):
+    """방별 지연 시간(ns) DataFrame (build_latency_histograms 입력)"""
+    return pd.DataFrame({ROOM_COLUMN: rooms, 'bin': 1, 'wait_time_ns': values})
+
+
+def test_exact_buckets_below_sub_bucket_count():
+    values = np.arange(SUB_BUCKET_COUNT)
+    lower, upper = bucket_bounds(bucket_index(values))
+
+    assert bucket_index(values).tolist() == values.tolist()
+    assert lower.tolist() == values.tolist()
+    assert upper.tolist() == values.tolist()
+
+
+def test_sub_bucket_boundary_at_256():
+    # 256 부터 2ns 폭 버킷, 512 부터 4ns 폭 버킷 (버킷 번호는 끊김 없이 이어짐)
+    assert bucket_index([255, 256, 257, 258, 511, 512, 515, 516]).tolist() == [255, 256, 256, 257, 383, 384, 384, 385]
+
+    lower, upper = bucket_bounds([255, 256, 383, 384])
+    assert lower.tolist() == [255, 256, 510, 512]
+    assert upper.tolist() == [255, 257, 511, 515]
+
+
+def test_bucket_bounds_tile_value_range():
+    # 이웃한 버킷은 겹치거나 빈틈 없이 맞닿음
+    index = np.arange(SUB_BUCKET_HALF * 50)
+    lower, upper = bucket_bounds(index)
+
+    assert (lower <= upper).all()
+    assert (lower[1:] == upper[:-1] + 1).all()
+
+
+def test_round_trip_across_powers_of_two():
+    values = power_of_two_boundaries()
+    index = bucket_index(values)
+    lower, upper = bucket_bounds(index)
+
+    assert ((lower <= values) & (values <= upper)).all()
+    assert (np.diff(index) >= 0).all()
+    # 같은 버킷의 값은 모두 하한 값으로 되돌아감
+    assert (bucket_index(lower) == index).all()
+    assert (bucket_index(upper) == index).all()
+    # 정확 버킷 밖의 버킷 폭 <= 하한 / SUB_BUCKET_HALF (큰 값의 float 반올림을 피해 정수로 비교)
+    wide = lower >= SUB_BUCKET_COUNT
+    assert ((upper[wide] - lower[wide] + 1) * SUB_BUCKET_HALF <= lower[wide]).all()
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_percentiles_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.lognormal(mean=12, sigma=1.5, size=5000)).astype(np.int64)
+    rooms = rng.integers(1, 4, size=len(values))
+    hist = build_latency_histograms([('wait', latency_frame(values, rooms), 'wait_time_ns')])
+
+    result = histogram_percentiles(hist).iloc[0]
+    assert result['count'] == len(values)
+    assert result['min(ns)'] == bucket_bounds(bucket_index(values.min()))[0]
+    assert result['max(ns)'] == bucket_bounds(bucket_index(values.max()))[1]
+
+    for percentile in DEFAULT_PERCENTILES:
+        estimate = result[percentile_column(percentile)]
+        # 순위 값이 속한 버킷의 상한
+        assert estimate == bucket_bounds(bucket_index(ranked_value(values, percentile)))[1]
+        # 선형 보간 백분위수와의 상대 오차 (버킷 폭 + 이웃 순위 값 사이 보간 차이)
+        exact = np.percentile(values, percentile)
+        assert abs(estimate - exact) / exact < 2 / SUB_BUCKET_HALF
+
+
+def test_percentiles_exact_below_sub_bucket_count():
+    values = np.arange(1, 201)
+    hist = build_latency_histograms([('wait', latency_frame(values, 1), 'wait_time_ns')])
+    result = histogram_percentiles(hist).iloc[0]
+
+    for percentile in DEFAULT_PERCENTILES:
+        assert result[percentile_column(percentile)] == ranked_value(values, percentile)
+
+
+def test_merged_room_histograms_match_whole_sample():
+    rng = np.random.default_rng(2)
+    values = rng.integers(0, 10_000_000, size=3000)
+    rooms = rng.integers(1, 4, size=len(values))
+    df = latency_frame(values, rooms)
+
+    per_room = [build_latency_histograms([('wait', df[df[ROOM_COLUMN] == room], 'wait_time_ns')]) for room in (1, 2, 3)]
+    merged = merge_histograms(per_room)
+    whole = merge_histograms(build_latency_histograms([('wait', df, 'wait_time_ns')]))
+    pd.testing.assert_frame_equal(merged, whole)
+
+    by_room = percentiles_by_room(per_room)
+    assert by_room[ROOM_COLUMN].tolist() == [1, 2, 3, ALL_ROOMS_LABEL]
+    overall = by_room[by_room[ROOM_COLUMN] == ALL_ROOMS_LABEL].drop(columns=ROOM_COLUMN).reset_index(drop=True)
+    pd.testing.assert_frame_equal(overall, histogram_percentiles(whole), check_dtype=False)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+common.log_tokenizer 병렬 파싱 회귀 테스트
+- tokenize_log_parallel(workers=N) 결과가 직렬 파싱(workers=1)과 컬럼/순서까지 동일한지 합성 로그로 검증
+- 구간 분할 목표 위치가 라인 중간에 걸리는 경우, 마지막 라인에 개행이 없는 경우, 방 번호 필터 포함
+- 실행: python -m pytest tests/test_log_tokenizer.py
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from common.log_tokenizer import (build_marker_spec, get_columns, split_line_aligned_offsets, tokenize_log,
+                                  tokenize_log_parallel)
+
+CRITICAL_SPEC = build_marker_spec(
+    'CRITICAL_SECTION_MARK', ['CRITICAL_SECTION_MARK tag='],
+    r'CRITICAL_SECTION_MARK tag=(?P<tag>WAITING_START|CRITICAL_ENTER|CRITICAL_LEAVE)'
+    r' timestampIso=(?P<timestamp>\S+)'
+    r' event=(?P<event>\w+)'
+    r'.* roomNumber=(?P<roomNumber>\d+)'
+    r' userId=(?P<userId>\S+)'
+    r'(?:.* nanoTime=(?P<nanoTime>\d+))?',
+    int_fields=['roomNumber', 'nanoTime'], copy_fields={'event_type': 'event'}
+)
+INCREMENT_SPEC = build_marker_spec(
+    'INCREMENT', ['event=INCREMENT_'],
+    r'timestampIso=(?P<timestamp>\S+)'
+    r' event=(?P<tag>INCREMENT_BEFORE|INCREMENT_AFTER)'
+    r' roomNumber=(?P<roomNumber>\d+)'
+    r' userId=(?P<userId>\S+)'
+    r'.* nanoTime=(?P<nanoTime>\d+)',
+    int_fields=['roomNumber', 'nanoTime'], constant_fields={'event_type': None}
+)
+LOG_SPECS = [CRITICAL_SPEC, INCREMENT_SPEC]
+
+
+def synthetic_lines(count, seed=0):
+    """규칙별 로그 라인 + 무관한 라인 (길이가 제각각이라 구간 목표 위치가 라인 중간에 걸림)"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        room_number = rng.choice([1, 2, 3])
+        timestamp = f'2025-07-23T02:24:37.{i:09d}Z'
+        padding = 'x' * rng.randrange(0, 40)
+        kind = rng.randrange(5)
+        if kind == 0:
+            tag = rng.choice(['WAITING_START', 'CRITICAL_ENTER', 'CRITICAL_LEAVE'])
+            nano = f' nanoTime={1000 + i}' if rng.random() < 0.8 else ''  # nanoTime 없는 라인 → None
+            lines.append(f'INFO CRITICAL_SECTION_MARK tag={tag} timestampIso={timestamp} event=EV_{i % 7}'
+                         f' className=Svc{padding} roomNumber={room_number} userId=user-{i}{nano}')
+        elif kind == 1:
+            tag = rng.choice(['INCREMENT_BEFORE', 'INCREMENT_AFTER'])
+            lines.append(f'timestampIso={timestamp} event={tag} roomNumber={room_number} userId=user-{i}'
+                         f' 방{padding} nanoTime={2000 + i}')
+        elif kind == 2:
+            lines.append(f'DEBUG 연결 처리 {padding} event=INCREMENT_ 불완전 라인')  # 사전 필터만 통과
+        else:
+            lines.append(f'INFO 일반 로그 {i} {padding}')
+    return lines
+
+
+@pytest.fixture(scope='module')
+def log_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp('logs') / 'ChatService.log'
+    # 마지막 라인은 개행 없이 끝남
+    path.write_bytes('\n'.join(synthetic_lines(3000)).encode('utf-8'))
+    return str(path)
+
+
+def test_synthetic_log_hits_every_rule(log_file):
+    data = tokenize_log(log_file, LOG_SPECS)
+
+    assert list(data) == get_columns(LOG_SPECS)
+    assert {'WAITING_START', 'CRITICAL_ENTER', 'INCREMENT_BEFORE', 'INCREMENT_AFTER'} <= set(data['tag'])
+    assert None in data['nanoTime']
+
+
+def test_chunk_targets_fall_mid_line(log_file):
+    # 분할 목표 위치(file_size × i / N)가 라인 시작이 아닌 경우가 실제로 포함되는지 확인
+    with open(log_file, 'rb') as f:
+        content = f.read()
+    line_starts = {0} | {i + 1 for i, byte in enumerate(content) if byte == ord('\n')}
+    targets = [len(content) * i // 7 for i in range(1, 7)]
+
+    assert any(target not in line_starts for target in targets)
+
+
+@pytest.mark.parametrize('chunk_count', [2, 3, 7, 16, 64])
+def test_offsets_are_line_aligned_and_contiguous(log_file, chunk_count):
+    with open(log_file, 'rb') as f:
+        content = f.read()
+    offsets = split_line_aligned_offsets(log_file, chunk_count)
+
+    assert offsets[0][0] == 0
+    assert offsets[-1][1] == len(content)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(offsets, offsets[1:]))
+    assert all(start == 0 or content[start - 1] == ord('\n') for start, _ in offsets)
+
+
+@pytest.mark.parametrize('workers', [2, 3, 7])
+@pytest.mark.parametrize('room_number', [None, 2])
+def test_parallel_matches_serial(log_file, workers, room_number):
+    serial = tokenize_log_parallel(log_file, LOG_SPECS, room_number=room_number, workers=1)
+    parallel = tokenize_log_parallel(log_file, LOG_SPECS, room_number=room_number, workers=workers)
+
+    assert list(parallel) == list(serial)
+    for column in serial:
+        assert parallel[column] == serial[column], column
+
+
+@pytest.mark.parametrize('chunk_count', [5, 64])
+def test_chunked_tokenize_matches_whole_file(log_file, chunk_count):
+    # 프로세스 없이 구간별 tokenize_log 결과를 이어 붙여도 전체 파싱과 동일 (구간 경계 라인 중복/누락 없음)
+    whole = tokenize_log(log_file, LOG_SPECS)
+    joined = {column: [] for column in whole}
+    for start, end in split_line_aligned_offsets(log_file, chunk_count):
+        for column, values in tokenize_log(log_file, LOG_SPECS, start=start, end=end).items():
+            joined[column].extend(values)
+
+    assert joined == whole
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+racecondition_event_preprocessor(_semaphore) 페어링 회귀 테스트
+- 단일 패스 페어링(pair_room_events) 결과가 기존 전방 탐색 구현과 동일한지 합성 로그로 검증
+- 실행: python -m pytest tests/test_racecondition_event_pairing.py
+"""
+
+import importlib.util
+import os
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PREPROCESSING_DIR = os.path.join(SCRIPTS_DIR, 'RaceConditionAnalzer_Scripts', '01_preprocessing')
+
+PREPROCESSORS = {
+    'racecondition_event_preprocessor': {
+        'build': 'build_paired_data_true_critical_section',
+        'create': 'create_paired_record',
+        'start': 'PRE_JOIN_CURRENT_STATE',
+        'success': 'JOIN_SUCCESS_EXISTING',
+        'fail': 'JOIN_FAIL_OVER_CAPACITY_EXISTING',
+    },
+    'racecondition_event_preprocessor_semaphore': {
+        'build': 'build_paired_data_semaphore_critical_section',
+        'create': 'create_semaphore_paired_record',
+        'start': 'JOIN_PERMIT_ATTEMPT',
+        'success': 'JOIN_PERMIT_SUCCESS',
+        'fail': 'JOIN_PERMIT_FAIL',
+    },
+}
+
+
+def load_preprocessor(module_name):
+    """스크립트 파일을 모듈로 로드"""
+    path = os.path.join(PREPROCESSING_DIR, f'{module_name}.py')
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_pairing(room_df, create_record, start_event, terminal_events):
+    """기존 전방 탐색 페어링 (room_df.iloc[j] 반복) - 비교 기준"""
+    result_list = []
+    i = 0
+    while i < len(room_df):
+        current_row = room_df.iloc[i]
+        if current_row['event'] == start_event:
+            pre_event = current_row
+            for j in range(i + 1, len(room_df)):
+                next_row = room_df.iloc[j]
+                if (next_row['userId'] == pre_event['userId'] and
+                        next_row['event'] in terminal_events):
+                    result_list.append(create_record(pre_event, next_row))
+                    break
+        i += 1
+    return result_list
+
+
+def write_synthetic_log(path, config, seed):
+    """
+    합성 로그 생성
+    - 정상 시작→종료, 시작 중복(같은 종료 이벤트 공유), 종료 없는 시작, 시작 없는 종료, 사용자 ID 재사용 포함
+    """
+    rng = random.Random(seed)
+    base_time = datetime(2025, 7, 9, 13, 36, 41)
+    nano_time = 5_000_000_000_000
+    lines = []
+
+    for room_number in (1, 2, 3):
+        pending = []
+        people = 0
+        for _ in range(120):
+            nano_time += rng.randint(1, 5000)
+            timestamp = (base_time + timedelta(microseconds=nano_time // 1000)).strftime('%Y-%m-%dT%H:%M:%S.%f') + 'Z'
+
+            if pending and rng.random() < 0.45:
+                user_id = pending.pop(rng.randrange(len(pending)))
+                event = config['success'] if rng.random() < 0.7 else config['fail']
+                if event == config['success']:
+                    people += 1
+            elif rng.random() < 0.05:
+                user_id = f'user{rng.randint(1, 40)}'
+                event = rng.choice([config['success'], config['fail']])
+            else:
+                user_id = f'user{rng.randint(1, 40)}'
+                event = config['start']
+                if rng.random() < 0.9:
+                    pending.append(user_id)
+
+            lines.append(
+                f'INFO timestampIso={timestamp} event={event} roomNumber={room_number} '
+                f'userId={user_id} currentPeople={people} maxPeople=20 nanoTime={nano_time}\n'
+            )
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+@pytest.mark.parametrize('module_name', sorted(PREPROCESSORS))
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_pairing_matches_forward_scan(tmp_path, monkeypatch, module_name, seed):
+    config = PREPROCESSORS[module_name]
+    module = load_preprocessor(module_name)
+    terminal_events = [config['success'], config['fail']]
+
+    log_path = tmp_path / 'ChatService.log'
+    write_synthetic_log(log_path, config, seed)
+    events = module.parse_logs(str(log_path))
+    build = getattr(module, config['build'])
+    create_record = getattr(module, config['create'])
+
+    # 방 단위 페어링 결과 비교
+    sort_key = events['nanoTime'].astype('int64')
+    events_sorted = events.assign(_sort=sort_key).sort_values(['roomNumber', '_sort']).drop(columns='_sort')
+    for _, room_df in events_sorted.groupby('roomNumber', sort=False):
+        room_df = room_df.reset_index(drop=True)
+        expected = reference_pairing(room_df, create_record, config['start'], terminal_events)
+        assert module.pair_room_events(room_df) == expected
+
+    # 전체 전처리 결과 비교 (페어링 단계만 기존 구현으로 교체)
+    actual_result = build(events.copy())
+    monkeypatch.setattr(
+        module, 'pair_room_events',
+        lambda room_df: reference_pairing(room_df, create_record, config['start'], terminal_events)
+    )
+    expected_result = build(events.copy())
+
+    assert len(actual_result) > 0
+    pd.testing.assert_frame_equal(actual_result, expected_result)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+common.table_io 스키마 적용 / 컬럼형 왕복 회귀 테스트
+- apply_table_schema 가 선언된 {컬럼명: dtype} 그대로 변환하는지 (빈 칸 결측값, 숫자로만 된 문자열 유지) 검증
+- write_table → read_table (Parquet/Feather) 왕복 후 dtype 과 값이 스키마와 같은지 검증 (pyarrow 없으면 건너뜀)
+- 실행: python -m pytest tests/test_table_io.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from common.nano_time import NANO_DTYPE
+from common.table_io import apply_table_schema, read_table, write_table
+
+EPOCH_NANO = 1_752_891_877_453_106_789  # float64 로는 정확히 표현되지 않는 값 (> 2^53)
+
+SCHEMA = {
+    'roomNumber': 'int64',
+    'user_id': 'string',
+    'expected_people': 'float64',
+    'curr_entry_time': 'datetime64[ns, UTC]',
+    'waiting_start_epochNano': NANO_DTYPE,
+    'anomaly_type': 'string',
+    'over_capacity_amount': 'float64',
+}
+
+
+def detector_like_frame():
+    """탐지기 출력처럼 fillna('') 로 빈 칸을 채운 object 컬럼이 섞인 DataFrame"""
+    return pd.DataFrame({
+        'roomNumber': [1, 1, 2],
+        'user_id': ['1001', 'user-2', '1003'],  # 숫자로만 된 사용자 ID 도 문자열 유지
+        'expected_people': pd.Series([2.0, '', 3.0], dtype=object),
+        'curr_entry_time': pd.Series([pd.Timestamp('2025-07-12 06:02:15.932842', tz='UTC'), '',
+                                      pd.Timestamp('2025-07-12 06:02:16', tz='UTC')], dtype=object),
+        'waiting_start_epochNano': [str(EPOCH_NANO), '', str(EPOCH_NANO + 1)],
+        'anomaly_type': ['값 불일치', '', '정원 초과 오류'],
+        'over_capacity_amount': pd.Series(['', '', 1], dtype=object),
+        'note': pd.Series(['a', 1, None], dtype=object),  # 스키마에 없는 혼합 타입 컬럼
+    }).set_axis([10, 11, 12])  # 저장 시 RangeIndex 로 초기화되는지 확인용
+
+
+def assert_schema_values(table):
+    for column, dtype in SCHEMA.items():
+        assert table[column].dtype == pd.api.types.pandas_dtype(dtype), column
+
+    assert table.index.equals(pd.RangeIndex(3))
+    assert table['user_id'].tolist() == ['1001', 'user-2', '1003']
+    assert table['expected_people'].isna().tolist() == [False, True, False]
+    assert table['curr_entry_time'].isna().tolist() == [False, True, False]
+    assert table['waiting_start_epochNano'].iloc[0] == EPOCH_NANO
+    assert table['waiting_start_epochNano'].iloc[2] == EPOCH_NANO + 1
+    assert table['anomaly_type'].isna().tolist() == [False, True, False]
+    assert table['over_capacity_amount'].iloc[2] == 1.0
+    assert table['note'].dtype == 'string'
+    assert table['note'].tolist()[:2] == ['a', '1']
+
+
+def test_apply_table_schema_casts_declared_dtypes():
+    assert_schema_values(apply_table_schema(detector_like_frame(), SCHEMA))
+
+
+def test_apply_table_schema_keeps_typed_columns():
+    # 이미 선언 dtype 인 컬럼은 값 변경 없음
+    df = pd.DataFrame({'roomNumber': np.array([3, 4], dtype=np.int64), 'expected_people': [1.5, np.nan]})
+    table = apply_table_schema(df, SCHEMA)
+
+    pd.testing.assert_frame_equal(table, df)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.feather'])
+def test_columnar_round_trip_keeps_schema(tmp_path, extension):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / f'anomalies{extension}')
+
+    write_table(detector_like_frame(), path, schema=SCHEMA)
+    table = read_table(path)
+
+    assert list(table.columns) == list(detector_like_frame().columns)
+    assert_schema_values(table)
+    pd.testing.assert_frame_equal(table, apply_table_schema(detector_like_frame(), SCHEMA))
+
+    subset = read_table(path, columns=['roomNumber', 'waiting_start_epochNano'])
+    assert list(subset.columns) == ['roomNumber', 'waiting_start_epochNano']
+    assert subset['waiting_start_epochNano'].dtype == NANO_DTYPE
+
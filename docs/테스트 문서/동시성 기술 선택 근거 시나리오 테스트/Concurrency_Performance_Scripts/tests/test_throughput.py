@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+common.throughput 처리량 시계열 회귀 테스트
+- 창별 offered/completed/in_flight 가 요청 단위로 직접 센 값과 같은지 검증
+- 시작 시각이 없는 요청(예: WAITING_START 없는 불완전 시도)이 있어도 in_flight 가 음수가 되지 않는지 검증
+- 실행: python -m pytest tests/test_throughput.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from common.throughput import ALL_ROOMS_LABEL, ROOM_COLUMN, throughput_time_series
+
+WINDOW_NS = 1_000_000  # window_ms=1.0
+ORIGIN = 5_000_000_000
+
+
+def request_frame(rooms, starts, ends):
+    """요청 단위 DataFrame (시각 None = 기록 없음)"""
+    return pd.DataFrame({
+        ROOM_COLUMN: rooms,
+        'start_ns': pd.array(starts, dtype='Int64'),
+        'end_ns': pd.array(ends, dtype='Int64'),
+        'wait_time_ns': 1,
+    })
+
+
+def series_for(df):
+    return throughput_time_series(df, 'start_ns', 'end_ns', 'wait_time_ns', window_ms=1.0)
+
+
+def reference_counts(df, room, window):
+    """창 하나의 도착/완료 수와 창 끝 시점 처리 중 요청 수 (시작/종료가 모두 있는 요청만) - 비교 기준"""
+    room_df = df if room == ALL_ROOMS_LABEL else df[df[ROOM_COLUMN] == room]
+    arrival = (room_df['start_ns'] - ORIGIN) // WINDOW_NS
+    completion = (room_df['end_ns'] - ORIGIN) // WINDOW_NS
+    tracked = arrival.notna() & completion.notna()
+    return {
+        'offered': int((arrival == window).sum()),
+        'completed': int((completion == window).sum()),
+        'in_flight': int((tracked & (arrival <= window) & (completion > window)).sum()),
+    }
+
+
+def test_request_without_start_does_not_go_negative():
+    df = request_frame(
+        rooms=[1, 1, 1],
+        starts=[ORIGIN, ORIGIN + 100, None],                   # 세 번째 요청은 시작 시각 없음
+        ends=[ORIGIN + WINDOW_NS, ORIGIN + 2 * WINDOW_NS + 5, ORIGIN + 2 * WINDOW_NS],
+    )
+    room = series_for(df)
+    room = room[room[ROOM_COLUMN] == 1]
+
+    assert room['completed'].tolist() == [0, 1, 2]
+    assert room['in_flight'].tolist() == [2, 1, 0]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_counts_match_reference_with_missing_times(seed):
+    rng = np.random.default_rng(seed)
+    size = 300
+    starts = ORIGIN + rng.integers(0, 20 * WINDOW_NS, size=size)
+    ends = starts + rng.integers(0, 5 * WINDOW_NS, size=size)
+    starts = [None if missing else int(value) for value, missing in zip(starts, rng.random(size) < 0.15)]
+    ends = [None if missing else int(value) for value, missing in zip(ends, rng.random(size) < 0.15)]
+    starts[0] = ORIGIN  # 창 0 = 전체 최초 시각
+    df = request_frame(rng.integers(1, 4, size=size), starts, ends)
+
+    series = series_for(df)
+
+    assert (series['in_flight'] >= 0).all()
+    for row in series.itertuples(index=False):
+        expected = reference_counts(df, getattr(row, ROOM_COLUMN), row.window)
+        assert (row.offered, row.completed, row.in_flight) == (
+            expected['offered'], expected['completed'], expected['in_flight']), (getattr(row, ROOM_COLUMN), row.window)